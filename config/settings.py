@@ -20,7 +20,8 @@ AVAILABLE_MODELS = {
         "cost_key": "model_cost_low",
         "description_key": "model_mistral_small_desc",
         "performance_key": "model_perf_good",
-        "cost_label_key": "model_cost_label_low"
+        "cost_label_key": "model_cost_label_low",
+        "tier": 1
     },
     "gpt-oss-120b": {
         "name": "GPT OSS 120B",
@@ -30,7 +31,8 @@ AVAILABLE_MODELS = {
         "cost_key": "model_cost_medium",
         "description_key": "model_gpt_oss_120b_desc",
         "performance_key": "model_perf_very_good",
-        "cost_label_key": "model_cost_label_medium"
+        "cost_label_key": "model_cost_label_medium",
+        "tier": 2
     },
     "Mixtral-8x7B-Instruct-v0.1": {
         "name": "Mixtral 8x7B Instruct",
@@ -40,10 +42,15 @@ AVAILABLE_MODELS = {
         "cost_key": "model_cost_high",
         "description_key": "model_mixtral_8x7b_desc",
         "performance_key": "model_perf_excellent",
-        "cost_label_key": "model_cost_label_high"
+        "cost_label_key": "model_cost_label_high",
+        "tier": 3
     }
 }
 
+# Modèle par défaut et mode de sélection automatique (routeur de modèles)
+DEFAULT_MODEL = "Mistral-Small-3.2-24B-Instruct-2506"
+AUTO_MODEL = "auto"
+
 
 class Settings(BaseSettings):
     """Configuration de l'application avec validation Pydantic"""
@@ -56,6 +63,40 @@ class Settings(BaseSettings):
     AI_API_BASE_URL: str = Field(default="https://oai.endpoints.kepler.ai.cloud.ovh.net/v1", description="URL de base de l'API OVH AI")
     AI_MAX_TOKENS: int = Field(default=1000, description="Nombre maximum de tokens pour les réponses")
     AI_TEMPERATURE: float = Field(default=0.1, description="Température pour la génération")
+    CV_TEXT_MARKDOWN_SECTIONS: bool = Field(default=False, description="Marquer les titres de section (## ...) dans le texte du CV envoyé au LLM")
+    LLM_COMPACT_SCHEMA: bool = Field(default=False, description="Schéma de sortie compact (clés courtes, tableaux) pour réduire les tokens générés")
+    LLM_MAX_CONTINUATIONS: int = Field(default=2, description="Nombre maximal de relances d'une réponse tronquée (finish_reason length) avant réparation locale")
+    LLM_FUSED_PITCH: bool = Field(default=False, description="Pitch produit par l'appel d'extraction lui-même (appel séparé en repli)")
+    LLM_STREAM_EXTRACTION: bool = Field(default=False, description="Extraction streamée : pitch lancé dès que ses entrées (en-tête, compétences, 3 expériences) sont générées")
+    LONG_CV_TOKEN_THRESHOLD: int = Field(default=6000, description="Tokens au-delà desquels un CV est extrait par sections en parallèle (0 = désactivé)")
+    LONG_CV_CHUNK_TOKENS: int = Field(default=2500, description="Taille maximale (tokens) d'un bloc d'expériences en extraction par sections")
+
+    # Pré-extraction spéculative dès l'upload
+    SPECULATIVE_EXTRACTION: bool = Field(default=False, description="Extraire et structurer le CV en arrière-plan dès l'upload (cache chaud à la conversion)")
+    SPECULATIVE_MAX_CONCURRENT: int = Field(default=4, description="Nombre maximal de pré-extractions simultanées")
+    SPECULATIVE_TIMEOUT_SECONDS: float = Field(default=120.0, description="Budget de temps d'une pré-extraction non réclamée (secondes)")
+
+    # Résilience des appels LLM
+    LLM_TIMEOUT_SECONDS: float = Field(default=90.0, description="Délai maximal d'une tentative d'appel LLM (secondes)")
+    LLM_CALL_BUDGET_SECONDS: float = Field(default=240.0, description="Budget total d'un appel LLM, tentatives comprises (secondes)")
+    LLM_MAX_RETRIES: int = Field(default=3, description="Nombre maximal de nouvelles tentatives sur erreur transitoire (429, 5xx, réseau)")
+    LLM_RETRY_BASE_DELAY: float = Field(default=1.0, description="Délai de base du backoff exponentiel avec jitter (secondes)")
+    LLM_RETRY_MAX_DELAY: float = Field(default=30.0, description="Délai maximal entre deux tentatives (secondes)")
+    LLM_BREAKER_FAILURE_THRESHOLD: int = Field(default=5, description="Échecs consécutifs avant ouverture du circuit d'un modèle")
+    LLM_BREAKER_RESET_SECONDS: float = Field(default=30.0, description="Durée d'ouverture du circuit avant un appel d'essai (secondes)")
+    LLM_HEDGE_PERCENTILE: float = Field(default=0.0, description="Percentile de latence déclenchant une requête dupliquée (ex: 0.95, 0 = désactivé)")
+
+    # Pool de connexions HTTP partagé des clients LLM
+    LLM_HTTP_MAX_CONNECTIONS: int = Field(default=20, description="Nombre maximal de connexions simultanées vers l'endpoint LLM")
+    LLM_HTTP_MAX_KEEPALIVE: int = Field(default=10, description="Nombre maximal de connexions inactives conservées (keep-alive)")
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = Field(default=60.0, description="Durée de conservation d'une connexion inactive (secondes)")
+    LLM_HTTP_CONNECT_TIMEOUT: float = Field(default=10.0, description="Délai maximal d'établissement d'une connexion (secondes)")
+    LLM_HTTP2: bool = Field(default=False, description="Activer HTTP/2 vers l'endpoint LLM (nécessite httpx[http2])")
+
+    # Routeur de modèles (model="auto")
+    MODEL_ROUTER_LONG_CV_TOKENS: int = Field(default=4000, description="Nombre de tokens au-delà duquel un CV est considéré comme long")
+    MODEL_ROUTER_MAX_ERROR_RATE: float = Field(default=0.3, description="Taux d'erreur au-delà duquel un modèle est considéré comme dégradé")
+    MODEL_ROUTER_MAX_P95_SECONDS: float = Field(default=60.0, description="Latence p95 au-delà de laquelle un modèle est considéré comme dégradé (0 = ignorée)")
     
     # Application
     APP_NAME: str = Field(default="CV Generator", description="Nom de l'application")
@@ -71,6 +112,7 @@ class Settings(BaseSettings):
     # Cache
     CACHE_ENABLED: bool = Field(default=True, description="Activer le cache")
     CACHE_TTL_DAYS: int = Field(default=30, description="Durée de vie du cache en jours")
+    LLM_CACHE_NAMESPACE: str = Field(default="default", description="Espace de noms du cache LLM (changer pour déployer de nouveaux prompts sans vider le cache)")
     
     # Logging
     LOG_LEVEL: str = Field(default="INFO", description="Niveau de log (DEBUG/INFO/WARNING/ERROR)")
@@ -6,22 +6,71 @@ Ce script orchestre le processus complet :
 3. Génération du fichier DOCX formaté
 """
 
+import asyncio
+import contextvars
+import functools
 import hashlib
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Callable, List, Optional, Tuple
 
 import docx2txt
-from diskcache import Cache
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from config.logging_config import setup_logger
+from config.settings import DEFAULT_MODEL, get_settings
+from core.cache import (
+    CACHE_DIR,
+    CACHE_TTL,
+    build_cache_key,
+    cache_set,
+    content_hash,
+    llm_cache,
+    single_flight,
+)
+from core.compact_schema import compact_cv_data, expand_cv_data, wire_schema
+from core.cv_schema import (
+    CVJsonError,
+    load_json_reply,
+    stitch_continuation,
+    validate_cv_data,
+)
 from core.docx_extractor import extract_docx_content
 from core.docx_generator import generate_docx_from_cv_data
+from core.events import ConsoleProgress, ProgressEmitter, ProgressEvent, ProgressHooks
+from core.llm_transport import get_llm_http_pool
+from core.long_cv import CVSection, merge_section_results, split_cv_sections
+from core.model_router import ModelRouter, is_auto
+from core.page_budget import fit_to_page_budget
 from core.pdf_extractor import extract_pdf_content
+from core.pipeline import PipelineReport, StageGraph
 from core.prompts import PromptTemplates
+from core.resilience import get_llm_gateway
+from core.streaming import (
+    STREAM_OPTIONS,
+    PitchSpeculation,
+    StreamObserver,
+    TokenProgress,
+    collect_stream,
+    collect_stream_async,
+    combine_observers,
+    pitch_first,
+)
+from core.telemetry import (
+    CONTINUATION,
+    CORRECTION,
+    EXTRACTION,
+    EXTRACTION_SECTION,
+    PITCH,
+    TRANSFORMATION,
+    ConversionTelemetry,
+    llm_telemetry,
+)
+from core.text_preprocessor import PAGE_BREAK, estimate_tokens, preprocess_cv_text
 
 # Charger le fichier .env
 load_dotenv()
@@ -29,11 +78,31 @@ load_dotenv()
 # Logger
 logger = setup_logger(__name__, "agent.log")
 
-# Cache global avec TTL de 15 jours (en secondes)
-CACHE_DIR = Path(__file__).parent.parent / "cache" / "llm_responses"
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
-llm_cache = Cache(str(CACHE_DIR))
-CACHE_TTL = 15 * 24 * 60 * 60  # 15 jours en secondes
+# Prompts système
+EXTRACTION_SYSTEM_PROMPT = "Tu es un assistant spécialisé dans l'extraction de données structurées à partir de CV. Tu retournes uniquement du JSON valide."
+PITCH_SYSTEM_PROMPT = (
+    "Tu es un consultant RH expert en rédaction de présentations professionnelles."
+)
+
+# Valeur de substitution de l'appel d'offres pour calculer la version du prompt
+JOB_OFFER_PLACEHOLDER = "{job_offer_content}"
+
+# Longueur minimale d'un pitch fusionné exploitable (mots)
+FUSED_PITCH_MIN_WORDS = 40
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Exécute une fonction bloquante (pdfplumber, python-docx...) hors de la boucle asyncio
+
+    Args:
+        func: Fonction synchrone à exécuter
+        *args, **kwargs: Arguments transmis à la fonction
+
+    Returns:
+        Le résultat de la fonction
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
 
 
 class CVConverterAgent:
@@ -54,10 +123,485 @@ class CVConverterAgent:
         base_url = os.getenv(
             "AI_API_BASE_URL", "https://oai.endpoints.kepler.ai.cloud.ovh.net/v1"
         )
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        # Les nouvelles tentatives sont gérées par la couche de résilience
+        self.gateway = get_llm_gateway()
+        # Pool de connexions partagé par toutes les instances de l'agent
+        self.http_pool = get_llm_http_pool()
+        self.client = OpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=0,
+            timeout=self.http_pool.policy.timeout,
+            http_client=self.http_pool.client,
+        )
+        self._api_key = api_key
+        self._base_url = base_url
+        self._async_client = None
 
         # Modèle par défaut ou personnalisé
-        self.model = os.getenv("AI_MODEL", "Mistral-Small-3.2-24B-Instruct-2506")
+        self.model = os.getenv("AI_MODEL", DEFAULT_MODEL)
+
+        # Sélection du modèle en mode "auto"
+        self.router = ModelRouter(self.gateway)
+
+        # Pitchs spéculatifs en vol (références des tâches asyncio)
+        self._speculative_pitches = set()
+
+        # Abonnés aux événements de progression (cf. core.events)
+        self.events = ProgressHooks()
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Client asynchrone (compatible OpenAI), créé au premier usage
+
+        Utilisé par le chemin asyncio (API FastAPI) pour ne pas bloquer la boucle
+        d'événements pendant les appels LLM.
+        """
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self._api_key,
+                base_url=self._base_url,
+                max_retries=0,
+                timeout=self.http_pool.policy.timeout,
+                http_client=self.http_pool.async_client,
+            )
+        return self._async_client
+
+    def _complete(self, request: dict, kind: str, schema: Optional[str] = None):
+        """Appel ``chat.completions.create`` via la couche de résilience
+
+        Nouvelles tentatives (backoff avec jitter, Retry-After), disjoncteur
+        par modèle et hedging optionnel. L'appel est mesuré (tokens, latence,
+        finish_reason) sous le type ``kind`` (cf. ``core.telemetry``) ;
+        ``schema`` indique la variante du schéma de sortie demandé.
+        """
+        with llm_telemetry.measure(kind, request["model"], schema) as probe:
+            probe["response"] = self.gateway.call(
+                request["model"],
+                lambda: self.client.chat.completions.create(**request),
+            )
+        return probe["response"]
+
+    async def _complete_async(
+        self, request: dict, kind: str, schema: Optional[str] = None
+    ):
+        """Variante asyncio de ``_complete``"""
+        with llm_telemetry.measure(kind, request["model"], schema) as probe:
+            probe["response"] = await self.gateway.call_async(
+                request["model"],
+                lambda: self.async_client.chat.completions.create(**request),
+            )
+        return probe["response"]
+
+    def _complete_streamed(
+        self,
+        request: dict,
+        kind: str,
+        schema: Optional[str],
+        observer: StreamObserver,
+    ):
+        """Variante streamée de ``_complete`` : les fragments alimentent ``observer``
+
+        La réponse reconstituée a la forme d'une réponse non streamée ; chaque
+        tentative (retry, hedging) repart d'un analyseur vierge.
+        """
+        with llm_telemetry.measure(kind, request["model"], schema) as probe:
+            probe["response"] = self.gateway.call(
+                request["model"],
+                lambda: collect_stream(
+                    self.client.chat.completions.create(
+                        **self._stream_request(request)
+                    ),
+                    observer.watcher(),
+                    probe,
+                ),
+            )
+        return probe["response"]
+
+    async def _complete_streamed_async(
+        self,
+        request: dict,
+        kind: str,
+        schema: Optional[str],
+        observer: StreamObserver,
+    ):
+        """Variante asyncio de ``_complete_streamed``"""
+
+        async def call():
+            stream = await self.async_client.chat.completions.create(
+                **self._stream_request(request)
+            )
+            return await collect_stream_async(stream, observer.watcher(), probe)
+
+        with llm_telemetry.measure(kind, request["model"], schema) as probe:
+            probe["response"] = await self.gateway.call_async(request["model"], call)
+        return probe["response"]
+
+    @staticmethod
+    def _stream_request(request: dict) -> dict:
+        """Paramètres d'un appel streamé (usage renvoyé dans le dernier fragment)"""
+        return {**request, "stream": True, "extra_body": STREAM_OPTIONS}
+
+    def _continuation_request(self, request: dict, content: str) -> dict:
+        """Relance d'une réponse tronquée : le modèle reprend là où il s'est arrêté
+
+        Sans ``response_format`` : la suite n'est pas un objet JSON à elle seule.
+        """
+        return {
+            "model": request["model"],
+            "messages": [
+                *request["messages"],
+                {"role": "assistant", "content": content},
+                {"role": "user", "content": PromptTemplates.CONTINUATION_PROMPT},
+            ],
+        }
+
+    def _complete_text(
+        self,
+        request: dict,
+        kind: str,
+        schema: Optional[str] = None,
+        observer: Optional[StreamObserver] = None,
+    ):
+        """Texte complet d'une réponse, prolongé si elle a été tronquée
+
+        Avec ``observer``, la réponse est streamée et suivie au fil de l'eau
+        (pitch spéculatif, progression ; cf. ``core.streaming``).
+        """
+        if observer is not None:
+            response = self._complete_streamed(request, kind, schema, observer)
+        else:
+            response = self._complete(request, kind, schema)
+        return self._continue_truncated(request, *self._reply(response), schema)
+
+    async def _complete_text_async(
+        self,
+        request: dict,
+        kind: str,
+        schema: Optional[str] = None,
+        observer: Optional[StreamObserver] = None,
+    ):
+        """Variante asyncio de ``_complete_text``"""
+        if observer is not None:
+            response = await self._complete_streamed_async(
+                request, kind, schema, observer
+            )
+        else:
+            response = await self._complete_async(request, kind, schema)
+        return await self._continue_truncated_async(
+            request, *self._reply(response), schema
+        )
+
+    @staticmethod
+    def _reply(response) -> Tuple[str, Optional[str]]:
+        """Texte et ``finish_reason`` du premier choix d'une réponse"""
+        choice = response.choices[0]
+        return choice.message.content or "", choice.finish_reason
+
+    def _may_continue(self, finish_reason, continuations: int) -> bool:
+        """Réponse tronquée (limite de tokens) encore prolongeable"""
+        if finish_reason != "length":
+            return False
+        if continuations >= get_settings().LLM_MAX_CONTINUATIONS:
+            logger.warning(
+                f"Réponse encore tronquée après {continuations} continuation(s)"
+            )
+            return False
+        logger.info(f"Réponse tronquée, continuation {continuations + 1}")
+        return True
+
+    @classmethod
+    def _stitch_reply(cls, content: str, response) -> Tuple[str, Optional[str]]:
+        """Recolle la suite reçue à la réponse partielle"""
+        continuation, finish_reason = cls._reply(response)
+        return stitch_continuation(content, continuation), finish_reason
+
+    def _continue_truncated(
+        self,
+        request: dict,
+        content: str,
+        finish_reason: Optional[str],
+        schema: Optional[str] = None,
+    ) -> str:
+        """Prolonge une réponse coupée par la limite de tokens (finish_reason "length")
+
+        Le modèle est relancé avec la réponse partielle pour continuer là où il
+        s'est arrêté, dans la limite de ``LLM_MAX_CONTINUATIONS`` ; les fragments
+        sont recollés (chevauchement retiré). Les tokens déjà générés ne sont pas
+        perdus ; une réponse encore tronquée est réparée à la validation.
+        """
+        continuations = 0
+        while self._may_continue(finish_reason, continuations):
+            continuations += 1
+            response = self._complete(
+                self._continuation_request(request, content), CONTINUATION, schema
+            )
+            content, finish_reason = self._stitch_reply(content, response)
+        return content
+
+    async def _continue_truncated_async(
+        self,
+        request: dict,
+        content: str,
+        finish_reason: Optional[str],
+        schema: Optional[str] = None,
+    ) -> str:
+        """Variante asyncio de ``_continue_truncated``"""
+        continuations = 0
+        while self._may_continue(finish_reason, continuations):
+            continuations += 1
+            response = await self._complete_async(
+                self._continuation_request(request, content), CONTINUATION, schema
+            )
+            content, finish_reason = self._stitch_reply(content, response)
+        return content
+
+    def _route(
+        self, model: str, cv_text: Optional[str], improvement_mode: str
+    ) -> List[str]:
+        """Modèles candidats : le modèle demandé, ou le choix du routeur en mode auto
+
+        En mode auto, les candidats suivants servent de repli si le premier
+        est indisponible (circuit ouvert, erreurs transitoires persistantes).
+        """
+        if not is_auto(model):
+            return [model]
+        candidates = self.router.candidates(
+            estimate_tokens(cv_text or ""), improvement_mode
+        )
+        logger.info(f"Routage auto: {candidates[0]} (repli: {candidates[1:]})")
+        return candidates
+
+    @staticmethod
+    def _compact_schema() -> bool:
+        """Schéma de sortie compact demandé au LLM (cf. ``core.compact_schema``)"""
+        return get_settings().LLM_COMPACT_SCHEMA
+
+    @staticmethod
+    def _fused_pitch() -> bool:
+        """Pitch demandé dans la réponse d'extraction (mode fusionné)"""
+        return get_settings().LLM_FUSED_PITCH
+
+    @staticmethod
+    def _stream_extraction() -> bool:
+        """Extraction streamée avec pitch spéculatif (cf. ``core.streaming``)"""
+        return get_settings().LLM_STREAM_EXTRACTION
+
+    def _speculation(
+        self, candidate_name, launch: Callable[[dict], None]
+    ) -> Optional[PitchSpeculation]:
+        """Spéculation dont le démarrage appelle ``launch`` avec les entrées du pitch"""
+        if not self._stream_extraction() or self._fused_pitch():
+            return None
+
+        def start(cv_data):
+            self._apply_candidate_name(cv_data, candidate_name)
+            logger.info("Entrées du pitch générées : pitch lancé pendant l'extraction")
+            launch(cv_data)
+
+        return PitchSpeculation(start, self._compact_schema())
+
+    def _pitch_speculation(
+        self, job_offer_content: Optional[str], candidate_name, model: str
+    ) -> Optional[PitchSpeculation]:
+        """Pitch lancé dans un thread dès que ses entrées sont générées
+
+        L'étape pitch retrouve ensuite le résultat en cache, ou rejoint l'appel
+        encore en vol ; il n'est jamais annulé.
+        """
+
+        def launch(cv_data):
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(self.generate_profile_pitch, cv_data, job_offer_content, model),
+                daemon=True,
+            ).start()
+
+        return self._speculation(candidate_name, launch)
+
+    def _emitter(
+        self, progress: Optional[Callable[[ProgressEvent], None]] = None
+    ) -> ProgressEmitter:
+        """Émetteur d'une conversion : abonnés de l'agent et suivi de l'appel"""
+        return ProgressEmitter(self.events, progress)
+
+    @staticmethod
+    def _token_progress(emit: ProgressEmitter) -> Optional[TokenProgress]:
+        """Progression de la structuration en tokens reçus (réponse streamée)"""
+        if not emit.active:
+            return None
+        return TokenProgress(lambda tokens: emit("llm_tokens", tokens=tokens))
+
+    def _pitch_speculation_async(
+        self, job_offer_content: Optional[str], candidate_name, model: str
+    ) -> Optional[PitchSpeculation]:
+        """Variante asyncio de ``_pitch_speculation`` (tâche sur la boucle courante)"""
+
+        def launch(cv_data):
+            task = asyncio.ensure_future(
+                self.generate_profile_pitch_async(cv_data, job_offer_content, model)
+            )
+            self._speculative_pitches.add(task)
+            task.add_done_callback(self._speculative_pitches.discard)
+
+        return self._speculation(candidate_name, launch)
+
+    def _usable_fused_pitch(self, cv_data: dict, candidate_name=None) -> Optional[str]:
+        """Pitch produit par l'appel d'extraction, s'il est exploitable
+
+        Absent ou trop court, il est demandé par l'appel séparé. Avec un nom de
+        candidat imposé, le pitch fusionné (rédigé avec le nom extrait) est écarté.
+        """
+        if not self._fused_pitch() or candidate_name:
+            return None
+        pitch = cv_data.get("pitch")
+        if not isinstance(pitch, str) or len(pitch.split()) < FUSED_PITCH_MIN_WORDS:
+            return None
+        return pitch.strip()
+
+    def _wire_schema(self) -> str:
+        return wire_schema(self._compact_schema())
+
+    def _build_correction_request(self, prompt: str, model: str) -> dict:
+        """Paramètres d'une demande de correction ciblée (sans le CV)"""
+        return {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            "response_format": {"type": "json_object"},
+        }
+
+    def _syntax_correction_request(self, content: str, model: str) -> dict:
+        logger.warning("JSON irréparable localement, correction de la syntaxe")
+        return self._build_correction_request(
+            PromptTemplates.build_json_syntax_correction_prompt(content), model
+        )
+
+    def _fragment_correction_request(self, validation, model: str) -> dict:
+        logger.warning(
+            f"Fragments invalides soumis au LLM: {', '.join(validation.broken)}"
+        )
+        return self._build_correction_request(
+            PromptTemplates.build_fragment_correction_prompt(
+                validation.broken, validation.expected_shapes()
+            ),
+            model,
+        )
+
+    @staticmethod
+    def _loaded_reply(content: str) -> dict:
+        data, repaired = load_json_reply(content)
+        if repaired:
+            logger.info("Réponse JSON réparée localement")
+        return data
+
+    @staticmethod
+    def _corrections(response) -> Optional[dict]:
+        """Fragments corrigés d'une réponse de correction"""
+        data, _ = load_json_reply(response.choices[0].message.content)
+        return data.get("fragments")
+
+    def _parse_cv_json(self, content: str, model: str) -> dict:
+        """Réponse CV du LLM -> cv_data canonique validé
+
+        Le JSON est réparé localement si besoin puis validé contre le schéma
+        typé (``core.cv_schema``) ; seule une réponse irréparable ou des
+        fragments invalides donnent lieu à une demande de correction ciblée.
+        """
+        try:
+            data = self._loaded_reply(content)
+        except CVJsonError:
+            request = self._syntax_correction_request(content, model)
+            response = self._complete(request, CORRECTION)
+            data = self._loaded_reply(response.choices[0].message.content)
+        return self._validate_cv_data(expand_cv_data(data), model)
+
+    async def _parse_cv_json_async(self, content: str, model: str) -> dict:
+        """Variante asyncio de ``_parse_cv_json``"""
+        try:
+            data = self._loaded_reply(content)
+        except CVJsonError:
+            request = self._syntax_correction_request(content, model)
+            response = await self._complete_async(request, CORRECTION)
+            data = self._loaded_reply(response.choices[0].message.content)
+        return await self._validate_cv_data_async(expand_cv_data(data), model)
+
+    def _validate_cv_data(self, data: dict, model: str) -> dict:
+        """Valide un cv_data ; les fragments irrécupérables sont corrigés par le LLM
+
+        À défaut de correction, ils reçoivent une valeur sûre.
+        """
+        validation = validate_cv_data(data)
+        if not validation.broken:
+            return validation.resolve()
+
+        try:
+            request = self._fragment_correction_request(validation, model)
+            corrections = self._corrections(self._complete(request, CORRECTION))
+        except Exception as e:
+            logger.warning(f"Correction des fragments impossible: {e}")
+            corrections = None
+        return validation.resolve(corrections)
+
+    async def _validate_cv_data_async(self, data: dict, model: str) -> dict:
+        """Variante asyncio de ``_validate_cv_data``"""
+        validation = validate_cv_data(data)
+        if not validation.broken:
+            return validation.resolve()
+
+        try:
+            request = self._fragment_correction_request(validation, model)
+            response = await self._complete_async(request, CORRECTION)
+            corrections = self._corrections(response)
+        except Exception as e:
+            logger.warning(f"Correction des fragments impossible: {e}")
+            corrections = None
+        return validation.resolve(corrections)
+
+    @staticmethod
+    def _normalize_language(target_language: Optional[str]) -> Optional[str]:
+        """Le français (langue source) équivaut à l'absence de traduction"""
+        return None if target_language in (None, "", "fr") else target_language
+
+    def _extraction_prompt_version(
+        self,
+        improve_content: bool,
+        improvement_mode: str,
+        job_offer_content: Optional[str],
+        max_pages: Optional[int],
+        target_language: Optional[str],
+    ) -> str:
+        """Empreinte du prompt d'extraction rendu pour ces options (sans le CV)"""
+        template = PromptTemplates.build_cv_extraction_prompt(
+            pdf_text="",
+            improve_content=improve_content,
+            improvement_mode=improvement_mode,
+            job_offer_content=JOB_OFFER_PLACEHOLDER if job_offer_content else None,
+            max_pages=max_pages,
+            target_language=target_language,
+            compact=self._compact_schema(),
+            pitch=self._fused_pitch(),
+            pitch_first=self._stream_extraction(),
+        )
+        return PromptTemplates.fingerprint(EXTRACTION_SYSTEM_PROMPT, template)
+
+    @staticmethod
+    def _pipeline_version() -> str:
+        """Empreinte des réglages qui modifient ``cv_data`` hors du prompt
+
+        Prétraitement du texte, extraction par sections des CV longs et schéma
+        de sortie : un changement de l'un d'eux invalide les clés de cache.
+        """
+        settings = get_settings()
+        options = {
+            "markdown_sections": settings.CV_TEXT_MARKDOWN_SECTIONS,
+            "long_cv_threshold": settings.LONG_CV_TOKEN_THRESHOLD,
+            "long_cv_chunk": settings.LONG_CV_CHUNK_TOKENS,
+            "compact_schema": settings.LLM_COMPACT_SCHEMA,
+        }
+        return content_hash(json.dumps(options, sort_keys=True, default=str))[:12]
 
     def _generate_cache_key(
         self,
@@ -65,29 +609,104 @@ class CVConverterAgent:
         improve_content: bool,
         improvement_mode: str,
         job_offer_content: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        target_language: Optional[str] = None,
+        model: Optional[str] = None,
     ) -> str:
-        """Génère une clé de cache unique basée sur le contenu et les options
+        """Génère une clé de cache canonique couvrant toutes les entrées du LLM
+
+        La clé inclut le contenu, chaque option qui modifie la sortie, le modèle,
+        l'empreinte du prompt rendu et celle des réglages du pipeline : une
+        modification des templates de ``PromptTemplates`` ou de ces réglages
+        invalide automatiquement les anciennes entrées.
 
         Args:
             pdf_content: Contenu du PDF
             improve_content: Amélioration activée ou non
             improvement_mode: Mode d'amélioration
             job_offer_content: Contenu de l'appel d'offres (optionnel)
+            max_pages: Nombre maximum de pages (optionnel)
+            target_language: Langue cible (optionnel)
+            model: Modèle LLM (défaut: modèle de l'agent)
 
         Returns:
             str: Clé de cache unique
         """
-        # Créer un hash du contenu du PDF
-        content_hash = hashlib.sha256(pdf_content.encode()).hexdigest()[:16]
+        return build_cache_key(
+            "cv",
+            content=content_hash(pdf_content),
+            job_offer=content_hash(job_offer_content),
+            improve_content=improve_content,
+            improvement_mode=improvement_mode,
+            max_pages=max_pages,
+            target_language=self._normalize_language(target_language),
+            model=model or self.model,
+            prompt_version=self._extraction_prompt_version(
+                improve_content,
+                improvement_mode,
+                job_offer_content,
+                max_pages,
+                target_language,
+            ),
+            pipeline_version=self._pipeline_version(),
+        )
+
+    @staticmethod
+    def _hash_file(file_path) -> str:
+        """Calcule le SHA-256 du contenu brut d'un fichier (lecture par blocs)"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _generate_file_cache_key(
+        self,
+        file_path,
+        improve_content: bool,
+        improvement_mode: str,
+        job_offer_path: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        target_language: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> str:
+        """Génère la clé de cache de premier niveau basée sur les octets du fichier
 
-        # Ajouter le hash de l'appel d'offres si présent
-        job_hash = ""
-        if job_offer_content:
-            job_hash = "_" + hashlib.sha256(job_offer_content.encode()).hexdigest()[:8]
+        Contrairement à ``_generate_cache_key`` (hash du texte extrait), cette clé
+        est calculable sans passer par pdfplumber : un upload identique est servi
+        directement depuis le cache, sans extraction.
+        Comme elle, elle couvre les réglages du pipeline (``_pipeline_version``).
 
-        # Clé composite
-        cache_key = f"cv_{content_hash}_{improvement_mode}_{improve_content}{job_hash}"
-        return cache_key
+        Args:
+            file_path: Chemin du CV uploadé
+            improve_content: Amélioration activée ou non
+            improvement_mode: Mode d'amélioration
+            job_offer_path: Chemin de l'appel d'offres (optionnel)
+            max_pages: Nombre maximum de pages (optionnel)
+            target_language: Langue cible (optionnel)
+            model: Modèle LLM
+
+        Returns:
+            str: Clé de cache unique
+        """
+        return build_cache_key(
+            "file",
+            file=self._hash_file(file_path),
+            job_offer=self._hash_file(job_offer_path) if job_offer_path else None,
+            improve_content=improve_content,
+            improvement_mode=improvement_mode,
+            max_pages=max_pages,
+            target_language=self._normalize_language(target_language),
+            model=model or self.model,
+            prompt_version=self._extraction_prompt_version(
+                improve_content,
+                improvement_mode,
+                job_offer_path,
+                max_pages,
+                target_language,
+            ),
+            pipeline_version=self._pipeline_version(),
+        )
 
     def extract_job_offer_content(self, job_offer_path: str) -> str:
         """Extrait le contenu d'un appel d'offres (PDF, DOCX ou TXT)
@@ -125,6 +744,136 @@ class CVConverterAgent:
             logger.error(f"Erreur lors de l'extraction de l'appel d'offres: {e}")
             raise
 
+    def _build_extraction_request(
+        self,
+        pdf_text: str,
+        improve_content: bool,
+        improvement_mode: str,
+        job_offer_content: Optional[str],
+        max_pages: Optional[int],
+        target_language: Optional[str],
+        model: str,
+    ) -> dict:
+        """Construit les paramètres de l'appel LLM d'extraction structurée
+
+        Returns:
+            dict: Arguments pour ``chat.completions.create``
+        """
+        # Construire le prompt avec le template centralisé
+        prompt = PromptTemplates.build_cv_extraction_prompt(
+            pdf_text=pdf_text,
+            improve_content=improve_content,
+            improvement_mode=improvement_mode,
+            job_offer_content=job_offer_content,
+            max_pages=max_pages,
+            target_language=target_language,
+            compact=self._compact_schema(),
+            pitch=self._fused_pitch(),
+            pitch_first=self._stream_extraction(),
+        )
+
+        return {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            "response_format": {"type": "json_object"},
+        }
+
+    def _build_transformation_request(
+        self,
+        cv_data: dict,
+        improvement_mode: str,
+        job_offer_content: Optional[str],
+        max_pages: Optional[int],
+        target_language: Optional[str],
+        model: str,
+    ) -> dict:
+        """Construit les paramètres de l'appel LLM de transformation d'un CV structuré
+
+        Returns:
+            dict: Arguments pour ``chat.completions.create``
+        """
+        compact = self._compact_schema()
+        if compact:
+            cv_data = compact_cv_data(cv_data)
+        if self._stream_extraction():
+            # La transformation suit l'ordre reçu : entrées du pitch en tête
+            cv_data = pitch_first(cv_data, compact)
+        prompt = PromptTemplates.build_cv_transformation_prompt(
+            cv_json=json.dumps(cv_data, ensure_ascii=False, separators=(",", ":")),
+            improvement_mode=improvement_mode,
+            job_offer_content=job_offer_content,
+            max_pages=max_pages,
+            target_language=target_language,
+            compact=compact,
+            pitch=self._fused_pitch(),
+        )
+
+        return {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            "response_format": {"type": "json_object"},
+        }
+
+    def _generate_transformation_cache_key(
+        self,
+        cv_data: dict,
+        improvement_mode: str,
+        job_offer_content: Optional[str],
+        max_pages: Optional[int],
+        target_language: Optional[str],
+        model: Optional[str],
+    ) -> str:
+        """Clé de cache d'une variante dérivée de l'extraction canonique"""
+        template = PromptTemplates.build_cv_transformation_prompt(
+            cv_json="",
+            improvement_mode=improvement_mode,
+            job_offer_content=JOB_OFFER_PLACEHOLDER if job_offer_content else None,
+            max_pages=max_pages,
+            target_language=target_language,
+            compact=self._compact_schema(),
+            pitch=self._fused_pitch(),
+        )
+        return build_cache_key(
+            "cv_variant",
+            source=content_hash(json.dumps(cv_data, sort_keys=True)),
+            job_offer=content_hash(job_offer_content),
+            improvement_mode=improvement_mode,
+            max_pages=max_pages,
+            target_language=target_language,
+            model=model or self.model,
+            prompt_version=PromptTemplates.fingerprint(
+                EXTRACTION_SYSTEM_PROMPT, template
+            ),
+        )
+
+    def _resolve_variant(
+        self,
+        improve_content: bool,
+        improvement_mode: str,
+        job_offer_content: Optional[str],
+        max_pages: Optional[int],
+        target_language: Optional[str],
+    ) -> Optional[tuple]:
+        """Options de la transformation à appliquer à l'extraction canonique
+
+        Returns:
+            tuple: (mode effectif, max_pages, langue) ou None si la variante
+            demandée est l'extraction canonique elle-même
+        """
+        effective_mode = PromptTemplates.get_effective_mode(
+            improve_content, improvement_mode, job_offer_content
+        )
+        language = self._normalize_language(target_language)
+        if effective_mode == "none" and not max_pages and not language:
+            return None
+        return effective_mode, max_pages, language
+
     def extract_structured_data_with_llm(
         self,
         pdf_text: str,
@@ -133,10 +882,16 @@ class CVConverterAgent:
         job_offer_content: Optional[str] = None,
         max_pages: Optional[int] = None,
         target_language: Optional[str] = None,
-        model: str = "gpt-4o-mini",
+        model: str = DEFAULT_MODEL,
+        observer: Optional[StreamObserver] = None,
     ) -> dict:
         """Utilise le LLM pour extraire les données structurées du CV
 
+        L'extraction fidèle (mode "none", sans traduction ni limite de pages)
+        est l'enregistrement canonique mis en cache. Les autres variantes
+        (amélioration, traduction, condensation) en sont dérivées par une
+        seconde étape sur le JSON compact, sans renvoyer le texte du PDF.
+
         Args:
             pdf_text: Texte extrait du PDF
             improve_content: Si True, le LLM peut améliorer le contenu
@@ -145,49 +900,368 @@ class CVConverterAgent:
             max_pages: Nombre maximum de pages (optionnel)
             target_language: Langue cible pour la traduction (optionnel: en, it, es)
             model: Modèle OpenAI à utiliser
+            observer: Observateur du dernier appel, alors streamé (pitch
+                spéculatif, progression ; optionnel, cf. ``core.streaming``)
 
         Returns:
             dict: Données structurées du CV
         """
-        # Vérifier le cache
-        cache_key = self._generate_cache_key(
-            pdf_text, improve_content, improvement_mode, job_offer_content
+        variant = self._resolve_variant(
+            improve_content,
+            improvement_mode,
+            job_offer_content,
+            max_pages,
+            target_language,
+        )
+        if variant is None:
+            return self._extract_canonical(pdf_text, model, observer)
+
+        canonical = self._extract_canonical(pdf_text, model)
+        effective_mode, max_pages, language = variant
+        return self.transform_cv_data(
+            canonical,
+            effective_mode,
+            job_offer_content,
+            max_pages,
+            language,
+            model,
+            observer=observer,
         )
 
-        if cache_key in llm_cache:
-            logger.info("Données trouvées dans le cache (pas d'appel LLM)")
-            return llm_cache[cache_key]
+    def _cached(
+        self, cache_key: str, kind: str, model: str, message: Optional[str] = None
+    ):
+        """Résultat déjà en cache (appel LLM évité, compté dans la télémétrie)"""
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            llm_telemetry.record_cache_hit(kind, model or self.model)
+            if message:
+                logger.info(message)
+        return cached
+
+    def _extract_canonical(
+        self,
+        pdf_text: str,
+        model: str,
+        observer: Optional[StreamObserver] = None,
+    ) -> dict:
+        """Extraction fidèle du texte du CV (enregistrement canonique en cache)"""
+        cache_key = self._generate_cache_key(pdf_text, False, "none", model=model)
+
+        cached = self._cached(
+            cache_key,
+            EXTRACTION,
+            model,
+            "Données trouvées dans le cache (pas d'appel LLM)",
+        )
+        if cached is not None:
+            return cached
 
         logger.info("Données non trouvées dans le cache, appel du LLM...")
 
-        # Construire le prompt avec le template centralisé
-        prompt = PromptTemplates.build_cv_extraction_prompt(
-            pdf_text=pdf_text,
-            improve_content=improve_content,
-            improvement_mode=improvement_mode,
-            job_offer_content=job_offer_content,
-            max_pages=max_pages,
-            target_language=target_language,
+        sections = self._split_long_cv(pdf_text)
+        request = self._build_extraction_request(
+            pdf_text, False, "none", None, None, None, model
         )
 
+        def call_llm():
+            if sections:
+                return self._extract_sections(sections, model)
+
+            content = self._complete_text(
+                request, EXTRACTION, self._wire_schema(), observer
+            )
+            return self._parse_cv_json(content, request["model"])
+
         try:
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Tu es un assistant spécialisé dans l'extraction de données structurées à partir de CV. Tu retournes uniquement du JSON valide.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                response_format={"type": "json_object"},
+            # Un seul appel pour les requêtes identiques concurrentes ;
+            # le résultat est mis en cache avec un TTL de 15 jours
+            cv_data = single_flight.run(llm_cache, cache_key, call_llm)
+
+            logger.info("Extraction structurée réussie via LLM (mis en cache)")
+            return cv_data
+
+        except Exception as e:
+            logger.error(f"Erreur lors de l'extraction structurée: {e}", exc_info=True)
+            raise
+
+    def _split_long_cv(self, pdf_text: str) -> List[CVSection]:
+        """Sections à extraire en parallèle si le CV dépasse le seuil de tokens
+
+        Returns:
+            List[CVSection]: Sections du CV, liste vide pour un appel unique
+        """
+        settings = get_settings()
+        tokens = estimate_tokens(pdf_text)
+        if (
+            not settings.LONG_CV_TOKEN_THRESHOLD
+            or tokens < settings.LONG_CV_TOKEN_THRESHOLD
+        ):
+            return []
+
+        sections = split_cv_sections(pdf_text, settings.LONG_CV_CHUNK_TOKENS)
+        if sections:
+            logger.info(
+                f"CV long ({tokens} tokens) : extraction par sections "
+                f"({', '.join(section.kind for section in sections)})"
+            )
+        return sections
+
+    def _build_section_request(self, section: CVSection, model: str) -> dict:
+        """Construit les paramètres de l'appel LLM d'extraction d'une section"""
+        prompt = PromptTemplates.build_section_extraction_prompt(
+            section.text, section.keys, section.context
+        )
+        return {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            "response_format": {"type": "json_object"},
+        }
+
+    def _generate_section_cache_key(self, section: CVSection, model: str) -> str:
+        """Clé de cache de l'extraction d'une section (reprise partielle)"""
+        template = PromptTemplates.build_section_extraction_prompt("", section.keys)
+        return build_cache_key(
+            "cv_section",
+            content=content_hash(section.text),
+            context=content_hash(section.context),
+            keys=list(section.keys),
+            model=model,
+            prompt_version=PromptTemplates.fingerprint(
+                EXTRACTION_SYSTEM_PROMPT, template
+            ),
+        )
+
+    def _extract_section(self, section: CVSection, model: str) -> dict:
+        """Extraction d'une section d'un CV long"""
+        cache_key = self._generate_section_cache_key(section, model)
+        cached = self._cached(cache_key, EXTRACTION_SECTION, model)
+        if cached is not None:
+            return cached
+
+        request = self._build_section_request(section, model)
+
+        def call_llm():
+            return self._loaded_reply(self._complete_text(request, EXTRACTION_SECTION))
+
+        return single_flight.run(llm_cache, cache_key, call_llm)
+
+    async def _extract_section_async(self, section: CVSection, model: str) -> dict:
+        """Variante asyncio de ``_extract_section``"""
+        cache_key = self._generate_section_cache_key(section, model)
+        cached = self._cached(cache_key, EXTRACTION_SECTION, model)
+        if cached is not None:
+            return cached
+
+        request = self._build_section_request(section, model)
+
+        async def call_llm():
+            return self._loaded_reply(
+                await self._complete_text_async(request, EXTRACTION_SECTION)
+            )
+
+        return await single_flight.run_async(llm_cache, cache_key, call_llm)
+
+    def _extract_sections(self, sections: List[CVSection], model: str) -> dict:
+        """Extrait les sections en parallèle puis fusionne dans le schéma cv_data"""
+        with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+            # Chaque thread reprend le contexte (télémétrie de la conversion)
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._extract_section,
+                    section,
+                    model,
+                )
+                for section in sections
+            ]
+            results = [future.result() for future in futures]
+        return self._validate_cv_data(merge_section_results(sections, results), model)
+
+    async def _extract_sections_async(
+        self, sections: List[CVSection], model: str
+    ) -> dict:
+        """Variante asyncio de ``_extract_sections``"""
+        results = await asyncio.gather(
+            *(self._extract_section_async(section, model) for section in sections)
+        )
+        return await self._validate_cv_data_async(
+            merge_section_results(sections, results), model
+        )
+
+    def _prepare_transformation(
+        self,
+        cv_data: dict,
+        improvement_mode: str,
+        job_offer_content: Optional[str],
+        max_pages: Optional[int],
+        target_language: Optional[str],
+        model: str,
+    ) -> Tuple[str, Optional[dict], Optional[dict]]:
+        """Clé de cache d'une variante, variante en cache ou requête LLM à envoyer"""
+        cache_key = self._generate_transformation_cache_key(
+            cv_data,
+            improvement_mode,
+            job_offer_content,
+            max_pages,
+            target_language,
+            model,
+        )
+        cached = self._cached(
+            cache_key,
+            TRANSFORMATION,
+            model,
+            "Variante trouvée dans le cache (pas d'appel LLM)",
+        )
+        if cached is not None:
+            return cache_key, cached, None
+
+        logger.info(
+            f"Transformation du CV structuré (mode: {improvement_mode}, "
+            f"pages: {max_pages}, langue: {target_language})..."
+        )
+        request = self._build_transformation_request(
+            cv_data,
+            improvement_mode,
+            job_offer_content,
+            max_pages,
+            target_language,
+            model,
+        )
+        return cache_key, None, request
+
+    def transform_cv_data(
+        self,
+        cv_data: dict,
+        improvement_mode: str = "none",
+        job_offer_content: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        target_language: Optional[str] = None,
+        model: str = DEFAULT_MODEL,
+        observer: Optional[StreamObserver] = None,
+    ) -> dict:
+        """Dérive une variante (amélioration, traduction, condensation) d'un CV structuré
+
+        Args:
+            cv_data: Extraction canonique du CV
+            improvement_mode: Mode d'amélioration effectif (none, basic, targeted)
+            job_offer_content: Contenu de l'appel d'offres (mode targeted)
+            max_pages: Nombre maximum de pages (optionnel)
+            target_language: Langue cible (optionnel: en, it, es)
+            model: Modèle OpenAI à utiliser
+            observer: Observateur de l'appel, alors streamé (optionnel)
+
+        Returns:
+            dict: Données structurées de la variante
+        """
+        cache_key, cached, request = self._prepare_transformation(
+            cv_data,
+            improvement_mode,
+            job_offer_content,
+            max_pages,
+            target_language,
+            model,
+        )
+        if cached is not None:
+            return cached
+
+        def call_llm():
+            content = self._complete_text(
+                request, TRANSFORMATION, self._wire_schema(), observer
             )
+            return self._parse_cv_json(content, request["model"])
+
+        try:
+            variant = single_flight.run(llm_cache, cache_key, call_llm)
+
+            logger.info("Transformation réussie via LLM (mis en cache)")
+            return variant
+
+        except Exception as e:
+            logger.error(f"Erreur lors de la transformation du CV: {e}", exc_info=True)
+            raise
+
+    async def extract_structured_data_with_llm_async(
+        self,
+        pdf_text: str,
+        improve_content: bool = False,
+        improvement_mode: str = "none",
+        job_offer_content: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        target_language: Optional[str] = None,
+        model: str = DEFAULT_MODEL,
+        observer: Optional[StreamObserver] = None,
+    ) -> dict:
+        """Variante asyncio de ``extract_structured_data_with_llm``
+
+        L'appel LLM passe par le client asynchrone : la boucle d'événements reste
+        libre pendant la génération. Mêmes arguments et même cache que la
+        version synchrone.
+
+        Returns:
+            dict: Données structurées du CV
+        """
+        variant = self._resolve_variant(
+            improve_content,
+            improvement_mode,
+            job_offer_content,
+            max_pages,
+            target_language,
+        )
+        if variant is None:
+            return await self._extract_canonical_async(pdf_text, model, observer)
+
+        canonical = await self._extract_canonical_async(pdf_text, model)
+        effective_mode, max_pages, language = variant
+        return await self.transform_cv_data_async(
+            canonical,
+            effective_mode,
+            job_offer_content,
+            max_pages,
+            language,
+            model,
+            observer=observer,
+        )
+
+    async def _extract_canonical_async(
+        self,
+        pdf_text: str,
+        model: str,
+        observer: Optional[StreamObserver] = None,
+    ) -> dict:
+        """Variante asyncio de ``_extract_canonical``"""
+        cache_key = self._generate_cache_key(pdf_text, False, "none", model=model)
+
+        cached = self._cached(
+            cache_key,
+            EXTRACTION,
+            model,
+            "Données trouvées dans le cache (pas d'appel LLM)",
+        )
+        if cached is not None:
+            return cached
 
-            json_response = response.choices[0].message.content
-            cv_data = json.loads(json_response)
+        logger.info("Données non trouvées dans le cache, appel du LLM (async)...")
 
-            # Stocker dans le cache avec TTL de 15 jours
-            llm_cache.set(cache_key, cv_data, expire=CACHE_TTL)
+        sections = self._split_long_cv(pdf_text)
+        request = self._build_extraction_request(
+            pdf_text, False, "none", None, None, None, model
+        )
+
+        async def call_llm():
+            if sections:
+                return await self._extract_sections_async(sections, model)
+
+            content = await self._complete_text_async(
+                request, EXTRACTION, self._wire_schema(), observer
+            )
+            return await self._parse_cv_json_async(content, request["model"])
+
+        try:
+            cv_data = await single_flight.run_async(llm_cache, cache_key, call_llm)
 
             logger.info("Extraction structurée réussie via LLM (mis en cache)")
             return cv_data
@@ -196,8 +1270,115 @@ class CVConverterAgent:
             logger.error(f"Erreur lors de l'extraction structurée: {e}", exc_info=True)
             raise
 
+    async def transform_cv_data_async(
+        self,
+        cv_data: dict,
+        improvement_mode: str = "none",
+        job_offer_content: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        target_language: Optional[str] = None,
+        model: str = DEFAULT_MODEL,
+        observer: Optional[StreamObserver] = None,
+    ) -> dict:
+        """Variante asyncio de ``transform_cv_data``"""
+        cache_key, cached, request = self._prepare_transformation(
+            cv_data,
+            improvement_mode,
+            job_offer_content,
+            max_pages,
+            target_language,
+            model,
+        )
+        if cached is not None:
+            return cached
+
+        async def call_llm():
+            content = await self._complete_text_async(
+                request, TRANSFORMATION, self._wire_schema(), observer
+            )
+            return await self._parse_cv_json_async(content, request["model"])
+
+        try:
+            variant = await single_flight.run_async(llm_cache, cache_key, call_llm)
+
+            logger.info("Transformation réussie via LLM (mis en cache)")
+            return variant
+
+        except Exception as e:
+            logger.error(f"Erreur lors de la transformation du CV: {e}", exc_info=True)
+            raise
+
+    def _generate_pitch_cache_key(
+        self,
+        cv_data: dict,
+        job_offer_content: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> str:
+        """Génère la clé de cache du pitch
+
+        Seule la projection des données lues par le prompt est hachée : une
+        modification de l'évaluation, du TJM ou des formations réutilise le
+        pitch existant.
+        """
+        inputs = PromptTemplates.pitch_inputs(cv_data, job_offer_content)
+        template = PromptTemplates.build_pitch_prompt(
+            {}, JOB_OFFER_PLACEHOLDER if job_offer_content else None
+        )
+        return build_cache_key(
+            "pitch",
+            inputs=content_hash(json.dumps(inputs, sort_keys=True)),
+            model=model or self.model,
+            prompt_version=PromptTemplates.fingerprint(PITCH_SYSTEM_PROMPT, template),
+        )
+
+    def _build_pitch_request(
+        self, cv_data: dict, job_offer_content: Optional[str], model: str
+    ) -> dict:
+        """Construit les paramètres de l'appel LLM de génération du pitch"""
+        # Construire le prompt avec le template centralisé
+        prompt = PromptTemplates.build_pitch_prompt(cv_data, job_offer_content)
+
+        return {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": PITCH_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            "max_tokens": 1000,
+        }
+
+    def _prepare_pitch(
+        self, cv_data: dict, job_offer_content: Optional[str], model: str
+    ) -> Tuple[str, Optional[str], Optional[dict]]:
+        """Clé de cache du pitch, pitch en cache ou requête LLM à envoyer"""
+        cache_key = self._generate_pitch_cache_key(cv_data, job_offer_content, model)
+        cached = self._cached(cache_key, PITCH, model, "Pitch récupéré depuis le cache")
+        if cached:
+            return cache_key, cached, None
+        return (
+            cache_key,
+            None,
+            self._build_pitch_request(cv_data, job_offer_content, model),
+        )
+
+    def _parse_pitch_response(self, response, model: str) -> Optional[str]:
+        """Extrait le pitch de la réponse LLM (None si vide)"""
+        pitch = (
+            response.choices[0].message.content.strip()
+            if response.choices[0].message.content
+            else ""
+        )
+
+        if not pitch:
+            logger.warning(
+                f"Pitch vide! finish_reason: {response.choices[0].finish_reason}, modèle: {model}"
+            )
+            return None
+
+        return pitch
+
     def generate_profile_pitch(
-        self, cv_data, job_offer_content=None, model="gpt-4o-mini"
+        self, cv_data, job_offer_content=None, model=DEFAULT_MODEL
     ):
         """Génère un pitch de profil pour présenter le candidat à un client
 
@@ -209,50 +1390,55 @@ class CVConverterAgent:
         Returns:
             str: Pitch de présentation du profil
         """
-        # Générer une clé de cache pour le pitch
-        cache_data = json.dumps(cv_data, sort_keys=True)
-        cache_key_input = cache_data + (job_offer_content or "")
-        pitch_cache_key = (
-            "pitch_" + hashlib.sha256(cache_key_input.encode()).hexdigest()[:24]
+        pitch_cache_key, cached_pitch, request = self._prepare_pitch(
+            cv_data, job_offer_content, model
         )
-
-        # Vérifier le cache
-        cached_pitch = llm_cache.get(pitch_cache_key)
         if cached_pitch:
-            logger.info("Pitch récupéré depuis le cache")
             return cached_pitch
 
-        # Construire le prompt avec le template centralisé
-        prompt = PromptTemplates.build_pitch_prompt(cv_data, job_offer_content)
+        def call_llm():
+            logger.info("Génération du pitch via OpenAI API...")
+            response = self._complete(request, PITCH)
+            return self._parse_pitch_response(response, model)
 
         try:
-            logger.info("Génération du pitch via OpenAI API...")
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Tu es un consultant RH expert en rédaction de présentations professionnelles.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=1000,
-            )
+            # Le pitch généré est mis en cache (un seul appel si requêtes concurrentes)
+            pitch = single_flight.run(llm_cache, pitch_cache_key, call_llm)
+            if not pitch:
+                return None
 
-            pitch = (
-                response.choices[0].message.content.strip()
-                if response.choices[0].message.content
-                else ""
-            )
+            logger.info("Pitch généré et mis en cache")
+
+            return pitch
+
+        except Exception as e:
+            logger.error(f"Erreur lors de la génération du pitch: {e}", exc_info=True)
+            return None
+
+    async def generate_profile_pitch_async(
+        self, cv_data, job_offer_content=None, model=DEFAULT_MODEL
+    ):
+        """Variante asyncio de ``generate_profile_pitch``
 
+        Returns:
+            str: Pitch de présentation du profil (None en cas d'échec)
+        """
+        pitch_cache_key, cached_pitch, request = self._prepare_pitch(
+            cv_data, job_offer_content, model
+        )
+        if cached_pitch:
+            return cached_pitch
+
+        async def call_llm():
+            logger.info("Génération du pitch via OpenAI API (async)...")
+            response = await self._complete_async(request, PITCH)
+            return self._parse_pitch_response(response, model)
+
+        try:
+            pitch = await single_flight.run_async(llm_cache, pitch_cache_key, call_llm)
             if not pitch:
-                logger.warning(
-                    f"Pitch vide! finish_reason: {response.choices[0].finish_reason}, modèle: {model}"
-                )
                 return None
 
-            # Mettre en cache le pitch généré
-            llm_cache.set(pitch_cache_key, pitch, expire=CACHE_TTL)
             logger.info("Pitch généré et mis en cache")
 
             return pitch
@@ -261,6 +1447,157 @@ class CVConverterAgent:
             logger.error(f"Erreur lors de la génération du pitch: {e}", exc_info=True)
             return None
 
+    def _extract_cv_text(self, pdf_path, emit: Optional[ProgressEmitter] = None) -> str:
+        """Extrait le texte du CV selon son format (PDF, DOCX, DOC)
+
+        Args:
+            pdf_path: Chemin du CV
+            emit: Émetteur des événements de la conversion (optionnel ;
+                extraction et prétraitement y sont signalés comme sous-étapes)
+
+        Raises:
+            ValueError: Format non supporté ou contenu insuffisant
+        """
+        if emit is None:
+            emit = ProgressEmitter(ProgressHooks())
+        file_extension = Path(pdf_path).suffix.lower()
+
+        with emit.measure("extraction", cached=False):
+            if file_extension == ".pdf":
+                cv_text = extract_pdf_content(
+                    pdf_path, page_separator=PAGE_BREAK, on_event=emit.publish
+                )
+            elif file_extension in [".docx", ".doc"]:
+                cv_text = extract_docx_content(pdf_path, on_event=emit.publish)
+            else:
+                raise ValueError(
+                    f"Format de fichier non supporté: {file_extension}. Formats acceptés: PDF, DOCX, DOC"
+                )
+
+        if not cv_text or len(cv_text.strip()) < 100:
+            raise ValueError("Le contenu extrait du CV est insuffisant ou vide")
+
+        # Retirer le bruit de mise en page avant l'envoi au LLM
+        with emit.measure("preprocessing"):
+            cv_text, report = preprocess_cv_text(
+                cv_text, markdown_sections=get_settings().CV_TEXT_MARKDOWN_SECTIONS
+            )
+        logger.info(
+            f"Prétraitement du texte : ~{report.tokens_saved} tokens économisés "
+            f"({report.saved_ratio:.0%}, {report.original_tokens} → {report.tokens})"
+        )
+        emit(
+            "extracted",
+            pages=report.pages,
+            tokens=report.tokens,
+            characters=len(cv_text),
+        )
+
+        return cv_text
+
+    @staticmethod
+    def _fit_page_budget(
+        cv_data: dict,
+        max_pages: Optional[int],
+        target_language: Optional[str],
+        speculation: Optional[PitchSpeculation] = None,
+    ) -> dict:
+        """Garantit la limite de pages par une réduction locale déterministe
+
+        La consigne de limitation envoyée au LLM n'est pas toujours respectée :
+        le réducteur estime la mise en page du DOCX et retire le surplus selon
+        les mêmes règles de priorité, en quelques millisecondes.
+
+        Si un pitch spéculatif est déjà lancé, ses entrées (compétences
+        opérationnelles) sont conservées : l'étape pitch retrouve ainsi la
+        même clé de cache au lieu de payer un second appel.
+        """
+        if not max_pages:
+            return cv_data
+
+        cv_data, report = fit_to_page_budget(
+            cv_data,
+            max_pages,
+            target_language,
+            keep_operationnelles=speculation is not None and speculation.started,
+        )
+        if report.actions:
+            logger.info(
+                f"Budget de {max_pages} page(s) : {report.pages_before:.2f} → "
+                f"{report.pages_after:.2f} pages estimées ({'; '.join(report.actions)})"
+            )
+        return cv_data
+
+    @staticmethod
+    def _apply_candidate_name(cv_data: dict, candidate_name: Optional[str]) -> None:
+        """Remplace le nom extrait par celui fourni (si présent)"""
+        if candidate_name:
+            if "header" not in cv_data:
+                cv_data["header"] = {}
+            cv_data["header"]["name"] = candidate_name
+
+    @staticmethod
+    def _notify_structured(
+        emit: ProgressEmitter, cv_data: dict, cached: bool, renamed: bool
+    ) -> None:
+        """Signale la fin de la structuration (nombre d'expériences, cache)"""
+        experiences = cv_data.get("experiences") or []
+        emit(
+            "structured",
+            experiences=len(experiences),
+            cached=cached,
+            renamed=renamed,
+        )
+
+    @staticmethod
+    def _notify_options(
+        emit: ProgressEmitter,
+        improve_content,
+        improvement_mode,
+        max_pages,
+        target_language,
+    ) -> None:
+        """Signale les options de traitement actives"""
+        if improve_content and improvement_mode == "none":
+            improvement_mode = "basic"
+        emit(
+            "options",
+            improvement_mode=improvement_mode,
+            max_pages=max_pages,
+            target_language=target_language,
+        )
+
+    @staticmethod
+    def _notify_completed(emit: ProgressEmitter, output_file, report) -> None:
+        """Signale la fin de la conversion (fichier, chemin critique)"""
+        emit(
+            "completed",
+            output_file=str(output_file),
+            critical_path=list(report.critical_path),
+            critical_path_time=round(report.critical_path_time, 4),
+            wall_time=round(report.wall_time, 4),
+        )
+
+    @staticmethod
+    def _resolve_output_path(cv_data: dict, pdf_path, output_path=None):
+        """Détermine le chemin du DOCX de sortie à partir du nom du candidat"""
+        if output_path is not None:
+            return output_path
+
+        # Utiliser le nom du candidat (fourni ou extrait) pour le fichier
+        person_name = cv_data.get("header", {}).get("name", "")
+        if person_name:
+            # Nettoyer le nom pour un nom de fichier valide
+            safe_name = "".join(
+                c for c in person_name if c.isalnum() or c in (" ", "-", "_")
+            ).strip()
+            safe_name = safe_name.replace(" ", "_")
+            return Path(pdf_path).parent / f"{safe_name}_CV.docx"
+
+        # Fallback : utiliser le nom du fichier PDF original
+        input_name = Path(pdf_path).stem
+        return Path(pdf_path).parent / f"{input_name}_converti.docx"
+
     def process_cv(
         self,
         pdf_path,
@@ -272,10 +1609,17 @@ class CVConverterAgent:
         candidate_name=None,
         max_pages=None,
         target_language=None,
-        model="gpt-4o-mini",
+        model=DEFAULT_MODEL,
+        pipeline_report: Optional[PipelineReport] = None,
+        llm_usage: Optional[ConversionTelemetry] = None,
+        progress: Optional[Callable[[ProgressEvent], None]] = None,
     ):
         """Traite un CV (PDF ou DOCX) et génère un fichier DOCX formaté
 
+        Les étapes sont exécutées sous forme de graphe : extraction du CV et de
+        l'appel d'offres en parallèle, puis structuration LLM, puis rendu DOCX
+        et pitch en parallèle.
+
         Args:
             pdf_path: Chemin vers le fichier CV d'entrée (PDF ou DOCX)
             output_path: Chemin vers le fichier DOCX de sortie (optionnel)
@@ -286,131 +1630,448 @@ class CVConverterAgent:
             candidate_name: Nom du candidat (optionnel, remplacera le nom extrait)
             max_pages: Nombre maximum de pages (optionnel)
             target_language: Langue cible pour la traduction (optionnel: fr, en, it, es)
-            model: Modèle OpenAI à utiliser (gpt-4o, gpt-4o-mini, gpt-3.5-turbo)
+            model: Modèle à utiliser (clé de AVAILABLE_MODELS, ou "auto" pour le routeur)
+            pipeline_report: Rapport à compléter avec les durées par étape (optionnel)
+            llm_usage: Bilan à compléter avec les appels LLM de la conversion (optionnel)
+            progress: Appelé avec chaque ``ProgressEvent`` de cette conversion
+                (optionnel, cf. ``core.events`` ; les abonnés de ``self.events``
+                reçoivent les mêmes événements). Avec au moins un abonné, la
+                structuration streamée signale les tokens reçus
 
         Returns:
             Tuple[str, dict]: Chemin du fichier DOCX généré et données structurées du CV
         """
-        print(f"\n{'='*60}")
-        print(f"Traitement du CV : {Path(pdf_path).name}")
-        print(f"{'='*60}\n")
+        emit = self._emitter(progress)
+        emit("conversion_started", file=Path(pdf_path).name)
+        stages = _ConversionStages(
+            self,
+            emit,
+            pdf_path,
+            output_path,
+            generate_pitch,
+            improve_content,
+            improvement_mode,
+            job_offer_path,
+            candidate_name,
+            max_pages,
+            target_language,
+            model,
+        )
 
-        # Détecter le type de fichier
-        input_file = Path(pdf_path)
-        file_extension = input_file.suffix.lower()
+        # Cache de premier niveau : octets du fichier + options
+        with emit.measure("cache_lookup") as lookup:
+            lookup["cached"] = stages.lookup(
+                self._generate_file_cache_key(*stages.file_key_args())
+            )
 
-        # Étape 1 : Extraction du contenu
-        print(f"Étape 1/3 : Extraction du contenu {file_extension.upper()}...")
+        def structure(cv_text, job_offer):
+            cached = stages.begin_structure()
+            if cached is not None:
+                return stages.structured(cached)
+
+            def extract(candidate):
+                return self.extract_structured_data_with_llm(
+                    cv_text,
+                    **stages.extraction_options(
+                        job_offer, candidate, self._pitch_speculation
+                    ),
+                )
 
-        if file_extension == ".pdf":
-            cv_text = extract_pdf_content(pdf_path)
-        elif file_extension in [".docx", ".doc"]:
-            cv_text = extract_docx_content(pdf_path)
-        else:
-            raise ValueError(
-                f"Format de fichier non supporté: {file_extension}. Formats acceptés: PDF, DOCX, DOC"
+            return stages.structured(
+                self.router.run(stages.candidates(cv_text), extract), extracted=True
             )
 
-        if not cv_text or len(cv_text.strip()) < 100:
-            raise ValueError("Le contenu extrait du CV est insuffisant ou vide")
+        def pitch(cv_data, job_offer):
+            fused = stages.fused_pitch(cv_data)
+            if fused:
+                return stages.pitch_ready(fused, job_offer, fused=True)
+            # Contenu de l'appel d'offres si disponible pour un pitch ciblé
+            result = self.generate_profile_pitch(
+                cv_data, job_offer_content=job_offer, model=stages.pitch_model()
+            )
+            return stages.pitch_ready(result, job_offer)
 
-        print(f"✓ {len(cv_text)} caractères extraits\n")
-
-        # Étape optionnelle : Extraction de l'appel d'offres
-        job_offer_content = None
-        if improvement_mode == "targeted" and job_offer_path:
-            print("Extraction de l'appel d'offres...")
-            job_offer_content = self.extract_job_offer_content(job_offer_path)
-            print()
-
-        # Étape 2 : Traitement par LLM
-        print("Étape 2/4 : Analyse et structuration via LLM...")
-        if target_language and target_language != "fr":
-            language_names = {"en": "Anglais", "it": "Italien", "es": "Espagnol"}
-            print(
-                f"🌐 TRADUCTION ACTIVÉE : Le CV sera traduit en {language_names.get(target_language, target_language.upper())}"
+        graph = stages.graph(structure, pitch)
+        with llm_telemetry.track(llm_usage) as usage:
+            results = graph.run(pipeline_report)
+        return stages.finish(results, graph.report, usage)
+
+    async def process_cv_async(
+        self,
+        pdf_path,
+        output_path=None,
+        generate_pitch=True,
+        improve_content=False,
+        improvement_mode="none",
+        job_offer_path=None,
+        candidate_name=None,
+        max_pages=None,
+        target_language=None,
+        model=DEFAULT_MODEL,
+        pipeline_report: Optional[PipelineReport] = None,
+        llm_usage: Optional[ConversionTelemetry] = None,
+        progress: Optional[Callable[[ProgressEvent], None]] = None,
+    ):
+        """Variante asyncio de ``process_cv`` pour le serveur API
+
+        Les étapes bloquantes (pdfplumber, docx2txt, python-docx) sont exécutées
+        dans le pool de threads et les appels LLM passent par le client
+        asynchrone : un worker uvicorn peut ainsi garder de nombreuses
+        conversions en vol sans geler ``/health`` ni les autres requêtes.
+        Mêmes arguments et même valeur de retour que ``process_cv``.
+
+        Returns:
+            Tuple[str, dict]: Chemin du fichier DOCX généré et données structurées du CV
+        """
+        logger.info(f"Traitement asynchrone du CV : {Path(pdf_path).name}")
+        emit = self._emitter(progress)
+        emit("conversion_started", file=Path(pdf_path).name)
+        stages = _ConversionStages(
+            self,
+            emit,
+            pdf_path,
+            output_path,
+            generate_pitch,
+            improve_content,
+            improvement_mode,
+            job_offer_path,
+            candidate_name,
+            max_pages,
+            target_language,
+            model,
+        )
+
+        # Cache de premier niveau : octets du fichier + options
+        with emit.measure("cache_lookup") as lookup:
+            lookup["cached"] = stages.lookup(
+                await run_blocking(
+                    self._generate_file_cache_key, *stages.file_key_args()
+                )
             )
-        if max_pages:
-            print(
-                f"🚨 MODE RÉDUCTION ACTIVÉ : CV limité à {max_pages} page(s) maximum !"
+
+        async def structure(cv_text, job_offer):
+            cached = stages.begin_structure()
+            if cached is not None:
+                return stages.structured(cached)
+
+            async def extract(candidate):
+                return await self.extract_structured_data_with_llm_async(
+                    cv_text,
+                    **stages.extraction_options(
+                        job_offer, candidate, self._pitch_speculation_async
+                    ),
+                )
+
+            return stages.structured(
+                await self.router.run_async(stages.candidates(cv_text), extract),
+                extracted=True,
             )
-        if improvement_mode == "targeted":
-            print(
-                "🎯 Mode amélioration ciblée activé - Le CV sera adapté à l'appel d'offres"
+
+        async def pitch(cv_data, job_offer):
+            fused = stages.fused_pitch(cv_data)
+            if fused:
+                return stages.pitch_ready(fused, job_offer, fused=True)
+            result = await self.generate_profile_pitch_async(
+                cv_data, job_offer_content=job_offer, model=stages.pitch_model()
             )
-        elif improve_content or improvement_mode == "basic":
-            print(
-                "⚠️  Mode amélioration basique activé - Le LLM va améliorer le contenu"
+            return stages.pitch_ready(result, job_offer)
+
+        graph = stages.graph(structure, pitch)
+        with llm_telemetry.track(llm_usage) as usage:
+            results = await graph.run_async(pipeline_report)
+        output_file, cv_data = stages.finish(results, graph.report, usage)
+
+        logger.info(f"Conversion asynchrone terminée : {Path(output_file).name}")
+
+        return output_file, cv_data
+
+    async def prefetch_async(self, pdf_path, model=DEFAULT_MODEL) -> dict:
+        """Extraction spéculative d'un CV avec les options par défaut
+
+        Extrait le texte puis structure le CV (``improvement_mode="none"``) et
+        renseigne le cache de fichier et la clé canonique d'extraction : la
+        conversion demandée ensuite part d'un cache chaud, les variantes
+        (amélioration, traduction...) étant dérivées de l'extraction canonique.
+
+        Returns:
+            dict: Données structurées du CV
+        """
+        file_cache_key = await run_blocking(
+            self._generate_file_cache_key,
+            pdf_path,
+            False,
+            "none",
+            None,
+            None,
+            None,
+            model,
+        )
+        cached_cv_data = llm_cache.get(file_cache_key)
+        if cached_cv_data is not None:
+            return cached_cv_data
+
+        cv_text = await run_blocking(self._extract_cv_text, pdf_path)
+
+        async def extract(candidate):
+            return await self.extract_structured_data_with_llm_async(
+                cv_text, model=candidate
             )
-        cv_data = self.extract_structured_data_with_llm(
-            cv_text,
-            improve_content=improve_content,
-            improvement_mode=improvement_mode,
-            job_offer_content=job_offer_content,
-            max_pages=max_pages,
-            target_language=target_language,
-            model=model,
+
+        cv_data = await self.router.run_async(
+            self._route(model, cv_text, "none"), extract
         )
-        print()
+        cache_set(llm_cache, file_cache_key, cv_data)
+        logger.info(f"Extraction spéculative en cache : {Path(pdf_path).name}")
+        return cv_data
+
+    @staticmethod
+    def _build_stage_graph(
+        extract_cv,
+        extract_job_offer,
+        structure,
+        render_docx,
+        pitch,
+        generate_pitch,
+        emit: Optional[ProgressEmitter] = None,
+    ) -> StageGraph:
+        """Assemble le graphe d'étapes commun aux chemins synchrone et asyncio
+
+        cv_text ─┐                 ┌─> output_file
+                 ├─> cv_data ──────┤
+        job_offer┘        └────────┴─> pitch (optionnel)
+
+        Le début et la fin (avec durée) de chaque étape sont signalés par ``emit``.
+        """
+        graph = StageGraph(listener=emit.stage if emit is not None else None)
+        graph.add_stage("cv_text", extract_cv)
+        graph.add_stage("job_offer", extract_job_offer)
+        graph.add_stage("cv_data", structure, depends_on=("cv_text", "job_offer"))
+        graph.add_stage("output_file", render_docx, depends_on=("cv_data",))
+        if generate_pitch:
+            graph.add_stage("pitch", pitch, depends_on=("cv_data", "job_offer"))
+        return graph
 
-        # Remplacer le nom si candidate_name est fourni
-        if candidate_name:
-            print(f"📝 Remplacement du nom par: {candidate_name}")
-            if "header" not in cv_data:
-                cv_data["header"] = {}
-            cv_data["header"]["name"] = candidate_name
+    @staticmethod
+    def _collect_results(
+        results: dict, report: PipelineReport, usage: ConversionTelemetry
+    ):
+        """Récupère le DOCX et les données CV (pitch inclus) et journalise le chemin critique"""
+        cv_data = results["cv_data"]
+
+        # Ajouter le pitch aux données CV pour le retour ; un pitch fusionné
+        # non demandé ou inexploitable n'est pas renvoyé
+        if results.get("pitch"):
+            cv_data["pitch"] = results["pitch"]
+        elif "pitch" in cv_data:
+            cv_data = {key: value for key, value in cv_data.items() if key != "pitch"}
+
+        logger.info(
+            f"Chemin critique: {' -> '.join(report.critical_path)} "
+            f"({report.critical_path_time:.2f}s, total {report.wall_time:.2f}s)"
+        )
+        summary = usage.as_dict()
+        logger.info(
+            f"Appels LLM: {summary['llm_calls']} (cache: {summary['cache_hits']}), "
+            f"tokens {summary['prompt_tokens']}+{summary['completion_tokens']}, "
+            f"{summary['llm_time']:.2f}s"
+        )
 
-        # Étape 3 : Génération du DOCX
-        print("Étape 3/4 : Génération du fichier Word...")
-
-        if output_path is None:
-            # Utiliser le nom du candidat (fourni ou extrait) pour le fichier
-            person_name = cv_data.get("header", {}).get("name", "")
-            if person_name:
-                # Nettoyer le nom pour un nom de fichier valide
-                safe_name = "".join(
-                    c for c in person_name if c.isalnum() or c in (" ", "-", "_")
-                ).strip()
-                safe_name = safe_name.replace(" ", "_")
-                output_path = Path(pdf_path).parent / f"{safe_name}_CV.docx"
-            else:
-                # Fallback : utiliser le nom du fichier PDF original
-                input_name = Path(pdf_path).stem
-                output_path = Path(pdf_path).parent / f"{input_name}_converti.docx"
+        return results["output_file"], cv_data
 
-        # Générer le DOCX avec la langue cible
-        output_file = generate_docx_from_cv_data(
-            cv_data, output_path, target_language=target_language
+
+class _ConversionStages:
+    """Étapes d'une conversion, communes à ``process_cv`` et ``process_cv_async``
+
+    Cache de fichier, extraction des textes, options de structuration, budget
+    de pages, rendu DOCX et événements de progression sont définis une seule
+    fois : seuls les appels LLM (structuration, pitch), synchrones ou asyncio,
+    restent à la charge de l'appelant.
+    """
+
+    def __init__(
+        self,
+        agent: CVConverterAgent,
+        emit: ProgressEmitter,
+        pdf_path,
+        output_path,
+        generate_pitch,
+        improve_content,
+        improvement_mode,
+        job_offer_path,
+        candidate_name,
+        max_pages,
+        target_language,
+        model,
+    ):
+        self.agent = agent
+        self.emit = emit
+        self.pdf_path = pdf_path
+        self.output_path = output_path
+        self.generate_pitch = generate_pitch
+        self.improve_content = improve_content
+        self.improvement_mode = improvement_mode
+        self.job_offer_path = job_offer_path if improvement_mode == "targeted" else None
+        self.candidate_name = candidate_name
+        self.max_pages = max_pages
+        self.target_language = target_language
+        self.model = model
+        self.file_cache_key = None
+        self.cached_cv_data = None
+        # Modèle et spéculation de la structuration retenue (mode auto)
+        self.routed = {}
+
+    def file_key_args(self) -> tuple:
+        """Arguments de ``_generate_file_cache_key`` pour cette conversion"""
+        return (
+            self.pdf_path,
+            self.improve_content,
+            self.improvement_mode,
+            self.job_offer_path,
+            self.max_pages,
+            self.target_language,
+            self.model,
         )
-        print()
 
-        # Étape 4 : Génération du pitch de profil (optionnel)
-        pitch = None
-        if generate_pitch:
-            print("Étape 4/4 : Génération du pitch de présentation...")
-            # Passer le contenu de l'appel d'offres si disponible pour un pitch ciblé
-            pitch = self.generate_profile_pitch(
-                cv_data, job_offer_content=job_offer_content, model=model
+    def lookup(self, file_cache_key: str) -> bool:
+        """Cherche les données structurées du fichier en cache"""
+        self.file_cache_key = file_cache_key
+        self.cached_cv_data = llm_cache.get(file_cache_key)
+        return self.cached_cv_data is not None
+
+    def extract_cv(self):
+        """Texte du CV (rien à extraire si le fichier est en cache)"""
+        if self.cached_cv_data is not None:
+            self.emit("extracted", cached=True)
+            return None
+        return self.agent._extract_cv_text(self.pdf_path, self.emit)
+
+    def extract_job_offer(self):
+        """Texte de l'appel d'offres (mode targeted uniquement)"""
+        if not self.job_offer_path:
+            return None
+        job_offer = self.agent.extract_job_offer_content(self.job_offer_path)
+        self.emit("job_offer_extracted", characters=len(job_offer))
+        return job_offer
+
+    def begin_structure(self) -> Optional[dict]:
+        """Signale les options ; données du cache de fichier s'il y en a"""
+        self.agent._notify_options(
+            self.emit,
+            self.improve_content,
+            self.improvement_mode,
+            self.max_pages,
+            self.target_language,
+        )
+        if self.cached_cv_data is not None:
+            logger.info("Fichier déjà traité : extraction et LLM évités (cache)")
+            llm_telemetry.record_cache_hit(EXTRACTION, self.model)
+        return self.cached_cv_data
+
+    def candidates(self, cv_text: str) -> List[str]:
+        """Modèles candidats de la structuration (cf. ``_route``)"""
+        return self.agent._route(self.model, cv_text, self.improvement_mode)
+
+    def extraction_options(
+        self,
+        job_offer: Optional[str],
+        candidate: str,
+        speculate: Callable[..., Optional[PitchSpeculation]],
+    ) -> dict:
+        """Arguments de la structuration par ``candidate`` (hors texte du CV)
+
+        ``speculate`` crée la spéculation du pitch (``_pitch_speculation`` ou
+        sa variante asyncio), seulement si le pitch est demandé.
+        """
+        speculation = (
+            speculate(job_offer, self.candidate_name, candidate)
+            if self.generate_pitch
+            else None
+        )
+        self.routed["model"] = candidate
+        self.routed["speculation"] = speculation
+        return dict(
+            improve_content=self.improve_content,
+            improvement_mode=self.improvement_mode,
+            job_offer_content=job_offer,
+            max_pages=self.max_pages,
+            target_language=self.target_language,
+            model=candidate,
+            observer=combine_observers(
+                speculation, self.agent._token_progress(self.emit)
+            ),
+        )
+
+    def structured(self, cv_data: dict, extracted: bool = False) -> dict:
+        """Budget de pages et cache d'une extraction, nom du candidat, événement"""
+        if extracted:
+            cv_data = self.agent._fit_page_budget(
+                cv_data,
+                self.max_pages,
+                self.target_language,
+                self.routed.get("speculation"),
             )
-            if pitch:
-                print(f"✓ Pitch généré ({len(pitch)} caractères)")
-                if job_offer_content:
-                    print("🎯 Pitch ciblé pour l'appel d'offres")
-                print(f"\nPitch de profil :\n{'-'*60}\n{pitch}\n{'-'*60}\n")
-            else:
-                print("✗ Échec de la génération du pitch\n")
-        else:
-            print("Étape 4/4 : Génération du pitch ignorée (option désactivée)\n")
+            cache_set(llm_cache, self.file_cache_key, cv_data)
+        # Remplacer le nom si candidate_name est fourni
+        self.agent._apply_candidate_name(cv_data, self.candidate_name)
+        self.agent._notify_structured(
+            self.emit, cv_data, not extracted, bool(self.candidate_name)
+        )
+        return cv_data
 
-        # Ajouter le pitch aux données CV pour le retour
-        if pitch:
-            cv_data["pitch"] = pitch
+    def render_docx(self, cv_data: dict):
+        """Génère le DOCX de sortie"""
+        output_file = generate_docx_from_cv_data(
+            cv_data,
+            self.agent._resolve_output_path(cv_data, self.pdf_path, self.output_path),
+            target_language=self.target_language,
+        )
+        self.emit("docx_rendered", filename=Path(output_file).name)
+        return output_file
 
-        print(f"\n{'='*60}")
-        print(f"✓ Conversion terminée avec succès !")
-        print(f"Fichier généré : {output_file}")
-        print(f"{'='*60}\n")
+    def pitch_model(self) -> str:
+        """Modèle du pitch : celui de la structuration, ou le choix du routeur"""
+        return (
+            self.routed.get("model") or self.agent._route(self.model, None, "none")[0]
+        )
 
+    def fused_pitch(self, cv_data: dict) -> Optional[str]:
+        """Pitch fusionné exploitable, qui évite l'appel dédié"""
+        fused = self.agent._usable_fused_pitch(cv_data, self.candidate_name)
+        if fused:
+            logger.info("Pitch produit par l'appel d'extraction (mode fusionné)")
+        return fused
+
+    def pitch_ready(
+        self, pitch: Optional[str], job_offer: Optional[str], fused: bool = False
+    ) -> Optional[str]:
+        """Signale le pitch obtenu"""
+        self.emit(
+            "pitch_ready",
+            characters=len(pitch or ""),
+            fused=fused,
+            targeted=bool(job_offer),
+        )
+        return pitch
+
+    def graph(self, structure, pitch) -> StageGraph:
+        """Graphe de la conversion avec les étapes LLM de l'appelant"""
+        graph = self.agent._build_stage_graph(
+            self.extract_cv,
+            self.extract_job_offer,
+            structure,
+            self.render_docx,
+            pitch,
+            self.generate_pitch,
+            self.emit,
+        )
+        if not self.generate_pitch:
+            self.emit("pitch_skipped")
+        return graph
+
+    def finish(self, results: dict, report: PipelineReport, usage):
+        """Résultat de la conversion : chemin du DOCX et données structurées"""
+        output_file, cv_data = self.agent._collect_results(results, report, usage)
+        self.agent._notify_completed(self.emit, output_file, report)
         return str(output_file), cv_data
 
 
@@ -439,7 +2100,10 @@ def main():
     try:
         # Création de l'agent et traitement
         agent = CVConverterAgent()
-        agent.process_cv(args.pdf_path, args.output)
+        agent.events.subscribe(ConsoleProgress())
+        _, cv_data = agent.process_cv(args.pdf_path, args.output)
+        if cv_data.get("pitch"):
+            print(f"Pitch de profil :\n{'-'*60}\n{cv_data['pitch']}\n{'-'*60}\n")
         return 0
 
     except Exception as e:
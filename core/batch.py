@@ -0,0 +1,482 @@
+"""
+Conversion en masse via l'API Batch (compatible OpenAI)
+Extrait tous les CV, écrit un fichier JSONL de requêtes d'extraction, le
+soumet à un endpoint Batch, suit le lot, puis verse les résultats dans
+``llm_cache`` (clés canoniques de l'agent) et génère les fichiers DOCX.
+
+Pour les endpoints sans API Batch, ``LocalBatchStandIn`` émule le service
+localement (transport httpx) en exécutant chaque requête du lot.
+"""
+
+import hashlib
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+from config.logging_config import setup_logger
+from core.cache import cache_set, llm_cache
+from core.docx_generator import generate_docx_from_cv_data
+
+# Logger
+logger = setup_logger(__name__, "batch.log")
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".doc"}
+
+
+class BatchError(Exception):
+    """Échec du lot (statut terminal autre que completed, délai dépassé)"""
+
+
+class BatchClient:
+    """Client minimal de l'API Batch : fichiers, création et suivi des lots"""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        transport: Optional[httpx.BaseTransport] = None,
+        timeout: float = 120.0,
+    ):
+        self.http = httpx.Client(
+            base_url=base_url.rstrip("/") + "/",
+            headers={"Authorization": f"Bearer {api_key}"},
+            transport=transport,
+            timeout=timeout,
+        )
+
+    def _json(self, response: httpx.Response) -> dict:
+        response.raise_for_status()
+        return response.json()
+
+    def upload(self, content: bytes, filename: str = "batch.jsonl") -> str:
+        """Téléverse le fichier JSONL du lot et retourne son identifiant"""
+        response = self.http.post(
+            "files",
+            data={"purpose": "batch"},
+            files={"file": (filename, content, "application/jsonl")},
+        )
+        return self._json(response)["id"]
+
+    def create(self, input_file_id: str, completion_window: str = "24h") -> dict:
+        """Crée le lot à partir du fichier téléversé"""
+        response = self.http.post(
+            "batches",
+            json={
+                "input_file_id": input_file_id,
+                "endpoint": BATCH_ENDPOINT,
+                "completion_window": completion_window,
+            },
+        )
+        return self._json(response)
+
+    def retrieve(self, batch_id: str) -> dict:
+        return self._json(self.http.get(f"batches/{batch_id}"))
+
+    def content(self, file_id: str) -> bytes:
+        response = self.http.get(f"files/{file_id}/content")
+        response.raise_for_status()
+        return response.content
+
+    def wait(self, batch_id: str, poll_interval: float, timeout: float) -> dict:
+        """Interroge le lot jusqu'à un statut terminal
+
+        Raises:
+            BatchError: Délai dépassé
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            batch = self.retrieve(batch_id)
+            if batch.get("status") in TERMINAL_STATUSES:
+                return batch
+            if time.monotonic() >= deadline:
+                raise BatchError(f"Lot {batch_id} non terminé après {timeout:.0f}s")
+            logger.info(
+                f"Lot {batch_id}: {batch.get('status')} "
+                f"({batch.get('request_counts', {})})"
+            )
+            time.sleep(poll_interval)
+
+
+class LocalBatchStandIn:
+    """Service Batch local (transport httpx) pour les tests et endpoints sans Batch
+
+    Chaque requête du lot est exécutée à la création par ``responder``, qui
+    reçoit le corps de la requête ``chat.completions`` et retourne le corps
+    de la réponse (dict) ; une exception produit une ligne d'erreur.
+    """
+
+    def __init__(self, responder: Callable[[dict], dict]):
+        self.responder = responder
+        self.files: Dict[str, bytes] = {}
+        self.batches: Dict[str, dict] = {}
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    @staticmethod
+    def _uploaded_file(request: httpx.Request) -> bytes:
+        """Contenu de la partie ``file`` d'une requête multipart"""
+        boundary = request.headers["content-type"].split("boundary=")[1].encode()
+        for part in request.content.split(b"--" + boundary):
+            headers, _, body = part.partition(b"\r\n\r\n")
+            if b'name="file"' in headers:
+                return body.rsplit(b"\r\n", 1)[0]
+        return b""
+
+    def _run(self, input_file_id: str) -> dict:
+        outputs, errors = [], []
+        for line in self.files[input_file_id].decode().splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            try:
+                body = self.responder(item["body"])
+                outputs.append(
+                    {
+                        "id": f"resp-{uuid.uuid4().hex[:8]}",
+                        "custom_id": item["custom_id"],
+                        "response": {"status_code": 200, "body": body},
+                        "error": None,
+                    }
+                )
+            except Exception as e:
+                errors.append(
+                    {
+                        "id": f"resp-{uuid.uuid4().hex[:8]}",
+                        "custom_id": item["custom_id"],
+                        "response": None,
+                        "error": {"code": type(e).__name__, "message": str(e)},
+                    }
+                )
+
+        batch = {
+            "id": f"batch-{uuid.uuid4().hex[:8]}",
+            "status": "completed",
+            "input_file_id": input_file_id,
+            "output_file_id": None,
+            "error_file_id": None,
+            "request_counts": {
+                "total": len(outputs) + len(errors),
+                "completed": len(outputs),
+                "failed": len(errors),
+            },
+        }
+        for key, lines in (("output_file_id", outputs), ("error_file_id", errors)):
+            if lines:
+                file_id = f"file-{uuid.uuid4().hex[:8]}"
+                self.files[file_id] = "\n".join(json.dumps(x) for x in lines).encode()
+                batch[key] = file_id
+        self.batches[batch["id"]] = batch
+        return batch
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        parts = request.url.path.rstrip("/").split("/")
+        if request.method == "POST" and parts[-1] == "files":
+            file_id = f"file-{uuid.uuid4().hex[:8]}"
+            self.files[file_id] = self._uploaded_file(request)
+            return httpx.Response(200, json={"id": file_id, "purpose": "batch"})
+        if request.method == "POST" and parts[-1] == "batches":
+            payload = json.loads(request.content)
+            return httpx.Response(200, json=self._run(payload["input_file_id"]))
+        if request.method == "GET" and parts[-2] == "batches":
+            return httpx.Response(200, json=self.batches[parts[-1]])
+        if request.method == "GET" and parts[-1] == "content":
+            return httpx.Response(200, content=self.files[parts[-2]])
+        return httpx.Response(404, json={"error": "not found"})
+
+
+@dataclass
+class BulkItem:
+    """Un CV du lot"""
+
+    path: Path
+    custom_id: str
+    cache_key: Optional[str] = None
+    cv_text: Optional[str] = None
+    model: Optional[str] = None
+    status: str = "pending"
+    output_file: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BulkReport:
+    """Bilan d'une conversion en masse"""
+
+    items: List[BulkItem] = field(default_factory=list)
+    batch_id: Optional[str] = None
+
+    def count(self, status: str) -> int:
+        return sum(1 for item in self.items if item.status == status)
+
+    def as_dict(self) -> dict:
+        return {
+            "batch_id": self.batch_id,
+            "total": len(self.items),
+            "rendered": self.count("rendered"),
+            "failed": self.count("failed"),
+            "items": [
+                {
+                    "path": str(item.path),
+                    "status": item.status,
+                    "output_file": item.output_file,
+                    "error": item.error,
+                }
+                for item in self.items
+            ],
+        }
+
+
+def collect_inputs(paths: Iterable) -> List[Path]:
+    """Fichiers CV à traiter (les répertoires sont parcourus récursivement)"""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(
+                sorted(
+                    p
+                    for p in path.rglob("*")
+                    if p.suffix.lower() in SUPPORTED_EXTENSIONS
+                )
+            )
+        elif path.suffix.lower() in SUPPORTED_EXTENSIONS:
+            files.append(path)
+    return files
+
+
+class BulkConverter:
+    """Conversion en masse de CV via un lot d'extractions canoniques
+
+    Les résultats sont versés dans ``llm_cache`` sous la clé d'extraction
+    canonique de l'agent : les conversions interactives ultérieures de ces
+    CV (avec ou sans variante) n'appellent plus le LLM pour l'extraction.
+    """
+
+    def __init__(
+        self,
+        agent,
+        batch_client: BatchClient,
+        model: Optional[str] = None,
+        output_dir: Optional[Path] = None,
+        poll_interval: float = 30.0,
+        timeout: float = 24 * 3600,
+    ):
+        self.agent = agent
+        self.batch_client = batch_client
+        self.model = model or agent.model
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    def prepare(self, paths: Iterable) -> List[BulkItem]:
+        """Extrait le texte de chaque CV ; les CV déjà en cache ne sont pas soumis"""
+        items = []
+        for index, path in enumerate(collect_inputs(paths)):
+            item = BulkItem(path=path, custom_id=f"cv-{index}")
+            items.append(item)
+            try:
+                item.cv_text = self.agent._extract_cv_text(path)
+            except Exception as e:
+                item.status, item.error = "failed", str(e)
+                continue
+            # Le lot exige un modèle concret : "auto" est résolu par le routeur
+            # comme en conversion interactive (même clé canonique)
+            item.model = self.agent._route(self.model, item.cv_text, "none")[0]
+            item.cache_key = self.agent._generate_cache_key(
+                item.cv_text, False, "none", model=item.model
+            )
+            if llm_cache.get(item.cache_key) is not None:
+                item.status = "cached"
+        return items
+
+    def _request(self, item: BulkItem) -> dict:
+        """Requête d'extraction canonique d'un CV (mêmes paramètres qu'en direct)"""
+        return self.agent._build_extraction_request(
+            item.cv_text, False, "none", None, None, None, item.model
+        )
+
+    def build_jsonl(self, items: List[BulkItem]) -> bytes:
+        """Une ligne de requête d'extraction par CV à soumettre"""
+        lines = []
+        for item in items:
+            if item.status != "pending":
+                continue
+            body = self._request(item)
+            lines.append(
+                json.dumps(
+                    {
+                        "custom_id": item.custom_id,
+                        "method": "POST",
+                        "url": BATCH_ENDPOINT,
+                        "body": body,
+                    },
+                    ensure_ascii=False,
+                )
+            )
+        return "\n".join(lines).encode("utf-8")
+
+    def submit(self, items: List[BulkItem]) -> Optional[dict]:
+        """Soumet le lot et attend sa fin (None si rien à soumettre)"""
+        payload = self.build_jsonl(items)
+        if not payload:
+            return None
+
+        file_id = self.batch_client.upload(payload)
+        batch = self.batch_client.create(file_id)
+        logger.info(
+            f"Lot {batch['id']} soumis "
+            f"({sum(item.status == 'pending' for item in items)} CV)"
+        )
+        if batch.get("status") not in TERMINAL_STATUSES:
+            batch = self.batch_client.wait(
+                batch["id"], self.poll_interval, self.timeout
+            )
+        if batch["status"] != "completed":
+            raise BatchError(f"Lot {batch['id']} terminé en statut {batch['status']}")
+        return batch
+
+    def collect(self, batch: dict, items: List[BulkItem]) -> None:
+        """Verse les résultats du lot dans ``llm_cache`` et marque les échecs"""
+        by_id = {item.custom_id: item for item in items}
+
+        for key in ("output_file_id", "error_file_id"):
+            if not batch.get(key):
+                continue
+            for line in self.batch_client.content(batch[key]).decode().splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                item = by_id.get(result.get("custom_id"))
+                if item is None:
+                    continue
+                try:
+                    response = result.get("response") or {}
+                    if response.get("status_code") != 200:
+                        raise BatchError(
+                            json.dumps(
+                                result.get("error") or response, ensure_ascii=False
+                            )
+                        )
+                    choice = response["body"]["choices"][0]
+                    content = choice["message"]["content"]
+                    if choice.get("finish_reason") == "length":
+                        # Suite demandée en direct (rare) plutôt qu'un échec
+                        content = self.agent._continue_truncated(
+                            self._request(item),
+                            content,
+                            "length",
+                            self.agent._wire_schema(),
+                        )
+                    cache_set(
+                        llm_cache,
+                        item.cache_key,
+                        self.agent._parse_cv_json(content, item.model),
+                    )
+                    item.status = "cached"
+                except Exception as e:
+                    item.status, item.error = "failed", str(e)
+
+        for item in items:
+            if item.status == "pending":
+                item.status, item.error = "failed", "Absent des résultats du lot"
+
+    def _output_path(self, cv_data: dict, item: BulkItem) -> Path:
+        """Chemin du DOCX : nom du candidat suffixé par l'empreinte du fichier source
+
+        Deux CV d'un même candidat (ou homonymes) ne s'écrasent pas.
+        """
+        output_path = Path(self.agent._resolve_output_path(cv_data, item.path))
+        digest = hashlib.sha256(str(item.path.resolve()).encode()).hexdigest()[:8]
+        name = f"{output_path.stem}_{digest}{output_path.suffix}"
+        return (self.output_dir or output_path.parent) / name
+
+    def render(self, items: List[BulkItem]) -> None:
+        """Génère le DOCX de chaque CV extrait"""
+        for item in items:
+            if item.status != "cached":
+                continue
+            try:
+                cv_data = llm_cache.get(item.cache_key)
+                output_path = self._output_path(cv_data, item)
+                if self.output_dir:
+                    self.output_dir.mkdir(parents=True, exist_ok=True)
+                item.output_file = str(generate_docx_from_cv_data(cv_data, output_path))
+                item.status = "rendered"
+            except Exception as e:
+                item.status, item.error = "failed", str(e)
+
+    def run(self, paths: Iterable) -> BulkReport:
+        """Extraction, lot, collecte des résultats et rendu DOCX"""
+        report = BulkReport(items=self.prepare(paths))
+        batch = self.submit(report.items)
+        if batch is not None:
+            report.batch_id = batch["id"]
+            self.collect(batch, report.items)
+        self.render(report.items)
+        logger.info(
+            f"Conversion en masse: {report.count('rendered')}/{len(report.items)} "
+            f"DOCX générés, {report.count('failed')} échec(s)"
+        )
+        return report
+
+
+def main():
+    """Conversion en masse en ligne de commande"""
+    import argparse
+
+    from core.agent import CVConverterAgent
+    from core.telemetry import EXTRACTION
+
+    parser = argparse.ArgumentParser(
+        description="Convertit en masse des CV via l'API Batch (extraction en lot)"
+    )
+    parser.add_argument("inputs", nargs="+", help="Fichiers CV ou répertoires")
+    parser.add_argument("-o", "--output-dir", default=None, help="Répertoire DOCX")
+    parser.add_argument("--model", default=None, help="Modèle (défaut: AI_MODEL)")
+    parser.add_argument(
+        "--poll-interval", type=float, default=30.0, help="Intervalle de suivi (s)"
+    )
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Émuler l'API Batch localement (endpoint sans API Batch)",
+    )
+    args = parser.parse_args()
+
+    agent = CVConverterAgent()
+    transport = None
+    if args.local:
+        stand_in = LocalBatchStandIn(
+            lambda body: agent._complete(
+                body, EXTRACTION, agent._wire_schema()
+            ).model_dump()
+        )
+        transport = stand_in.transport
+
+    client = BatchClient(agent._api_key, agent._base_url, transport=transport)
+    converter = BulkConverter(
+        agent,
+        client,
+        model=args.model,
+        output_dir=args.output_dir,
+        poll_interval=args.poll_interval,
+    )
+    report = converter.run(args.inputs)
+
+    for item in report.items:
+        status = "✓" if item.status == "rendered" else "✗"
+        print(f"{status} {item.path} → {item.output_file or item.error}")
+    print(f"\n{report.count('rendered')}/{len(report.items)} CV convertis")
+    return 0 if not report.count("failed") else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,473 @@
+"""
+Cache des réponses LLM
+Clés canoniques versionnées et espaces de noms (namespaces) sur un cache à deux
+niveaux (LRU en mémoire devant diskcache), avec coalescence des appels
+identiques en cours (single-flight)
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+
+from diskcache import Cache
+
+from config.settings import get_settings
+
+CACHE_DIR = Path(__file__).parent.parent / "cache" / "llm_responses"
+CACHE_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_TTL = 15 * 24 * 60 * 60  # 15 jours en secondes
+
+# Bornes du niveau mémoire (par processus)
+MEMORY_MAX_ENTRIES = 256
+MEMORY_MAX_BYTES = 64 * 1024 * 1024
+
+_MISSING = object()
+
+# Durée de vie du marqueur « appel en cours » inter-processus (processus
+# arrêté en cours d'appel)
+LOCK_EXPIRE = 10 * 60
+LOCK_PREFIX = "lock:"
+
+# Attente d'un appel en cours dans un autre processus : relecture du cache
+# à intervalles croissants (lectures seules, aucune écriture SQLite)
+POLL_MIN_INTERVAL = 0.05
+POLL_MAX_INTERVAL = 1.0
+
+# Résultat transmis aux appels en attente quand le leader asyncio est annulé
+_LEADER_CANCELLED = object()
+
+
+@dataclass
+class TierStats:
+    """Compteurs d'un niveau de cache"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    bytes_served: int = 0
+
+
+class TieredCache:
+    """Cache à deux niveaux : LRU en mémoire devant un cache diskcache
+
+    Le niveau mémoire est borné en nombre d'entrées et en octets ; il conserve
+    les valeurs sérialisées (pickle) pour que l'appelant reçoive toujours une
+    copie indépendante, comme avec diskcache. Une lecture (``get``) consulte
+    la mémoire puis le disque et promeut en mémoire les entrées trouvées sur
+    disque. Les écritures vont aux deux niveaux.
+
+    Les clés étant dérivées du contenu (cf. ``build_cache_key``), une entrée
+    mémoire ne devient jamais incohérente : seule l'expiration compte.
+
+    Les méthodes ``add`` et ``delete`` passent directement au disque : elles
+    servent au marqueur « appel en cours » inter-processus de ``SingleFlight``.
+    """
+
+    def __init__(
+        self,
+        disk: Cache,
+        max_entries: int = MEMORY_MAX_ENTRIES,
+        max_bytes: int = MEMORY_MAX_BYTES,
+    ):
+        self.disk = disk
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = {"memory": TierStats(), "disk": TierStats()}
+        # clé -> (valeur sérialisée, échéance absolue, tag), du moins au plus récent
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    # ── Niveau mémoire ────────────────────────────────────────────────────────
+    def _memory_get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                self.stats["memory"].misses += 1
+                return None
+
+            payload, expire_at, _ = entry
+            if expire_at is not None and expire_at <= time.time():
+                self._memory_discard(key)
+                self.stats["memory"].misses += 1
+                return None
+
+            self._memory.move_to_end(key)
+            self.stats["memory"].hits += 1
+            self.stats["memory"].bytes_served += len(payload)
+            return payload
+
+    def _memory_put(
+        self,
+        key: str,
+        payload: bytes,
+        expire_at: Optional[float],
+        tag: Optional[str],
+    ) -> None:
+        if len(payload) > self.max_bytes:
+            return
+
+        with self._lock:
+            self._memory_discard(key)
+            self._memory[key] = (payload, expire_at, tag)
+            self._memory_bytes += len(payload)
+
+            while (
+                len(self._memory) > self.max_entries
+                or self._memory_bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._memory))
+                self._memory_discard(oldest)
+                self.stats["memory"].evictions += 1
+
+    def _memory_discard(self, key: str) -> None:
+        """Retire une entrée du niveau mémoire (appelant détenteur du verrou)"""
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry[0])
+
+    # ── Interface compatible diskcache ────────────────────────────────────────
+    def get(self, key: str, default=None):
+        """Lecture en une seule consultation (mémoire puis disque)"""
+        payload = self._memory_get(key)
+        if payload is not None:
+            return pickle.loads(payload)
+
+        value, expire_at, tag = self.disk.get(
+            key, default=_MISSING, expire_time=True, tag=True
+        )
+        if value is _MISSING:
+            self.stats["disk"].misses += 1
+            return default
+
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self.stats["disk"].hits += 1
+        self.stats["disk"].bytes_served += len(payload)
+        self._memory_put(key, payload, expire_at, tag)
+        return value
+
+    def set(
+        self,
+        key: str,
+        value,
+        expire: Optional[float] = None,
+        tag: Optional[str] = None,
+        retry: bool = False,
+    ) -> bool:
+        """Écrit l'entrée sur disque et dans le niveau mémoire"""
+        result = self.disk.set(key, value, expire=expire, tag=tag, retry=retry)
+        expire_at = time.time() + expire if expire is not None else None
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._memory_put(key, payload, expire_at, tag)
+        return result
+
+    def add(self, key: str, value, expire=None, tag=None, retry: bool = False):
+        return self.disk.add(key, value, expire=expire, tag=tag, retry=retry)
+
+    def delete(self, key: str, retry: bool = False) -> bool:
+        with self._lock:
+            self._memory_discard(key)
+        return self.disk.delete(key, retry=retry)
+
+    def evict(self, tag: str, retry: bool = False) -> int:
+        """Supprime toutes les entrées d'un tag des deux niveaux"""
+        with self._lock:
+            for key in [k for k, e in self._memory.items() if e[2] == tag]:
+                self._memory_discard(key)
+                self.stats["memory"].evictions += 1
+        removed = self.disk.evict(tag, retry=retry)
+        self.stats["disk"].evictions += removed
+        return removed
+
+    def clear(self) -> int:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        return self.disk.clear()
+
+    def close(self) -> None:
+        self.disk.close()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is not None and (entry[1] is None or entry[1] > time.time()):
+            return True
+        return key in self.disk
+
+    def __getitem__(self, key: str):
+        value = self.get(key, default=_MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value) -> None:
+        self.set(key, value)
+
+    def statistics(self) -> dict:
+        """Compteurs par niveau et occupation (exposés par l'API)"""
+        with self._lock:
+            memory = dict(
+                asdict(self.stats["memory"]),
+                entries=len(self._memory),
+                size_bytes=self._memory_bytes,
+            )
+        disk = dict(
+            asdict(self.stats["disk"]),
+            entries=len(self.disk),
+            size_bytes=self.disk.volume(),
+        )
+        return {"memory": memory, "disk": disk}
+
+
+# Cache global : LRU mémoire devant le cache disque (TTL de 15 jours)
+llm_cache = TieredCache(Cache(str(CACHE_DIR)))
+
+
+def content_hash(content: Optional[str]) -> Optional[str]:
+    """SHA-256 d'un contenu texte (None si absent)"""
+    if content is None:
+        return None
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def current_namespace() -> str:
+    """Espace de noms actif du cache (variable LLM_CACHE_NAMESPACE)"""
+    return get_settings().LLM_CACHE_NAMESPACE
+
+
+def build_cache_key(kind: str, namespace: Optional[str] = None, **parts) -> str:
+    """Construit une clé de cache canonique
+
+    Toutes les entrées qui influencent la sortie du LLM sont passées dans
+    ``parts`` ; elles sont sérialisées de façon déterministe (clés triées)
+    puis hachées. L'espace de noms préfixe la clé et sert de tag diskcache.
+
+    Args:
+        kind: Type d'entrée (cv, file, pitch...)
+        namespace: Espace de noms (défaut: LLM_CACHE_NAMESPACE)
+        **parts: Entrées influençant le résultat (valeurs JSON-sérialisables)
+
+    Returns:
+        str: Clé de la forme ``{namespace}:{kind}:{digest}``
+    """
+    namespace = namespace or current_namespace()
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    digest = hashlib.sha256(payload.encode()).hexdigest()[:32]
+    return f"{namespace}:{kind}:{digest}"
+
+
+def namespace_of(cache_key: str) -> Optional[str]:
+    """Retourne l'espace de noms d'une clé construite par ``build_cache_key``"""
+    parts = cache_key.split(":", 2)
+    return parts[0] if len(parts) == 3 else None
+
+
+def cache_set(cache, cache_key: str, value, expire: int = CACHE_TTL) -> None:
+    """Écrit une entrée en la taguant avec son espace de noms"""
+    cache.set(cache_key, value, expire=expire, tag=namespace_of(cache_key))
+
+
+def evict_namespace(namespace: str, cache=None) -> int:
+    """Supprime toutes les entrées d'un espace de noms (sans vider le reste du cache)
+
+    Permet de retirer les entrées d'une ancienne version de prompts une fois
+    la nouvelle version déployée et le cache réchauffé.
+
+    Args:
+        namespace: Espace de noms à supprimer
+        cache: Cache cible (défaut: cache LLM global)
+
+    Returns:
+        int: Nombre d'entrées supprimées
+    """
+    cache = cache if cache is not None else llm_cache
+    return cache.evict(namespace)
+
+
+class SingleFlight:
+    """Coalescence des appels LLM identiques en cours
+
+    Les appels concurrents portant sur la même clé de cache attendent un seul
+    appel en cours et partagent son résultat :
+
+    - entre threads (ou tâches asyncio) d'un même processus, via un futur
+      partagé par clé ;
+    - entre processus workers, via un marqueur « en cours » posé dans le
+      cache par ``add`` (écriture atomique, expirant après ``lock_expire``) :
+      les autres processus relisent le cache à intervalles croissants
+      (``POLL_MIN_INTERVAL`` à ``POLL_MAX_INTERVAL``) jusqu'à l'apparition
+      du résultat ou la disparition du marqueur, sans écrire dans le cache
+      ni occuper de thread pendant l'attente.
+
+    Le résultat est écrit dans le cache par l'appelant « leader » ; une valeur
+    None (échec non bloquant, ex. pitch vide) est partagée mais jamais mise
+    en cache. Chaque appelant reçoit sa propre copie du résultat, comme à la
+    lecture du cache : l'un peut la modifier (nom du candidat, pitch) sans
+    toucher celle des autres.
+
+    Si le leader asyncio est annulé (ex. pré-extraction non réclamée), les
+    appels en attente reprennent : l'un d'eux devient le nouveau leader.
+    """
+
+    def __init__(
+        self,
+        lock_expire: int = LOCK_EXPIRE,
+        poll_min: float = POLL_MIN_INTERVAL,
+        poll_max: float = POLL_MAX_INTERVAL,
+    ):
+        self.lock_expire = lock_expire
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.coalesced = 0
+        self._guard = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self._async_calls: Dict[str, asyncio.Future] = {}
+
+    def _claim(self, cache, cache_key: str):
+        """Valeur en cache, ou réservation de l'appel pour ce processus
+
+        Returns:
+            Tuple (valeur, réservé) : ``réservé`` est True si ce processus a
+            posé le marqueur et doit appeler le LLM ; (None, False) si un
+            autre processus a l'appel en cours
+        """
+        value = cache.get(cache_key)
+        if value is not None:
+            return value, False
+        marker = f"{LOCK_PREFIX}{cache_key}"
+        # Lecture seule tant qu'un autre processus détient le marqueur
+        if marker in cache or not cache.add(marker, True, expire=self.lock_expire):
+            return None, False
+        # Résultat écrit entre la lecture et la réservation
+        value = cache.get(cache_key)
+        if value is not None:
+            cache.delete(marker)
+            return value, False
+        return None, True
+
+    @staticmethod
+    def _release(cache, cache_key: str) -> None:
+        cache.delete(f"{LOCK_PREFIX}{cache_key}")
+
+    def _next_poll(self, delay: float) -> float:
+        return min(delay * 2, self.poll_max)
+
+    def run(self, cache, cache_key: str, func: Callable[[], object]):
+        """Exécute ``func`` une seule fois pour les appels concurrents sur ``cache_key``
+
+        Args:
+            cache: Cache diskcache où lire/écrire le résultat
+            cache_key: Clé de cache de l'appel
+            func: Appel LLM à exécuter en cas d'absence dans le cache
+
+        Returns:
+            Résultat (partagé) de l'appel ou valeur déjà en cache
+        """
+        with self._guard:
+            call = self._calls.get(cache_key)
+            leader = call is None
+            if leader:
+                call = self._calls[cache_key] = Future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return copy.deepcopy(call.result())
+
+        try:
+            delay = self.poll_min
+            while True:
+                value, claimed = self._claim(cache, cache_key)
+                if value is not None:
+                    break
+                if claimed:
+                    try:
+                        value = func()
+                        if value is not None:
+                            cache_set(cache, cache_key, value)
+                    finally:
+                        self._release(cache, cache_key)
+                    break
+                time.sleep(delay)
+                delay = self._next_poll(delay)
+            # Copie partagée prise avant que le leader ne modifie sa valeur
+            call.set_result(copy.deepcopy(value))
+            return value
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        finally:
+            with self._guard:
+                self._calls.pop(cache_key, None)
+
+    async def run_async(
+        self, cache, cache_key: str, func: Callable[[], Awaitable[object]]
+    ):
+        """Variante asyncio de ``run`` (``func`` retourne une coroutine)
+
+        L'attente d'un autre processus se fait par ``asyncio.sleep`` : elle
+        ne bloque ni la boucle d'événements ni un thread du pool.
+        """
+        pending = self._async_calls.get(cache_key)
+        if pending is not None:
+            self.coalesced += 1
+        while pending is not None:
+            value = await asyncio.shield(pending)
+            if value is not _LEADER_CANCELLED:
+                return copy.deepcopy(value)
+            # Leader annulé : reprendre l'appel (ou rejoindre le nouveau leader)
+            pending = self._async_calls.get(cache_key)
+
+        loop = asyncio.get_running_loop()
+        call = self._async_calls[cache_key] = loop.create_future()
+
+        try:
+            delay = self.poll_min
+            while True:
+                value, claimed = self._claim(cache, cache_key)
+                if value is not None:
+                    break
+                if claimed:
+                    try:
+                        value = await func()
+                        if value is not None:
+                            cache_set(cache, cache_key, value)
+                    finally:
+                        self._release(cache, cache_key)
+                    break
+                await asyncio.sleep(delay)
+                delay = self._next_poll(delay)
+            call.set_result(copy.deepcopy(value))
+            return value
+        except asyncio.CancelledError:
+            call.set_result(_LEADER_CANCELLED)
+            raise
+        except BaseException as e:
+            call.set_exception(e)
+            # Marque l'exception comme consultée s'il n'y a aucun appel en attente
+            call.exception()
+            raise
+        finally:
+            self._async_calls.pop(cache_key, None)
+
+
+# Instance partagée par les extractions et les pitchs de l'agent
+single_flight = SingleFlight()
+
+
+def cache_statistics(cache=None) -> dict:
+    """Statistiques du cache LLM (niveaux mémoire/disque et coalescence)"""
+    cache = cache if cache is not None else llm_cache
+    stats = cache.statistics()
+    stats["coalesced"] = single_flight.coalesced
+    return stats
@@ -0,0 +1,144 @@
+"""
+Schéma de sortie compact des appels LLM
+Le temps de génération est dominé par les tokens produits : en format compact,
+le LLM répond avec des clés courtes et des tableaux à positions fixes au lieu
+d'objets aux clés verbeuses répétées pour chaque expérience et compétence.
+La réponse est ramenée à la forme canonique de ``cv_data`` en un seul endroit
+(``expand_cv_data``), juste après le parsing.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+# Variantes du schéma de sortie (télémétrie)
+VERBOSE = "verbose"
+COMPACT = "compact"
+
+# Champs des enregistrements à positions fixes : (nom canonique, défaut)
+HEADER_FIELDS = (("name", ""), ("title", ""), ("experience", ""))
+SKILL_FIELDS = (("skill", ""), ("level", 0))
+CATEGORY_FIELDS = (("category", ""), ("items", []))
+FORMATION_FIELDS = (("year", ""), ("description", ""))
+EXPERIENCE_FIELDS = (
+    ("company", ""),
+    ("period", ""),
+    ("title", ""),
+    ("context", ""),
+    ("activities", []),
+    ("tech_env", ""),
+)
+
+# Clé compacte -> clé canonique (competences : sous-clés)
+COMPACT_KEYS = {
+    "h": "header",
+    "tjm": "suggested_tjm",
+    "sa": "skills_assessment",
+    "op": "operationnelles",
+    "te": "techniques",
+    "f": "formations",
+    "x": "experiences",
+}
+
+
+def _expand_record(value, fields: Sequence[Tuple[str, object]]):
+    """Tableau à positions fixes -> objet (les objets sont laissés tels quels)"""
+    if isinstance(value, dict):
+        return value
+    values = list(value) if isinstance(value, (list, tuple)) else [value]
+    record = {}
+    for index, (name, default) in enumerate(fields):
+        if index < len(values) and values[index] is not None:
+            record[name] = values[index]
+        else:
+            record[name] = list(default) if isinstance(default, list) else default
+    return record
+
+
+def _expand_records(values, fields) -> list:
+    return [_expand_record(value, fields) for value in values or []]
+
+
+def _compact_record(record, fields) -> list:
+    if not isinstance(record, dict):
+        return record
+    return [record.get(name, default) for name, default in fields]
+
+
+def is_compact(data) -> bool:
+    """Réponse au format compact (et non déjà canonique)"""
+    return (
+        isinstance(data, dict)
+        and "header" not in data
+        and any(key in data for key in COMPACT_KEYS)
+    )
+
+
+def expand_cv_data(data: dict) -> dict:
+    """Ramène une réponse compacte à la forme canonique de ``cv_data``
+
+    Les réponses déjà canoniques sont retournées telles quelles ; les clés
+    inconnues sont conservées.
+    """
+    if not is_compact(data):
+        return data
+
+    cv_data = {"header": _expand_record(data.get("h") or [], HEADER_FIELDS)}
+    if "tjm" in data:
+        cv_data["suggested_tjm"] = data["tjm"]
+    cv_data["skills_assessment"] = _expand_records(data.get("sa"), SKILL_FIELDS)
+    cv_data["competences"] = {
+        "operationnelles": list(data.get("op") or []),
+        "techniques": _expand_records(data.get("te"), CATEGORY_FIELDS),
+    }
+    cv_data["formations"] = _expand_records(data.get("f"), FORMATION_FIELDS)
+    cv_data["experiences"] = _expand_records(data.get("x"), EXPERIENCE_FIELDS)
+
+    for key, value in data.items():
+        if key not in COMPACT_KEYS:
+            cv_data[key] = value
+    return cv_data
+
+
+def compact_cv_data(cv_data: dict) -> dict:
+    """Forme compacte d'un ``cv_data`` canonique (entrée des transformations)"""
+    competences = cv_data.get("competences") or {}
+    data = {
+        "h": _compact_record(cv_data.get("header") or {}, HEADER_FIELDS),
+        "tjm": cv_data.get("suggested_tjm"),
+        "sa": [
+            _compact_record(skill, SKILL_FIELDS)
+            for skill in cv_data.get("skills_assessment") or []
+        ],
+        "op": list(competences.get("operationnelles") or []),
+        "te": [
+            _compact_record(category, CATEGORY_FIELDS)
+            for category in competences.get("techniques") or []
+        ],
+        "f": [
+            _compact_record(formation, FORMATION_FIELDS)
+            for formation in cv_data.get("formations") or []
+        ],
+        "x": [
+            _compact_record(experience, EXPERIENCE_FIELDS)
+            for experience in cv_data.get("experiences") or []
+        ],
+    }
+    if data["tjm"] is None:
+        del data["tjm"]
+
+    canonical = {
+        "header",
+        "suggested_tjm",
+        "skills_assessment",
+        "competences",
+        "formations",
+        "experiences",
+    }
+    for key, value in cv_data.items():
+        if key not in canonical:
+            data[key] = value
+    return data
+
+
+def wire_schema(compact: Optional[bool]) -> str:
+    """Nom de la variante de schéma (télémétrie)"""
+    return COMPACT if compact else VERBOSE
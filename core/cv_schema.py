@@ -0,0 +1,461 @@
+"""
+Validation des réponses JSON du LLM avant génération du DOCX
+Une réponse presque valide (virgule finale, crochet non fermé, réponse
+tronquée, texte autour du JSON) est réparée localement ; le résultat est
+validé fragment par fragment contre le schéma typé que consomme
+``CVDocxGenerator``, les champs absents recevant une valeur par défaut.
+
+Seuls les fragments irrécupérables (une expérience réduite à une chaîne, un
+en-tête qui n'est pas un objet...) sont renvoyés au LLM dans une demande de
+correction ciblée, jamais le prompt complet ; à défaut de correction, ils sont
+remplacés par une valeur sûre (élément de liste retiré, objet vide).
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    TypeAdapter,
+    ValidationError,
+    field_validator,
+)
+
+# Nombre maximal de coupures essayées sur une réponse tronquée
+MAX_TRUNCATION_CUTS = 20
+# Chevauchement recherché entre une réponse tronquée et sa continuation
+MIN_OVERLAP = 8
+MAX_OVERLAP = 500
+
+_FENCE = re.compile(r"^\s*```[a-zA-Z]*\s*|\s*```\s*$")
+
+
+class CVJsonError(ValueError):
+    """Réponse du LLM irréparable localement"""
+
+
+# ---------------------------------------------------------------------------
+# Réparation syntaxique
+# ---------------------------------------------------------------------------
+
+
+def _drop_trailing_comma(out: List[str]) -> None:
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def _close_json(text: str) -> Tuple[str, List[int]]:
+    """Ferme chaînes et crochets ouverts, retire les virgules finales
+
+    Returns:
+        Tuple[str, List[int]]: Texte réparé, positions des virgules
+        structurelles du texte source (coupures possibles si tronqué)
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    commas: List[int] = []
+    in_string = escape = False
+
+    for position, char in enumerate(text):
+        if in_string:
+            out.append(char)
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if char not in stack:
+                # Fermant orphelin
+                continue
+            while True:
+                _drop_trailing_comma(out)
+                closer = stack.pop()
+                out.append(closer)
+                if closer == char:
+                    break
+            if not stack:
+                # Texte après l'objet racine ignoré
+                break
+            continue
+        elif char == ",":
+            commas.append(position)
+        out.append(char)
+
+    if in_string:
+        if escape:
+            out.pop()
+        out.append('"')
+    _drop_trailing_comma(out)
+    if out and out[-1] == ":":
+        out.append("null")
+    while stack:
+        _drop_trailing_comma(out)
+        out.append(stack.pop())
+    return "".join(out), commas
+
+
+def repair_json(text: str) -> str:
+    """Réparation locale d'un JSON presque valide
+
+    Retire les balises Markdown et le texte autour de l'objet, les virgules
+    finales, ferme les chaînes et crochets ouverts. Une réponse tronquée au
+    milieu d'une paire clé/valeur est coupée à la dernière virgule structurelle
+    qui donne un JSON valide.
+
+    Raises:
+        CVJsonError: Si aucun objet JSON ne peut être reconstitué
+    """
+    text = _FENCE.sub("", text or "")
+    start = text.find("{")
+    if start < 0:
+        raise CVJsonError("Aucun objet JSON dans la réponse")
+    text = text[start:]
+
+    repaired, commas = _close_json(text)
+    candidates = [repaired]
+    for position in reversed(commas[-MAX_TRUNCATION_CUTS:]):
+        candidates.append(_close_json(text[:position])[0])
+
+    for candidate in candidates:
+        try:
+            json.loads(candidate)
+            return candidate
+        except json.JSONDecodeError:
+            continue
+    raise CVJsonError("JSON irréparable localement")
+
+
+def stitch_continuation(previous: str, continuation: str) -> str:
+    """Recolle la suite d'une réponse tronquée
+
+    Les balises Markdown de la suite sont retirées, ainsi que la reprise des
+    derniers caractères déjà produits (chevauchement d'au moins
+    ``MIN_OVERLAP`` caractères).
+    """
+    continuation = _FENCE.sub("", continuation)
+    longest = min(len(previous), len(continuation), MAX_OVERLAP)
+    for size in range(longest, MIN_OVERLAP - 1, -1):
+        if previous.endswith(continuation[:size]):
+            return previous + continuation[size:]
+    return previous + continuation
+
+
+def load_json_reply(content: str) -> Tuple[dict, bool]:
+    """Parse une réponse JSON du LLM, réparée localement si nécessaire
+
+    Returns:
+        Tuple[dict, bool]: Objet JSON, True s'il a fallu le réparer
+
+    Raises:
+        CVJsonError: Si la réponse n'est pas un objet JSON réparable
+    """
+    try:
+        data, repaired = json.loads(content), False
+    except (TypeError, json.JSONDecodeError):
+        data, repaired = json.loads(repair_json(content)), True
+    if not isinstance(data, dict):
+        raise CVJsonError("La réponse n'est pas un objet JSON")
+    return data, repaired
+
+
+# ---------------------------------------------------------------------------
+# Schéma typé (champs lus par CVDocxGenerator)
+# ---------------------------------------------------------------------------
+
+
+def _as_list(value):
+    """Chaîne isolée -> liste d'un élément"""
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    return value
+
+
+class _Fragment(BaseModel):
+    """Fragment du cv_data : champs absents par défaut, clés inconnues conservées"""
+
+    model_config = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+
+
+class HeaderModel(_Fragment):
+    name: str = ""
+    title: str = ""
+    experience: str = ""
+
+
+class SkillModel(_Fragment):
+    skill: str = ""
+    level: int = 0
+
+    @field_validator("level", mode="before")
+    @classmethod
+    def parse_level(cls, value):
+        # "85%" -> 85, 72.5 -> 72
+        if isinstance(value, str):
+            value = value.strip().rstrip("%").strip() or 0
+        if isinstance(value, (int, float, str)):
+            return round(float(value))
+        return value
+
+
+class CategoryModel(_Fragment):
+    category: str = ""
+    items: List[str] = []
+
+    @field_validator("items", mode="before")
+    @classmethod
+    def split_items(cls, value):
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return value
+
+
+class CompetencesModel(_Fragment):
+    operationnelles: List[str] = []
+    techniques: List[CategoryModel] = []
+
+    @field_validator("operationnelles", mode="before")
+    @classmethod
+    def wrap_operationnelles(cls, value):
+        return _as_list(value)
+
+
+class FormationModel(_Fragment):
+    year: str = ""
+    description: str = ""
+
+
+class ExperienceModel(_Fragment):
+    company: str = ""
+    period: str = ""
+    title: str = ""
+    context: str = ""
+    activities: List[str] = []
+    tech_env: str = ""
+
+    @field_validator("activities", mode="before")
+    @classmethod
+    def wrap_activities(cls, value):
+        return _as_list(value)
+
+
+class CVDataModel(_Fragment):
+    """Schéma complet du cv_data"""
+
+    header: HeaderModel = HeaderModel()
+    suggested_tjm: Optional[float] = None
+    skills_assessment: List[SkillModel] = []
+    competences: CompetencesModel = CompetencesModel()
+    formations: List[FormationModel] = []
+    experiences: List[ExperienceModel] = []
+
+
+# Listes d'éléments validés un à un : clé -> modèle d'un élément
+LIST_SECTIONS = {
+    "skills_assessment": SkillModel,
+    "formations": FormationModel,
+    "experiences": ExperienceModel,
+}
+
+_TJM = TypeAdapter(Optional[float])
+_STRINGS = TypeAdapter(List[str])
+# Élément de liste invalide non corrigé : retiré du cv_data
+_DROP = object()
+
+
+def _without_nulls(value):
+    """Les valeurs null reçoivent la valeur par défaut du champ"""
+    if isinstance(value, dict):
+        return {key: item for key, item in value.items() if item is not None}
+    return value
+
+
+def _model_validator(model) -> Callable[[Any], dict]:
+    return lambda value: model.model_validate(_without_nulls(value)).model_dump()
+
+
+def _list_validator(model) -> Callable[[Any], list]:
+    def validate(values):
+        if not isinstance(values, list):
+            raise TypeError("Liste attendue")
+        return [_model_validator(model)(value) for value in values]
+
+    return validate
+
+
+@dataclass
+class _Slot:
+    """Emplacement d'un fragment invalide dans le cv_data"""
+
+    container: Any
+    key: Any
+    validate: Callable[[Any], Any]
+    default: Any
+    expected: Any
+
+
+@dataclass
+class CVValidation:
+    """Résultat de la validation d'une réponse
+
+    ``broken`` contient les fragments irrécupérables localement (chemin ->
+    valeur reçue) à soumettre au LLM ; ``resolve`` les remplace par leur
+    correction, ou par une valeur sûre.
+    """
+
+    cv_data: dict = field(default_factory=dict)
+    defaults: List[str] = field(default_factory=list)
+    broken: Dict[str, Any] = field(default_factory=dict)
+    _slots: Dict[str, _Slot] = field(default_factory=dict, repr=False)
+
+    def expected_shapes(self) -> Dict[str, Any]:
+        """Forme attendue de chaque fragment invalide (demande de correction)"""
+        return {path: slot.expected for path, slot in self._slots.items()}
+
+    def resolve(self, corrections: Optional[dict] = None) -> dict:
+        """Intègre les fragments corrigés ; les autres reçoivent un défaut sûr
+
+        Returns:
+            dict: cv_data canonique complet
+        """
+        corrections = corrections if isinstance(corrections, dict) else {}
+        for path, slot in self._slots.items():
+            try:
+                value = slot.validate(corrections[path])
+            except (KeyError, ValueError, TypeError):
+                value = slot.default
+            slot.container[slot.key] = value
+
+        competences = self.cv_data["competences"]
+        for container, key in [
+            *((self.cv_data, key) for key in LIST_SECTIONS),
+            (competences, "techniques"),
+        ]:
+            container[key] = [item for item in container[key] if item is not _DROP]
+
+        self._slots.clear()
+        self.broken.clear()
+        return self.cv_data
+
+    def _flag(self, path: str, value, slot: _Slot) -> None:
+        self.broken[path] = value
+        self._slots[path] = slot
+        slot.container[slot.key] = slot.default
+
+    def _check(self, container, key, value, model, path: str) -> None:
+        """Valide un objet ; s'il est irrécupérable, réserve son emplacement"""
+        try:
+            validated = model.model_validate(_without_nulls(value))
+        except ValidationError:
+            default = model().model_dump()
+            self._flag(
+                path,
+                value,
+                _Slot(container, key, _model_validator(model), default, default),
+            )
+            return
+        self.defaults.extend(
+            f"{path}.{name}"
+            for name in type(validated).model_fields
+            if name not in validated.model_fields_set
+        )
+        container[key] = validated.model_dump()
+
+    def _check_list(self, container, key, values, model, path: str) -> None:
+        """Valide une liste élément par élément"""
+        if not isinstance(values, list):
+            slot = _Slot(
+                container, key, _list_validator(model), [], [model().model_dump()]
+            )
+            self._flag(path, values, slot)
+            return
+
+        items = container[key] = [_DROP] * len(values)
+        for index, value in enumerate(values):
+            item_path = f"{path}[{index}]"
+            try:
+                validated = model.model_validate(_without_nulls(value))
+            except ValidationError:
+                expected = model().model_dump()
+                self._flag(
+                    item_path,
+                    value,
+                    _Slot(items, index, _model_validator(model), _DROP, expected),
+                )
+                continue
+            self.defaults.extend(
+                f"{item_path}.{name}"
+                for name in type(validated).model_fields
+                if name not in validated.model_fields_set
+            )
+            items[index] = validated.model_dump()
+
+
+def validate_cv_data(data: dict) -> CVValidation:
+    """Valide un cv_data canonique contre le schéma typé
+
+    Les valeurs sont converties quand c'est sans ambiguïté (nombre -> texte,
+    chaîne -> liste, "85%" -> 85), les champs absents ou null reçoivent une
+    valeur par défaut ; les fragments non convertibles sont signalés dans
+    ``broken``.
+    """
+    result = CVValidation()
+    cv_data = result.cv_data
+
+    result._check(cv_data, "header", data.get("header") or {}, HeaderModel, "header")
+
+    # TJM non numérique : simplement omis
+    try:
+        tjm = _TJM.validate_python(data.get("suggested_tjm"))
+    except ValidationError:
+        tjm = None
+    if tjm is not None:
+        cv_data["suggested_tjm"] = tjm
+
+    competences = data.get("competences") or {}
+    if not isinstance(competences, dict):
+        result._check(
+            cv_data, "competences", competences, CompetencesModel, "competences"
+        )
+    else:
+        cv_data["competences"] = section = dict(competences)
+        try:
+            section["operationnelles"] = _STRINGS.validate_python(
+                _as_list(competences.get("operationnelles") or [])
+            )
+        except ValidationError:
+            section["operationnelles"] = []
+            result.broken["competences.operationnelles"] = competences[
+                "operationnelles"
+            ]
+            result._slots["competences.operationnelles"] = _Slot(
+                section, "operationnelles", _STRINGS.validate_python, [], [""]
+            )
+        result._check_list(
+            section,
+            "techniques",
+            competences.get("techniques") or [],
+            CategoryModel,
+            "competences.techniques",
+        )
+
+    for key, model in LIST_SECTIONS.items():
+        result._check_list(cv_data, key, data.get(key) or [], model, key)
+
+    # Clés inconnues conservées (pitch...)
+    for key, value in data.items():
+        if key not in CVDataModel.model_fields:
+            cv_data[key] = value
+    return result
@@ -4,22 +4,28 @@ Extrait le texte d'un fichier DOCX pour traitement par LLM
 """
 
 from pathlib import Path
-from typing import Union
+from typing import Callable, Optional, Union
 
 import docx2txt
 
 from config.logging_config import setup_logger
+from core.events import ProgressEvent
 
 # Logger
 logger = setup_logger(__name__, "docx_extractor.log")
 
 
-def extract_docx_content(docx_path: Union[str, Path]) -> str:
+def extract_docx_content(
+    docx_path: Union[str, Path],
+    on_event: Optional[Callable[[ProgressEvent], None]] = None,
+) -> str:
     """
     Extrait le contenu textuel d'un fichier DOCX.
 
     Args:
         docx_path: Chemin vers le fichier DOCX (str ou Path)
+        on_event: Reçoit l'événement ``docx_extracted`` (caractères) en fin
+            d'extraction (optionnel)
 
     Returns:
         str: Texte extrait du DOCX
@@ -48,7 +54,12 @@ def extract_docx_content(docx_path: Union[str, Path]) -> str:
 
         logger.info(f"Extraction DOCX réussie: {len(text_content)} caractères")
 
-        return text_content.strip()
+        text_content = text_content.strip()
+        if on_event is not None:
+            on_event(
+                ProgressEvent("docx_extracted", data={"characters": len(text_content)})
+            )
+        return text_content
 
     except Exception as e:
         logger.error(f"Erreur extraction DOCX: {str(e)}", exc_info=True)
@@ -643,7 +643,7 @@ class CVDocxGenerator:
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         self.doc.save(output_path)
-        print(f"✓ Fichier DOCX généré : {output_path}")
+        logger.info(f"Fichier DOCX généré : {output_path.name}")
 
         return str(output_path)
 
@@ -0,0 +1,404 @@
+"""
+Événements de progression d'une conversion
+L'agent et les extracteurs signalent leur avancement par des événements
+structurés (début et fin d'étape avec durée, compteurs) au lieu d'écrire sur
+la sortie standard : la CLI les affiche (``ConsoleProgress``), l'API les
+transmet au client (SSE) et aux métriques (``stage_metrics``), un utilisateur
+de la bibliothèque s'y abonne (``agent.events.subscribe``).
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from config.logging_config import setup_logger
+from core.telemetry import (
+    CONTINUATION,
+    CORRECTION,
+    EXTRACTION,
+    EXTRACTION_SECTION,
+    LATENCY_BUCKETS,
+    PITCH,
+    TRANSFORMATION,
+    ConversionTelemetry,
+    Histogram,
+)
+
+logger = setup_logger(__name__, "events.log")
+
+# Début et fin d'une étape du pipeline (``ProgressEvent.stage``)
+STAGE_START = "stage_start"
+STAGE_END = "stage_end"
+
+# Événements métier : extracted (pages, tokens), pdf_extracted, docx_extracted,
+# job_offer_extracted, options, llm_tokens (tokens reçus en streaming),
+# structured, docx_rendered, pitch_ready, pitch_skipped, conversion_started,
+# completed
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """Événement de progression
+
+    Attributes:
+        name: Type d'événement (``STAGE_START``, ``STAGE_END`` ou événement métier)
+        stage: Étape du pipeline concernée (événements d'étape)
+        data: Compteurs et informations de l'événement
+        duration: Durée de l'étape en secondes (``STAGE_END``)
+    """
+
+    name: str
+    stage: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    duration: Optional[float] = None
+
+    def as_dict(self) -> dict:
+        """Représentation sérialisable (SSE, logs)"""
+        payload = dict(self.data)
+        if self.stage is not None:
+            payload["stage"] = self.stage
+        if self.duration is not None:
+            payload["duration"] = round(self.duration, 4)
+        return payload
+
+
+Listener = Callable[[ProgressEvent], None]
+
+
+def _deliver(listener: Listener, event: ProgressEvent) -> None:
+    """Transmet un événement ; l'erreur d'un abonné n'interrompt pas la conversion"""
+    try:
+        listener(event)
+    except Exception:
+        logger.warning(f"Abonné aux événements en échec ({event.name})", exc_info=True)
+
+
+class ProgressHooks:
+    """Abonnés aux événements de progression d'un agent"""
+
+    def __init__(self):
+        self._listeners: List[Listener] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        """Abonne ``listener`` à tous les événements
+
+        Returns:
+            Fonction de désabonnement
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    @property
+    def listeners(self) -> List[Listener]:
+        with self._lock:
+            return list(self._listeners)
+
+    def emit(self, event: ProgressEvent) -> None:
+        for listener in self.listeners:
+            _deliver(listener, event)
+
+
+class ProgressEmitter:
+    """Émetteur d'une conversion : abonnés de l'agent et suivi propre à l'appel
+
+    Args:
+        hooks: Abonnés de l'agent
+        listener: Suivi de cette conversion seulement (optionnel)
+    """
+
+    def __init__(self, hooks: ProgressHooks, listener: Optional[Listener] = None):
+        self.hooks = hooks
+        self.listener = listener
+
+    @property
+    def active(self) -> bool:
+        """Au moins un abonné (sinon, rien à mesurer en streaming)"""
+        return self.listener is not None or bool(self.hooks.listeners)
+
+    def publish(self, event: ProgressEvent) -> None:
+        if self.listener is not None:
+            _deliver(self.listener, event)
+        self.hooks.emit(event)
+
+    def __call__(self, name: str, **data) -> None:
+        self.publish(ProgressEvent(name, data=data))
+
+    def stage(self, name: str, timing=None) -> None:
+        """Début (``timing`` None) ou fin d'une étape (écouteur de ``StageGraph``)"""
+        if timing is None:
+            self.publish(ProgressEvent(STAGE_START, stage=name))
+        else:
+            self.publish(ProgressEvent(STAGE_END, stage=name, duration=timing.duration))
+
+    @contextmanager
+    def measure(self, name: str, **data) -> Iterator[dict]:
+        """Sous-étape mesurée hors du graphe (recherche en cache, prétraitement...)
+
+        Le dict produit (``data``) peut être complété par l'appelant ; il est
+        transmis avec la durée dans l'événement de fin.
+        """
+        self.publish(ProgressEvent(STAGE_START, stage=name))
+        start = time.perf_counter()
+        try:
+            yield data
+        finally:
+            duration = time.perf_counter() - start
+            self.publish(
+                ProgressEvent(STAGE_END, stage=name, data=data, duration=duration)
+            )
+
+
+class StageMetrics:
+    """Histogrammes des durées par étape du pipeline (abonné aux événements)"""
+
+    def __init__(self):
+        self._stages: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: ProgressEvent) -> None:
+        if event.name != STAGE_END or event.duration is None:
+            return
+        with self._lock:
+            self._stages.setdefault(event.stage, Histogram(LATENCY_BUCKETS)).observe(
+                event.duration
+            )
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {stage: stats.as_dict() for stage, stats in self._stages.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+
+stage_metrics = StageMetrics()
+
+
+# Nom de chaque étape dans le détail des durées, dans l'ordre d'exécution.
+# L'étape cv_text du graphe n'y figure pas : c'est la somme de l'extraction
+# et du prétraitement, mesurés séparément.
+TIMING_STAGES = {
+    "upload": "upload",
+    "cache_lookup": "cache_lookup",
+    "extraction": "extraction",
+    "preprocessing": "preprocessing",
+    "job_offer": "job_offer",
+    "cv_data": "llm_extraction",
+    "output_file": "docx_render",
+    "pitch": "pitch",
+    "cleanup": "cleanup",
+}
+# Types d'appels LLM de chaque étape (hit du cache d'après la télémétrie)
+_LLM_STAGE_KINDS = {
+    "llm_extraction": (
+        EXTRACTION,
+        EXTRACTION_SECTION,
+        TRANSFORMATION,
+        CORRECTION,
+        CONTINUATION,
+    ),
+    "pitch": (PITCH,),
+}
+
+
+class ConversionTimings:
+    """Détail des durées d'une conversion, étape par étape (réponse API, logs)
+
+    Abonné aux événements de la conversion ; les étapes propres à l'appelant
+    (enregistrement de l'upload, nettoyage) sont mesurées par ``measure``.
+    Une étape qu'un cache peut servir porte aussi ``cached``.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, dict] = {}
+        self.critical_path: List[str] = []
+        self._lock = threading.Lock()
+
+    def record(
+        self, stage: str, duration: float, cached: Optional[bool] = None
+    ) -> None:
+        entry: Dict[str, Any] = {"duration": round(duration, 4)}
+        if cached is not None:
+            entry["cached"] = cached
+        with self._lock:
+            self.stages[stage] = entry
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def __call__(self, event: ProgressEvent) -> None:
+        if event.name == STAGE_END and event.stage in TIMING_STAGES:
+            self.record(
+                TIMING_STAGES[event.stage], event.duration, event.data.get("cached")
+            )
+        elif event.name == "extracted" and event.data.get("cached"):
+            # Fichier déjà traité : ni extraction ni prétraitement
+            self.record("extraction", 0.0, cached=True)
+        elif event.name == "completed":
+            self.critical_path = [
+                TIMING_STAGES.get(stage, stage)
+                for stage in event.data.get("critical_path", ())
+            ]
+
+    def add_llm_usage(self, usage: ConversionTelemetry) -> None:
+        """Hits du cache des étapes LLM d'après les appels de la conversion
+
+        Une étape est servie par le cache si tous ses appels l'ont été.
+        """
+        with self._lock:
+            for stage, kinds in _LLM_STAGE_KINDS.items():
+                records = [record for record in usage.calls if record.kind in kinds]
+                if stage in self.stages and records:
+                    self.stages[stage]["cached"] = all(
+                        record.cache_hit for record in records
+                    )
+
+    def as_dict(self) -> dict:
+        """Représentation sérialisable (réponse API)"""
+        order = list(TIMING_STAGES.values())
+        with self._lock:
+            stages = {
+                stage: dict(self.stages[stage])
+                for stage in sorted(
+                    self.stages,
+                    key=lambda name: order.index(name) if name in order else len(order),
+                )
+            }
+        return {"stages": stages, "critical_path": list(self.critical_path)}
+
+    def summary(self) -> str:
+        """Résumé d'une ligne pour les logs"""
+        return ", ".join(
+            f"{stage} {entry['duration']:.2f}s"
+            + (" (cache)" if entry.get("cached") else "")
+            for stage, entry in self.as_dict()["stages"].items()
+        )
+
+
+# Libellés des étapes du pipeline pour la console
+_STAGE_TITLES = {
+    "cv_text": "Étape 1/4 : Extraction du contenu...",
+    "cv_data": "Étape 2/4 : Analyse et structuration via LLM...",
+    "output_file": "Étape 3/4 : Génération du fichier Word...",
+    "pitch": "Étape 4/4 : Génération du pitch de présentation...",
+}
+_LANGUAGE_NAMES = {"en": "Anglais", "it": "Italien", "es": "Espagnol"}
+
+
+class ConsoleProgress:
+    """Affiche la progression d'une conversion (ligne de commande)"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def _print(self, text: str = "") -> None:
+        print(text, file=self.stream or sys.stdout)
+
+    def __call__(self, event: ProgressEvent) -> None:
+        handler = getattr(self, f"_on_{event.name}", None)
+        if handler is not None:
+            handler(event, **event.data)
+
+    def _on_stage_start(self, event: ProgressEvent) -> None:
+        if event.stage in _STAGE_TITLES:
+            self._print(_STAGE_TITLES[event.stage])
+
+    def _on_conversion_started(self, event: ProgressEvent, file: str, **_) -> None:
+        self._print(f"\n{'=' * 60}\nTraitement du CV : {file}\n{'=' * 60}\n")
+
+    def _on_pdf_extracted(self, event: ProgressEvent, pages: int, **_) -> None:
+        self._print(f"  Nombre de pages : {pages}")
+
+    def _on_extracted(
+        self, event: ProgressEvent, cached=False, characters=0, pages=0, **_
+    ) -> None:
+        if cached:
+            self._print("✓ Fichier déjà traité, extraction ignorée (cache)\n")
+        else:
+            self._print(f"✓ {characters} caractères extraits ({pages} page(s))\n")
+
+    def _on_job_offer_extracted(self, event: ProgressEvent, **_) -> None:
+        self._print("✓ Appel d'offres extrait")
+
+    def _on_options(
+        self,
+        event: ProgressEvent,
+        improvement_mode="none",
+        max_pages=None,
+        target_language=None,
+        **_,
+    ) -> None:
+        if target_language and target_language != "fr":
+            language = _LANGUAGE_NAMES.get(target_language, target_language.upper())
+            self._print(f"🌐 TRADUCTION ACTIVÉE : Le CV sera traduit en {language}")
+        if max_pages:
+            self._print(
+                f"🚨 MODE RÉDUCTION ACTIVÉ : CV limité à {max_pages} page(s) maximum !"
+            )
+        if improvement_mode == "targeted":
+            self._print(
+                "🎯 Mode amélioration ciblée activé - Le CV sera adapté à l'appel d'offres"
+            )
+        elif improvement_mode == "basic":
+            self._print(
+                "⚠️  Mode amélioration basique activé - Le LLM va améliorer le contenu"
+            )
+
+    def _on_structured(
+        self, event: ProgressEvent, experiences=0, renamed=False, **_
+    ) -> None:
+        if renamed:
+            self._print("📝 Nom du candidat remplacé par celui fourni")
+        self._print(f"✓ CV structuré ({experiences} expérience(s))\n")
+
+    def _on_docx_rendered(self, event: ProgressEvent, filename: str, **_) -> None:
+        self._print(f"✓ Fichier DOCX généré : {filename}\n")
+
+    def _on_pitch_ready(
+        self, event: ProgressEvent, characters=0, fused=False, targeted=False, **_
+    ) -> None:
+        if not characters:
+            self._print("✗ Échec de la génération du pitch\n")
+            return
+        origin = " par l'appel d'extraction (mode fusionné)" if fused else ""
+        self._print(f"✓ Pitch généré{origin} ({characters} caractères)")
+        if targeted:
+            self._print("🎯 Pitch ciblé pour l'appel d'offres")
+        self._print()
+
+    def _on_pitch_skipped(self, event: ProgressEvent, **_) -> None:
+        self._print("Étape 4/4 : Génération du pitch ignorée (option désactivée)\n")
+
+    def _on_completed(
+        self,
+        event: ProgressEvent,
+        output_file: str,
+        critical_path=(),
+        critical_path_time=0.0,
+        **_,
+    ) -> None:
+        self._print(f"\n{'=' * 60}")
+        self._print("✓ Conversion terminée avec succès !")
+        self._print(f"Fichier généré : {output_file}")
+        self._print(
+            f"Chemin critique : {' → '.join(critical_path)} "
+            f"({critical_path_time:.2f}s)"
+        )
+        self._print(f"{'=' * 60}\n")
@@ -0,0 +1,313 @@
+"""
+Transport HTTP partagé des clients LLM
+Un pool de connexions unique pour le processus (keep-alive, HTTP/2 optionnel,
+délais de connexion et de lecture explicites) est partagé par toutes les
+instances de l'agent, en synchrone comme en asyncio : les rafales de
+conversions réutilisent les connexions TLS ouvertes vers l'endpoint.
+Le transport mesure l'occupation du pool (requêtes en cours, pic, saturation).
+"""
+
+import asyncio
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import httpx
+
+from config.logging_config import setup_logger
+from config.settings import get_settings
+
+# Logger
+logger = setup_logger(__name__, "llm_transport.log")
+
+
+def http2_available() -> bool:
+    """HTTP/2 nécessite le paquet optionnel ``h2`` (``httpx[http2]``)"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass
+class TransportPolicy:
+    """Paramètres du pool de connexions LLM"""
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 90.0
+    http2: bool = False
+
+    @classmethod
+    def from_settings(cls) -> "TransportPolicy":
+        settings = get_settings()
+        return cls(
+            max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+            connect_timeout=settings.LLM_HTTP_CONNECT_TIMEOUT,
+            read_timeout=settings.LLM_TIMEOUT_SECONDS,
+            http2=settings.LLM_HTTP2,
+        )
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        """Lecture, écriture et attente d'une connexion libre : ``read_timeout``"""
+        return httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+
+
+class PoolMetrics:
+    """Occupation du pool : requêtes en cours, pic et attentes de connexion"""
+
+    def __init__(self, max_connections: int):
+        self.max_connections = max_connections
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        # Requêtes émises alors que toutes les connexions étaient occupées
+        self.saturated = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            self.requests += 1
+            if self.in_flight >= self.max_connections:
+                self.saturated += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def release(self, error: bool = False) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if error:
+                self.errors += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "saturated": self.saturated,
+                "saturation_rate": (
+                    round(self.saturated / self.requests, 4) if self.requests else 0.0
+                ),
+            }
+
+
+class _Release:
+    """Libère une seule fois l'emplacement d'une requête dans les métriques"""
+
+    def __init__(self, metrics: PoolMetrics):
+        self.metrics = metrics
+        self.done = False
+
+    def __call__(self) -> None:
+        if not self.done:
+            self.done = True
+            self.metrics.release()
+
+
+class _MeteredStream(httpx.SyncByteStream):
+    def __init__(self, stream, release: _Release):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+
+class _AsyncMeteredStream(httpx.AsyncByteStream):
+    def __init__(self, stream, release: _Release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+def _metered(response: httpx.Response, stream) -> httpx.Response:
+    return httpx.Response(
+        status_code=response.status_code,
+        headers=response.headers,
+        stream=stream,
+        extensions=response.extensions,
+    )
+
+
+class MeteredTransport(httpx.BaseTransport):
+    """Transport synchrone mesuré (la requête est en cours jusqu'à la
+    fermeture de la réponse, streaming compris)"""
+
+    def __init__(self, transport: httpx.BaseTransport, metrics: PoolMetrics):
+        self._transport = transport
+        self.metrics = metrics
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.metrics.acquire()
+        try:
+            response = self._transport.handle_request(request)
+        except Exception:
+            self.metrics.release(error=True)
+            raise
+        release = _Release(self.metrics)
+        return _metered(response, _MeteredStream(response.stream, release))
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncMeteredTransport(httpx.AsyncBaseTransport):
+    """Transport asyncio mesuré, avec un pool par boucle d'événements
+
+    Les connexions asyncio sont liées à leur boucle : chaque boucle (serveur
+    FastAPI, ``asyncio.run`` des scripts) dispose de son propre pool, libéré
+    avec elle.
+    """
+
+    def __init__(
+        self, factory: Callable[[], httpx.AsyncBaseTransport], metrics: PoolMetrics
+    ):
+        self._factory = factory
+        self._transports = weakref.WeakKeyDictionary()
+        self.metrics = metrics
+
+    def _transport(self) -> httpx.AsyncBaseTransport:
+        loop = asyncio.get_running_loop()
+        transport = self._transports.get(loop)
+        if transport is None:
+            transport = self._transports[loop] = self._factory()
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        transport = self._transport()
+        self.metrics.acquire()
+        try:
+            response = await transport.handle_async_request(request)
+        except Exception:
+            self.metrics.release(error=True)
+            raise
+        release = _Release(self.metrics)
+        return _metered(response, _AsyncMeteredStream(response.stream, release))
+
+    async def aclose(self) -> None:
+        transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+
+class LLMHttpPool:
+    """Clients httpx partagés (synchrone et asyncio) des clients LLM
+
+    Args:
+        policy: Paramètres du pool
+        transport: Transport sous-jacent imposé (tests), à la place des
+            transports HTTP configurés par ``policy``
+    """
+
+    def __init__(
+        self,
+        policy: Optional[TransportPolicy] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        self.policy = policy or TransportPolicy()
+        self.http2 = self.policy.http2 and http2_available()
+        if self.policy.http2 and not self.http2:
+            logger.warning("HTTP/2 demandé mais le paquet h2 est absent (HTTP/1.1)")
+
+        self.metrics = PoolMetrics(self.policy.max_connections)
+        self._transport = transport
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+
+    def _sync_transport(self) -> httpx.BaseTransport:
+        if self._transport is not None:
+            return self._transport
+        return httpx.HTTPTransport(limits=self.policy.limits, http2=self.http2)
+
+    def _async_transport(self) -> httpx.AsyncBaseTransport:
+        if self._transport is not None:
+            return self._transport
+        return httpx.AsyncHTTPTransport(limits=self.policy.limits, http2=self.http2)
+
+    @property
+    def client(self) -> httpx.Client:
+        """Client synchrone partagé (créé au premier usage)"""
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    transport=MeteredTransport(self._sync_transport(), self.metrics),
+                    timeout=self.policy.timeout,
+                )
+            return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Client asyncio partagé (un pool de connexions par boucle)"""
+        with self._lock:
+            if self._async_client is None:
+                self._async_client = httpx.AsyncClient(
+                    transport=AsyncMeteredTransport(
+                        self._async_transport, self.metrics
+                    ),
+                    timeout=self.policy.timeout,
+                )
+            return self._async_client
+
+    def stats(self) -> dict:
+        """Configuration et occupation du pool"""
+        return {
+            "max_connections": self.policy.max_connections,
+            "max_keepalive_connections": self.policy.max_keepalive_connections,
+            "keepalive_expiry": self.policy.keepalive_expiry,
+            "connect_timeout": self.policy.connect_timeout,
+            "read_timeout": self.policy.read_timeout,
+            "http2": self.http2,
+            **self.metrics.as_dict(),
+        }
+
+    def close(self) -> None:
+        """Ferme le client synchrone (arrêt du processus)"""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+_pool: Optional[LLMHttpPool] = None
+
+
+def get_llm_http_pool() -> LLMHttpPool:
+    """Pool HTTP partagé par tous les clients LLM du processus"""
+    global _pool
+    if _pool is None:
+        _pool = LLMHttpPool(TransportPolicy.from_settings())
+    return _pool
@@ -0,0 +1,203 @@
+"""
+Extraction des CV longs en map-reduce
+Découpe le texte prétraité en sections (profil/compétences, formations, blocs
+d'expériences) extraites en parallèle par des prompts plus courts, puis
+fusionne les résultats de façon déterministe dans le schéma ``cv_data``.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from core.text_preprocessor import SECTION_KEYWORDS, estimate_tokens, section_key
+
+# Clés du schéma extraites par type de section
+PROFILE_KEYS = ("header", "suggested_tjm", "skills_assessment", "competences")
+EDUCATION_KEYS = ("formations",)
+EXPERIENCE_KEYS = ("experiences",)
+
+EXPERIENCE_TITLES = {
+    "experience",
+    "experiences",
+    "experience professionnelle",
+    "experiences professionnelles",
+    "parcours professionnel",
+    "professional experience",
+    "work experience",
+}
+EDUCATION_TITLES = {
+    "formation",
+    "formations",
+    "diplomes",
+    "certifications",
+    "education",
+}
+
+# Ligne de période : deux années, ou une année suivie d'une fin ouverte
+_YEAR = r"(?:19|20)\d{2}"
+_PERIOD_RE = re.compile(
+    rf"{_YEAR}.{{0,30}}?(?:{_YEAR}|aujourd|ce jour|présent|present|now|actuel)",
+    re.IGNORECASE,
+)
+PERIOD_LINE_MAX_CHARS = 80
+
+# Lignes d'en-tête (entreprise, titre) rattachées au bloc qui suit
+MAX_HEADER_LINES = 2
+
+
+@dataclass
+class CVSection:
+    """Section d'un CV long extraite par un appel LLM dédié"""
+
+    kind: str
+    text: str
+    keys: tuple
+    context: str = ""
+
+
+def _is_period_line(line: str) -> bool:
+    return len(line) <= PERIOD_LINE_MAX_CHARS and bool(_PERIOD_RE.search(line))
+
+
+def _is_header_line(line: str) -> bool:
+    """Ligne courte pouvant précéder une période (entreprise, intitulé du poste)"""
+    line = line.strip()
+    return (
+        bool(line)
+        and len(line) <= PERIOD_LINE_MAX_CHARS
+        and not line.startswith("- ")
+        and not line.endswith(".")
+    )
+
+
+def _experience_blocks(lines: List[str]) -> List[List[str]]:
+    """Découpe la section expériences en blocs commençant par une expérience
+
+    Un bloc commence à une ligne de période, en y rattachant les lignes
+    d'en-tête qui la précèdent immédiatement.
+    """
+    starts = [0]
+    for index, line in enumerate(lines):
+        if not _is_period_line(line):
+            continue
+        start = index
+        while (
+            start > starts[-1]
+            and index - start < MAX_HEADER_LINES
+            and _is_header_line(lines[start - 1])
+        ):
+            start -= 1
+        if start > starts[-1]:
+            starts.append(start)
+
+    bounds = starts + [len(lines)]
+    return [lines[a:b] for a, b in zip(bounds, bounds[1:]) if any(lines[a:b])]
+
+
+def _pack(blocks: List[List[str]], chunk_tokens: int) -> List[str]:
+    """Regroupe des blocs consécutifs en morceaux d'au plus ``chunk_tokens``"""
+    chunks, current = [], []
+    for block in blocks:
+        candidate = "\n".join(current + block)
+        if current and estimate_tokens(candidate) > chunk_tokens:
+            chunks.append("\n".join(current).strip())
+            current = []
+        current = current + block
+    if current:
+        chunks.append("\n".join(current).strip())
+    return [chunk for chunk in chunks if chunk]
+
+
+def split_cv_sections(text: str, chunk_tokens: int) -> List[CVSection]:
+    """Découpe un CV en sections à extraire en parallèle
+
+    Les titres de section connus orientent chaque ligne vers le profil, les
+    formations ou les expériences ; ces dernières sont regroupées en blocs
+    d'au plus ``chunk_tokens``. Les périodes des expériences sont transmises
+    en contexte à la section profil (calcul des années d'expérience).
+
+    Args:
+        text: Texte prétraité du CV
+        chunk_tokens: Taille maximale (tokens estimés) d'un bloc d'expériences
+
+    Returns:
+        List[CVSection]: Sections dans l'ordre du document, liste vide si le
+        CV ne se prête pas au découpage (aucune section d'expériences)
+    """
+    buckets = {"profile": [], "education": [], "experiences": []}
+    current = "profile"
+    for line in text.split("\n"):
+        key = section_key(line)
+        if key in EXPERIENCE_TITLES:
+            current = "experiences"
+        elif key in EDUCATION_TITLES:
+            current = "education"
+        elif key in SECTION_KEYWORDS:
+            current = "profile"
+        buckets[current].append(line)
+
+    experience_lines = buckets["experiences"]
+    chunks = _pack(_experience_blocks(experience_lines), chunk_tokens)
+    if not chunks:
+        return []
+
+    education = "\n".join(buckets["education"]).strip()
+    periods = "\n".join(line for line in experience_lines if _is_period_line(line))
+
+    # Sans section formations identifiée, le profil extrait aussi les formations
+    profile_keys = PROFILE_KEYS if education else PROFILE_KEYS + EDUCATION_KEYS
+    sections = [
+        CVSection(
+            "profile",
+            "\n".join(buckets["profile"]).strip(),
+            profile_keys,
+            context=f"Périodes des expériences :\n{periods}" if periods else "",
+        )
+    ]
+    if education:
+        sections.append(CVSection("education", education, EDUCATION_KEYS))
+    sections.extend(
+        CVSection("experiences", chunk, EXPERIENCE_KEYS) for chunk in chunks
+    )
+    return sections
+
+
+def _experience_identity(experience: dict) -> tuple:
+    return tuple(
+        str(experience.get(field, "")).strip().lower()
+        for field in ("company", "period", "title")
+    )
+
+
+def merge_section_results(
+    sections: Sequence[CVSection], results: Sequence[dict]
+) -> dict:
+    """Fusionne les extractions par section dans le schéma ``cv_data``
+
+    Fusion déterministe dans l'ordre des sections : les listes sont
+    concaténées (expériences dédoublonnées par entreprise, période et titre,
+    une expérience coupée entre deux blocs pouvant apparaître deux fois), les
+    autres clés sont prises de la première section qui les fournit.
+    """
+    merged = {"formations": [], "experiences": []}
+    seen_experiences = set()
+
+    for section, data in zip(sections, results):
+        for key in section.keys:
+            value = data.get(key)
+            if value in (None, "", [], {}):
+                continue
+            if key == "experiences":
+                for experience in value:
+                    identity = _experience_identity(experience)
+                    if any(identity):
+                        if identity in seen_experiences:
+                            continue
+                        seen_experiences.add(identity)
+                    merged["experiences"].append(experience)
+            elif isinstance(merged.get(key), list):
+                merged[key].extend(value)
+            elif key not in merged:
+                merged[key] = value
+
+    return merged
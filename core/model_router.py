@@ -0,0 +1,165 @@
+"""
+Routeur de modèles (mode "auto")
+Choisit un modèle de AVAILABLE_MODELS selon la taille du CV, le mode
+d'amélioration et l'état observé de chaque modèle (latence, erreurs,
+disjoncteur), avec repli sur un autre modèle quand l'un est dégradé.
+"""
+
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from config.logging_config import setup_logger
+from config.settings import AUTO_MODEL, AVAILABLE_MODELS, get_settings
+from core.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientLLM,
+    get_llm_gateway,
+    is_retryable,
+)
+
+# Logger
+logger = setup_logger(__name__, "model_router.log")
+
+# Nombre minimal d'appels avant de juger le taux d'erreur d'un modèle
+MIN_CALLS_FOR_ERROR_RATE = 5
+
+# Difficulté ajoutée par mode d'amélioration (un CV long ajoute 1)
+MODE_DIFFICULTY = {"none": 0, "basic": 1, "targeted": 1}
+
+
+def is_auto(model: Optional[str]) -> bool:
+    """Le modèle demandé est-il le mode de sélection automatique ?"""
+    return model == AUTO_MODEL
+
+
+@dataclass
+class RoutingPolicy:
+    """Seuils du routeur"""
+
+    long_cv_tokens: int = 4000
+    max_error_rate: float = 0.3
+    max_p95_seconds: float = 60.0
+
+    @classmethod
+    def from_settings(cls) -> "RoutingPolicy":
+        settings = get_settings()
+        return cls(
+            long_cv_tokens=settings.MODEL_ROUTER_LONG_CV_TOKENS,
+            max_error_rate=settings.MODEL_ROUTER_MAX_ERROR_RATE,
+            max_p95_seconds=settings.MODEL_ROUTER_MAX_P95_SECONDS,
+        )
+
+
+class ModelRouter:
+    """Sélection d'un modèle par requête
+
+    Chaque modèle du catalogue a un ``tier`` (1 = rapide et économique,
+    3 = le plus capable). La requête exige un tier minimal : un CV court
+    sans amélioration se contente du tier 1, une réécriture ciblée d'un CV
+    long demande le tier 3. Parmi les modèles sains et suffisants, le moins
+    coûteux puis le plus rapide (p95) est retenu ; les modèles dégradés ne
+    sont utilisés qu'en dernier recours.
+    """
+
+    def __init__(
+        self,
+        gateway: Optional[ResilientLLM] = None,
+        policy: Optional[RoutingPolicy] = None,
+        models: Optional[Dict[str, dict]] = None,
+    ):
+        self.gateway = gateway or get_llm_gateway()
+        self.policy = policy or RoutingPolicy.from_settings()
+        self.tiers = {
+            name: info.get("tier", 1)
+            for name, info in (models or AVAILABLE_MODELS).items()
+        }
+
+    def required_tier(self, input_tokens: int, improvement_mode: str) -> int:
+        """Tier minimal exigé par la requête"""
+        difficulty = MODE_DIFFICULTY.get(improvement_mode, 1)
+        if input_tokens >= self.policy.long_cv_tokens:
+            difficulty += 1
+        return min(1 + difficulty, max(self.tiers.values()))
+
+    def is_degraded(self, model: str) -> bool:
+        """Circuit non fermé, taux d'erreur ou latence p95 excessifs"""
+        if self.gateway.breaker(model).state != CircuitBreaker.CLOSED:
+            return True
+
+        stats = self.gateway.stats(model)
+        if (
+            stats.calls >= MIN_CALLS_FOR_ERROR_RATE
+            and stats.failures / stats.calls > self.policy.max_error_rate
+        ):
+            return True
+
+        p95 = stats.percentile(0.95)
+        return bool(
+            self.policy.max_p95_seconds and p95 and p95 > self.policy.max_p95_seconds
+        )
+
+    def candidates(self, input_tokens: int, improvement_mode: str) -> List[str]:
+        """Modèles par ordre de préférence (le premier est le choix du routeur)
+
+        1. modèles sains de tier suffisant (tier croissant, puis p95 croissant),
+        2. modèles sains de tier inférieur (le plus proche d'abord),
+        3. modèles dégradés, dans le même ordre.
+        """
+        required = self.required_tier(input_tokens, improvement_mode)
+
+        def preference(model: str):
+            tier = self.tiers[model]
+            p95 = self.gateway.stats(model).percentile(0.95) or 0.0
+            if tier >= required:
+                return (0, tier, p95)
+            return (1, -tier, p95)
+
+        ordered = sorted(self.tiers, key=preference)
+        healthy = [model for model in ordered if not self.is_degraded(model)]
+        return healthy + [model for model in ordered if model not in healthy]
+
+    def select(self, input_tokens: int, improvement_mode: str) -> str:
+        """Modèle retenu pour la requête"""
+        model = self.candidates(input_tokens, improvement_mode)[0]
+        logger.info(
+            f"Routage auto: {model} (tokens: {input_tokens}, mode: {improvement_mode}, "
+            f"tier requis: {self.required_tier(input_tokens, improvement_mode)})"
+        )
+        return model
+
+    @staticmethod
+    def _should_fall_back(error: BaseException) -> bool:
+        return isinstance(error, CircuitOpenError) or is_retryable(error)
+
+    def run(self, candidates: List[str], func: Callable[[str], object]):
+        """Exécute ``func(model)`` en se repliant sur le candidat suivant
+
+        Le repli n'a lieu que pour un circuit ouvert ou une erreur transitoire
+        persistante ; les autres erreurs sont relancées telles quelles.
+        """
+        for index, model in enumerate(candidates):
+            try:
+                return func(model)
+            except Exception as error:
+                if index == len(candidates) - 1 or not self._should_fall_back(error):
+                    raise
+                logger.warning(
+                    f"Modèle {model} indisponible ({error}), "
+                    f"repli sur {candidates[index + 1]}"
+                )
+
+    async def run_async(
+        self, candidates: List[str], func: Callable[[str], Awaitable[object]]
+    ):
+        """Variante asyncio de ``run``"""
+        for index, model in enumerate(candidates):
+            try:
+                return await func(model)
+            except Exception as error:
+                if index == len(candidates) - 1 or not self._should_fall_back(error):
+                    raise
+                logger.warning(
+                    f"Modèle {model} indisponible ({error}), "
+                    f"repli sur {candidates[index + 1]}"
+                )
@@ -0,0 +1,432 @@
+"""
+Budget de pages local et déterministe
+Estime le nombre de pages du DOCX produit par CVDocxGenerator et réduit les
+données structurées pour respecter ``max_pages``, sans nouvel appel LLM.
+"""
+
+import copy
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from config.logging_config import setup_logger
+from core.docx_generator import CVDocxGenerator
+from core.prompts import PromptTemplates
+
+# Logger
+logger = setup_logger(__name__, "page_budget.log")
+
+PT_PER_CM = 72 / 2.54
+
+# Gabarit python-docx par défaut : interligne 1,15 (276/240) et 10pt après
+# chaque paragraphe ; hauteur de ligne Calibri ≈ 1,22 × taille de police
+LINE_HEIGHT_FACTOR = 1.15 * 1.22
+DEFAULT_SPACE_AFTER = 10.0
+
+# Largeur moyenne d'un caractère Calibri (en em) : texte courant / majuscules grasses
+CHAR_WIDTH_EM = 0.5
+UPPER_BOLD_CHAR_WIDTH_EM = 0.65
+
+
+@dataclass
+class PageLayout:
+    """Géométrie de page de CVDocxGenerator (en points)
+
+    Format Letter du gabarit python-docx, marges de ``_setup_document`` ; le
+    pied de page (tableau 9pt à 36pt du bord) réduit la zone de texte en bas.
+    """
+
+    page_width: float = 612.0
+    page_height: float = 792.0
+    top_margin: float = 5.57 * PT_PER_CM
+    bottom_margin: float = 0.49 * PT_PER_CM
+    left_margin: float = 1.76 * PT_PER_CM
+    right_margin: float = 1.76 * PT_PER_CM
+    footer_height: float = 36.0 + 9 * LINE_HEIGHT_FACTOR + DEFAULT_SPACE_AFTER
+    bullet_indent: float = 72.0  # Inches(1.0) dans _add_bullet_list
+
+    @property
+    def body_width(self) -> float:
+        return self.page_width - self.left_margin - self.right_margin
+
+    @property
+    def body_height(self) -> float:
+        bottom = max(self.bottom_margin, self.footer_height)
+        return self.page_height - self.top_margin - bottom
+
+
+@dataclass
+class _Block:
+    """Paragraphe rendu : espacements et nombre de lignes"""
+
+    lines: int
+    font_size: float = 12.0
+    space_before: float = 0.0
+    space_after: float = DEFAULT_SPACE_AFTER
+    keep_together: bool = False
+
+    @property
+    def line_height(self) -> float:
+        return self.font_size * LINE_HEIGHT_FACTOR
+
+
+class PageEstimator:
+    """Estime le nombre de pages rendues par CVDocxGenerator
+
+    Reproduit la suite de paragraphes de ``CVDocxGenerator.generate`` (polices,
+    espacements, retraits) et simule leur répartition sur les pages.
+    """
+
+    def __init__(
+        self, target_language: Optional[str] = "fr", layout: Optional[PageLayout] = None
+    ):
+        self.layout = layout or PageLayout()
+        labels = CVDocxGenerator.LABELS
+        self.labels = labels.get(target_language or "fr", labels["fr"])
+
+    def _lines(
+        self,
+        text: str,
+        font_size: float = 12.0,
+        width: Optional[float] = None,
+        char_width_em: float = CHAR_WIDTH_EM,
+    ) -> int:
+        width = width if width is not None else self.layout.body_width
+        chars_per_line = max(1, int(width / (font_size * char_width_em)))
+        return max(1, math.ceil(len(text) / chars_per_line))
+
+    def _section_title(self) -> _Block:
+        return _Block(1, space_before=30, space_after=15, keep_together=True)
+
+    def _bullets(self, items) -> List[_Block]:
+        width = self.layout.body_width - self.layout.bullet_indent
+        return [
+            _Block(self._lines(str(item), width=width), space_after=4) for item in items
+        ]
+
+    def _blocks(self, cv_data: dict) -> List[_Block]:
+        header = cv_data.get("header", {})
+        blocks = [
+            _Block(
+                self._lines(
+                    header.get("title", ""), 20, None, UPPER_BOLD_CHAR_WIDTH_EM
+                ),
+                font_size=20,
+            ),
+            _Block(self._lines(header.get("experience", ""), 20), 20, space_after=20),
+        ]
+
+        # Compétences
+        competences = cv_data.get("competences", {})
+        blocks.append(self._section_title())
+        if competences.get("operationnelles"):
+            blocks.append(_Block(1, space_before=15, space_after=8))
+            blocks.extend(self._bullets(competences["operationnelles"]))
+        if competences.get("techniques"):
+            blocks.append(_Block(1, space_before=15, space_after=8))
+            blocks.extend(self._bullets(_technique_lines(competences["techniques"])))
+
+        # Formations
+        formations = cv_data.get("formations", [])
+        if formations:
+            blocks.append(self._section_title())
+            blocks.extend(self._bullets(_formation_lines(formations)))
+
+        # Expériences
+        experiences = cv_data.get("experiences", [])
+        if experiences:
+            blocks.append(self._section_title())
+        for experience in experiences:
+            blocks.append(
+                _Block(1, 14, space_before=10, space_after=5, keep_together=True)
+            )
+            blocks.append(
+                _Block(
+                    self._lines(
+                        experience.get("title", ""), 14, None, UPPER_BOLD_CHAR_WIDTH_EM
+                    ),
+                    14,
+                    space_after=8,
+                )
+            )
+            if experience.get("context"):
+                text = f"{self.labels['contexte']} : {experience['context']}"
+                blocks.append(_Block(self._lines(text)))
+            if experience.get("activities"):
+                blocks.append(_Block(1, space_before=8))
+                blocks.extend(self._bullets(experience["activities"]))
+            if experience.get("tech_env"):
+                text = f"{self.labels['env_tech']} : {experience['tech_env']}"
+                blocks.append(_Block(self._lines(text), space_before=8, space_after=25))
+
+        return blocks
+
+    def estimate(self, cv_data: dict) -> float:
+        """Nombre de pages estimé (fractionnaire : 1.5 = page 2 à moitié remplie)"""
+        body = self.layout.body_height
+        pages, y = 1, 0.0
+
+        for block in self._blocks(cv_data):
+            height = block.space_before + block.lines * block.line_height
+            if block.keep_together or block.lines == 1:
+                if y > 0 and y + height > body:
+                    pages, y = pages + 1, 0.0
+                y += height
+            else:
+                y += block.space_before
+                for _ in range(block.lines):
+                    if y > 0 and y + block.line_height > body:
+                        pages, y = pages + 1, 0.0
+                    y += block.line_height
+            y = min(y + block.space_after, body)
+
+        return pages - 1 + y / body
+
+    def page_count(self, cv_data: dict) -> int:
+        """Nombre de pages estimé (entier)"""
+        return max(1, math.ceil(self.estimate(cv_data) - 1e-9))
+
+
+def _technique_lines(techniques) -> List[str]:
+    """Lignes « Catégorie : items » telles que rendues par _add_competences"""
+    lines = []
+    for tech in techniques:
+        if isinstance(tech, dict):
+            items = tech.get("items", [])
+            items_str = ", ".join(items) if isinstance(items, list) else str(items)
+            category = tech.get("category", "")
+            lines.append(f"{category} : {items_str}" if category else items_str)
+        else:
+            lines.append(str(tech))
+    return lines
+
+
+def _formation_lines(formations) -> List[str]:
+    """Lignes « année : description » telles que rendues par _add_formations"""
+    lines = []
+    for formation in formations:
+        if isinstance(formation, dict):
+            year = formation.get("year", "")
+            description = formation.get("description", "")
+            lines.append(f"{year} : {description}" if year else description)
+        else:
+            lines.append(str(formation))
+    return lines
+
+
+@dataclass
+class TrimReport:
+    """Bilan de la réduction d'un CV à un budget de pages"""
+
+    max_pages: int
+    pages_before: float
+    pages_after: float = 0.0
+    actions: List[str] = field(default_factory=list)
+
+    @property
+    def fits(self) -> bool:
+        return self.pages_after <= self.max_pages
+
+    def as_dict(self) -> dict:
+        return {
+            "max_pages": self.max_pages,
+            "pages_before": round(self.pages_before, 2),
+            "pages_after": round(self.pages_after, 2),
+            "fits": self.fits,
+            "actions": list(self.actions),
+        }
+
+
+class PageBudgetTrimmer:
+    """Réduit un CV structuré pour tenir dans ``max_pages`` pages
+
+    Applique, dans l'ordre et jusqu'à ce que l'estimation tienne dans le
+    budget, les règles de priorité de la limitation de pages
+    (``PromptTemplates.get_page_limits``) :
+
+    1. activités par expérience (toutes les expériences sont conservées),
+    2. catégories de compétences techniques, classées par niveau
+       (``skills_assessment``),
+    3. formations et compétences opérationnelles,
+
+    puis, si nécessaire, réduit progressivement les activités en partant des
+    expériences les plus anciennes. Déterministe, sans appel LLM.
+
+    ``skills_assessment`` n'est jamais réduit : le DOCX ne l'affiche pas (la
+    réduction ne gagnerait aucune place) et l'interface s'en sert.
+
+    Avec ``keep_operationnelles``, les compétences opérationnelles (entrées
+    d'un pitch spéculatif déjà lancé) sont conservées telles quelles.
+    """
+
+    def __init__(
+        self,
+        target_language: Optional[str] = "fr",
+        layout: Optional[PageLayout] = None,
+        keep_operationnelles: bool = False,
+    ):
+        self.estimator = PageEstimator(target_language, layout)
+        self.keep_operationnelles = keep_operationnelles
+
+    def fit(self, cv_data: dict, max_pages: int) -> Tuple[dict, TrimReport]:
+        """Retourne une copie réduite de ``cv_data`` et le bilan de réduction"""
+        cv_data = copy.deepcopy(cv_data)
+        report = TrimReport(max_pages, self.estimator.estimate(cv_data))
+        report.pages_after = report.pages_before
+        if report.fits:
+            return cv_data, report
+
+        limits = PromptTemplates.get_page_limits(max_pages)
+        levels = _skill_levels(cv_data)
+        steps = [
+            lambda: self._cap_activities(cv_data, limits["activities_per_experience"]),
+            lambda: self._cap_skill_categories(
+                cv_data,
+                limits["skill_categories"],
+                limits["items_per_category"],
+                levels,
+            ),
+            lambda: self._cap_list(cv_data, "formations", limits["formations"]),
+            lambda: self._cap_operationnelles(cv_data, limits["operationnelles"]),
+        ]
+        for step in steps:
+            if self._apply(step, cv_data, report):
+                return cv_data, report
+
+        # Réduction progressive des activités, des expériences les plus anciennes
+        # (fin de liste) vers les plus récentes
+        experiences = cv_data.get("experiences", [])
+        for cap in range(limits["activities_per_experience"] - 1, 0, -1):
+            for experience in reversed(experiences):
+                activities = experience.get("activities")
+                if isinstance(activities, list) and len(activities) > cap:
+                    label = experience.get("company", "")
+                    step = (
+                        lambda e=experience, c=cap, n=label: self._trim(  # noqa: E731
+                            e, "activities", c, f"activités {n}"
+                        )
+                    )
+                    if self._apply(step, cv_data, report):
+                        return cv_data, report
+
+        logger.warning(
+            f"Budget de {max_pages} page(s) non atteint après réduction "
+            f"({report.pages_after:.2f} pages estimées)"
+        )
+        return cv_data, report
+
+    def _apply(self, step, cv_data: dict, report: TrimReport) -> bool:
+        """Applique une étape de réduction ; True si le budget est atteint"""
+        action = step()
+        if action:
+            report.actions.append(action)
+            report.pages_after = self.estimator.estimate(cv_data)
+        return report.fits
+
+    @staticmethod
+    def _trim(container: dict, key: str, limit: int, label: str) -> Optional[str]:
+        values = container.get(key)
+        if not isinstance(values, list) or len(values) <= limit:
+            return None
+        container[key] = values[:limit]
+        return f"{label}: {len(values)} → {limit}"
+
+    def _cap_activities(self, cv_data: dict, limit: int) -> Optional[str]:
+        removed = 0
+        for experience in cv_data.get("experiences", []):
+            activities = experience.get("activities")
+            if isinstance(activities, list) and len(activities) > limit:
+                removed += len(activities) - limit
+                experience["activities"] = activities[:limit]
+        if not removed:
+            return None
+        return f"activités: {limit} max par expérience ({removed} retirées)"
+
+    def _cap_skill_categories(
+        self,
+        cv_data: dict,
+        max_categories: int,
+        max_items: int,
+        levels: Dict[str, int],
+    ) -> Optional[str]:
+        techniques = cv_data.get("competences", {}).get("techniques")
+        if not isinstance(techniques, list):
+            return None
+
+        changed = False
+        for tech in techniques:
+            items = tech.get("items") if isinstance(tech, dict) else None
+            if isinstance(items, list) and len(items) > max_items:
+                tech["items"] = _top_by_level(
+                    items, max_items, lambda item: levels.get(str(item).lower(), 0)
+                )
+                changed = True
+
+        if len(techniques) > max_categories:
+
+            def category_level(tech):
+                items = tech.get("items", []) if isinstance(tech, dict) else []
+                items = items if isinstance(items, list) else [items]
+                return max((levels.get(str(i).lower(), 0) for i in items), default=0)
+
+            cv_data["competences"]["techniques"] = _top_by_level(
+                techniques, max_categories, category_level
+            )
+            changed = True
+
+        return (
+            f"compétences techniques: {max_categories} catégories max"
+            if changed
+            else None
+        )
+
+    def _cap_list(self, cv_data: dict, key: str, limit: int) -> Optional[str]:
+        return self._trim(cv_data, key, limit, key)
+
+    def _cap_operationnelles(self, cv_data: dict, limit: int) -> Optional[str]:
+        competences = cv_data.get("competences")
+        if self.keep_operationnelles or not isinstance(competences, dict):
+            return None
+        return self._trim(
+            competences, "operationnelles", limit, "compétences opérationnelles"
+        )
+
+
+def _skill_levels(cv_data: dict) -> Dict[str, int]:
+    """Niveaux de ``skills_assessment`` indexés par nom (minuscules)"""
+    levels = {}
+    for skill in cv_data.get("skills_assessment") or []:
+        if isinstance(skill, dict) and skill.get("skill"):
+            try:
+                levels[str(skill["skill"]).lower()] = int(skill.get("level", 0))
+            except (TypeError, ValueError):
+                continue
+    return levels
+
+
+def _top_by_level(values: list, limit: int, score) -> list:
+    """Garde les ``limit`` valeurs de plus haut niveau, dans leur ordre d'origine"""
+    ranked = sorted(enumerate(values), key=lambda iv: (-score(iv[1]), iv[0]))
+    return [value for _, value in sorted(ranked[:limit], key=lambda iv: iv[0])]
+
+
+def fit_to_page_budget(
+    cv_data: dict,
+    max_pages: int,
+    target_language: Optional[str] = "fr",
+    keep_operationnelles: bool = False,
+) -> Tuple[dict, TrimReport]:
+    """Réduit ``cv_data`` pour tenir dans ``max_pages`` pages (copie, sans appel LLM)
+
+    Args:
+        cv_data: Données structurées du CV
+        max_pages: Nombre maximum de pages
+        target_language: Langue des libellés du DOCX (fr, en, it, es)
+        keep_operationnelles: Ne pas réduire les compétences opérationnelles
+
+    Returns:
+        Tuple[dict, TrimReport]: Données réduites et bilan de la réduction
+    """
+    return PageBudgetTrimmer(
+        target_language, keep_operationnelles=keep_operationnelles
+    ).fit(cv_data, max_pages)
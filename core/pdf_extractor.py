@@ -4,22 +4,31 @@ Extrait le texte et la structure d'un fichier PDF pour traitement par LLM
 """
 
 from pathlib import Path
-from typing import Union
+from typing import Callable, Optional, Union
 
 import pdfplumber
 
 from config.logging_config import setup_logger
+from core.events import ProgressEvent
 
 # Logger
 logger = setup_logger(__name__, "pdf_extractor.log")
 
 
-def extract_pdf_content(pdf_path: Union[str, Path]) -> str:
+def extract_pdf_content(
+    pdf_path: Union[str, Path],
+    page_separator: str = "\n\n",
+    on_event: Optional[Callable[[ProgressEvent], None]] = None,
+) -> str:
     """
     Extrait le contenu textuel d'un fichier PDF.
 
     Args:
         pdf_path: Chemin vers le fichier PDF (str ou Path)
+        page_separator: Séparateur inséré entre les pages (``"\\f"`` pour
+            permettre la détection des en-têtes/pieds de page répétés)
+        on_event: Reçoit l'événement ``pdf_extracted`` (pages, caractères)
+            en fin d'extraction (optionnel)
 
     Returns:
         str: Texte extrait du PDF
@@ -41,7 +50,8 @@ def extract_pdf_content(pdf_path: Union[str, Path]) -> str:
         text_content = []
 
         with pdfplumber.open(pdf_path) as pdf:
-            print(f"  Nombre de pages : {len(pdf.pages)}")
+            page_count = len(pdf.pages)
+            logger.debug(f"Nombre de pages : {page_count}")
 
             for i, page in enumerate(pdf.pages, 1):
                 # Extraction du texte avec préservation de la mise en page
@@ -53,11 +63,18 @@ def extract_pdf_content(pdf_path: Union[str, Path]) -> str:
                 else:
                     logger.warning(f"Page {i}: Aucun texte détecté")
 
-        full_text = "\n\n".join(text_content)
+        full_text = page_separator.join(text_content)
 
         if not full_text.strip():
             raise ValueError("Aucun contenu textuel n'a pu être extrait du PDF")
 
+        if on_event is not None:
+            on_event(
+                ProgressEvent(
+                    "pdf_extracted",
+                    data={"pages": page_count, "characters": len(full_text)},
+                )
+            )
         return full_text
 
     except Exception as e:
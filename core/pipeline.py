@@ -0,0 +1,239 @@
+"""
+Exécution des étapes de conversion sous forme de graphe de dépendances
+Les étapes indépendantes (extraction CV / appel d'offres, rendu DOCX / pitch)
+s'exécutent en parallèle et le chemin critique est mesuré à chaque conversion.
+"""
+
+import asyncio
+import contextvars
+import inspect
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class StageTiming:
+    """Horodatage d'une étape (secondes relatives au début du pipeline)"""
+
+    name: str
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class PipelineReport:
+    """Bilan d'exécution d'un graphe d'étapes"""
+
+    timings: Dict[str, StageTiming] = field(default_factory=dict)
+    critical_path: List[str] = field(default_factory=list)
+    critical_path_time: float = 0.0
+    wall_time: float = 0.0
+
+    def as_dict(self) -> dict:
+        """Représentation sérialisable (logs, réponse API)"""
+        return {
+            "stages": {
+                name: round(timing.duration, 4) for name, timing in self.timings.items()
+            },
+            "critical_path": list(self.critical_path),
+            "critical_path_time": round(self.critical_path_time, 4),
+            "wall_time": round(self.wall_time, 4),
+        }
+
+
+class StageGraph:
+    """Petit graphe d'étapes avec dépendances explicites
+
+    Chaque étape est une fonction recevant en arguments nommés les résultats
+    des étapes dont elle dépend. Les étapes dont les dépendances sont
+    satisfaites s'exécutent en parallèle (threads en mode synchrone, tâches
+    asyncio en mode asynchrone).
+
+    Exemple:
+        graph = StageGraph()
+        graph.add_stage("cv_text", lambda: extract(path))
+        graph.add_stage("cv_data", lambda cv_text: llm(cv_text), depends_on=["cv_text"])
+        results = graph.run()
+
+    Args:
+        listener: Appelé au début (``listener(nom, None)``) et à la fin
+            (``listener(nom, timing)``) de chaque étape (optionnel)
+    """
+
+    def __init__(
+        self, listener: Optional[Callable[[str, Optional[StageTiming]], None]] = None
+    ):
+        self._stages: Dict[str, Tuple[Callable, Tuple[str, ...]]] = {}
+        self.report = PipelineReport()
+        self.listener = listener
+
+    def _started(self, name: str) -> None:
+        if self.listener is not None:
+            self.listener(name, None)
+
+    def _ended(self, name: str, start: float, end: float) -> None:
+        timing = StageTiming(name, start, end)
+        self.report.timings[name] = timing
+        if self.listener is not None:
+            self.listener(name, timing)
+
+    def add_stage(
+        self, name: str, func: Callable, depends_on: Iterable[str] = ()
+    ) -> "StageGraph":
+        """Ajoute une étape au graphe
+
+        Args:
+            name: Nom unique de l'étape (sert aussi de nom d'argument aux dépendants)
+            func: Fonction (ou coroutine en mode asynchrone) à exécuter
+            depends_on: Noms des étapes dont le résultat est requis
+
+        Returns:
+            StageGraph: Le graphe (chaînage)
+        """
+        if name in self._stages:
+            raise ValueError(f"Étape déjà définie: {name}")
+
+        deps = tuple(depends_on)
+        for dep in deps:
+            if dep not in self._stages:
+                raise ValueError(f"Dépendance inconnue pour '{name}': {dep}")
+
+        self._stages[name] = (func, deps)
+        return self
+
+    def run(self, report: Optional[PipelineReport] = None) -> Dict[str, Any]:
+        """Exécute le graphe avec un pool de threads
+
+        Args:
+            report: Rapport à compléter (optionnel, sinon ``self.report``)
+
+        Returns:
+            dict: Résultat de chaque étape, indexé par nom
+
+        Raises:
+            Exception: La première erreur levée par une étape
+        """
+        if report is not None:
+            self.report = report
+
+        origin = time.perf_counter()
+        results: Dict[str, Any] = {}
+        pending = dict(self._stages)
+        running = {}
+
+        def timed(name, func, kwargs):
+            self._started(name)
+            start = time.perf_counter() - origin
+            try:
+                return func(**kwargs)
+            finally:
+                self._ended(name, start, time.perf_counter() - origin)
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self._stages))) as executor:
+            while pending or running:
+                for name in [
+                    n
+                    for n, (_, deps) in pending.items()
+                    if all(d in results for d in deps)
+                ]:
+                    func, deps = pending.pop(name)
+                    kwargs = {dep: results[dep] for dep in deps}
+                    # Chaque étape s'exécute dans une copie du contexte appelant
+                    context = contextvars.copy_context()
+                    future = executor.submit(context.run, timed, name, func, kwargs)
+                    running[future] = name
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        for other in running:
+                            other.cancel()
+                        raise error
+                    results[name] = future.result()
+
+        self._finalize(origin)
+        return results
+
+    async def run_async(
+        self, report: Optional[PipelineReport] = None
+    ) -> Dict[str, Any]:
+        """Exécute le graphe dans la boucle asyncio courante
+
+        Les coroutines sont attendues directement ; les fonctions synchrones
+        (bloquantes) sont exécutées dans le pool de threads par défaut.
+
+        Args:
+            report: Rapport à compléter (optionnel, sinon ``self.report``)
+
+        Returns:
+            dict: Résultat de chaque étape, indexé par nom
+        """
+        if report is not None:
+            self.report = report
+
+        loop = asyncio.get_running_loop()
+        origin = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def execute(name, func, deps):
+            dep_values = await asyncio.gather(*(tasks[dep] for dep in deps))
+            kwargs = dict(zip(deps, dep_values))
+            self._started(name)
+            start = time.perf_counter() - origin
+            try:
+                if inspect.iscoroutinefunction(func):
+                    return await func(**kwargs)
+                context = contextvars.copy_context()
+                return await loop.run_in_executor(
+                    None, lambda: context.run(func, **kwargs)
+                )
+            finally:
+                self._ended(name, start, time.perf_counter() - origin)
+
+        # Les étapes sont déclarées dans l'ordre topologique (cf. add_stage)
+        for name, (func, deps) in self._stages.items():
+            tasks[name] = asyncio.ensure_future(execute(name, func, deps))
+
+        try:
+            values = await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        self._finalize(origin)
+        return dict(zip(tasks.keys(), values))
+
+    def _finalize(self, origin: float) -> None:
+        """Calcule le chemin critique et la durée totale"""
+        self.report.wall_time = time.perf_counter() - origin
+        self.report.critical_path = self._critical_path()
+        self.report.critical_path_time = sum(
+            self.report.timings[name].duration for name in self.report.critical_path
+        )
+
+    def _critical_path(self) -> List[str]:
+        """Remonte depuis l'étape terminée en dernier via la dépendance la plus tardive"""
+        timings = self.report.timings
+        candidates = [name for name in self._stages if name in timings]
+        if not candidates:
+            return []
+
+        current = max(candidates, key=lambda n: timings[n].end)
+        path = [current]
+        while True:
+            deps = [d for d in self._stages[current][1] if d in timings]
+            if not deps:
+                break
+            current = max(deps, key=lambda d: timings[d].end)
+            path.append(current)
+
+        return list(reversed(path))
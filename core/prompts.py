@@ -3,6 +3,8 @@ Templates de prompts pour l'interaction avec l'API OpenAI
 Centralise tous les prompts utilisés pour l'extraction et la génération
 """
 
+import hashlib
+import json
 from typing import Optional
 
 
@@ -12,6 +14,15 @@ class PromptTemplates:
     # Mappage des langues
     LANGUAGE_NAMES = {"en": "ANGLAIS", "it": "ITALIEN", "es": "ESPAGNOL"}
 
+    @staticmethod
+    def fingerprint(*texts: str) -> str:
+        """Empreinte courte de textes de prompt rendus
+
+        Incluse dans les clés de cache : toute modification d'un template
+        invalide automatiquement les entrées produites avec l'ancienne version.
+        """
+        return hashlib.sha256("\x00".join(texts).encode()).hexdigest()[:16]
+
     @staticmethod
     def get_translation_instruction(target_language: Optional[str]) -> str:
         """Génère l'instruction de traduction si nécessaire"""
@@ -29,15 +40,33 @@ class PromptTemplates:
 - Les dates restent au format d'origine
 """
 
+    @staticmethod
+    def get_page_limits(max_pages: int) -> dict:
+        """Plafonds de contenu associés à une limite de pages
+
+        Partagés par l'instruction envoyée au LLM et par le réducteur local
+        (``core.page_budget``).
+        """
+        compact = max_pages <= 2
+        return {
+            "activities_per_experience": 3 if compact else 4,
+            "skill_categories": 4 if compact else 6,
+            "items_per_category": 8,
+            "skills_assessment": 8 if compact else 10,
+            "formations": 3,
+            "operationnelles": 6,
+        }
+
     @staticmethod
     def get_page_limitation_instruction(max_pages: Optional[int]) -> str:
         """Génère l'instruction de limitation de pages"""
         if not max_pages:
             return ""
 
-        max_activities_per_exp = 3 if max_pages <= 2 else 4
-        max_skills_categories = 4 if max_pages <= 2 else 6
-        max_skills_assessment = 8 if max_pages <= 2 else 10
+        limits = PromptTemplates.get_page_limits(max_pages)
+        max_activities_per_exp = limits["activities_per_experience"]
+        max_skills_categories = limits["skill_categories"]
+        max_skills_assessment = limits["skills_assessment"]
 
         return f"""
 🚨 CONTRAINTE ABSOLUE : Le CV final NE DOIT PAS dépasser {max_pages} page(s) au format DOCX.
@@ -103,30 +132,27 @@ Analyse le texte du CV suivant, AMÉLIORE le contenu (reformule, corrige les fau
 Analyse le texte du CV suivant et retourne un JSON structuré avec EXACTEMENT ce format :
 {translation_instruction}"""
 
-    @staticmethod
-    def get_json_schema() -> str:
-        """Retourne le schéma JSON attendu"""
-        return """
-{
-    "header": {
+    # Blocs du schéma JSON verbeux, dans l'ordre par défaut
+    JSON_SCHEMA_FIELDS = {
+        "header": """    "header": {
         "name": "Nom complet",
         "title": "Titre du poste",
         "experience": "X ans d'expérience (OBLIGATOIRE - extrais ou calcule depuis les expériences)"
-    },
-    "suggested_tjm": 500,
-    "skills_assessment": [
+    }""",
+        "suggested_tjm": """    "suggested_tjm": 500""",
+        "skills_assessment": """    "skills_assessment": [
         {"skill": "Nom de la technologie/méthodologie", "level": 85}
-    ],
-    "competences": {
+    ]""",
+        "competences": """    "competences": {
         "operationnelles": ["liste des compétences opérationnelles"],
         "techniques": [
             {"category": "Nom de la catégorie", "items": ["tech1", "tech2", "tech3"]}
         ]
-    },
-    "formations": [
+    }""",
+        "formations": """    "formations": [
         {"year": "année", "description": "description de la formation"}
-    ],
-    "experiences": [
+    ]""",
+        "experiences": """    "experiences": [
         {
             "company": "Entreprise / Société (Ville)",
             "period": "Période",
@@ -135,10 +161,91 @@ Analyse le texte du CV suivant et retourne un JSON structuré avec EXACTEMENT ce
             "activities": ["liste des activités"],
             "tech_env": "Environnement technique"
         }
-    ]
-}
+    ]""",
+    }
+
+    # Blocs du schéma compact, dans l'ordre par défaut
+    COMPACT_SCHEMA_FIELDS = {
+        "h": """    "h": ["Nom complet", "Titre du poste", "X ans d'expérience (OBLIGATOIRE - extrais ou calcule depuis les expériences)"]""",
+        "tjm": """    "tjm": 500""",
+        "sa": """    "sa": [["Nom de la technologie/méthodologie", 85]]""",
+        "op": """    "op": ["liste des compétences opérationnelles"]""",
+        "te": """    "te": [["Nom de la catégorie", ["tech1", "tech2", "tech3"]]]""",
+        "f": """    "f": [["année", "description de la formation"]]""",
+        "x": """    "x": [["Entreprise / Société (Ville)", "Période", "Titre du poste", "Texte du contexte", ["liste des activités"], "Environnement technique"]]""",
+    }
+
+    # Ordre « pitch d'abord » des réponses en streaming : les entrées du pitch
+    # (en-tête, compétences opérationnelles, expériences) sont générées en
+    # premier (cf. core.streaming)
+    PITCH_FIRST_ORDER = (
+        "header",
+        "competences",
+        "experiences",
+        "suggested_tjm",
+        "skills_assessment",
+        "formations",
+    )
+    COMPACT_PITCH_FIRST_ORDER = ("h", "op", "te", "x", "tjm", "sa", "f")
+
+    @staticmethod
+    def _schema_body(fields: dict, order) -> str:
+        return "{\n" + ",\n".join(fields[key] for key in order) + "\n}"
+
+    @staticmethod
+    def get_json_schema(pitch_first: bool = False) -> str:
+        """Retourne le schéma JSON attendu
+
+        ``pitch_first`` place les entrées du pitch en tête (streaming).
+        """
+        order = (
+            PromptTemplates.PITCH_FIRST_ORDER
+            if pitch_first
+            else PromptTemplates.JSON_SCHEMA_FIELDS
+        )
+        schema = PromptTemplates._schema_body(PromptTemplates.JSON_SCHEMA_FIELDS, order)
+        return f"\n{schema}\n\n" + PromptTemplates.get_json_rules()
+
+    @staticmethod
+    def get_compact_json_schema(pitch_first: bool = False) -> str:
+        """Schéma JSON compact (clés courtes, tableaux à positions fixes)
+
+        Réduit les tokens générés ; la réponse est ramenée à la forme
+        canonique par ``core.compact_schema.expand_cv_data``.
+        """
+        order = (
+            PromptTemplates.COMPACT_PITCH_FIRST_ORDER
+            if pitch_first
+            else PromptTemplates.COMPACT_SCHEMA_FIELDS
+        )
+        schema = PromptTemplates._schema_body(
+            PromptTemplates.COMPACT_SCHEMA_FIELDS, order
+        )
+        return (
+            f"\n{schema}\n"
+            + PromptTemplates.get_compact_legend()
+            + PromptTemplates.get_json_rules()
+        )
 
-RÈGLES IMPORTANTES : 
+    @staticmethod
+    def get_compact_legend() -> str:
+        """Correspondance entre le format compact et les champs des règles"""
+        return """
+FORMAT COMPACT (respecte EXACTEMENT l'ordre des positions dans chaque tableau) :
+- "h" = [name, title, experience] (header)
+- "tjm" = suggested_tjm
+- "sa" = skills_assessment, chaque élément = [skill, level]
+- "op" = compétences opérationnelles
+- "te" = compétences techniques, chaque élément = [category, items]
+- "f" = formations, chaque élément = [year, description]
+- "x" = experiences, chaque élément = [company, period, title, context, activities, tech_env]
+
+"""
+
+    @staticmethod
+    def get_json_rules() -> str:
+        """Règles de remplissage communes aux schémas verbeux et compact"""
+        return """RÈGLES IMPORTANTES : 
 - "experience" dans header est OBLIGATOIRE : si le CV mentionne "X ans d'expérience", utilise cette valeur. Sinon, calcule approximativement depuis les dates des expériences professionnelles
 - "suggested_tjm" : Suggère un Taux Journalier Moyen (TJM) en euros basé sur :
   * Le niveau d'expérience (junior: 350-450€, confirmé: 450-550€, senior: 550-650€, expert: 650-850€)
@@ -197,17 +304,12 @@ INSTRUCTIONS D'AMÉLIORATION CIBLÉE:
 """
 
     @staticmethod
-    def build_cv_extraction_prompt(
-        pdf_text: str,
+    def get_effective_mode(
         improve_content: bool,
         improvement_mode: str,
         job_offer_content: Optional[str] = None,
-        max_pages: Optional[int] = None,
-        target_language: Optional[str] = None,
     ) -> str:
-        """Construit le prompt complet pour l'extraction de CV"""
-
-        # Déterminer le mode effectif
+        """Détermine le mode d'amélioration effectif (none, basic, targeted)"""
         effective_mode = (
             improvement_mode
             if (improve_content or improvement_mode != "none")
@@ -215,6 +317,47 @@ INSTRUCTIONS D'AMÉLIORATION CIBLÉE:
         )
         if effective_mode == "targeted" and not job_offer_content:
             effective_mode = "basic" if improve_content else "none"
+        return effective_mode
+
+    @staticmethod
+    def get_fused_pitch_rule(pitch: bool, targeted: bool = False) -> str:
+        """Règle demandant le pitch dans la réponse d'extraction (mode fusionné)
+
+        Mêmes consignes que ``build_pitch_prompt`` ; chaîne vide hors mode
+        fusionné (prompt inchangé).
+        """
+        if not pitch:
+            return ""
+        focus = (
+            "mettant en avant les compétences et expériences EN LIEN DIRECT avec les exigences de l'appel d'offres et montrant comment le candidat répond aux besoins du client"
+            if targeted
+            else "mettant en valeur l'expérience, les compétences clés et la valeur ajoutée"
+        )
+        return f"""- Renseigne dans le JSON une clé "pitch" : présentation professionnelle et concise du candidat à un client (150-200 mots maximum), rédigée à la 3ème personne, percutante, {focus}, en texte simple sans introduction ni conclusion, dans la langue du CV produit
+"""
+
+    @staticmethod
+    def build_cv_extraction_prompt(
+        pdf_text: str,
+        improve_content: bool,
+        improvement_mode: str,
+        job_offer_content: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        target_language: Optional[str] = None,
+        compact: bool = False,
+        pitch: bool = False,
+        pitch_first: bool = False,
+    ) -> str:
+        """Construit le prompt complet pour l'extraction de CV
+
+        ``compact`` demande le schéma de sortie compact (moins de tokens générés),
+        ``pitch`` le pitch de présentation dans la même réponse (mode fusionné),
+        ``pitch_first`` les entrées du pitch en tête de réponse (streaming).
+        """
+
+        effective_mode = PromptTemplates.get_effective_mode(
+            improve_content, improvement_mode, job_offer_content
+        )
 
         # Construire le prompt
         translation_instruction = PromptTemplates.get_translation_instruction(
@@ -224,47 +367,220 @@ INSTRUCTIONS D'AMÉLIORATION CIBLÉE:
             effective_mode, translation_instruction
         )
         page_limitation = PromptTemplates.get_page_limitation_instruction(max_pages)
-        json_schema = PromptTemplates.get_json_schema()
+        json_schema = (
+            PromptTemplates.get_compact_json_schema(pitch_first)
+            if compact
+            else PromptTemplates.get_json_schema(pitch_first)
+        )
         improvement_rules = PromptTemplates.get_improvement_rules(
             effective_mode, job_offer_content
         )
+        pitch_rule = PromptTemplates.get_fused_pitch_rule(
+            pitch, effective_mode == "targeted" and bool(job_offer_content)
+        )
 
         final_prompt = f"""{base_prompt}
 {page_limitation}
 {json_schema}
 {improvement_rules}
-- Retourne UNIQUEMENT le JSON, sans texte avant ou après
+{pitch_rule}- Retourne UNIQUEMENT le JSON, sans texte avant ou après
 
 Texte du CV :
 {pdf_text}"""
 
         return final_prompt
 
+    @staticmethod
+    def build_cv_transformation_prompt(
+        cv_json: str,
+        improvement_mode: str,
+        job_offer_content: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        target_language: Optional[str] = None,
+        compact: bool = False,
+        pitch: bool = False,
+    ) -> str:
+        """Construit le prompt de transformation d'un CV déjà structuré
+
+        Seconde étape appliquée à l'extraction canonique (mode "none") :
+        amélioration, traduction et condensation travaillent sur le JSON
+        compact plutôt que sur le texte brut du PDF.
+
+        Args:
+            cv_json: Données structurées du CV (JSON compact)
+            improvement_mode: Mode d'amélioration effectif (none, basic, targeted)
+            job_offer_content: Contenu de l'appel d'offres (mode targeted)
+            max_pages: Nombre maximum de pages (optionnel)
+            target_language: Langue cible (optionnel)
+            compact: JSON d'entrée et de sortie au format compact
+            pitch: (Ré)écrire le pitch de présentation dans la même réponse
+        """
+        translation_instruction = PromptTemplates.get_translation_instruction(
+            target_language
+        )
+        page_limitation = PromptTemplates.get_page_limitation_instruction(max_pages)
+        legend = PromptTemplates.get_compact_legend() if compact else ""
+        pitch_rule = PromptTemplates.get_fused_pitch_rule(
+            pitch, improvement_mode == "targeted" and bool(job_offer_content)
+        )
+
+        if improvement_mode == "none":
+            improvement_rules = """
+- NE MODIFIE PAS le fond du contenu : n'applique que les transformations demandées ci-dessus
+- Préserve le formatage, les majuscules et la ponctuation originaux
+"""
+        else:
+            improvement_rules = PromptTemplates.get_improvement_rules(
+                improvement_mode, job_offer_content
+            )
+
+        return f"""Tu es un expert en rédaction de CV professionnels.
+Les données ci-dessous sont l'extraction fidèle d'un CV au format JSON. Produis une nouvelle version de ce JSON en appliquant les transformations demandées.
+{translation_instruction}
+{page_limitation}{legend}
+
+RÈGLES :
+- Conserve EXACTEMENT la même structure JSON (mêmes clés, mêmes types)
+- Conserve les informations factuelles (dates, entreprises, diplômes), n'invente rien
+{improvement_rules}
+{pitch_rule}- Retourne UNIQUEMENT le JSON, sans texte avant ou après
+
+Données du CV (JSON) :
+{cv_json}"""
+
+    SECTION_RULES = {
+        "header": """- "experience" dans header est OBLIGATOIRE : si le CV mentionne "X ans d'expérience", utilise cette valeur. Sinon, calcule approximativement depuis les périodes des expériences fournies""",
+        "suggested_tjm": """- "suggested_tjm" : Suggère un Taux Journalier Moyen (TJM) en euros réaliste selon le niveau d'expérience (junior: 350-450€, confirmé: 450-550€, senior: 550-650€, expert: 650-850€) et la rareté des compétences""",
+        "skills_assessment": """- "skills_assessment" : évalue le niveau de maîtrise (0-100) des 8-12 compétences techniques principales""",
+        "competences": """- Pour les compétences techniques, groupe-les par catégorie avec "category" et "items" comme array""",
+        "experiences": """- "period" doit TOUJOURS être au format "{Mois} {Année} à {Mois} {Année}" avec le mois en toutes lettres avec majuscule (ex: "Septembre 2019 à Octobre 2021"), "à aujourd'hui" si l'expérience est en cours
+- "company" contient UNIQUEMENT le nom de l'entreprise et la ville entre parenthèses, "title" UNIQUEMENT le titre du poste
+- Le texte est un EXTRAIT de la liste des expériences : extrais toutes les expériences présentes, dans l'ordre, sans en inventer""",
+    }
+
+    @staticmethod
+    def build_section_extraction_prompt(
+        section_text: str, keys: tuple, context: str = ""
+    ) -> str:
+        """Construit le prompt d'extraction d'une section d'un CV long
+
+        Le CV est découpé en sections (profil/compétences, formations, blocs
+        d'expériences) extraites en parallèle : chaque prompt ne demande que
+        les clés du schéma couvertes par sa section.
+
+        Args:
+            section_text: Texte de la section
+            keys: Clés de ``JSON_SCHEMA_FIELDS`` à extraire (cf. ``core.long_cv``)
+            context: Informations complémentaires issues du reste du CV (optionnel)
+        """
+        # Mêmes blocs que le schéma complet, restreints aux clés de la section
+        schema = PromptTemplates._schema_body(PromptTemplates.JSON_SCHEMA_FIELDS, keys)
+        rules = "\n".join(
+            PromptTemplates.SECTION_RULES[key]
+            for key in keys
+            if key in PromptTemplates.SECTION_RULES
+        )
+        context_block = (
+            f"\nInformations complémentaires (reste du CV) :\n{context}\n"
+            if context
+            else ""
+        )
+
+        return f"""Tu es un expert en extraction de données de CV.
+Analyse l'extrait de CV suivant et retourne un JSON structuré avec EXACTEMENT ce format :
+{schema}
+
+RÈGLES IMPORTANTES :
+{rules}
+{PromptTemplates.get_improvement_rules("none", None)}
+- Retourne UNIQUEMENT le JSON, sans texte avant ou après
+{context_block}
+Extrait du CV :
+{section_text}"""
+
+    # Relance d'une réponse coupée par la limite de tokens
+    CONTINUATION_PROMPT = """Ta réponse précédente a été interrompue (limite de longueur atteinte).
+Continue-la EXACTEMENT à partir du dernier caractère produit, sans rien répéter ni ajouter de texte ou de balise : ta réponse sera concaténée telle quelle à la précédente."""
+
+    @staticmethod
+    def build_fragment_correction_prompt(fragments: dict, expected: dict) -> str:
+        """Demande de correction des seuls fragments invalides d'une réponse
+
+        Ni le texte du CV ni le prompt d'extraction ne sont renvoyés : seuls
+        les fragments qui ne respectent pas le schéma, avec leur forme attendue.
+
+        Args:
+            fragments: Chemin du fragment -> valeur reçue
+            expected: Chemin du fragment -> forme attendue (valeurs par défaut)
+        """
+        blocks = "\n\n".join(
+            f"Fragment {path}\n"
+            f"Reçu : {json.dumps(value, ensure_ascii=False)}\n"
+            f"Forme attendue : {json.dumps(expected[path], ensure_ascii=False)}"
+            for path, value in fragments.items()
+        )
+        return f"""Les fragments JSON suivants, extraits d'un CV structuré, ne respectent pas la forme attendue.
+Corrige chaque fragment pour qu'il ait EXACTEMENT la forme attendue (mêmes clés, mêmes types), en conservant les informations reçues, sans en inventer.
+
+{blocks}
+
+Retourne UNIQUEMENT un JSON de la forme {{"fragments": {{"<chemin du fragment>": <fragment corrigé>}}}}"""
+
+    @staticmethod
+    def build_json_syntax_correction_prompt(content: str) -> str:
+        """Demande de correction de la seule syntaxe d'une réponse irréparable"""
+        return f"""La réponse JSON suivante est syntaxiquement invalide.
+Corrige UNIQUEMENT la syntaxe JSON (guillemets, virgules, crochets) sans modifier, ajouter ni retirer d'information.
+Retourne UNIQUEMENT le JSON corrigé, sans texte avant ou après.
+
+{content}"""
+
+    @staticmethod
+    def pitch_inputs(cv_data: dict, job_offer_content: Optional[str] = None) -> dict:
+        """Projection des seules données lues par le prompt de pitch
+
+        Sert à la fois à construire le prompt et à calculer la clé de cache :
+        les champs non repris (évaluation, TJM, formations...) ne changent pas
+        le pitch et ne doivent pas invalider le cache.
+        """
+        header = cv_data.get("header") or {}
+        competences = cv_data.get("competences") or {}
+        return {
+            "name": header.get("name", ""),
+            "title": header.get("title", ""),
+            "experience": header.get("experience", ""),
+            "operationnelles": list(competences.get("operationnelles") or []),
+            # 3 premières expériences
+            "experiences": [
+                {"company": exp.get("company", ""), "title": exp.get("title", "")}
+                for exp in (cv_data.get("experiences") or [])[:3]
+            ],
+            "job_offer": job_offer_content[:2000] if job_offer_content else None,
+        }
+
     @staticmethod
     def build_pitch_prompt(
         cv_data: dict, job_offer_content: Optional[str] = None
     ) -> str:
         """Construit le prompt pour la génération de pitch"""
 
-        header = cv_data.get("header", {})
-        competences = cv_data.get("competences", {})
-        experiences = cv_data.get("experiences", [])
+        inputs = PromptTemplates.pitch_inputs(cv_data, job_offer_content)
 
         # Préparer le contexte
         context = f"""
-Profil : {header.get('name', '')}
-Titre : {header.get('title', '')}
-Expérience : {header.get('experience', '')}
+Profil : {inputs['name']}
+Titre : {inputs['title']}
+Expérience : {inputs['experience']}
 
-Compétences opérationnelles : {', '.join(competences.get('operationnelles', []))}
+Compétences opérationnelles : {', '.join(inputs['operationnelles'])}
 
 Expériences récentes :
 """
-        for exp in experiences[:3]:  # 3 premières expériences
-            context += f"- {exp.get('company', '')} : {exp.get('title', '')}\n"
+        for exp in inputs["experiences"]:
+            context += f"- {exp['company']} : {exp['title']}\n"
 
         # Prompt selon contexte
-        if job_offer_content:
+        if inputs["job_offer"]:
             return f"""Tu es un consultant RH expert. Rédige un pitch professionnel et concis (150-200 mots maximum) pour présenter ce candidat à un client DANS LE CONTEXTE DE L'APPEL D'OFFRES CI-DESSOUS.
 
 Le pitch doit :
@@ -279,7 +595,7 @@ Données du profil :
 {context}
 
 Appel d'offres / Mission :
-{job_offer_content[:2000]}
+{inputs['job_offer']}
 
 Rédige le pitch directement, sans introduction ni conclusion. Concentre-toi sur l'adéquation entre le profil et la mission."""
 
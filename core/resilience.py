@@ -0,0 +1,438 @@
+"""
+Résilience des appels LLM
+Nouvelles tentatives avec backoff exponentiel et jitter (respect de Retry-After),
+disjoncteur (circuit breaker) par modèle et requête dupliquée optionnelle
+(hedging) au-delà d'un percentile de latence. Métriques par modèle.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+import openai
+
+from config.logging_config import setup_logger
+from config.settings import get_settings
+
+# Logger
+logger = setup_logger(__name__, "resilience.log")
+
+# Statuts HTTP transitoires (réessayables)
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# Nombre minimal de latences observées avant d'activer le hedging
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+
+class CircuitOpenError(Exception):
+    """Le circuit du modèle est ouvert : appel refusé sans solliciter l'API"""
+
+
+@dataclass
+class ResiliencePolicy:
+    """Paramètres de la couche de résilience"""
+
+    timeout: float = 90.0
+    budget: float = 240.0
+    max_retries: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+    hedge_percentile: float = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "ResiliencePolicy":
+        settings = get_settings()
+        return cls(
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            budget=settings.LLM_CALL_BUDGET_SECONDS,
+            max_retries=settings.LLM_MAX_RETRIES,
+            base_delay=settings.LLM_RETRY_BASE_DELAY,
+            max_delay=settings.LLM_RETRY_MAX_DELAY,
+            breaker_failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+            breaker_reset_timeout=settings.LLM_BREAKER_RESET_SECONDS,
+            hedge_percentile=settings.LLM_HEDGE_PERCENTILE,
+        )
+
+
+class CircuitBreaker:
+    """Disjoncteur d'un modèle : fermé → ouvert après N échecs → semi-ouvert"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Autorise un appel (un seul appel d'essai quand le délai est écoulé)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if (
+                self.state == self.OPEN
+                and time.monotonic() - self.opened_at >= self.reset_timeout
+            ):
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self, transient: bool = True) -> bool:
+        """Enregistre un échec ; True si le circuit vient de s'ouvrir
+
+        Une erreur non transitoire (requête invalide...) prouve que l'endpoint
+        répond : elle referme un circuit semi-ouvert sans compter d'échec.
+        """
+        with self._lock:
+            if not transient:
+                if self.state == self.HALF_OPEN:
+                    self.state = self.CLOSED
+                    self.failures = 0
+                return False
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def abandon(self) -> None:
+        """Appel d'essai interrompu (annulation) : le circuit est rouvert"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+@dataclass
+class ModelStats:
+    """Métriques de résilience d'un modèle"""
+
+    calls: int = 0
+    successes: int = 0
+    failures: int = 0
+    retries: int = 0
+    short_circuited: int = 0
+    breaker_opens: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def as_dict(self) -> dict:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "short_circuited": self.short_circuited,
+            "breaker_opens": self.breaker_opens,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "latency_p50": round(p50, 3) if p50 is not None else None,
+            "latency_p95": round(p95, 3) if p95 is not None else None,
+        }
+
+
+# Erreurs httpx levées telles quelles par le SDK pendant la lecture d'une
+# réponse streamée (connexion coupée en cours de flux)
+_STREAM_TRANSPORT_ERRORS = (
+    httpx.NetworkError,
+    httpx.TimeoutException,
+    httpx.RemoteProtocolError,
+)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Erreur transitoire de l'endpoint (réseau, délai, 429, 5xx)"""
+    if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    if isinstance(error, _STREAM_TRANSPORT_ERRORS):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS
+    return isinstance(error, (TimeoutError, asyncio.TimeoutError))
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Délai demandé par le serveur (en-têtes retry-after-ms / Retry-After)"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class ResilientLLM:
+    """Exécute les appels LLM avec la politique de résilience
+
+    ``call`` / ``call_async`` reçoivent le nom du modèle (disjoncteur et
+    métriques par modèle) et une fonction sans argument effectuant l'appel.
+    """
+
+    def __init__(self, policy: Optional[ResiliencePolicy] = None):
+        self.policy = policy or ResiliencePolicy()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stats: Dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        with self._lock:
+            if model not in self._breakers:
+                self._breakers[model] = CircuitBreaker(
+                    self.policy.breaker_failure_threshold,
+                    self.policy.breaker_reset_timeout,
+                )
+            return self._breakers[model]
+
+    def stats(self, model: str) -> ModelStats:
+        with self._lock:
+            return self._stats.setdefault(model, ModelStats())
+
+    def metrics(self) -> dict:
+        """Métriques par modèle (exposées par l'API)"""
+        with self._lock:
+            models = list(self._stats)
+        return {
+            model: dict(self.stats(model).as_dict(), breaker=self.breaker(model).state)
+            for model in models
+        }
+
+    # ── Politique ────────────────────────────────────────────────────────────
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        """Délai avant la tentative suivante (Retry-After prioritaire, sinon full jitter)"""
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            return min(retry_after, self.policy.max_delay)
+        ceiling = min(self.policy.max_delay, self.policy.base_delay * 2**attempt)
+        return random.uniform(0, ceiling)
+
+    def _hedge_delay(self, model: str) -> Optional[float]:
+        """Latence au-delà de laquelle une requête dupliquée est envoyée"""
+        if not self.policy.hedge_percentile:
+            return None
+        stats = self.stats(model)
+        if len(stats.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return stats.percentile(self.policy.hedge_percentile)
+
+    def _before_call(self, model: str) -> ModelStats:
+        stats = self.stats(model)
+        stats.calls += 1
+        if not self.breaker(model).allow():
+            stats.short_circuited += 1
+            raise CircuitOpenError(f"Circuit ouvert pour le modèle {model}")
+        return stats
+
+    def _on_success(self, model: str, stats: ModelStats, started: float) -> None:
+        stats.successes += 1
+        stats.latencies.append(time.monotonic() - started)
+        self.breaker(model).record_success()
+
+    def _on_failure(self, model: str, stats: ModelStats, error: BaseException) -> None:
+        stats.failures += 1
+        # Seules les erreurs transitoires reflètent l'état de l'endpoint
+        if self.breaker(model).record_failure(transient=is_retryable(error)):
+            stats.breaker_opens += 1
+            logger.warning(f"Circuit ouvert pour le modèle {model} après: {error}")
+
+    def _next_delay(
+        self, attempt: int, error: BaseException, deadline: float
+    ) -> Optional[float]:
+        """Délai avant nouvelle tentative, ou None si on abandonne"""
+        if not is_retryable(error) or attempt >= self.policy.max_retries:
+            return None
+        delay = self._backoff(attempt, error)
+        if time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+    # ── Synchrone ────────────────────────────────────────────────────────────
+    def call(self, model: str, func: Callable[[], object]):
+        """Appel LLM synchrone avec retries, disjoncteur et hedging"""
+        stats = self._before_call(model)
+        deadline = time.monotonic() + self.policy.budget
+        attempt = 0
+
+        settled = False
+        try:
+            while True:
+                started = time.monotonic()
+                try:
+                    result = self._attempt(model, stats, func)
+                except Exception as error:
+                    delay = self._next_delay(attempt, error, deadline)
+                    if delay is None:
+                        settled = True
+                        self._on_failure(model, stats, error)
+                        raise
+                    attempt += 1
+                    stats.retries += 1
+                    logger.warning(
+                        f"Appel LLM {model} en échec ({error}), nouvelle tentative "
+                        f"{attempt}/{self.policy.max_retries} dans {delay:.1f}s"
+                    )
+                    time.sleep(delay)
+                    continue
+
+                settled = True
+                self._on_success(model, stats, started)
+                return result
+        finally:
+            # Annulation en cours d'essai : un circuit semi-ouvert ne doit pas
+            # le rester indéfiniment
+            if not settled:
+                self.breaker(model).abandon()
+
+    def _attempt(self, model: str, stats: ModelStats, func: Callable[[], object]):
+        hedge_delay = self._hedge_delay(model)
+        if hedge_delay is None:
+            return func()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(thread_name_prefix="llm-hedge")
+        primary = self._executor.submit(func)
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        stats.hedges += 1
+        hedge = self._executor.submit(func)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        stats.hedge_wins += 1
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    # ── Asynchrone ───────────────────────────────────────────────────────────
+    async def call_async(self, model: str, func: Callable[[], Awaitable[object]]):
+        """Variante asyncio de ``call`` (``func`` retourne une coroutine)"""
+        stats = self._before_call(model)
+        deadline = time.monotonic() + self.policy.budget
+        attempt = 0
+
+        settled = False
+        try:
+            while True:
+                started = time.monotonic()
+                try:
+                    result = await self._attempt_async(model, stats, func)
+                except Exception as error:
+                    delay = self._next_delay(attempt, error, deadline)
+                    if delay is None:
+                        settled = True
+                        self._on_failure(model, stats, error)
+                        raise
+                    attempt += 1
+                    stats.retries += 1
+                    logger.warning(
+                        f"Appel LLM {model} en échec ({error}), nouvelle tentative "
+                        f"{attempt}/{self.policy.max_retries} dans {delay:.1f}s"
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+
+                settled = True
+                self._on_success(model, stats, started)
+                return result
+        finally:
+            # Annulation en cours d'essai : un circuit semi-ouvert ne doit pas
+            # le rester indéfiniment
+            if not settled:
+                self.breaker(model).abandon()
+
+    async def _attempt_async(
+        self, model: str, stats: ModelStats, func: Callable[[], Awaitable[object]]
+    ):
+        hedge_delay = self._hedge_delay(model)
+        if hedge_delay is None:
+            return await func()
+
+        primary = asyncio.ensure_future(func())
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        stats.hedges += 1
+        hedge = asyncio.ensure_future(func())
+        pending = {primary, hedge}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            stats.hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            # La requête perdante est annulée
+            for task in pending:
+                task.cancel()
+
+
+_gateway: Optional[ResilientLLM] = None
+
+
+def get_llm_gateway() -> ResilientLLM:
+    """Instance partagée (disjoncteurs et métriques communs au processus)"""
+    global _gateway
+    if _gateway is None:
+        _gateway = ResilientLLM(ResiliencePolicy.from_settings())
+    return _gateway
@@ -0,0 +1,184 @@
+"""
+Pré-extraction spéculative des CV dès l'upload
+Pendant que l'utilisateur choisit ses options, le backend extrait le texte et
+lance la structuration par défaut en arrière-plan (``agent.prefetch_async``) :
+la conversion demandée ensuite trouve souvent un cache chaud.
+
+Le travail spéculatif est borné (nombre de tâches simultanées, budget de
+temps par tâche) et annulable : un upload abandonné reste peu coûteux. Une
+conversion qui « réclame » une tâche en cours l'attend et la soustrait à
+l'annulation.
+"""
+
+import asyncio
+import hashlib
+import tempfile
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+from config.logging_config import setup_logger
+from config.settings import get_settings
+
+# Logger
+logger = setup_logger(__name__, "speculative.log")
+
+# Statuts d'une spéculation
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+EXPIRED = "expired"
+REJECTED = "rejected"
+
+
+def upload_fingerprint(content: bytes, model: Optional[str]) -> str:
+    """Empreinte d'un upload : octets du fichier et modèle demandé"""
+    digest = hashlib.sha256(content)
+    digest.update(f"\x00{model or ''}".encode())
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: str, model: Optional[str]) -> str:
+    """Empreinte d'un fichier sur disque, identique à celle de son upload
+
+    Lecture et hachage bloquants : à exécuter hors de la boucle asyncio.
+    """
+    return upload_fingerprint(Path(path).read_bytes(), model)
+
+
+@dataclass
+class Speculation:
+    """Une extraction spéculative"""
+
+    id: str
+    key: str
+    status: str = RUNNING
+    claimed: bool = False
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    deadline: Optional[asyncio.TimerHandle] = field(default=None, repr=False)
+
+
+class SpeculativeExtractor:
+    """Tâches de pré-extraction en arrière-plan (boucle asyncio de l'API)
+
+    Args:
+        agent: Agent de conversion (``prefetch_async``)
+        max_concurrent: Nombre maximal de tâches spéculatives simultanées
+            (au-delà, l'upload n'est pas pré-traité)
+        timeout: Budget de temps d'une tâche non réclamée (secondes)
+    """
+
+    def __init__(self, agent, max_concurrent: int = 4, timeout: float = 120.0):
+        self.agent = agent
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self.counters = Counter()
+        self._by_id: Dict[str, Speculation] = {}
+        self._by_key: Dict[str, Speculation] = {}
+
+    @classmethod
+    def from_settings(cls, agent) -> "SpeculativeExtractor":
+        settings = get_settings()
+        return cls(
+            agent,
+            max_concurrent=settings.SPECULATIVE_MAX_CONCURRENT,
+            timeout=settings.SPECULATIVE_TIMEOUT_SECONDS,
+        )
+
+    @property
+    def running(self) -> int:
+        return len(self._by_id)
+
+    def submit(self, content: bytes, suffix: str, model: Optional[str]) -> Speculation:
+        """Lance la pré-extraction d'un fichier uploadé (à appeler dans la boucle)
+
+        Un même fichier (et modèle) déjà en cours n'est pas relancé.
+        """
+        key = upload_fingerprint(content, model)
+        existing = self._by_key.get(key)
+        if existing is not None:
+            return existing
+
+        if self.running >= self.max_concurrent:
+            self.counters[REJECTED] += 1
+            logger.info("Pré-extraction ignorée : budget de tâches atteint")
+            return Speculation(id="", key=key, status=REJECTED)
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+            tmp.write(content)
+            path = tmp.name
+
+        speculation = Speculation(id=str(uuid.uuid4()), key=key)
+        self._by_id[speculation.id] = self._by_key[key] = speculation
+        self.counters["submitted"] += 1
+
+        loop = asyncio.get_running_loop()
+        speculation.task = loop.create_task(self._run(speculation, path, model))
+        speculation.deadline = loop.call_later(
+            self.timeout, self._stop, speculation, EXPIRED
+        )
+        return speculation
+
+    async def _run(self, speculation: Speculation, path: str, model: Optional[str]):
+        try:
+            await self.agent.prefetch_async(path, model=model)
+            speculation.status = DONE
+        except asyncio.CancelledError:
+            if speculation.status == RUNNING:
+                speculation.status = CANCELLED
+        except Exception as e:
+            speculation.status = FAILED
+            logger.warning(f"Échec de la pré-extraction: {e}")
+        finally:
+            speculation.deadline.cancel()
+            self._by_id.pop(speculation.id, None)
+            self._by_key.pop(speculation.key, None)
+            self.counters[speculation.status] += 1
+            Path(path).unlink(missing_ok=True)
+
+    def _stop(self, speculation: Speculation, status: str) -> bool:
+        if speculation.claimed or speculation.task.done():
+            return False
+        speculation.status = status
+        speculation.task.cancel()
+        logger.info(f"Pré-extraction interrompue ({status})")
+        return True
+
+    def cancel(self, speculation_id: str) -> bool:
+        """Annule une pré-extraction non réclamée (upload abandonné)"""
+        speculation = self._by_id.get(speculation_id)
+        return speculation is not None and self._stop(speculation, CANCELLED)
+
+    async def claim(self, content: bytes, model: Optional[str]) -> bool:
+        """Attend la pré-extraction en cours du même fichier, s'il y en a une
+
+        La tâche réclamée n'est plus annulable : la conversion réutilise son
+        résultat (cache) au lieu de relancer les mêmes appels LLM.
+
+        Returns:
+            bool: True si une pré-extraction a été attendue
+        """
+        return await self.claim_fingerprint(upload_fingerprint(content, model))
+
+    async def claim_fingerprint(self, fingerprint: str) -> bool:
+        """Variante de ``claim`` à partir d'une empreinte déjà calculée
+
+        Args:
+            fingerprint: Résultat de ``upload_fingerprint`` / ``file_fingerprint``
+        """
+        speculation = self._by_key.get(fingerprint)
+        if speculation is None:
+            return False
+
+        speculation.claimed = True
+        self.counters["claimed"] += 1
+        # asyncio.wait ne relance pas l'erreur de la tâche et ne l'annule pas
+        # si l'appelant est lui-même annulé
+        await asyncio.wait({speculation.task})
+        return True
+
+    def stats(self) -> dict:
+        return {"running": self.running, **self.counters}
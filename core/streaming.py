@@ -0,0 +1,299 @@
+"""
+Extraction en streaming et pitch spéculatif
+Le prompt de pitch ne lit que l'en-tête, les compétences opérationnelles et
+les trois premières expériences (``PromptTemplates.pitch_inputs``). En
+streaming, avec ces champs placés en tête de réponse, un analyseur JSON
+incrémental détecte le moment où ils sont complets : le pitch est alors lancé
+pendant que le LLM génère encore le reste du CV (expériences plus anciennes,
+évaluation des compétences, formations).
+
+Le pitch spéculatif passe par ``generate_profile_pitch`` : il est mis en cache
+sous la clé de sa projection, que l'étape pitch retrouve (ou rejoint s'il est
+encore en vol) quand les données finales donnent la même projection.
+
+Une réponse streamée peut avoir plusieurs observateurs (pitch spéculatif,
+progression en tokens reçus) : chacun fournit par ``watcher()`` la fonction
+alimentée par les fragments d'une tentative d'appel.
+"""
+
+import time
+from types import SimpleNamespace
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from core.compact_schema import expand_cv_data
+from core.cv_schema import CVJsonError, load_json_reply, validate_cv_data
+
+# Chemins JSON des entrées du pitch : (en-tête, compétences opérationnelles,
+# clé des expériences) pour les schémas verbeux et compact
+PITCH_PATHS = {
+    False: (("header",), ("competences", "operationnelles"), "experiences"),
+    True: (("h",), ("op",), "x"),
+}
+PITCH_EXPERIENCES = 3
+
+# Demande de l'usage (tokens) dans le dernier fragment d'une réponse streamée
+STREAM_OPTIONS = {"stream_options": {"include_usage": True}}
+
+# Intervalle minimal entre deux signalements de progression (secondes)
+PROGRESS_INTERVAL = 0.5
+
+
+class JsonStreamScanner:
+    """Analyse incrémentale d'un JSON en cours de génération
+
+    Suit la pile des conteneurs ouverts et note le chemin de chaque objet ou
+    tableau terminé : ``("header",)``, ``("experiences", 2)``... Chaque
+    fragment n'est parcouru qu'une fois.
+    """
+
+    def __init__(self):
+        self.completed = set()
+        self._chunks: List[str] = []
+        # Pile : [chemin du conteneur, type, clé/index courant, clé attendue]
+        self._stack: List[list] = []
+        self._in_string = self._escape = False
+        self._string: List[str] = []
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def done(self, *path) -> bool:
+        return tuple(path) in self.completed
+
+    def _child_path(self) -> Tuple:
+        if not self._stack:
+            return ()
+        path, _, key, _ = self._stack[-1]
+        return (*path, key)
+
+    def feed(self, delta: str) -> None:
+        self._chunks.append(delta)
+        for char in delta:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._end_string()
+                    continue
+                self._string.append(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string = []
+            elif char in "{[":
+                kind = "object" if char == "{" else "array"
+                self._stack.append(
+                    [self._child_path(), kind, None if kind == "object" else 0, True]
+                )
+            elif char in "}]" and self._stack:
+                path = self._stack.pop()[0]
+                self.completed.add(path)
+            elif char == ":" and self._stack:
+                self._stack[-1][3] = False
+            elif char == "," and self._stack:
+                frame = self._stack[-1]
+                if frame[1] == "array":
+                    frame[2] += 1
+                else:
+                    frame[3] = True
+
+    def _end_string(self) -> None:
+        if self._stack and self._stack[-1][1] == "object" and self._stack[-1][3]:
+            self._stack[-1][2] = "".join(self._string)
+
+
+def pitch_inputs_ready(scanner: JsonStreamScanner, compact: bool = False) -> bool:
+    """En-tête, compétences opérationnelles et 3 premières expériences générés"""
+    header, operationnelles, experiences = PITCH_PATHS[compact]
+    return (
+        scanner.done(*header)
+        and scanner.done(*operationnelles)
+        and (
+            scanner.done(experiences, PITCH_EXPERIENCES - 1)
+            or scanner.done(experiences)
+        )
+    )
+
+
+def pitch_first(data: dict, compact: bool = False) -> dict:
+    """Réordonne un cv_data (entrée d'une transformation) : entrées du pitch d'abord
+
+    Une transformation conserve la structure du JSON reçu ; en streaming, ses
+    entrées du pitch sont ainsi générées en premier.
+    """
+    header, operationnelles, experiences = PITCH_PATHS[compact]
+    first = [header[0], operationnelles[0], experiences]
+    ordered = {key: data[key] for key in first if key in data}
+    ordered.update((key, value) for key, value in data.items() if key not in ordered)
+    return ordered
+
+
+class StreamObserver:
+    """Observateur d'une réponse streamée"""
+
+    def watcher(self) -> Callable[[str], None]:
+        """Fonction à alimenter avec les fragments d'une tentative d'appel
+
+        Une fonction par tentative : une nouvelle tentative (retry, hedging)
+        repart d'un état vierge.
+        """
+        raise NotImplementedError
+
+
+class StreamObservers(StreamObserver):
+    """Plusieurs observateurs d'une même réponse streamée"""
+
+    def __init__(self, observers: Iterable[StreamObserver]):
+        self.observers = list(observers)
+
+    def watcher(self) -> Callable[[str], None]:
+        feeds = [observer.watcher() for observer in self.observers]
+
+        def feed(delta: str) -> None:
+            for observer_feed in feeds:
+                observer_feed(delta)
+
+        return feed
+
+
+def combine_observers(*observers: Optional[StreamObserver]) -> Optional[StreamObserver]:
+    """Regroupe les observateurs fournis (None : réponse non streamée)"""
+    present = [observer for observer in observers if observer is not None]
+    if len(present) <= 1:
+        return present[0] if present else None
+    return StreamObservers(present)
+
+
+class TokenProgress(StreamObserver):
+    """Signale périodiquement le nombre de tokens reçus
+
+    Un fragment streamé porte un token (serveurs compatibles OpenAI, vLLM) :
+    le compte de fragments en est une bonne approximation.
+
+    Args:
+        report: Appelé avec le nombre de tokens reçus par la tentative en cours
+        interval: Intervalle minimal entre deux appels (secondes)
+    """
+
+    def __init__(
+        self, report: Callable[[int], None], interval: float = PROGRESS_INTERVAL
+    ):
+        self.report = report
+        self.interval = interval
+
+    def watcher(self) -> Callable[[str], None]:
+        state = {"tokens": 0, "reported": 0.0}
+
+        def feed(delta: str) -> None:
+            state["tokens"] += 1
+            now = time.perf_counter()
+            if now - state["reported"] >= self.interval:
+                state["reported"] = now
+                self.report(state["tokens"])
+
+        return feed
+
+
+class PitchSpeculation(StreamObserver):
+    """Lance le pitch dès que ses entrées sont générées (une seule fois)
+
+    Args:
+        start: Appelé avec le cv_data partiel (normalisé comme les données
+            finales) pour lancer le pitch en arrière-plan
+        compact: Réponse au schéma compact
+    """
+
+    def __init__(self, start: Callable[[dict], None], compact: bool = False):
+        self.start = start
+        self.compact = compact
+        self.started = False
+
+    def watcher(self) -> Callable[[str], None]:
+        """Un analyseur par tentative : une nouvelle tentative repart d'un texte vide"""
+        scanner = JsonStreamScanner()
+
+        def feed(delta: str) -> None:
+            if self.started:
+                return
+            scanner.feed(delta)
+            if pitch_inputs_ready(scanner, self.compact):
+                partial = self.partial_cv_data(scanner.text)
+                if partial is not None:
+                    self.started = True
+                    self.start(partial)
+
+        return feed
+
+    def partial_cv_data(self, text: str) -> Optional[dict]:
+        """cv_data partiel normalisé comme le sera la réponse complète"""
+        try:
+            data, _ = load_json_reply(text)
+        except CVJsonError:
+            return None
+        return validate_cv_data(expand_cv_data(data)).resolve()
+
+
+def _namespace(value):
+    """Objet à attributs pour un usage reçu sous forme de dict (champ extra)"""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: _namespace(v) for key, v in value.items()})
+    return value
+
+
+class _StreamedReply:
+    """Accumule les fragments d'une réponse streamée"""
+
+    def __init__(self, feed: Callable[[str], None], probe: Optional[dict]):
+        self.feed = feed
+        self.probe = probe
+        self.parts: List[str] = []
+        self.finish_reason = self.usage = None
+
+    def add(self, chunk) -> None:
+        self.usage = _namespace(getattr(chunk, "usage", None)) or self.usage
+        for choice in getattr(chunk, "choices", None) or []:
+            delta = getattr(choice.delta, "content", None)
+            if delta:
+                if self.probe is not None and self.probe.get("first_token") is None:
+                    self.probe["first_token"] = time.perf_counter()
+                self.parts.append(delta)
+                self.feed(delta)
+            self.finish_reason = choice.finish_reason or self.finish_reason
+
+    def response(self):
+        message = SimpleNamespace(role="assistant", content="".join(self.parts))
+        choice = SimpleNamespace(message=message, finish_reason=self.finish_reason)
+        return SimpleNamespace(choices=[choice], usage=self.usage)
+
+
+def collect_stream(
+    chunks: Iterable, feed: Callable[[str], None], probe: Optional[dict] = None
+):
+    """Reconstitue une réponse ``chat.completions`` à partir des fragments streamés
+
+    Chaque fragment de texte est transmis à ``feed`` au fil de l'eau ;
+    ``probe["first_token"]`` reçoit l'horodatage du premier (télémétrie).
+
+    Returns:
+        Réponse de même forme qu'un appel non streamé (``choices[0].message``,
+        ``finish_reason``, ``usage``)
+    """
+    reply = _StreamedReply(feed, probe)
+    for chunk in chunks:
+        reply.add(chunk)
+    return reply.response()
+
+
+async def collect_stream_async(
+    chunks, feed: Callable[[str], None], probe: Optional[dict] = None
+):
+    """Variante asyncio de ``collect_stream``"""
+    reply = _StreamedReply(feed, probe)
+    async for chunk in chunks:
+        reply.add(chunk)
+    return reply.response()
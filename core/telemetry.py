@@ -0,0 +1,373 @@
+"""
+Télémétrie des appels LLM
+Chaque appel (ou réponse servie par le cache) produit un enregistrement :
+tokens (prompt, complétion, en cache), latence, délai du premier token en
+streaming, modèle, finish_reason, hit/miss du cache et type d'appel.
+Les enregistrements alimentent des histogrammes agrégés par type d'appel et
+le bilan de la conversion en cours (contextvars).
+"""
+
+import bisect
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from config.logging_config import setup_logger
+
+# Logger
+logger = setup_logger(__name__, "telemetry.log")
+
+# Bornes des histogrammes (la dernière classe est ouverte)
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 40, 80)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+# Types d'appels
+EXTRACTION = "extraction"
+EXTRACTION_SECTION = "extraction_section"
+TRANSFORMATION = "transformation"
+PITCH = "pitch"
+CORRECTION = "correction"
+CONTINUATION = "continuation"
+
+
+def _as_int(value) -> int:
+    return value if isinstance(value, int) else 0
+
+
+@dataclass
+class LLMCallRecord:
+    """Mesures d'un appel LLM (ou d'une réponse servie par le cache)"""
+
+    kind: str
+    model: str
+    cache_hit: bool = False
+    latency: float = 0.0
+    time_to_first_token: Optional[float] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    finish_reason: Optional[str] = None
+    error: Optional[str] = None
+    # Variante du schéma de sortie demandé (verbose / compact)
+    schema: Optional[str] = None
+
+    @classmethod
+    def from_response(
+        cls,
+        kind: str,
+        model: str,
+        response,
+        latency: float,
+        time_to_first_token: Optional[float] = None,
+        schema: Optional[str] = None,
+    ) -> "LLMCallRecord":
+        """Construit l'enregistrement depuis une réponse ``chat.completions``"""
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        choices = getattr(response, "choices", None) or [None]
+        finish_reason = getattr(choices[0], "finish_reason", None)
+        return cls(
+            kind=kind,
+            model=model,
+            latency=latency,
+            time_to_first_token=time_to_first_token,
+            prompt_tokens=_as_int(getattr(usage, "prompt_tokens", 0)),
+            completion_tokens=_as_int(getattr(usage, "completion_tokens", 0)),
+            cached_tokens=_as_int(getattr(details, "cached_tokens", 0)),
+            finish_reason=finish_reason if isinstance(finish_reason, str) else None,
+            schema=schema,
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "model": self.model,
+            "cache_hit": self.cache_hit,
+            "latency": round(self.latency, 4),
+            "time_to_first_token": (
+                round(self.time_to_first_token, 4)
+                if self.time_to_first_token is not None
+                else None
+            ),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "finish_reason": self.finish_reason,
+            "error": self.error,
+            "schema": self.schema,
+        }
+
+
+class Histogram:
+    """Histogramme à classes fixes (compte, somme, répartition)"""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def as_dict(self) -> dict:
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 4),
+            "mean": round(self.total / self.count, 4) if self.count else None,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+@dataclass
+class KindStats:
+    """Agrégats d'un type d'appel"""
+
+    calls: int = 0
+    cache_hits: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    finish_reasons: Counter = field(default_factory=Counter)
+    models: Counter = field(default_factory=Counter)
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    time_to_first_token: Histogram = field(
+        default_factory=lambda: Histogram(LATENCY_BUCKETS)
+    )
+    prompt_tokens_histogram: Histogram = field(
+        default_factory=lambda: Histogram(TOKEN_BUCKETS)
+    )
+    completion_tokens_histogram: Histogram = field(
+        default_factory=lambda: Histogram(TOKEN_BUCKETS)
+    )
+
+    def add(self, record: LLMCallRecord) -> None:
+        if record.cache_hit:
+            self.cache_hits += 1
+            return
+        self.calls += 1
+        self.models[record.model] += 1
+        if record.error:
+            self.errors += 1
+            return
+        self.prompt_tokens += record.prompt_tokens
+        self.completion_tokens += record.completion_tokens
+        self.cached_tokens += record.cached_tokens
+        self.finish_reasons[record.finish_reason or "unknown"] += 1
+        self.latency.observe(record.latency)
+        if record.time_to_first_token is not None:
+            self.time_to_first_token.observe(record.time_to_first_token)
+        self.prompt_tokens_histogram.observe(record.prompt_tokens)
+        self.completion_tokens_histogram.observe(record.completion_tokens)
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.calls,
+            "errors": self.errors,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "finish_reasons": dict(self.finish_reasons),
+            "models": dict(self.models),
+            "latency": self.latency.as_dict(),
+            "time_to_first_token": self.time_to_first_token.as_dict(),
+            "prompt_tokens_histogram": self.prompt_tokens_histogram.as_dict(),
+            "completion_tokens_histogram": self.completion_tokens_histogram.as_dict(),
+        }
+
+
+@dataclass
+class SchemaStats:
+    """Tokens générés et latence des appels d'un modèle pour une variante de schéma"""
+
+    calls: int = 0
+    completion_tokens: int = 0
+    latency: float = 0.0
+
+    def add(self, record: LLMCallRecord) -> None:
+        self.calls += 1
+        self.completion_tokens += record.completion_tokens
+        self.latency += record.latency
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "mean_completion_tokens": round(self.completion_tokens / self.calls, 1),
+            "mean_latency": round(self.latency / self.calls, 4),
+        }
+
+
+@dataclass
+class ConversionTelemetry:
+    """Appels LLM d'une conversion (bilan par conversion)"""
+
+    calls: List[LLMCallRecord] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        by_kind: Dict[str, dict] = {}
+        for record in self.calls:
+            entry = by_kind.setdefault(
+                record.kind,
+                {
+                    "calls": 0,
+                    "cache_hits": 0,
+                    "latency": 0.0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "cached_tokens": 0,
+                },
+            )
+            if record.cache_hit:
+                entry["cache_hits"] += 1
+                continue
+            entry["calls"] += 1
+            entry["latency"] = round(entry["latency"] + record.latency, 4)
+            entry["prompt_tokens"] += record.prompt_tokens
+            entry["completion_tokens"] += record.completion_tokens
+            entry["cached_tokens"] += record.cached_tokens
+
+        return {
+            "llm_calls": sum(1 for record in self.calls if not record.cache_hit),
+            "cache_hits": sum(1 for record in self.calls if record.cache_hit),
+            "prompt_tokens": sum(record.prompt_tokens for record in self.calls),
+            "completion_tokens": sum(record.completion_tokens for record in self.calls),
+            "llm_time": round(sum(record.latency for record in self.calls), 4),
+            "by_kind": by_kind,
+            "calls": [record.as_dict() for record in self.calls],
+        }
+
+
+_current_conversion: ContextVar[Optional[ConversionTelemetry]] = ContextVar(
+    "llm_conversion_telemetry", default=None
+)
+
+
+class LLMTelemetry:
+    """Agrégation des enregistrements d'appels LLM du processus"""
+
+    def __init__(self):
+        self._kinds: Dict[str, KindStats] = {}
+        self._schemas: Dict[Tuple[str, str], SchemaStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, record: LLMCallRecord) -> LLMCallRecord:
+        """Ajoute un enregistrement aux agrégats et à la conversion en cours"""
+        with self._lock:
+            self._kinds.setdefault(record.kind, KindStats()).add(record)
+            if record.schema and not (record.cache_hit or record.error):
+                key = (record.model, record.schema)
+                self._schemas.setdefault(key, SchemaStats()).add(record)
+
+        conversion = _current_conversion.get()
+        if conversion is not None:
+            conversion.calls.append(record)
+
+        if not record.cache_hit:
+            logger.info(
+                f"LLM {record.kind} [{record.model}] {record.latency:.2f}s "
+                f"tokens {record.prompt_tokens}+{record.completion_tokens} "
+                f"(cache prompt: {record.cached_tokens}) "
+                f"finish: {record.finish_reason}"
+                + (f" erreur: {record.error}" if record.error else "")
+            )
+        return record
+
+    def record_cache_hit(self, kind: str, model: str) -> LLMCallRecord:
+        """Réponse servie par le cache (aucun appel LLM)"""
+        return self.record(LLMCallRecord(kind=kind, model=model, cache_hit=True))
+
+    @contextmanager
+    def measure(
+        self, kind: str, model: str, schema: Optional[str] = None
+    ) -> Iterator[dict]:
+        """Mesure un appel : ``probe["response"]`` reçoit la réponse
+
+        ``probe["first_token"]`` (horodatage ``time.perf_counter``) peut être
+        renseigné par un appel en streaming pour le délai du premier token.
+        ``schema`` indique la variante du schéma de sortie demandé.
+        """
+        probe = {"response": None, "first_token": None}
+        start = time.perf_counter()
+        try:
+            yield probe
+        except Exception as e:
+            self.record(
+                LLMCallRecord(
+                    kind=kind,
+                    model=model,
+                    latency=time.perf_counter() - start,
+                    error=type(e).__name__,
+                    schema=schema,
+                )
+            )
+            raise
+        first_token = probe["first_token"]
+        self.record(
+            LLMCallRecord.from_response(
+                kind,
+                model,
+                probe["response"],
+                time.perf_counter() - start,
+                first_token - start if first_token is not None else None,
+                schema,
+            )
+        )
+
+    @contextmanager
+    def track(
+        self, conversion: Optional[ConversionTelemetry] = None
+    ) -> Iterator[ConversionTelemetry]:
+        """Rattache les appels suivants (même contexte) au bilan d'une conversion"""
+        conversion = conversion if conversion is not None else ConversionTelemetry()
+        token = _current_conversion.set(conversion)
+        try:
+            yield conversion
+        finally:
+            _current_conversion.reset(token)
+
+    def snapshot(self) -> dict:
+        """Agrégats par type d'appel (histogrammes compris)"""
+        with self._lock:
+            return {kind: stats.as_dict() for kind, stats in self._kinds.items()}
+
+    def schema_savings(self) -> dict:
+        """Gain du schéma compact par modèle (moyennes par appel)
+
+        Tokens générés et latence moyens de chaque variante ; l'économie n'est
+        calculée que si les deux variantes ont été observées pour le modèle.
+        """
+        with self._lock:
+            by_model: Dict[str, dict] = {}
+            for (model, schema), stats in self._schemas.items():
+                by_model.setdefault(model, {})[schema] = stats.as_dict()
+
+        for variants in by_model.values():
+            verbose, compact = variants.get("verbose"), variants.get("compact")
+            if verbose and compact:
+                variants["saved_completion_tokens"] = round(
+                    verbose["mean_completion_tokens"]
+                    - compact["mean_completion_tokens"],
+                    1,
+                )
+                variants["saved_latency"] = round(
+                    verbose["mean_latency"] - compact["mean_latency"], 4
+                )
+        return by_model
+
+    def reset(self) -> None:
+        with self._lock:
+            self._kinds.clear()
+            self._schemas.clear()
+
+
+llm_telemetry = LLMTelemetry()
@@ -0,0 +1,194 @@
+"""
+Prétraitement du texte extrait avant l'envoi au LLM
+Retire le bruit de mise en page (en-têtes/pieds de page répétés, numéros de
+page, césures, espaces, caractères décoratifs) pour réduire les tokens d'entrée.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Tuple
+
+# Séparateur de pages produit par extract_pdf_content(page_separator=PAGE_BREAK)
+PAGE_BREAK = "\f"
+
+# Lignes examinées en haut et en bas de chaque page pour détecter les répétitions
+EDGE_LINES = 3
+
+# Approximation du nombre de tokens (≈ 4 caractères par token pour du texte latin)
+CHARS_PER_TOKEN = 4
+
+_PAGE_NUMBER_RE = re.compile(
+    r"^[-–—\s]*(page|p\.)?\s*\d{1,3}\s*((/|sur|of|de)\s*\d{1,3})?[-–—\s]*$",
+    re.IGNORECASE,
+)
+_DECORATIVE_LINE_RE = re.compile(r"^[\W_]+$")
+_BULLET_RE = re.compile(r"^[•●▪■□◆◇►▸➢➤✓✔❖◦·]+\s*")
+_HYPHENATION_RE = re.compile(r"(\w)[-‐]\n[ \t]*([a-zà-öø-ÿ])")
+_SPACES_RE = re.compile(r"[ \t\u00a0\u2000-\u200b]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+# Titres de sections usuels d'un CV (comparaison sans accents ni casse)
+SECTION_KEYWORDS = {
+    "competences",
+    "competences techniques",
+    "competences fonctionnelles",
+    "competences operationnelles",
+    "experience",
+    "experiences",
+    "experience professionnelle",
+    "experiences professionnelles",
+    "parcours professionnel",
+    "formation",
+    "formations",
+    "diplomes",
+    "certifications",
+    "langues",
+    "centres d'interet",
+    "profil",
+    "resume",
+    "projets",
+    "skills",
+    "technical skills",
+    "professional experience",
+    "work experience",
+    "education",
+    "languages",
+    "projects",
+    "summary",
+}
+
+_ACCENTS = str.maketrans("àâäéèêëîïôöùûüç", "aaaeeeeiioouuuc")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimation du nombre de tokens d'un texte"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass
+class PreprocessReport:
+    """Bilan du prétraitement d'un document"""
+
+    original_tokens: int
+    tokens: int
+    pages: int = 1
+    repeated_lines_removed: int = 0
+    page_numbers_removed: int = 0
+    hyphenations_joined: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.tokens
+
+    @property
+    def saved_ratio(self) -> float:
+        return self.tokens_saved / self.original_tokens if self.original_tokens else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "original_tokens": self.original_tokens,
+            "tokens": self.tokens,
+            "tokens_saved": self.tokens_saved,
+            "pages": self.pages,
+            "saved_ratio": round(self.saved_ratio, 4),
+            "repeated_lines_removed": self.repeated_lines_removed,
+            "page_numbers_removed": self.page_numbers_removed,
+            "hyphenations_joined": self.hyphenations_joined,
+        }
+
+
+def _normalize(line: str) -> str:
+    """Forme canonique d'une ligne pour détecter les répétitions entre pages"""
+    return re.sub(r"\d+", "#", _SPACES_RE.sub(" ", line).strip().lower())
+
+
+def _repeated_edge_lines(pages: List[List[str]]) -> set:
+    """Lignes présentes en haut ou en bas de (presque) toutes les pages"""
+    if len(pages) < 2:
+        return set()
+
+    counts = Counter()
+    for lines in pages:
+        content = [line for line in lines if line.strip()]
+        edges = content[:EDGE_LINES] + content[-EDGE_LINES:]
+        counts.update({_normalize(line) for line in edges})
+
+    threshold = max(2, math.ceil(len(pages) * 0.8))
+    return {line for line, count in counts.items() if line and count >= threshold}
+
+
+def section_key(line: str) -> str:
+    """Forme canonique d'un titre de section (sans accents, casse ni ``##``)"""
+    return line.strip(" :#").lower().translate(_ACCENTS)
+
+
+def _is_section_title(line: str) -> bool:
+    """Titre de section : mot-clé connu ou ligne courte en majuscules"""
+    if section_key(line) in SECTION_KEYWORDS:
+        return True
+    letters = [c for c in line if c.isalpha()]
+    return 3 <= len(line) <= 40 and len(letters) >= 3 and line.isupper()
+
+
+def preprocess_cv_text(
+    text: str, markdown_sections: bool = False
+) -> Tuple[str, PreprocessReport]:
+    """Nettoie le texte extrait d'un CV pour réduire les tokens envoyés au LLM
+
+    - supprime les lignes répétées en haut/bas de chaque page (la première
+      occurrence est conservée : un nom en en-tête reste présent une fois),
+    - supprime les numéros de page et les lignes purement décoratives,
+    - recolle les mots coupés par une césure en fin de ligne,
+    - normalise les puces et réduit les espaces et lignes vides,
+    - optionnellement, préfixe les titres de section par ``##``.
+
+    Args:
+        text: Texte extrait (pages séparées par ``PAGE_BREAK`` si disponible)
+        markdown_sections: Ajouter des marqueurs de section de type markdown
+
+    Returns:
+        Tuple[str, PreprocessReport]: Texte nettoyé et bilan (tokens économisés)
+    """
+    report = PreprocessReport(original_tokens=estimate_tokens(text), tokens=0)
+
+    pages = [page.split("\n") for page in text.split(PAGE_BREAK)]
+    report.pages = len(pages)
+    repeated = _repeated_edge_lines(pages)
+    seen_repeated = set()
+
+    kept = []
+    for lines in pages:
+        for raw in lines:
+            line = _SPACES_RE.sub(" ", raw).strip()
+            if not line:
+                kept.append("")
+                continue
+
+            if _PAGE_NUMBER_RE.match(line):
+                report.page_numbers_removed += 1
+                continue
+            if _DECORATIVE_LINE_RE.match(line):
+                continue
+
+            normalized = _normalize(line)
+            if normalized in repeated:
+                if normalized in seen_repeated:
+                    report.repeated_lines_removed += 1
+                    continue
+                seen_repeated.add(normalized)
+
+            line = _BULLET_RE.sub("- ", line)
+            if markdown_sections and _is_section_title(line):
+                kept.extend(["", f"## {line.rstrip(' :')}"])
+                continue
+            kept.append(line)
+        kept.append("")
+
+    cleaned = "\n".join(kept)
+    cleaned, report.hyphenations_joined = _HYPHENATION_RE.subn(r"\1\2", cleaned)
+    cleaned = _BLANK_LINES_RE.sub("\n\n", cleaned).strip()
+
+    report.tokens = estimate_tokens(cleaned)
+    return cleaned, report
@@ -2,9 +2,11 @@
 API Backend FastAPI pour le CV Generator
 """
 
+import asyncio
 import base64
 import hashlib
 import hmac
+import json
 import re
 import shutil
 import sys
@@ -13,7 +15,7 @@ import uuid
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from fastapi import (
     Depends,
@@ -26,16 +28,29 @@ from fastapi import (
     status,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.security import APIKeyHeader
+from starlette.background import BackgroundTask
 
 # Ajouter le répertoire racine au PYTHONPATH
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from config.logging_config import api_logger
-from config.settings import AVAILABLE_MODELS, get_settings
+from config.settings import AVAILABLE_MODELS, DEFAULT_MODEL, get_settings
+from core.cache import cache_statistics
 from core.docx_extractor import is_docx_file
-from src.backend.models import ConversionResponse, HealthCheck
+from core.events import ConversionTimings, ProgressEvent, stage_metrics
+from core.llm_transport import get_llm_http_pool
+from core.resilience import get_llm_gateway
+from core.telemetry import ConversionTelemetry, llm_telemetry
+from src.backend.models import (
+    CacheStats,
+    ConversionResponse,
+    HealthCheck,
+    LLMStats,
+    LLMTelemetrySnapshot,
+    SpeculationResponse,
+)
 from src.backend.service import CVConversionService
 from src.backend.translations import t
 
@@ -99,6 +114,10 @@ _MAX_CACHE_SIZE = 200
 conversion_cache = {}
 CACHE_EXPIRY_MINUTES = 10
 
+# Conversions diffusées en SSE (référence gardée jusqu'à leur fin)
+_streamed_conversions = set()
+SSE_KEEPALIVE_SECONDS = 15
+
 
 @app.get("/", response_model=HealthCheck)
 async def root():
@@ -112,49 +131,114 @@ async def health_check():
     return HealthCheck(status="healthy", version=settings.APP_VERSION)
 
 
+@app.get(
+    "/api/cache/stats",
+    response_model=CacheStats,
+    dependencies=[Depends(_verify_api_token)],
+)
+async def get_cache_stats():
+    """Efficacité du cache LLM : hits, misses, évictions et octets servis par niveau"""
+    return CacheStats(**cache_statistics())
+
+
+@app.get(
+    "/api/llm/stats",
+    response_model=LLMStats,
+    dependencies=[Depends(_verify_api_token)],
+)
+async def get_llm_stats():
+    """Résilience des appels LLM : tentatives, circuits et hedging par modèle,
+    occupation du pool de connexions partagé"""
+    return LLMStats(
+        models=get_llm_gateway().metrics(), transport=get_llm_http_pool().stats()
+    )
+
+
+@app.get(
+    "/api/llm/telemetry",
+    response_model=LLMTelemetrySnapshot,
+    dependencies=[Depends(_verify_api_token)],
+)
+async def get_llm_telemetry():
+    """Où partent le temps et les tokens : histogrammes par type d'appel LLM et par étape"""
+    return LLMTelemetrySnapshot(
+        kinds=llm_telemetry.snapshot(),
+        schema_savings=llm_telemetry.schema_savings(),
+        stages=stage_metrics.snapshot(),
+    )
+
+
 @app.post(
-    "/api/convert",
-    response_model=ConversionResponse,
+    "/api/speculate",
+    response_model=SpeculationResponse,
     dependencies=[Depends(_verify_api_token)],
 )
-async def convert_cv(
+async def speculate_cv(
     file: UploadFile = File(..., description=t("file_description", lang="fr")),
-    generate_pitch: str = Form("true"),
-    improvement_mode: str = Form(
-        "none", description=t("improvement_mode_description", lang="fr")
-    ),
-    job_offer_file: Optional[UploadFile] = File(
-        None, description=t("job_offer_description", lang="fr")
-    ),
-    candidate_name: Optional[str] = Form(
-        None, description=t("candidate_name_description", lang="fr")
-    ),
-    max_pages: Optional[str] = Form(
-        None, description=t("max_pages_description", lang="fr")
-    ),
-    target_language: Optional[str] = Form(
-        None, description=t("target_language_description", lang="fr")
-    ),
     model: Optional[str] = Form(
-        "gpt-4o-mini",
-        description="Modèle OpenAI à utiliser (gpt-4o, gpt-4o-mini, gpt-3.5-turbo)",
+        DEFAULT_MODEL,
+        description='Modèle prévu (clé de AVAILABLE_MODELS, ou "auto" pour le routeur)',
     ),
 ):
     """
-    Convertit un CV (PDF ou DOCX) en DOCX formaté
+    Pré-extraction spéculative d'un CV dès son upload
 
-    Args:
-        file: Fichier CV uploadé (PDF, DOCX ou DOC)
-        generate_pitch: Générer ou non le pitch (true/false)
-        improvement_mode: Mode d'amélioration (none, basic, targeted)
-        job_offer_file: Fichier de l'appel d'offres (requis si improvement_mode=targeted)
-        candidate_name: Nom du candidat (optionnel)
-        max_pages: Nombre maximum de pages (optionnel)
-        target_language: Langue cible pour la traduction (optionnel: fr, en, it, es)
-        model: Modèle OpenAI à utiliser (gpt-4o, gpt-4o-mini, gpt-3.5-turbo)
+    Le texte est extrait et structuré en arrière-plan avec les options par
+    défaut pendant que l'utilisateur choisit les siennes ; ``/api/convert``
+    part ensuite d'un cache chaud. Réponse immédiate, travail borné
+    (SPECULATIVE_MAX_CONCURRENT, SPECULATIVE_TIMEOUT_SECONDS).
+    """
+    if not settings.SPECULATIVE_EXTRACTION:
+        return SpeculationResponse(status="disabled")
+
+    suffix = Path(file.filename).suffix.lower()
+    if suffix not in (".pdf", ".docx", ".doc"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=t("error_file_must_be_pdf", lang="fr"),
+        )
+    if model and not re.match(r"^[\w.\-]{1,120}$", model):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Nom de modèle invalide.",
+        )
+
+    content = await file.read()
+    if len(content) > settings.MAX_FILE_SIZE_MB * 1024 * 1024:
+        return SpeculationResponse(status="rejected")
+
+    speculation = conversion_service.speculative.submit(content, suffix, model)
+    api_logger.info(
+        f"Pré-extraction {speculation.status}: {_anon(file.filename)} "
+        f"({conversion_service.speculative.running} en cours)"
+    )
+    return SpeculationResponse(
+        speculation_id=speculation.id or None, status=speculation.status
+    )
+
+
+@app.post(
+    "/api/speculate/{speculation_id}/cancel",
+    dependencies=[Depends(_verify_api_token)],
+)
+async def cancel_speculation(speculation_id: str):
+    """Annule une pré-extraction (fichier retiré avant conversion)"""
+    return {"cancelled": conversion_service.speculative.cancel(speculation_id)}
+
+
+def _validate_conversion_request(
+    file: UploadFile,
+    improvement_mode: str,
+    job_offer_file: Optional[UploadFile],
+    model: Optional[str],
+) -> ImprovementMode:
+    """Valide les paramètres d'une conversion (avant tout traitement)
 
     Returns:
-        ConversionResponse avec le résultat de la conversion
+        ImprovementMode: Mode d'amélioration demandé
+
+    Raises:
+        HTTPException: 400 si un paramètre est invalide
     """
     # Validation du type de fichier
     if not file.filename.lower().endswith(".pdf"):
@@ -201,113 +285,238 @@ async def convert_cv(
                 detail=t("error_job_offer_format", lang="fr"),
             )
 
-    # Créer des fichiers temporaires
-    temp_pdf = None
-    temp_job_offer = None
+    return improvement_mode_enum
 
-    try:
-        api_logger.info(
-            f"Requête de conversion reçue: {_anon(file.filename)} (mode: {improvement_mode})"
-        )
 
-        # Convertir les paramètres string en boolean
-        generate_pitch_bool = generate_pitch.lower() == "true"
-        improve_content = improvement_mode_enum != ImprovementMode.NONE
+def _save_upload(upload: UploadFile) -> str:
+    """Enregistre un fichier uploadé dans un fichier temporaire (même extension)"""
+    with tempfile.NamedTemporaryFile(
+        delete=False, suffix=Path(upload.filename).suffix
+    ) as tmp:
+        shutil.copyfileobj(upload.file, tmp)
+        return tmp.name
 
-        # Sauvegarder le CV uploadé avec la bonne extension
-        cv_extension = Path(file.filename).suffix
-        with tempfile.NamedTemporaryFile(delete=False, suffix=cv_extension) as tmp:
-            shutil.copyfileobj(file.file, tmp)
-            temp_pdf = tmp.name
 
-        # Sauvegarder l'appel d'offres si fourni
-        job_offer_path = None
-        if job_offer_file:
-            file_extension = Path(job_offer_file.filename).suffix
-            with tempfile.NamedTemporaryFile(
-                delete=False, suffix=file_extension
-            ) as tmp:
-                shutil.copyfileobj(job_offer_file.file, tmp)
-                temp_job_offer = tmp.name
-                job_offer_path = temp_job_offer
-            api_logger.info(f"Appel d'offres reçu: {_anon(job_offer_file.filename)}")
+def _remove_temp_files(*paths: Optional[str]) -> None:
+    """Supprime les fichiers temporaires d'une conversion"""
+    for path in paths:
+        if path and Path(path).exists():
+            Path(path).unlink()
 
-        # Convertir max_pages en int si fourni
-        max_pages_int = None
-        if max_pages:
-            try:
-                max_pages_int = int(max_pages)
-                api_logger.info(
-                    f"Limitation de pages activée: {max_pages_int} page(s) maximum"
-                )
-            except ValueError:
-                api_logger.warning(f"Valeur max_pages invalide: {max_pages}")
-
-        # Vérifier la langue cible
-        if target_language:
-            valid_languages = ["fr", "en", "it", "es"]
-            if target_language not in valid_languages:
-                api_logger.warning(
-                    f"Langue cible invalide: {target_language}, défaut à None"
-                )
-                target_language = None
-            else:
-                api_logger.info(f"Traduction du CV en: {target_language}")
 
-        # Convertir avec les nouveaux paramètres
-        success, docx_path, cv_data, pitch, processing_time = (
-            conversion_service.convert_pdf_to_docx(
-                temp_pdf,
-                generate_pitch=generate_pitch_bool,
-                improve_content=improve_content,
-                improvement_mode=improvement_mode_enum.value,
-                job_offer_path=job_offer_path,
-                candidate_name=candidate_name,
-                max_pages=max_pages_int,
-                target_language=target_language,
-                model=model,
-            )
-        )
+def _release_uploads(uploads: list) -> None:
+    """Supprime les uploads dont aucune conversion n'a pris la charge
 
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=t("error_conversion_failed", lang="fr"),
+    Tâche de fond du flux SSE : si le client se déconnecte avant la première
+    lecture, le générateur ne démarre jamais et ne supprime rien.
+    """
+    _remove_temp_files(*uploads)
+    uploads.clear()
+
+
+def _conversion_options(
+    generate_pitch: str,
+    improvement_mode: ImprovementMode,
+    job_offer_path: Optional[str],
+    candidate_name: Optional[str],
+    max_pages: Optional[str],
+    target_language: Optional[str],
+    model: Optional[str],
+) -> dict:
+    """Arguments de ``convert_pdf_to_docx_async`` à partir des champs du formulaire"""
+    # Convertir max_pages en int si fourni
+    max_pages_int = None
+    if max_pages:
+        try:
+            max_pages_int = int(max_pages)
+            api_logger.info(
+                f"Limitation de pages activée: {max_pages_int} page(s) maximum"
+            )
+        except ValueError:
+            api_logger.warning(f"Valeur max_pages invalide: {max_pages}")
+
+    # Vérifier la langue cible
+    if target_language:
+        valid_languages = ["fr", "en", "it", "es"]
+        if target_language not in valid_languages:
+            api_logger.warning(
+                f"Langue cible invalide: {target_language}, défaut à None"
             )
+            target_language = None
+        else:
+            api_logger.info(f"Traduction du CV en: {target_language}")
+
+    return {
+        "generate_pitch": generate_pitch.lower() == "true",
+        "improve_content": improvement_mode != ImprovementMode.NONE,
+        "improvement_mode": improvement_mode.value,
+        "job_offer_path": job_offer_path,
+        "candidate_name": candidate_name,
+        "max_pages": max_pages_int,
+        "target_language": target_language,
+        "model": model,
+    }
+
+
+async def _run_conversion(
+    filename: str,
+    temp_pdf: str,
+    options: dict,
+    progress: Optional[Callable[[ProgressEvent], None]] = None,
+    timings: Optional[ConversionTimings] = None,
+) -> ConversionResponse:
+    """Convertit le CV enregistré et garde le résultat pour le téléchargement
 
-        # Préparer la réponse
-        response = ConversionResponse(
-            success=True,
-            filename=Path(docx_path).name,
-            cv_data=cv_data,
-            pitch=pitch,
-            processing_time=processing_time,
+    Args:
+        timings: Détail des durées à compléter (optionnel ; l'appelant y
+            ajoute l'enregistrement de l'upload et le nettoyage)
+
+    Raises:
+        HTTPException: 500 si la conversion échoue
+    """
+    llm_usage = ConversionTelemetry()
+    timings = timings if timings is not None else ConversionTimings()
+
+    def listen(event: ProgressEvent) -> None:
+        timings(event)
+        if progress is not None:
+            progress(event)
+
+    success, docx_path, cv_data, pitch, processing_time = (
+        await conversion_service.convert_pdf_to_docx_async(
+            temp_pdf, llm_usage=llm_usage, progress=listen, **options
         )
+    )
 
-        api_logger.info(
-            f"Conversion réussie: {_anon(file.filename)} -> {_anon(response.filename)} "
-            f"({processing_time:.2f}s)"
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=t("error_conversion_failed", lang="fr"),
         )
 
-        # Générer un ID unique pour la conversion
-        conversion_id = str(uuid.uuid4())
+    # Préparer la réponse
+    response = ConversionResponse(
+        success=True,
+        filename=Path(docx_path).name,
+        cv_data=cv_data,
+        pitch=pitch,
+        processing_time=processing_time,
+        llm_usage=llm_usage.as_dict(),
+    )
+    timings.add_llm_usage(llm_usage)
+    response.timings = timings.as_dict()
 
-        # Stocker en cache avec un timestamp (taille bornée à _MAX_CACHE_SIZE)
-        if len(conversion_cache) >= _MAX_CACHE_SIZE:
-            oldest = min(
-                conversion_cache, key=lambda k: conversion_cache[k]["timestamp"]
-            )
-            del conversion_cache[oldest]
-        conversion_cache[conversion_id] = {
-            "docx_path": docx_path,
-            "result": response,
-            "timestamp": datetime.now(),
-        }
+    api_logger.info(
+        f"Conversion réussie: {_anon(filename)} -> {_anon(response.filename)} "
+        f"({processing_time:.2f}s)"
+    )
+
+    # Générer un ID unique pour la conversion
+    conversion_id = str(uuid.uuid4())
+
+    # Stocker en cache avec un timestamp (taille bornée à _MAX_CACHE_SIZE)
+    if len(conversion_cache) >= _MAX_CACHE_SIZE:
+        oldest = min(conversion_cache, key=lambda k: conversion_cache[k]["timestamp"])
+        del conversion_cache[oldest]
+    conversion_cache[conversion_id] = {
+        "docx_path": docx_path,
+        "result": response,
+        "timestamp": datetime.now(),
+    }
 
-        # Ajouter l'ID de conversion à la réponse
-        response.conversion_id = conversion_id
+    # Ajouter l'ID de conversion à la réponse
+    response.conversion_id = conversion_id
 
-        return response
+    return response
+
+
+def _finish_timings(
+    filename: str, response: ConversionResponse, timings: ConversionTimings
+) -> ConversionResponse:
+    """Complète la réponse avec le détail des durées (nettoyage compris) et le journalise"""
+    response.timings = timings.as_dict()
+    api_logger.info(f"Durées par étape ({_anon(filename)}): {timings.summary()}")
+    return response
+
+
+@app.post(
+    "/api/convert",
+    response_model=ConversionResponse,
+    dependencies=[Depends(_verify_api_token)],
+)
+async def convert_cv(
+    file: UploadFile = File(..., description=t("file_description", lang="fr")),
+    generate_pitch: str = Form("true"),
+    improvement_mode: str = Form(
+        "none", description=t("improvement_mode_description", lang="fr")
+    ),
+    job_offer_file: Optional[UploadFile] = File(
+        None, description=t("job_offer_description", lang="fr")
+    ),
+    candidate_name: Optional[str] = Form(
+        None, description=t("candidate_name_description", lang="fr")
+    ),
+    max_pages: Optional[str] = Form(
+        None, description=t("max_pages_description", lang="fr")
+    ),
+    target_language: Optional[str] = Form(
+        None, description=t("target_language_description", lang="fr")
+    ),
+    model: Optional[str] = Form(
+        DEFAULT_MODEL,
+        description='Modèle à utiliser (clé de AVAILABLE_MODELS, ou "auto" pour le routeur)',
+    ),
+):
+    """
+    Convertit un CV (PDF ou DOCX) en DOCX formaté
+
+    Args:
+        file: Fichier CV uploadé (PDF, DOCX ou DOC)
+        generate_pitch: Générer ou non le pitch (true/false)
+        improvement_mode: Mode d'amélioration (none, basic, targeted)
+        job_offer_file: Fichier de l'appel d'offres (requis si improvement_mode=targeted)
+        candidate_name: Nom du candidat (optionnel)
+        max_pages: Nombre maximum de pages (optionnel)
+        target_language: Langue cible pour la traduction (optionnel: fr, en, it, es)
+        model: Modèle à utiliser (clé de AVAILABLE_MODELS, ou "auto" pour le routeur)
+
+    Returns:
+        ConversionResponse avec le résultat de la conversion
+    """
+    improvement_mode_enum = _validate_conversion_request(
+        file, improvement_mode, job_offer_file, model
+    )
+
+    # Créer des fichiers temporaires
+    temp_pdf = None
+    temp_job_offer = None
+    timings = ConversionTimings()
+
+    try:
+        api_logger.info(
+            f"Requête de conversion reçue: {_anon(file.filename)} (mode: {improvement_mode})"
+        )
+
+        # Sauvegarder le CV (et l'appel d'offres si fourni) avec la bonne extension
+        with timings.measure("upload"):
+            temp_pdf = _save_upload(file)
+            if job_offer_file:
+                temp_job_offer = _save_upload(job_offer_file)
+        if job_offer_file:
+            api_logger.info(f"Appel d'offres reçu: {_anon(job_offer_file.filename)}")
+
+        options = _conversion_options(
+            generate_pitch,
+            improvement_mode_enum,
+            temp_job_offer,
+            candidate_name,
+            max_pages,
+            target_language,
+            model,
+        )
+        response = await _run_conversion(
+            file.filename, temp_pdf, options, timings=timings
+        )
 
     except HTTPException:
         raise
@@ -319,10 +528,147 @@ async def convert_cv(
         )
     finally:
         # Nettoyage des fichiers temporaires
-        if temp_pdf and Path(temp_pdf).exists():
-            Path(temp_pdf).unlink()
-        if temp_job_offer and Path(temp_job_offer).exists():
-            Path(temp_job_offer).unlink()
+        with timings.measure("cleanup"):
+            _remove_temp_files(temp_pdf, temp_job_offer)
+
+    return _finish_timings(file.filename, response, timings)
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Message Server-Sent Events (données JSON sur une ligne)"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _conversion_events(
+    filename: str,
+    uploads: list,
+    options: dict,
+    timings: Optional[ConversionTimings] = None,
+):
+    """Flux SSE d'une conversion : une étape par événement, le résultat en dernier
+
+    Un commentaire est envoyé toutes les ``SSE_KEEPALIVE_SECONDS`` sans
+    événement pour garder la connexion ouverte derrière les proxys. Si le
+    client se déconnecte, la conversion va à son terme : son résultat est mis
+    en cache et une nouvelle demande identique le retrouve (ou rejoint les
+    appels LLM encore en vol) au lieu de tout recommencer.
+
+    ``uploads`` ([CV, appel d'offres ou None]) est vidé au démarrage : la
+    conversion prend alors en charge la suppression des fichiers temporaires.
+    """
+    temp_pdf, temp_job_offer = uploads
+    uploads.clear()
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    timings = timings if timings is not None else ConversionTimings()
+
+    def send(event: str, data: dict) -> None:
+        # Appelé depuis la boucle ou depuis les threads des étapes bloquantes
+        loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+
+    def progress(event: ProgressEvent) -> None:
+        send(event.name, event.as_dict())
+
+    async def convert():
+        try:
+            try:
+                response = await _run_conversion(
+                    filename, temp_pdf, options, progress, timings
+                )
+            finally:
+                with timings.measure("cleanup"):
+                    _remove_temp_files(temp_pdf, temp_job_offer)
+            _finish_timings(filename, response, timings)
+            send("result", response.model_dump(mode="json"))
+        except HTTPException as e:
+            send("error", {"detail": e.detail})
+        except Exception as e:
+            api_logger.error(f"Erreur lors de la conversion: {str(e)}", exc_info=True)
+            send("error", {"detail": t("error_internal", lang="fr", error=str(e))})
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    task = asyncio.ensure_future(convert())
+    _streamed_conversions.add(task)
+    task.add_done_callback(_streamed_conversions.discard)
+
+    yield _sse_event("accepted", {"filename": filename})
+    while True:
+        try:
+            item = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE_SECONDS)
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+        if item is None:
+            break
+        yield _sse_event(*item)
+
+
+@app.post("/api/convert/stream", dependencies=[Depends(_verify_api_token)])
+async def convert_cv_stream(
+    file: UploadFile = File(..., description=t("file_description", lang="fr")),
+    generate_pitch: str = Form("true"),
+    improvement_mode: str = Form(
+        "none", description=t("improvement_mode_description", lang="fr")
+    ),
+    job_offer_file: Optional[UploadFile] = File(
+        None, description=t("job_offer_description", lang="fr")
+    ),
+    candidate_name: Optional[str] = Form(
+        None, description=t("candidate_name_description", lang="fr")
+    ),
+    max_pages: Optional[str] = Form(
+        None, description=t("max_pages_description", lang="fr")
+    ),
+    target_language: Optional[str] = Form(
+        None, description=t("target_language_description", lang="fr")
+    ),
+    model: Optional[str] = Form(
+        DEFAULT_MODEL,
+        description='Modèle à utiliser (clé de AVAILABLE_MODELS, ou "auto" pour le routeur)',
+    ),
+):
+    """
+    Variante de ``/api/convert`` diffusant l'avancement en Server-Sent Events
+
+    Mêmes paramètres. Événements (données JSON) : accepted, extracted (pages),
+    llm_tokens (tokens reçus), structured, docx_rendered, pitch_ready, puis
+    result (ConversionResponse) ou error (detail). Les paramètres invalides
+    sont refusés avant le flux (400).
+
+    Returns:
+        StreamingResponse ``text/event-stream``
+    """
+    improvement_mode_enum = _validate_conversion_request(
+        file, improvement_mode, job_offer_file, model
+    )
+    api_logger.info(
+        f"Requête de conversion (flux) reçue: {_anon(file.filename)} "
+        f"(mode: {improvement_mode})"
+    )
+
+    # Les fichiers sont enregistrés avant le flux (fermés après la requête)
+    timings = ConversionTimings()
+    with timings.measure("upload"):
+        temp_pdf = _save_upload(file)
+        temp_job_offer = _save_upload(job_offer_file) if job_offer_file else None
+    uploads = [temp_pdf, temp_job_offer]
+    options = _conversion_options(
+        generate_pitch,
+        improvement_mode_enum,
+        temp_job_offer,
+        candidate_name,
+        max_pages,
+        target_language,
+        model,
+    )
+
+    return StreamingResponse(
+        _conversion_events(file.filename, uploads, options, timings),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(_release_uploads, uploads),
+    )
 
 
 @app.post("/api/convert/download", dependencies=[Depends(_verify_api_token)])
@@ -346,32 +692,9 @@ async def convert_and_download_cv(
     Returns:
         Fichier DOCX converti
     """
-    # Validation du type de fichier
-    if not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=t("error_file_must_be_pdf", lang="fr"),
-        )
-
-    # Validation du mode d'amélioration
-    try:
-        improvement_mode_enum = ImprovementMode(improvement_mode.lower())
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=t(
-                "error_invalid_improvement_mode",
-                lang="fr",
-                values=", ".join([m.value for m in ImprovementMode]),
-            ),
-        )
-
-    # Validation: si mode targeted, l'appel d'offres est requis
-    if improvement_mode_enum == ImprovementMode.TARGETED and not job_offer_file:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=t("error_job_offer_required", lang="fr"),
-        )
+    improvement_mode_enum = _validate_conversion_request(
+        file, improvement_mode, job_offer_file, None
+    )
 
     temp_pdf = None
     temp_job_offer = None
@@ -381,31 +704,21 @@ async def convert_and_download_cv(
             f"Requête de conversion+téléchargement: {_anon(file.filename)} (mode: {improvement_mode})"
         )
 
-        # Sauvegarder le CV uploadé
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-            shutil.copyfileobj(file.file, tmp)
-            temp_pdf = tmp.name
-
-        # Sauvegarder l'appel d'offres si fourni
-        job_offer_path = None
+        temp_pdf = _save_upload(file)
         if job_offer_file:
-            file_extension = Path(job_offer_file.filename).suffix
-            with tempfile.NamedTemporaryFile(
-                delete=False, suffix=file_extension
-            ) as tmp:
-                shutil.copyfileobj(job_offer_file.file, tmp)
-                temp_job_offer = tmp.name
-                job_offer_path = temp_job_offer
-
-        # Convertir avec les nouveaux paramètres
-        improve_content = improvement_mode_enum != ImprovementMode.NONE
+            temp_job_offer = _save_upload(job_offer_file)
+
+        options = _conversion_options(
+            "true",
+            improvement_mode_enum,
+            temp_job_offer,
+            None,
+            None,
+            None,
+            DEFAULT_MODEL,
+        )
         success, docx_path, cv_data, pitch, processing_time = (
-            conversion_service.convert_pdf_to_docx(
-                temp_pdf,
-                improve_content=improve_content,
-                improvement_mode=improvement_mode_enum.value,
-                job_offer_path=job_offer_path,
-            )
+            await conversion_service.convert_pdf_to_docx_async(temp_pdf, **options)
         )
 
         if not success or not docx_path:
@@ -447,10 +760,7 @@ async def convert_and_download_cv(
         )
     finally:
         # Nettoyage des fichiers temporaires
-        if temp_pdf and Path(temp_pdf).exists():
-            Path(temp_pdf).unlink()
-        if temp_job_offer and Path(temp_job_offer).exists():
-            Path(temp_job_offer).unlink()
+        _remove_temp_files(temp_pdf, temp_job_offer)
 
 
 @app.get(
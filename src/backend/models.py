@@ -94,6 +94,13 @@ class ConversionResponse(BaseModel):
     processing_time: Optional[float] = Field(
         None, description="Temps de traitement en secondes"
     )
+    llm_usage: Optional[Dict[str, Any]] = Field(
+        None, description="Appels LLM de la conversion (tokens, latences, cache)"
+    )
+    timings: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Durées par étape (upload, extraction, LLM, DOCX, pitch, nettoyage) et hits du cache",
+    )
     created_at: datetime = Field(
         default_factory=datetime.now, description="Date de création"
     )
@@ -105,3 +112,80 @@ class HealthCheck(BaseModel):
     status: str = Field(..., description="Statut de l'API")
     version: str = Field(..., description="Version de l'application")
     timestamp: datetime = Field(default_factory=datetime.now)
+
+
+class CacheTierStats(BaseModel):
+    """Compteurs d'un niveau du cache LLM"""
+
+    hits: int = Field(0, description="Lectures servies par ce niveau")
+    misses: int = Field(0, description="Lectures absentes de ce niveau")
+    evictions: int = Field(0, description="Entrées évincées")
+    bytes_served: int = Field(0, description="Octets servis par ce niveau")
+    entries: int = Field(0, description="Nombre d'entrées")
+    size_bytes: int = Field(0, description="Taille occupée en octets")
+
+
+class CacheStats(BaseModel):
+    """Statistiques du cache LLM (mémoire + disque)"""
+
+    memory: CacheTierStats = Field(..., description="Niveau LRU en mémoire")
+    disk: CacheTierStats = Field(..., description="Niveau disque (diskcache)")
+    coalesced: int = Field(
+        0, description="Appels identiques coalescés sur un appel en cours"
+    )
+
+
+class LLMModelStats(BaseModel):
+    """Métriques de résilience des appels LLM d'un modèle"""
+
+    calls: int = Field(0, description="Appels demandés")
+    successes: int = Field(0, description="Appels réussis")
+    failures: int = Field(0, description="Appels en échec après nouvelles tentatives")
+    retries: int = Field(0, description="Nouvelles tentatives effectuées")
+    short_circuited: int = Field(0, description="Appels refusés (circuit ouvert)")
+    breaker_opens: int = Field(0, description="Ouvertures du circuit")
+    hedges: int = Field(0, description="Requêtes dupliquées envoyées (hedging)")
+    hedge_wins: int = Field(0, description="Requêtes dupliquées arrivées en premier")
+    latency_p50: Optional[float] = Field(None, description="Latence médiane (s)")
+    latency_p95: Optional[float] = Field(None, description="Latence au 95e centile (s)")
+    breaker: str = Field(
+        "closed", description="État du circuit (closed, open, half_open)"
+    )
+
+
+class LLMStats(BaseModel):
+    """Métriques de résilience des appels LLM, par modèle"""
+
+    models: Dict[str, LLMModelStats] = Field(default_factory=dict)
+    transport: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Pool de connexions HTTP partagé (configuration et saturation)",
+    )
+
+
+class SpeculationResponse(BaseModel):
+    """Résultat du lancement d'une pré-extraction spéculative"""
+
+    speculation_id: Optional[str] = Field(
+        None, description="Identifiant (annulation de la pré-extraction)"
+    )
+    status: str = Field(
+        ..., description="running, rejected (budget atteint) ou disabled"
+    )
+
+
+class LLMTelemetrySnapshot(BaseModel):
+    """Télémétrie agrégée des appels LLM, par type d'appel"""
+
+    kinds: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Compteurs et histogrammes (latence, tokens) par type d'appel",
+    )
+    schema_savings: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Tokens générés et latence moyens par modèle et variante de schéma",
+    )
+    stages: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Histogrammes des durées par étape du pipeline de conversion",
+    )
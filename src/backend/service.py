@@ -3,14 +3,17 @@
 import sys
 import time
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
 # Ajouter le répertoire racine au PYTHONPATH
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from config.logging_config import conversion_logger
-from config.settings import get_settings
-from core.agent import CVConverterAgent
+from config.settings import DEFAULT_MODEL, get_settings
+from core.agent import CVConverterAgent, run_blocking
+from core.events import ProgressEvent, stage_metrics
+from core.speculative import SpeculativeExtractor, file_fingerprint
+from core.telemetry import ConversionTelemetry
 
 
 class CVConversionService:
@@ -19,6 +22,9 @@ class CVConversionService:
     def __init__(self):
         self.settings = get_settings()
         self.agent = CVConverterAgent()
+        # Durées par étape agrégées pour /api/llm/telemetry
+        self.agent.events.subscribe(stage_metrics)
+        self.speculative = SpeculativeExtractor.from_settings(self.agent)
         self.logger = conversion_logger
 
     def convert_pdf_to_docx(
@@ -32,7 +38,9 @@ class CVConversionService:
         candidate_name: Optional[str] = None,
         max_pages: Optional[int] = None,
         target_language: Optional[str] = None,
-        model: str = "gpt-4o-mini",
+        model: str = DEFAULT_MODEL,
+        llm_usage: Optional[ConversionTelemetry] = None,
+        progress: Optional[Callable[[ProgressEvent], None]] = None,
     ) -> Tuple[bool, Optional[str], Optional[dict], Optional[str], float]:
         """
         Convertit un CV PDF en DOCX
@@ -47,7 +55,9 @@ class CVConversionService:
             candidate_name: Nom du candidat (optionnel, remplacera le nom extrait)
             max_pages: Nombre maximum de pages (optionnel)
             target_language: Langue cible pour la traduction (optionnel: fr, en, it, es)
-            model: Modèle OpenAI à utiliser (gpt-4o, gpt-4o-mini, gpt-3.5-turbo)
+            model: Modèle à utiliser (clé de AVAILABLE_MODELS, ou "auto" pour le routeur)
+            llm_usage: Bilan à compléter avec les appels LLM (tokens, latences)
+            progress: Appelé à chaque étape franchie (cf. ``CVConverterAgent.process_cv``)
 
         Returns:
             Tuple (success, docx_path, cv_data, pitch, processing_time)
@@ -57,18 +67,7 @@ class CVConversionService:
         try:
             self.logger.info(f"Début de conversion: {pdf_path}")
 
-            # Validation du fichier
-            pdf_file = Path(pdf_path)
-            if not pdf_file.exists():
-                raise FileNotFoundError(f"Fichier PDF introuvable: {pdf_path}")
-
-            # Vérifier la taille du fichier
-            file_size_mb = pdf_file.stat().st_size / (1024 * 1024)
-            if file_size_mb > self.settings.MAX_FILE_SIZE_MB:
-                raise ValueError(
-                    f"Fichier trop volumineux: {file_size_mb:.2f}MB "
-                    f"(max: {self.settings.MAX_FILE_SIZE_MB}MB)"
-                )
+            self._validate_input_file(pdf_path)
 
             # Conversion avec options
             output_file, cv_data = self.agent.process_cv(
@@ -82,21 +81,79 @@ class CVConversionService:
                 max_pages=max_pages,
                 target_language=target_language,
                 model=model,
+                llm_usage=llm_usage,
+                progress=progress,
             )
 
-            # Récupération du pitch (peut être None si generate_pitch=False)
-            pitch = cv_data.get("pitch") if isinstance(cv_data, dict) else None
+            pitch = self._extract_pitch(cv_data, generate_pitch)
+
+            processing_time = time.time() - start_time
+
+            self.logger.info(
+                f"Conversion réussie: {output_file} " f"(durée: {processing_time:.2f}s)"
+            )
 
-            # Log pour debug
-            if generate_pitch:
-                if pitch:
-                    self.logger.info(
-                        f"Pitch généré avec succès: {len(pitch)} caractères"
-                    )
-                else:
-                    self.logger.warning(
-                        "Le pitch n'a pas été généré malgré generate_pitch=True"
-                    )
+            return True, output_file, cv_data, pitch, processing_time
+
+        except Exception as e:
+            processing_time = time.time() - start_time
+            self.logger.error(f"Erreur de conversion: {str(e)}", exc_info=True)
+            return False, None, None, None, processing_time
+
+    async def convert_pdf_to_docx_async(
+        self,
+        pdf_path: str,
+        output_path: Optional[str] = None,
+        generate_pitch: bool = True,
+        improve_content: bool = False,
+        improvement_mode: str = "none",
+        job_offer_path: Optional[str] = None,
+        candidate_name: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        target_language: Optional[str] = None,
+        model: str = DEFAULT_MODEL,
+        llm_usage: Optional[ConversionTelemetry] = None,
+        progress: Optional[Callable[[ProgressEvent], None]] = None,
+    ) -> Tuple[bool, Optional[str], Optional[dict], Optional[str], float]:
+        """
+        Variante asyncio de ``convert_pdf_to_docx`` (utilisée par l'API)
+
+        Mêmes arguments et même valeur de retour ; ne bloque pas la boucle
+        d'événements pendant l'extraction, les appels LLM et la génération DOCX.
+
+        Returns:
+            Tuple (success, docx_path, cv_data, pitch, processing_time)
+        """
+        start_time = time.time()
+
+        try:
+            self.logger.info(f"Début de conversion (async): {pdf_path}")
+
+            self._validate_input_file(pdf_path)
+
+            # Pré-extraction du même fichier en cours : attendre son résultat
+            if self.settings.SPECULATIVE_EXTRACTION:
+                # Lecture et hachage du fichier hors de la boucle d'événements
+                fingerprint = await run_blocking(file_fingerprint, pdf_path, model)
+                if await self.speculative.claim_fingerprint(fingerprint):
+                    self.logger.info("Pré-extraction réclamée (cache chaud)")
+
+            output_file, cv_data = await self.agent.process_cv_async(
+                pdf_path,
+                output_path,
+                generate_pitch=generate_pitch,
+                improve_content=improve_content,
+                improvement_mode=improvement_mode,
+                job_offer_path=job_offer_path,
+                candidate_name=candidate_name,
+                max_pages=max_pages,
+                target_language=target_language,
+                model=model,
+                llm_usage=llm_usage,
+                progress=progress,
+            )
+
+            pitch = self._extract_pitch(cv_data, generate_pitch)
 
             processing_time = time.time() - start_time
 
@@ -111,6 +168,41 @@ class CVConversionService:
             self.logger.error(f"Erreur de conversion: {str(e)}", exc_info=True)
             return False, None, None, None, processing_time
 
+    def _validate_input_file(self, pdf_path: str) -> None:
+        """
+        Vérifie l'existence et la taille du fichier à convertir
+
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas
+            ValueError: Si le fichier dépasse MAX_FILE_SIZE_MB
+        """
+        pdf_file = Path(pdf_path)
+        if not pdf_file.exists():
+            raise FileNotFoundError(f"Fichier PDF introuvable: {pdf_path}")
+
+        # Vérifier la taille du fichier
+        file_size_mb = pdf_file.stat().st_size / (1024 * 1024)
+        if file_size_mb > self.settings.MAX_FILE_SIZE_MB:
+            raise ValueError(
+                f"Fichier trop volumineux: {file_size_mb:.2f}MB "
+                f"(max: {self.settings.MAX_FILE_SIZE_MB}MB)"
+            )
+
+    def _extract_pitch(self, cv_data: dict, generate_pitch: bool) -> Optional[str]:
+        """Récupère le pitch des données CV (peut être None si generate_pitch=False)"""
+        pitch = cv_data.get("pitch") if isinstance(cv_data, dict) else None
+
+        # Log pour debug
+        if generate_pitch:
+            if pitch:
+                self.logger.info(f"Pitch généré avec succès: {len(pitch)} caractères")
+            else:
+                self.logger.warning(
+                    "Le pitch n'a pas été généré malgré generate_pitch=True"
+                )
+
+        return pitch
+
     def validate_cv_data(self, cv_data: dict) -> bool:
         """
         Valide les données extraites du CV
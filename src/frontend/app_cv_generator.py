@@ -15,7 +15,7 @@ from components.api_utils import display_api_status
 from components.auth import render_user_info, require_auth
 
 # Import des composants
-from components.conversion import process_conversion
+from components.conversion import process_conversion, speculate_uploads
 from components.help import render_user_guide
 from components.history import get_cv_from_history, render_history_sidebar
 from components.options import render_processing_options
@@ -119,39 +119,52 @@ if uploaded_files:
 
     with col1:
         # Importer la configuration des modèles
-        from config.settings import AVAILABLE_MODELS
+        from config.settings import AUTO_MODEL, AVAILABLE_MODELS
 
-        # Créer la liste déroulante pour le modèle
-        model_options = list(AVAILABLE_MODELS.keys())
-        model_labels = [AVAILABLE_MODELS[key]["name"] for key in model_options]
+        # Créer la liste déroulante pour le modèle ("auto" = routeur de modèles)
+        model_options = [AUTO_MODEL] + list(AVAILABLE_MODELS.keys())
+        model_labels = [t("model_auto_name")] + [
+            AVAILABLE_MODELS[key]["name"] for key in model_options[1:]
+        ]
 
         selected_model_index = st.selectbox(
             t("select_model"),
             options=range(len(model_options)),
             format_func=lambda i: model_labels[i],
-            index=0,  # Mistral-Small-3.2-24B-Instruct-2506 par défaut
+            index=0,  # Sélection automatique par défaut
             help=t("select_model_help"),
         )
 
         selected_model_key = model_options[selected_model_index]
-        model_info = AVAILABLE_MODELS[selected_model_key]
 
-        # Récupérer les textes traduits via les clés
-        performance_text = (
-            f"{model_info['performance']} {t(model_info['performance_key'])}"
-        )
-        cost_text = f"{model_info['cost']} {t(model_info['cost_label_key'])}"
-        cost_details = t(model_info["cost_key"])
-        description = t(model_info["description_key"])
+        # Pré-extraction en arrière-plan pendant le choix des options
+        if settings.SPECULATIVE_EXTRACTION:
+            speculate_uploads(uploaded_files, API_URL, model=selected_model_key)
+
+        if selected_model_key == AUTO_MODEL:
+            model_details = f"<small>{t('model_auto_desc')}</small>"
+        else:
+            model_info = AVAILABLE_MODELS[selected_model_key]
+
+            # Récupérer les textes traduits via les clés
+            performance_text = (
+                f"{model_info['performance']} {t(model_info['performance_key'])}"
+            )
+            cost_text = f"{model_info['cost']} {t(model_info['cost_label_key'])}"
+            cost_details = t(model_info["cost_key"])
+            description = t(model_info["description_key"])
+            model_details = (
+                f"<strong>Performance:</strong> {performance_text}<br>"
+                f"<strong>Coût:</strong> {cost_text} ({cost_details})<br>"
+                f"<small>{description}</small>"
+            )
 
         # Afficher les infos du modèle sélectionné
         st.markdown(
             f"""
         <div style='background-color: #f0f2f6; padding: 10px; border-radius: 5px; margin-top: 10px;'>
             <p style='margin: 0; font-size: 0.9em;'>
-                <strong>Performance:</strong> {performance_text}<br>
-                <strong>Coût:</strong> {cost_text} ({cost_details})<br>
-                <small>{description}</small>
+                {model_details}
             </p>
         </div>
         """,
@@ -185,7 +198,7 @@ if uploaded_files:
             candidate_name=candidate_name,
             max_pages=max_pages,
             target_language=current_language,
-            model=model_info["model_id"],
+            model=selected_model_key,
         )
 
 # Afficher les résultats (persiste après download)
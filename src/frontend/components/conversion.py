@@ -1,6 +1,7 @@
 """Composant de conversion et traitement des CV"""
 
 import hashlib
+import json
 
 import requests
 import streamlit as st
@@ -8,6 +9,7 @@ from components.history import get_cv_from_history, save_cv_to_history
 from components.translations import t
 
 from config.logging_config import app_logger
+from config.settings import DEFAULT_MODEL
 
 
 def _api_headers() -> dict:
@@ -23,11 +25,75 @@ def _api_headers() -> dict:
     return {}
 
 
+# Avancement de la conversion d'un fichier à chaque étape signalée par l'API
+_STAGE_PROGRESS = {
+    "accepted": 0.05,
+    "extracted": 0.2,
+    "structured": 0.7,
+    "docx_rendered": 0.85,
+    "pitch_ready": 0.95,
+}
+# Tokens reçus pour lesquels la structuration affiche la moitié de son avancement
+_LLM_TOKENS_HALF_PROGRESS = 1000
+# Événements affichés (les autres : début/fin d'étape, options... sont ignorés)
+_DISPLAYED_STAGES = {*_STAGE_PROGRESS, "llm_tokens"}
+
+
 def _anon(name: str) -> str:
     """Anonymise un nom de fichier pour les logs (anti-PII)."""
     return hashlib.sha256(name.encode()).hexdigest()[:10]
 
 
+def speculate_uploads(uploaded_files, api_url, model=DEFAULT_MODEL):
+    """
+    Lance la pré-extraction spéculative des CV uploadés (SPECULATIVE_EXTRACTION)
+
+    Le backend extrait et structure les CV pendant le choix des options ; un
+    seul envoi par jeu de fichiers et modèle, les pré-extractions du jeu
+    précédent sont annulées. Best effort : une erreur n'affecte pas l'interface.
+
+    Args:
+        uploaded_files: Liste des fichiers uploadés
+        api_url: URL de l'API
+        model: Modèle sélectionné (clé de AVAILABLE_MODELS, ou "auto")
+    """
+    signature = ([f.name for f in uploaded_files], model)
+    previous = st.session_state.get("speculations")
+    if previous and previous["signature"] == signature:
+        return
+
+    try:
+        for speculation_id in previous["ids"] if previous else []:
+            requests.post(
+                f"{api_url}/api/speculate/{speculation_id}/cancel",
+                headers=_api_headers(),
+                timeout=5,
+            )
+
+        ids = []
+        for uploaded_file in uploaded_files:
+            response = requests.post(
+                f"{api_url}/api/speculate",
+                files={
+                    "file": (
+                        uploaded_file.name,
+                        uploaded_file.getvalue(),
+                        _get_mime_type(uploaded_file.name),
+                    )
+                },
+                data={"model": model},
+                headers=_api_headers(),
+                timeout=10,
+            )
+            if response.status_code == 200 and response.json().get("speculation_id"):
+                ids.append(response.json()["speculation_id"])
+    except requests.exceptions.RequestException as e:
+        app_logger.warning(f"Pré-extraction non lancée: {str(e)}")
+        ids = []
+
+    st.session_state["speculations"] = {"signature": signature, "ids": ids}
+
+
 def process_conversion(
     uploaded_files,
     improvement_mode,
@@ -37,7 +103,7 @@ def process_conversion(
     candidate_name=None,
     max_pages=None,
     target_language="fr",
-    model="gpt-4o-mini",
+    model=DEFAULT_MODEL,
 ):
     """
     Lance la conversion des CV
@@ -51,7 +117,7 @@ def process_conversion(
         candidate_name: Nom du candidat (optionnel)
         max_pages: Nombre maximum de pages (optionnel)
         target_language: Langue cible pour la traduction du CV (fr, en, it, es)
-        model: Modèle OpenAI à utiliser (gpt-4o, gpt-4o-mini, gpt-3.5-turbo)
+        model: Modèle à utiliser (clé de AVAILABLE_MODELS, ou "auto" pour le routeur)
     """
     # Validation: si mode targeted, l'appel d'offres est requis
     if improvement_mode == "targeted" and not job_offer_file:
@@ -124,9 +190,6 @@ def process_conversion(
                     continue
 
                 # Pas en cache, faire l'appel API
-                # Étape 1: Préparation
-                progress_bar.progress(base_progress + step_size * 0.25)
-
                 # Préparer les données
                 files = {
                     "file": (
@@ -144,9 +207,6 @@ def process_conversion(
                         _get_mime_type(job_offer_file.name),
                     )
 
-                # Étape 2: Envoi à l'API
-                progress_bar.progress(base_progress + step_size * 0.50)
-
                 # Préparer les données du formulaire
                 form_data = {
                     "generate_pitch": str(generate_pitch).lower(),
@@ -166,20 +226,27 @@ def process_conversion(
                 if target_language and target_language != "fr":
                     form_data["target_language"] = target_language
 
-                response = requests.post(
-                    f"{api_url}/api/convert",
-                    files=files,
-                    data=form_data,
-                    headers=_api_headers(),
-                    timeout=300,
+                processing_message = t(
+                    "processing_cv",
+                    current=file_index,
+                    total=total_files,
+                    filename=uploaded_file.name,
                 )
 
-                # Étape 3: Traitement de la réponse
-                progress_bar.progress(base_progress + step_size * 0.75)
+                def on_stage(event, data):
+                    fraction = _stage_fraction(event, data)
+                    if fraction is not None:
+                        progress_bar.progress(base_progress + step_size * fraction)
+                    status_text.text(
+                        f"{processing_message} — {_stage_label(event, data)}"
+                    )
 
-                if response.status_code == 200:
-                    result = response.json()
+                # Conversion avec suivi des étapes en direct (Server-Sent Events)
+                status_code, result = _convert_with_progress(
+                    api_url, files, form_data, on_stage
+                )
 
+                if status_code == 200:
                     # Récupérer l'ID de conversion depuis la réponse
                     conversion_id = result.get("conversion_id")
 
@@ -243,7 +310,7 @@ def process_conversion(
                     all_results.append(
                         {
                             "filename": uploaded_file.name,
-                            "error": response.json().get("detail", t("unknown_error")),
+                            "error": result.get("detail", t("unknown_error")),
                             "success": False,
                         }
                     )
@@ -277,6 +344,75 @@ def process_conversion(
         app_logger.error(f"Erreur frontend: {str(e)}", exc_info=True)
 
 
+def _iter_sse(response):
+    """Événements ``(nom, données)`` d'une réponse Server-Sent Events
+
+    Les commentaires (lignes ``:``, maintien de la connexion) sont ignorés.
+    """
+    event, data = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line.partition(":")[2].strip()
+        elif line.startswith("data:"):
+            data.append(line.partition(":")[2].strip())
+
+
+def _stage_fraction(event, data):
+    """Part de la conversion d'un fichier atteinte à cet événement (None : inchangée)"""
+    if event == "llm_tokens":
+        # Le nombre total de tokens n'est pas connu : progression asymptotique
+        tokens = data.get("tokens", 0)
+        return 0.2 + 0.5 * tokens / (tokens + _LLM_TOKENS_HALF_PROGRESS)
+    return _STAGE_PROGRESS.get(event)
+
+
+def _stage_label(event, data):
+    """Libellé traduit d'une étape signalée par l'API"""
+    if event == "extracted" and data.get("cached"):
+        return t("stage_extracted_cached")
+    return t(f"stage_{event}", **data)
+
+
+def _convert_with_progress(api_url, files, form_data, on_stage):
+    """
+    Convertit un CV via ``/api/convert/stream`` en suivant les étapes en direct
+
+    Args:
+        api_url: URL de l'API
+        files: Fichiers du formulaire (CV, appel d'offres)
+        form_data: Options de conversion
+        on_stage: Appelé avec ``(événement, données)`` à chaque étape affichée
+
+    Returns:
+        Tuple (status_code, données) : la ConversionResponse (200) ou ``{"detail": ...}``
+    """
+    # Délai de lecture entre deux messages (l'API en envoie au moins toutes les 15 s)
+    with requests.post(
+        f"{api_url}/api/convert/stream",
+        files=files,
+        data=form_data,
+        headers=_api_headers(),
+        stream=True,
+        timeout=(10, 300),
+    ) as response:
+        if response.status_code != 200:
+            return response.status_code, response.json()
+
+        for event, data in _iter_sse(response):
+            if event == "result":
+                return 200, data
+            if event == "error":
+                return 500, data
+            if event in _DISPLAYED_STAGES:
+                on_stage(event, data)
+
+    return 500, {"detail": t("unknown_error")}
+
+
 def _get_mime_type(filename: str) -> str:
     """Retourne le type MIME en fonction de l'extension du fichier"""
     if filename.endswith(".pdf"):
@@ -150,9 +150,14 @@ def _render_cv_result(res, index, total_files, generate_pitch):
                 st.error(t("download_error", status=download_status))
 
             # Informations de traitement
-            col1, col2, col3 = st.columns(3)
+            timings = (result.get("timings") or {}).get("stages") or {}
+            col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric(t("metric_time"), f"{result['processing_time']:.2f}s")
+                st.metric(
+                    t("metric_time"),
+                    f"{result['processing_time']:.2f}s",
+                    help=_timings_help(timings),
+                )
             with col2:
                 st.metric(
                     t("metric_name"),
@@ -164,6 +169,8 @@ def _render_cv_result(res, index, total_files, generate_pitch):
                 )
             with col3:
                 st.metric(t("metric_status"), t("status_success"))
+            with col4:
+                st.metric(t("metric_slowest_stage"), _slowest_stage(timings))
 
             # Afficher les compétences avec niveaux de maîtrise
             _render_skills_assessment(
@@ -173,6 +180,29 @@ def _render_cv_result(res, index, total_files, generate_pitch):
             st.error(t("error", error=res["error"]))
 
 
+def _stage_timing(stage, entry):
+    """Libellé d'une étape du détail des durées : nom traduit, durée, cache"""
+    cached = f" ({t('timing_cached')})" if entry.get("cached") else ""
+    return f"{t(f'timing_{stage}')} : {entry['duration']:.2f}s{cached}"
+
+
+def _timings_help(timings):
+    """Détail des durées par étape (infobulle du temps de traitement)"""
+    if not timings:
+        return None
+    return "\n".join(
+        f"- {_stage_timing(stage, entry)}" for stage, entry in timings.items()
+    )
+
+
+def _slowest_stage(timings):
+    """Étape la plus longue de la conversion (N/A sans détail des durées)"""
+    if not timings:
+        return "N/A"
+    stage = max(timings, key=lambda name: timings[name]["duration"])
+    return f"{t(f'timing_{stage}')} ({timings[stage]['duration']:.2f}s)"
+
+
 def _render_skills_assessment(skills_assessment):
     """Affiche les compétences avec barres de progression horizontales
 
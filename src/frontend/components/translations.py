@@ -88,6 +88,8 @@ TRANSLATIONS = {
         "model_perf_excellent": "Excellent",
         "model_perf_very_good": "Très bon",
         "model_perf_good": "Bon",
+        "model_auto_name": "Automatique (recommandé)",
+        "model_auto_desc": "Choisit le modèle selon la longueur du CV, le mode d'amélioration et la disponibilité des modèles : rapide pour les CV simples, plus puissant pour les réécritures ciblées.",
         # Modèles IA - Coût
         "model_cost_high": "~0,03$/CV généré",
         "model_cost_medium": "~0,003$/CV généré",
@@ -110,6 +112,13 @@ TRANSLATIONS = {
         "connection_error": "❌ Erreur de connexion à l'API",
         "error": "❌ Erreur: {error}",
         "unknown_error": "Erreur inconnue",
+        "stage_accepted": "Conversion lancée...",
+        "stage_extracted": "{pages} page(s) extraite(s)",
+        "stage_extracted_cached": "Fichier déjà traité (cache)",
+        "stage_llm_tokens": "Structuration par l'IA : {tokens} tokens reçus",
+        "stage_structured": "CV structuré",
+        "stage_docx_rendered": "Document Word généré",
+        "stage_pitch_ready": "Pitch prêt",
         # Résultats
         "results_title": "📊 Résultats",
         "results_success": "✅ {success}/{total} CV converti(s) avec succès",
@@ -129,6 +138,17 @@ TRANSLATIONS = {
         "metric_time": "Temps",
         "metric_name": "Nom",
         "metric_status": "Statut",
+        "metric_slowest_stage": "Étape la plus lente",
+        "timing_upload": "Upload",
+        "timing_cache_lookup": "Cache",
+        "timing_extraction": "Extraction",
+        "timing_preprocessing": "Prétraitement",
+        "timing_job_offer": "Appel d'offres",
+        "timing_llm_extraction": "Analyse LLM",
+        "timing_docx_render": "Rendu Word",
+        "timing_pitch": "Pitch",
+        "timing_cleanup": "Nettoyage",
+        "timing_cached": "cache",
         "status_success": "✅ Succès",
         "skills_title": "🎯 Compétences et Niveau de Maîtrise",
         "skills_empty": "Aucune évaluation de compétences disponible",
@@ -268,6 +288,8 @@ TRANSLATIONS = {
         "model_perf_excellent": "Excellent",
         "model_perf_very_good": "Very Good",
         "model_perf_good": "Good",
+        "model_auto_name": "Automatic (recommended)",
+        "model_auto_desc": "Picks the model from the CV length, the improvement mode and model availability: fast for simple CVs, more powerful for targeted rewrites.",
         # AI Models - Cost
         "model_cost_high": "~$0.03/CV generated",
         "model_cost_medium": "~$0.003/CV generated",
@@ -290,6 +312,13 @@ TRANSLATIONS = {
         "connection_error": "❌ API connection error",
         "error": "❌ Error: {error}",
         "unknown_error": "Unknown error",
+        "stage_accepted": "Conversion started...",
+        "stage_extracted": "{pages} page(s) extracted",
+        "stage_extracted_cached": "File already processed (cache)",
+        "stage_llm_tokens": "AI structuring: {tokens} tokens received",
+        "stage_structured": "CV structured",
+        "stage_docx_rendered": "Word document generated",
+        "stage_pitch_ready": "Pitch ready",
         # Results
         "results_title": "📊 Results",
         "results_success": "✅ {success}/{total} CV(s) converted successfully",
@@ -309,6 +338,17 @@ TRANSLATIONS = {
         "metric_time": "Time",
         "metric_name": "Name",
         "metric_status": "Status",
+        "metric_slowest_stage": "Slowest stage",
+        "timing_upload": "Upload",
+        "timing_cache_lookup": "Cache",
+        "timing_extraction": "Extraction",
+        "timing_preprocessing": "Preprocessing",
+        "timing_job_offer": "Job offer",
+        "timing_llm_extraction": "LLM analysis",
+        "timing_docx_render": "Word rendering",
+        "timing_pitch": "Pitch",
+        "timing_cleanup": "Cleanup",
+        "timing_cached": "cache",
         "status_success": "✅ Success",
         "skills_title": "🎯 Skills and Proficiency Level",
         "skills_empty": "No skills assessment available",
@@ -448,6 +488,8 @@ TRANSLATIONS = {
         "model_perf_excellent": "Eccellente",
         "model_perf_very_good": "Molto buono",
         "model_perf_good": "Buono",
+        "model_auto_name": "Automatico (consigliato)",
+        "model_auto_desc": "Sceglie il modello in base alla lunghezza del CV, alla modalità di miglioramento e alla disponibilità dei modelli: veloce per i CV semplici, più potente per le riscritture mirate.",
         # Modelli IA - Costo
         "model_cost_high": "~$0,03/CV generato",
         "model_cost_medium": "~$0,003/CV generato",
@@ -467,6 +509,13 @@ TRANSLATIONS = {
         "connection_error": "❌ Errore di connessione API",
         "error": "❌ Errore: {error}",
         "unknown_error": "Errore sconosciuto",
+        "stage_accepted": "Conversione avviata...",
+        "stage_extracted": "{pages} pagina/e estratta/e",
+        "stage_extracted_cached": "File già elaborato (cache)",
+        "stage_llm_tokens": "Strutturazione IA: {tokens} token ricevuti",
+        "stage_structured": "CV strutturato",
+        "stage_docx_rendered": "Documento Word generato",
+        "stage_pitch_ready": "Pitch pronto",
         # Risultati
         "results_title": "📊 Risultati",
         "results_success": "✅ {success}/{total} CV convertito/i con successo",
@@ -486,6 +535,17 @@ TRANSLATIONS = {
         "metric_time": "Tempo",
         "metric_name": "Nome",
         "metric_status": "Stato",
+        "metric_slowest_stage": "Fase più lenta",
+        "timing_upload": "Upload",
+        "timing_cache_lookup": "Cache",
+        "timing_extraction": "Estrazione",
+        "timing_preprocessing": "Pre-elaborazione",
+        "timing_job_offer": "Bando",
+        "timing_llm_extraction": "Analisi LLM",
+        "timing_docx_render": "Generazione Word",
+        "timing_pitch": "Pitch",
+        "timing_cleanup": "Pulizia",
+        "timing_cached": "cache",
         "status_success": "✅ Successo",
         "skills_title": "🎯 Competenze e Livello di Padronanza",
         "skills_empty": "Nessuna valutazione delle competenze disponibile",
@@ -625,6 +685,8 @@ TRANSLATIONS = {
         "model_perf_excellent": "Excelente",
         "model_perf_very_good": "Muy bueno",
         "model_perf_good": "Bueno",
+        "model_auto_name": "Automático (recomendado)",
+        "model_auto_desc": "Elige el modelo según la longitud del CV, el modo de mejora y la disponibilidad de los modelos: rápido para CV simples, más potente para reescrituras dirigidas.",
         # Modelos IA - Costo
         "model_cost_high": "~$0,03/CV generado",
         "model_cost_medium": "~$0,003/CV generado",
@@ -644,6 +706,13 @@ TRANSLATIONS = {
         "connection_error": "❌ Error de conexión API",
         "error": "❌ Error: {error}",
         "unknown_error": "Error desconocido",
+        "stage_accepted": "Conversión iniciada...",
+        "stage_extracted": "{pages} página(s) extraída(s)",
+        "stage_extracted_cached": "Archivo ya procesado (caché)",
+        "stage_llm_tokens": "Estructuración por IA: {tokens} tokens recibidos",
+        "stage_structured": "CV estructurado",
+        "stage_docx_rendered": "Documento Word generado",
+        "stage_pitch_ready": "Pitch listo",
         # Resultados
         "results_title": "📊 Resultados",
         "results_success": "✅ {success}/{total} CV(s) convertido(s) exitosamente",
@@ -663,6 +732,17 @@ TRANSLATIONS = {
         "metric_time": "Tiempo",
         "metric_name": "Nombre",
         "metric_status": "Estado",
+        "metric_slowest_stage": "Etapa más lenta",
+        "timing_upload": "Subida",
+        "timing_cache_lookup": "Caché",
+        "timing_extraction": "Extracción",
+        "timing_preprocessing": "Preprocesamiento",
+        "timing_job_offer": "Oferta",
+        "timing_llm_extraction": "Análisis LLM",
+        "timing_docx_render": "Generación Word",
+        "timing_pitch": "Pitch",
+        "timing_cleanup": "Limpieza",
+        "timing_cached": "caché",
         "status_success": "✅ Éxito",
         "skills_title": "🎯 Habilidades y Nivel de Dominio",
         "skills_empty": "No hay evaluación de habilidades disponible",
@@ -17,6 +17,21 @@ os.environ.setdefault("AI_API_KEY", "test-key-for-testing")
 os.environ.setdefault("ENVIRONMENT", "testing")
 
 
+@pytest.fixture(autouse=True)
+def isolated_llm_cache(tmp_path, monkeypatch):
+    """Remplace le cache LLM sur disque par un cache temporaire propre à chaque test"""
+    from diskcache import Cache
+
+    from core.cache import TieredCache
+
+    cache = TieredCache(Cache(str(tmp_path / "llm_cache")))
+    monkeypatch.setattr("core.cache.llm_cache", cache)
+    monkeypatch.setattr("core.agent.llm_cache", cache)
+    monkeypatch.setattr("core.batch.llm_cache", cache)
+    yield cache
+    cache.close()
+
+
 @pytest.fixture(scope="session")
 def test_data_dir():
     """Fixture pour le répertoire de données de test"""
@@ -2,19 +2,24 @@
 Tests unitaires pour le module core.agent
 """
 
+import asyncio
 import json
 import os
 import sys
 import tempfile
+import threading
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 
 # Ajouter le répertoire racine au PYTHONPATH
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.agent import CVConverterAgent
+from config.settings import get_settings
+from core.agent import PITCH_SYSTEM_PROMPT, CVConverterAgent
+from core.telemetry import llm_telemetry
 
 
 class TestCVConverterAgent:
@@ -29,6 +34,9 @@ class TestCVConverterAgent:
             mock_openai.assert_called_once_with(
                 api_key="test-key",
                 base_url="https://oai.endpoints.kepler.ai.cloud.ovh.net/v1",
+                max_retries=0,
+                timeout=agent.http_pool.policy.timeout,
+                http_client=agent.http_pool.client,
             )
 
     def test_initialization_without_api_key(self):
@@ -53,8 +61,7 @@ class TestCVConverterAgent:
         with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
             agent = CVConverterAgent()
             key = agent._generate_cache_key("test content", False, "none")
-            assert key.startswith("cv_")
-            assert "_none_False" in key
+            assert key.startswith("default:cv:")
 
     @patch("core.agent.OpenAI")
     def test_generate_cache_key_with_job_offer(self, mock_openai):
@@ -66,7 +73,6 @@ class TestCVConverterAgent:
             )
             key2 = agent._generate_cache_key("test content", True, "targeted")
             assert key1 != key2
-            assert "_targeted_True_" in key1
 
     @patch("core.agent.OpenAI")
     def test_generate_cache_key_consistency(self, mock_openai):
@@ -77,6 +83,59 @@ class TestCVConverterAgent:
             key2 = agent._generate_cache_key("test", False, "none")
             assert key1 == key2
 
+    @patch("core.agent.OpenAI")
+    def test_generate_cache_key_covers_all_options(self, mock_openai):
+        """Test que langue, limite de pages et modèle changent la clé"""
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+            base = agent._generate_cache_key("test", False, "none")
+            variants = {
+                agent._generate_cache_key("test", False, "none", target_language="en"),
+                agent._generate_cache_key("test", False, "none", max_pages=2),
+                agent._generate_cache_key("test", False, "none", model="gpt-oss-120b"),
+            }
+            assert base not in variants
+            assert len(variants) == 3
+            # Le français (langue source) équivaut à l'absence de traduction
+            assert base == agent._generate_cache_key(
+                "test", False, "none", target_language="fr"
+            )
+
+    @patch("core.agent.OpenAI")
+    def test_generate_cache_key_changes_with_prompt_template(self, mock_openai):
+        """Test qu'une modification du template de prompt invalide la clé"""
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+            key1 = agent._generate_cache_key("test", False, "none")
+            with patch(
+                "core.prompts.PromptTemplates.get_base_prompt",
+                return_value="Nouveau prompt {pdf_text}",
+            ):
+                key2 = agent._generate_cache_key("test", False, "none")
+            assert key1 != key2
+
+    @patch("core.agent.OpenAI")
+    def test_pitch_cache_key_covers_only_prompt_inputs(self, mock_openai):
+        """Test que la clé du pitch ignore les champs non lus par le prompt"""
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+            cv_data = {
+                "header": {"name": "Jean Dupont", "title": "Dev", "experience": "5"},
+                "competences": {"operationnelles": ["Python"], "techniques": {}},
+                "experiences": [{"company": f"S{i}", "title": "Dev"} for i in range(4)],
+                "formations": ["Master"],
+            }
+            base = agent._generate_pitch_cache_key(cv_data)
+
+            edited = dict(cv_data, formations=[], suggested_tjm=650)
+            edited["experiences"] = cv_data["experiences"][:3] + [{"company": "X"}]
+            assert agent._generate_pitch_cache_key(edited) == base
+
+            renamed = dict(cv_data, header=dict(cv_data["header"], name="J. D."))
+            assert agent._generate_pitch_cache_key(renamed) != base
+            assert agent._generate_pitch_cache_key(cv_data, "Mission") != base
+            assert agent._generate_pitch_cache_key(cv_data, model="m2") != base
+
     @patch("core.agent.OpenAI")
     def test_extract_job_offer_content_file_not_found(self, mock_openai):
         """Test extraction d'appel d'offres avec fichier inexistant"""
@@ -171,7 +230,7 @@ class TestCVConverterAgent:
             agent = CVConverterAgent()
 
             # Simuler un cache vide
-            mock_cache.__contains__.return_value = False
+            mock_cache.get.return_value = None
 
             # Mock de la réponse OpenAI
             mock_response = Mock()
@@ -204,7 +263,7 @@ class TestCVConverterAgent:
             agent = CVConverterAgent()
 
             # Simuler un cache vide
-            mock_cache.__contains__.return_value = False
+            mock_cache.get.return_value = None
 
             mock_response = Mock()
             mock_response.choices = [Mock()]
@@ -240,7 +299,7 @@ class TestCVConverterAgent:
             agent = CVConverterAgent()
 
             # Simuler un cache vide
-            mock_cache.__contains__.return_value = False
+            mock_cache.get.return_value = None
 
             mock_response = Mock()
             mock_response.choices = [Mock()]
@@ -276,7 +335,7 @@ class TestCVConverterAgent:
             agent = CVConverterAgent()
 
             # Simuler un cache vide
-            mock_cache.__contains__.return_value = False
+            mock_cache.get.return_value = None
 
             mock_response = Mock()
             mock_response.choices = [Mock()]
@@ -312,7 +371,7 @@ class TestCVConverterAgent:
             agent = CVConverterAgent()
 
             # Simuler un cache vide
-            mock_cache.__contains__.return_value = False
+            mock_cache.get.return_value = None
 
             mock_response = Mock()
             mock_response.choices = [Mock()]
@@ -334,6 +393,245 @@ class TestCVConverterAgent:
             call_args = agent.client.chat.completions.create.call_args
             assert "2 page(s)" in call_args[1]["messages"][1]["content"]
 
+    @patch("core.agent.OpenAI")
+    def test_variants_derive_from_canonical_extraction(self, mock_openai_class):
+        """Test que les variantes réutilisent l'extraction canonique en cache"""
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+
+            mock_response = Mock()
+            mock_response.choices = [Mock()]
+            mock_response.choices[0].message.content = json.dumps(
+                {"header": {"name": "Test"}, "experiences": []}
+            )
+            agent.client.chat.completions.create = Mock(return_value=mock_response)
+
+            agent.extract_structured_data_with_llm("Texte brut du CV")
+            agent.extract_structured_data_with_llm(
+                "Texte brut du CV", target_language="en"
+            )
+            agent.extract_structured_data_with_llm(
+                "Texte brut du CV", target_language="en", max_pages=2
+            )
+
+            calls = agent.client.chat.completions.create.call_args_list
+            prompts = [c[1]["messages"][1]["content"] for c in calls]
+
+            # 1 extraction canonique + 2 transformations
+            assert len(calls) == 3
+            assert "Texte brut du CV" in prompts[0]
+            for prompt in prompts[1:]:
+                assert "Texte brut du CV" not in prompt
+                # Entrée des transformations : extraction canonique validée
+                assert '{"header":{"name":"Test","title":"","experience":""}' in prompt
+            assert "ANGLAIS" in prompts[1]
+            assert "2 page(s)" in prompts[2]
+
+            # Variante déjà produite : aucun appel supplémentaire
+            agent.extract_structured_data_with_llm(
+                "Texte brut du CV", target_language="en"
+            )
+            assert agent.client.chat.completions.create.call_count == 3
+
+    @patch("core.agent.OpenAI")
+    def test_llm_calls_are_measured(self, mock_openai_class):
+        """Test que chaque appel LLM et chaque hit de cache est mesuré"""
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+
+            mock_response = Mock()
+            mock_response.choices = [Mock(finish_reason="stop")]
+            mock_response.choices[0].message.content = json.dumps({"header": {}})
+            mock_response.usage = Mock(prompt_tokens=900, completion_tokens=120)
+            agent.client.chat.completions.create = Mock(return_value=mock_response)
+
+            with llm_telemetry.track() as usage:
+                agent.extract_structured_data_with_llm("CV mesuré", model="m")
+                agent.extract_structured_data_with_llm("CV mesuré", model="m")
+
+            first, second = usage.calls
+            assert (first.kind, first.cache_hit) == ("extraction", False)
+            assert (first.prompt_tokens, first.completion_tokens) == (900, 120)
+            assert first.finish_reason == "stop"
+            assert second.cache_hit
+
+    @patch("core.agent.OpenAI")
+    def test_invalid_reply_repaired_then_fragment_corrected(self, mock_openai_class):
+        """Test de la réparation locale et de la correction ciblée d'un fragment"""
+
+        def reply(content):
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = content
+            return response
+
+        # Virgule finale (réparée localement), expérience réduite à une chaîne
+        extraction = reply(
+            '{"header": {"name": "J.D."}, '
+            '"experiences": [{"company": "A"}, "B - Chef de projet - 2020"],}'
+        )
+        correction = reply(
+            json.dumps(
+                {
+                    "fragments": {
+                        "experiences[1]": {
+                            "company": "B",
+                            "title": "Chef de projet",
+                            "period": "2020",
+                        }
+                    }
+                }
+            )
+        )
+
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+            agent.client.chat.completions.create = Mock(
+                side_effect=[extraction, correction]
+            )
+
+            with llm_telemetry.track() as usage:
+                result = agent.extract_structured_data_with_llm(
+                    "Texte brut du CV", model="m"
+                )
+
+            prompt = agent.client.chat.completions.create.call_args[1]["messages"][1]
+            # La correction ne renvoie que le fragment, pas le CV
+            assert "B - Chef de projet - 2020" in prompt["content"]
+            assert "Texte brut du CV" not in prompt["content"]
+            assert [call.kind for call in usage.calls] == ["extraction", "correction"]
+            assert result["experiences"][1]["title"] == "Chef de projet"
+            assert result["experiences"][1]["activities"] == []
+
+    @patch("core.agent.OpenAI")
+    def test_truncated_reply_is_continued(self, mock_openai_class):
+        """Test de la continuation d'une réponse coupée par la limite de tokens"""
+
+        def reply(content, finish_reason):
+            response = Mock()
+            response.choices = [Mock(finish_reason=finish_reason)]
+            response.choices[0].message.content = content
+            return response
+
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+            agent.client.chat.completions.create = Mock(
+                side_effect=[
+                    reply(
+                        '{"header": {"name": "J.D."}, "experiences": [{"company": "AC',
+                        "length",
+                    ),
+                    # Reprise des derniers caractères déjà produits
+                    reply('[{"company": "ACME", "title": "Dev"}]}', "stop"),
+                ]
+            )
+
+            with llm_telemetry.track() as usage:
+                result = agent.extract_structured_data_with_llm("CV long", model="m")
+
+            continuation = agent.client.chat.completions.create.call_args[1]
+            assert "response_format" not in continuation
+            assert continuation["messages"][-2]["role"] == "assistant"
+            assert [call.kind for call in usage.calls] == ["extraction", "continuation"]
+            assert result["experiences"][0]["company"] == "ACME"
+            assert result["experiences"][0]["title"] == "Dev"
+
+    @patch("core.agent.get_settings")
+    @patch("core.agent.OpenAI")
+    def test_continuations_are_bounded(self, mock_openai_class, mock_settings):
+        """Test du nombre maximal de continuations, puis réparation locale"""
+        mock_settings.return_value = Mock(
+            LLM_COMPACT_SCHEMA=False, LONG_CV_TOKEN_THRESHOLD=0, LLM_MAX_CONTINUATIONS=1
+        )
+        response = Mock()
+        response.choices = [Mock(finish_reason="length")]
+        response.choices[0].message.content = '{"header": {"name": "J.D.", "ti'
+
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+            agent.client.chat.completions.create = Mock(return_value=response)
+
+            result = agent.extract_structured_data_with_llm("CV long", model="m")
+
+            assert agent.client.chat.completions.create.call_count == 2
+            assert result["header"]["name"] == "J.D."
+
+    @patch("core.agent.get_settings")
+    @patch("core.agent.OpenAI")
+    def test_compact_schema_response_is_expanded(
+        self, mock_openai_class, mock_settings
+    ):
+        """Test qu'une réponse au schéma compact est ramenée au cv_data canonique"""
+        mock_settings.return_value = Mock(
+            LLM_COMPACT_SCHEMA=True, LONG_CV_TOKEN_THRESHOLD=0
+        )
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = json.dumps(
+            {"h": ["J.D.", "Dev", "5 ans"], "x": [["ACME", "2020 - 2023"]]}
+        )
+
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+            agent.client.chat.completions.create = Mock(return_value=response)
+
+            with llm_telemetry.track() as usage:
+                result = agent.extract_structured_data_with_llm("CV compact", model="m")
+
+            prompt = agent.client.chat.completions.create.call_args[1]["messages"][1]
+            assert '"x": [' in prompt["content"]
+            assert result["header"]["name"] == "J.D."
+            assert result["experiences"][0]["company"] == "ACME"
+            assert usage.calls[0].schema == "compact"
+
+    @patch("core.agent.get_settings")
+    @patch("core.agent.OpenAI")
+    def test_long_cv_extracted_by_sections(self, mock_openai_class, mock_settings):
+        """Test qu'un CV long est extrait par sections puis fusionné"""
+        mock_settings.return_value = Mock(
+            LONG_CV_TOKEN_THRESHOLD=100, LONG_CV_CHUNK_TOKENS=60
+        )
+        experiences = [
+            f"SOCIETE {i} (LYON)\nDÉVELOPPEUR\nMars {2010 + i} à Mai {2011 + i}\n"
+            f"- Développement des services du projet {i}"
+            for i in range(4)
+        ]
+        cv_text = "\n".join(
+            ["Jean Dupont", "COMPÉTENCES", "- Java", "EXPÉRIENCES", *experiences]
+        )
+
+        def respond(**request):
+            prompt = request["messages"][1]["content"]
+            if '"experiences": [' in prompt:
+                data = {
+                    "experiences": [
+                        {"company": f"SOCIETE {i}", "period": str(i)}
+                        for i in range(4)
+                        if f"SOCIETE {i} (LYON)" in prompt
+                    ]
+                }
+            else:
+                data = {"header": {"name": "Jean Dupont"}, "formations": []}
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = json.dumps(data)
+            return response
+
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+            agent.client.chat.completions.create = Mock(side_effect=respond)
+
+            result = agent.extract_structured_data_with_llm(cv_text)
+
+            assert agent.client.chat.completions.create.call_count > 2
+            assert result["header"]["name"] == "Jean Dupont"
+            assert [e["company"] for e in result["experiences"]] == [
+                "SOCIETE 0",
+                "SOCIETE 1",
+                "SOCIETE 2",
+                "SOCIETE 3",
+            ]
+
     @patch("core.agent.llm_cache")
     @patch("core.agent.OpenAI")
     def test_generate_profile_pitch_basic(self, mock_openai_class, mock_cache):
@@ -565,6 +863,45 @@ class TestCVConverterAgent:
             finally:
                 Path(tmp_path).unlink(missing_ok=True)
 
+    @patch("core.agent.OpenAI")
+    @patch("core.agent.extract_pdf_content")
+    @patch("core.agent.CVConverterAgent.extract_structured_data_with_llm")
+    @patch("core.agent.generate_docx_from_cv_data")
+    def test_process_cv_reports_events_without_stdout(
+        self, mock_gen_docx, mock_extract_llm, mock_extract_pdf, mock_openai, capsys
+    ):
+        """Test que la progression passe par les abonnés, sans écrire sur stdout"""
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+            events = []
+            unsubscribe = agent.events.subscribe(events.append)
+
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+                tmp.write(b"dummy pdf content")
+                tmp_path = tmp.name
+
+            try:
+                mock_extract_pdf.return_value = "PDF text content long enough " * 10
+                mock_extract_llm.return_value = {"header": {}, "experiences": []}
+                mock_gen_docx.return_value = tmp_path.replace(".pdf", ".docx")
+
+                agent.process_cv(tmp_path, generate_pitch=False)
+                unsubscribe()
+                agent.process_cv(tmp_path, generate_pitch=False)
+            finally:
+                Path(tmp_path).unlink(missing_ok=True)
+
+        assert capsys.readouterr().out == ""
+        assert events[0].name == "conversion_started"
+        assert events[-1].name == "completed"
+        assert "pitch_skipped" in [event.name for event in events]
+        # Un seul passage : le désabonnement coupe les événements suivants
+        ends = [event for event in events if event.name == "stage_end"]
+        assert [event.stage for event in ends if event.stage == "cv_data"] == [
+            "cv_data"
+        ]
+        assert all(event.duration >= 0 for event in ends)
+
     @patch("core.agent.OpenAI")
     @patch("core.agent.extract_pdf_content")
     def test_process_cv_insufficient_content(self, mock_extract_pdf, mock_openai):
@@ -640,3 +977,512 @@ class TestCVConverterAgent:
                 assert cv_data["header"]["name"] == "Custom Name"
             finally:
                 Path(tmp_path).unlink(missing_ok=True)
+
+    @patch("core.agent.OpenAI")
+    @patch("core.agent.extract_pdf_content")
+    @patch("core.agent.generate_docx_from_cv_data")
+    def test_process_cv_file_cache_skips_extraction(
+        self, mock_gen_docx, mock_extract_pdf, mock_openai
+    ):
+        """Test cache sur les octets du fichier puis repli sur le hash du texte"""
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+
+            mock_response = Mock()
+            mock_response.choices = [Mock()]
+            mock_response.choices[0].message.content = json.dumps(
+                {"header": {"name": "Test User"}, "experiences": []}
+            )
+            agent.client.chat.completions.create = Mock(return_value=mock_response)
+            mock_extract_pdf.return_value = "Même texte de CV réexporté " * 10
+
+            paths = []
+            for content in (b"original export", b"re-exported pdf bytes"):
+                with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+                    tmp.write(content)
+                    paths.append(tmp.name)
+            mock_gen_docx.return_value = paths[0].replace(".pdf", ".docx")
+
+            try:
+                agent.process_cv(paths[0], generate_pitch=False)
+                # Même fichier : ni extraction PDF, ni appel LLM
+                agent.process_cv(paths[0], generate_pitch=False)
+                assert mock_extract_pdf.call_count == 1
+                assert agent.client.chat.completions.create.call_count == 1
+
+                # Octets différents, même texte : extraction mais pas d'appel LLM
+                _, cv_data = agent.process_cv(paths[1], generate_pitch=False)
+                assert mock_extract_pdf.call_count == 2
+                assert agent.client.chat.completions.create.call_count == 1
+                assert cv_data["header"]["name"] == "Test User"
+            finally:
+                for path in paths:
+                    Path(path).unlink(missing_ok=True)
+
+    @patch("core.agent.OpenAI")
+    @patch("core.agent.extract_pdf_content")
+    @patch("core.agent.generate_docx_from_cv_data")
+    def test_pipeline_settings_invalidate_cache(
+        self, mock_gen_docx, mock_extract_pdf, mock_openai
+    ):
+        """Test qu'un réglage du pipeline modifiant cv_data invalide le cache"""
+        settings = get_settings()
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+
+            keys = {
+                (
+                    agent._generate_cache_key("test", False, "none"),
+                    agent._generate_file_cache_key(__file__, False, "none"),
+                )
+            }
+            for name, value in (
+                ("CV_TEXT_MARKDOWN_SECTIONS", not settings.CV_TEXT_MARKDOWN_SECTIONS),
+                ("LONG_CV_TOKEN_THRESHOLD", settings.LONG_CV_TOKEN_THRESHOLD + 1),
+                ("LONG_CV_CHUNK_TOKENS", settings.LONG_CV_CHUNK_TOKENS + 1),
+                ("LLM_COMPACT_SCHEMA", not settings.LLM_COMPACT_SCHEMA),
+            ):
+                with patch.object(settings, name, value):
+                    keys.add(
+                        (
+                            agent._generate_cache_key("test", False, "none"),
+                            agent._generate_file_cache_key(__file__, False, "none"),
+                        )
+                    )
+            # Chaque réglage change à la fois la clé canonique et la clé fichier
+            assert len({canonical for canonical, _ in keys}) == 5
+            assert len({file_key for _, file_key in keys}) == 5
+
+            mock_response = Mock()
+            mock_response.choices = [Mock()]
+            mock_response.choices[0].message.content = json.dumps(
+                {"header": {"name": "Test User"}, "experiences": []}
+            )
+            agent.client.chat.completions.create = Mock(return_value=mock_response)
+            mock_extract_pdf.return_value = "Texte de CV suffisamment long " * 10
+
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+                tmp.write(b"dummy pdf content")
+                tmp_path = tmp.name
+            mock_gen_docx.return_value = tmp_path.replace(".pdf", ".docx")
+
+            try:
+                agent.process_cv(tmp_path, generate_pitch=False)
+                with patch.object(
+                    settings, "LONG_CV_CHUNK_TOKENS", settings.LONG_CV_CHUNK_TOKENS + 1
+                ):
+                    agent.process_cv(tmp_path, generate_pitch=False)
+            finally:
+                Path(tmp_path).unlink(missing_ok=True)
+
+            assert agent.client.chat.completions.create.call_count == 2
+
+
+class TestCVConverterAgentAsync:
+    """Tests du chemin asyncio de l'agent"""
+
+    @patch("core.agent.llm_cache")
+    @patch("core.agent.OpenAI")
+    def test_extract_structured_data_async_uses_async_client(
+        self, mock_openai_class, mock_cache
+    ):
+        """Test extraction asynchrone via le client AsyncOpenAI"""
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+            mock_cache.get.return_value = None
+
+            mock_response = Mock()
+            mock_response.choices = [Mock()]
+            mock_response.choices[0].message.content = json.dumps(
+                {"header": {"name": "Async"}, "experiences": []}
+            )
+            agent._async_client = Mock()
+            agent._async_client.chat.completions.create = AsyncMock(
+                return_value=mock_response
+            )
+
+            result = asyncio.run(
+                agent.extract_structured_data_with_llm_async(
+                    "CV content", model="gpt-4o-mini"
+                )
+            )
+
+            assert result["header"]["name"] == "Async"
+            agent._async_client.chat.completions.create.assert_awaited_once()
+            agent.client.chat.completions.create.assert_not_called()
+            mock_cache.set.assert_called_once()
+
+    @patch("core.agent.llm_cache")
+    @patch("core.agent.OpenAI")
+    def test_generate_profile_pitch_async_error_returns_none(
+        self, mock_openai_class, mock_cache
+    ):
+        """Test pitch asynchrone avec erreur API"""
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+            mock_cache.get.return_value = None
+            agent._async_client = Mock()
+            agent._async_client.chat.completions.create = AsyncMock(
+                side_effect=Exception("API Error")
+            )
+
+            pitch = asyncio.run(
+                agent.generate_profile_pitch_async(
+                    {"header": {"name": "Test"}}, model="gpt-4o-mini"
+                )
+            )
+
+            assert pitch is None
+
+    @patch("core.agent.OpenAI")
+    @patch("core.agent.extract_pdf_content")
+    @patch("core.agent.generate_docx_from_cv_data")
+    def test_process_cv_async_with_pitch(
+        self, mock_gen_docx, mock_extract_pdf, mock_openai
+    ):
+        """Test traitement asynchrone complet avec pitch"""
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+                tmp.write(b"dummy pdf content")
+                tmp_path = tmp.name
+
+            try:
+                mock_extract_pdf.return_value = (
+                    "PDF text content with sufficient length " * 10
+                )
+                mock_gen_docx.return_value = tmp_path.replace(".pdf", ".docx")
+
+                with patch.object(
+                    agent,
+                    "extract_structured_data_with_llm_async",
+                    AsyncMock(return_value={"header": {"name": "Original"}}),
+                ), patch.object(
+                    agent,
+                    "generate_profile_pitch_async",
+                    AsyncMock(return_value="Profil asynchrone"),
+                ):
+                    output_file, cv_data = asyncio.run(
+                        agent.process_cv_async(tmp_path, candidate_name="Custom Name")
+                    )
+
+                assert output_file == tmp_path.replace(".pdf", ".docx")
+                assert cv_data["header"]["name"] == "Custom Name"
+                assert cv_data["pitch"] == "Profil asynchrone"
+                mock_extract_pdf.assert_called_once()
+                mock_gen_docx.assert_called_once()
+            finally:
+                Path(tmp_path).unlink(missing_ok=True)
+
+    def _run_fused_conversion(self, mock_gen_docx, mock_extract_pdf, fused_pitch):
+        """Conversion asynchrone en mode fusionné : (cv_data, mock du pitch séparé)"""
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+                tmp.write(b"dummy pdf content")
+                tmp_path = tmp.name
+
+            try:
+                mock_extract_pdf.return_value = "Texte du CV suffisamment long " * 10
+                mock_gen_docx.return_value = tmp_path.replace(".pdf", ".docx")
+                extraction = AsyncMock(
+                    return_value={"header": {"name": "J.D."}, "pitch": fused_pitch}
+                )
+                separate = AsyncMock(return_value="Pitch de l'appel séparé")
+
+                with patch.object(
+                    CVConverterAgent, "_fused_pitch", return_value=True
+                ), patch.object(
+                    agent, "extract_structured_data_with_llm_async", extraction
+                ), patch.object(
+                    agent, "generate_profile_pitch_async", separate
+                ):
+                    _, cv_data = asyncio.run(agent.process_cv_async(tmp_path))
+                return cv_data, separate
+            finally:
+                Path(tmp_path).unlink(missing_ok=True)
+
+    @patch("core.agent.OpenAI")
+    @patch("core.agent.extract_pdf_content")
+    @patch("core.agent.generate_docx_from_cv_data")
+    def test_fused_pitch_skips_pitch_call(
+        self, mock_gen_docx, mock_extract_pdf, mock_openai
+    ):
+        """Test que le pitch fusionné évite l'appel de pitch séparé"""
+        fused = "Consultant senior " * 30
+
+        cv_data, separate = self._run_fused_conversion(
+            mock_gen_docx, mock_extract_pdf, fused
+        )
+
+        assert cv_data["pitch"] == fused.strip()
+        separate.assert_not_awaited()
+
+    @patch("core.agent.OpenAI")
+    @patch("core.agent.extract_pdf_content")
+    @patch("core.agent.generate_docx_from_cv_data")
+    def test_unusable_fused_pitch_falls_back(
+        self, mock_gen_docx, mock_extract_pdf, mock_openai
+    ):
+        """Test du repli sur l'appel séparé si le pitch fusionné est inexploitable"""
+        cv_data, separate = self._run_fused_conversion(
+            mock_gen_docx, mock_extract_pdf, "Trop court"
+        )
+
+        assert cv_data["pitch"] == "Pitch de l'appel séparé"
+        separate.assert_awaited_once()
+
+    @patch("core.agent.OpenAI")
+    @patch("core.agent.extract_pdf_content")
+    @patch("core.agent.generate_docx_from_cv_data")
+    def test_progress_events(self, mock_gen_docx, mock_extract_pdf, mock_openai):
+        """Test que chaque étape franchie est signalée au suivi de progression"""
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+                tmp.write(b"dummy pdf content")
+                tmp_path = tmp.name
+
+            try:
+                mock_extract_pdf.return_value = "Texte du CV\fsuffisamment long " * 10
+                mock_gen_docx.return_value = tmp_path.replace(".pdf", ".docx")
+                extraction = AsyncMock(return_value={"experiences": [{}, {}]})
+                events = []
+
+                with patch.object(
+                    agent, "extract_structured_data_with_llm_async", extraction
+                ), patch.object(
+                    agent, "generate_profile_pitch_async", AsyncMock(return_value="P")
+                ):
+                    asyncio.run(
+                        agent.process_cv_async(
+                            tmp_path,
+                            progress=events.append,
+                        )
+                    )
+            finally:
+                Path(tmp_path).unlink(missing_ok=True)
+
+        names = [
+            event.name
+            for event in events
+            if event.name not in ("stage_start", "stage_end")
+        ]
+        # Rendu DOCX et pitch s'exécutent en parallèle
+        assert names[:4] == ["conversion_started", "extracted", "options", "structured"]
+        assert sorted(names[4:-1]) == ["docx_rendered", "pitch_ready"]
+        assert names[-1] == "completed"
+        data = {event.name: event.data for event in events}
+        assert data["extracted"]["pages"] == 11
+        assert data["structured"] == {
+            "experiences": 2,
+            "cached": False,
+            "renamed": False,
+        }
+        assert data["pitch_ready"]["characters"] == 1
+        ended = {event.stage for event in events if event.name == "stage_end"}
+        assert ended == {
+            "cache_lookup",
+            "cv_text",
+            "extraction",
+            "preprocessing",
+            "job_offer",
+            "cv_data",
+            "output_file",
+            "pitch",
+        }
+        # La structuration est streamée pour signaler les tokens reçus
+        assert extraction.await_args.kwargs["observer"] is not None
+
+    @patch("core.agent.OpenAI")
+    def test_fused_pitch_requested_in_extraction_prompt(self, mock_openai):
+        """Test que le mode fusionné demande le pitch et change la version du prompt"""
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+            request = agent._build_extraction_request(
+                "CV", False, "none", None, None, None, "m"
+            )
+            key = agent._generate_cache_key("CV", False, "none", model="m")
+
+            with patch.object(CVConverterAgent, "_fused_pitch", return_value=True):
+                fused = agent._build_extraction_request(
+                    "CV", False, "none", None, None, None, "m"
+                )
+                fused_key = agent._generate_cache_key("CV", False, "none", model="m")
+
+        assert 'clé "pitch"' not in request["messages"][1]["content"]
+        assert 'clé "pitch"' in fused["messages"][1]["content"]
+        assert key != fused_key
+
+    @patch("core.agent.OpenAI")
+    def test_streamed_extraction_starts_pitch_early(self, mock_openai):
+        """Test que le pitch part dès que ses entrées sont streamées"""
+        experiences = [
+            {"company": f"Société {index}", "title": "Dev"} for index in range(4)
+        ]
+        reply = json.dumps(
+            {
+                "header": {"name": "Jean Dupont", "title": "Dev", "experience": "10"},
+                "competences": {"operationnelles": ["Pilotage"], "techniques": []},
+                "experiences": experiences,
+                "formations": [],
+            },
+            ensure_ascii=False,
+        )
+        cut = reply.index('{"company": "Société 3"')
+        pitch_started = threading.Event()
+        seen = {}
+
+        def chunk(content=None, finish_reason=None):
+            delta = SimpleNamespace(content=content)
+            choice = SimpleNamespace(delta=delta, finish_reason=finish_reason)
+            return SimpleNamespace(choices=[choice], usage=None)
+
+        def stream(**kwargs):
+            seen["stream"] = kwargs.get("stream")
+            yield chunk(reply[:cut])
+            # Le reste de la réponse n'est émis qu'une fois le pitch lancé
+            seen["early"] = pitch_started.wait(timeout=5)
+            yield chunk(reply[cut:], finish_reason="stop")
+
+        def pitch(cv_data, job_offer_content=None, model=None):
+            seen["pitch_inputs"] = cv_data
+            pitch_started.set()
+            return "Pitch"
+
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+            agent.client.chat.completions.create.side_effect = stream
+
+            with patch.object(
+                CVConverterAgent, "_stream_extraction", return_value=True
+            ), patch.object(
+                CVConverterAgent, "_fused_pitch", return_value=False
+            ), patch.object(
+                CVConverterAgent, "_compact_schema", return_value=False
+            ), patch.object(
+                agent, "generate_profile_pitch", side_effect=pitch
+            ):
+                speculation = agent._pitch_speculation(None, "J.D.", "m")
+                cv_data = agent.extract_structured_data_with_llm(
+                    "Texte du CV", model="m", observer=speculation
+                )
+
+        assert seen["stream"] is True
+        assert seen["early"] is True
+        assert len(cv_data["experiences"]) == 4
+        assert len(seen["pitch_inputs"]["experiences"]) == 3
+        assert seen["pitch_inputs"]["header"]["name"] == "J.D."
+
+    @patch("core.agent.OpenAI")
+    @patch("core.agent.extract_pdf_content")
+    @patch("core.agent.generate_docx_from_cv_data")
+    def test_page_budget_keeps_speculative_pitch_inputs(
+        self, mock_gen_docx, mock_extract_pdf, mock_openai
+    ):
+        """Test que le budget de pages ne fait pas rater le pitch spéculatif"""
+        operationnelles = [f"Compétence opérationnelle {i}" for i in range(10)]
+        experiences = [
+            {
+                "company": f"Société {index} (Paris)",
+                "period": "Janvier 2010 à Décembre 2012",
+                "title": "Consultant",
+                "context": "Refonte du système d'information " * 5,
+                "activities": [f"Activité {n} " * 12 for n in range(6)],
+                "tech_env": "Java, Python",
+            }
+            for index in range(8)
+        ]
+        reply = json.dumps(
+            {
+                "header": {"name": "Jean Dupont", "title": "Dev", "experience": "10"},
+                "competences": {"operationnelles": operationnelles, "techniques": []},
+                "experiences": experiences,
+                "formations": [],
+            },
+            ensure_ascii=False,
+        )
+        pitch_calls = []
+
+        def chunk(content=None, finish_reason=None):
+            delta = SimpleNamespace(content=content)
+            choice = SimpleNamespace(delta=delta, finish_reason=finish_reason)
+            return SimpleNamespace(choices=[choice], usage=None)
+
+        def create(**kwargs):
+            if kwargs.get("stream"):
+                return iter([chunk(reply, finish_reason="stop")])
+            if kwargs["messages"][0]["content"] != PITCH_SYSTEM_PROMPT:
+                # Transformation (limite de pages) : données inchangées
+                message = SimpleNamespace(content=reply)
+                choice = SimpleNamespace(message=message, finish_reason="stop")
+                return SimpleNamespace(choices=[choice], usage=None)
+            pitch_calls.append(kwargs)
+            message = SimpleNamespace(content="Pitch du profil " * 5)
+            choice = SimpleNamespace(message=message, finish_reason="stop")
+            return SimpleNamespace(choices=[choice], usage=None)
+
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+            agent.client.chat.completions.create.side_effect = create
+
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+                tmp.write(b"dummy pdf content")
+                tmp_path = tmp.name
+
+            try:
+                mock_extract_pdf.return_value = "Texte du CV suffisamment long " * 10
+                mock_gen_docx.return_value = tmp_path.replace(".pdf", ".docx")
+
+                with patch.object(
+                    CVConverterAgent, "_stream_extraction", return_value=True
+                ), patch.object(
+                    CVConverterAgent, "_fused_pitch", return_value=False
+                ), patch.object(
+                    CVConverterAgent, "_compact_schema", return_value=False
+                ):
+                    _, cv_data = agent.process_cv(
+                        tmp_path, generate_pitch=True, max_pages=1, model="m"
+                    )
+            finally:
+                Path(tmp_path).unlink(missing_ok=True)
+
+        # Le budget a réduit le CV sans toucher aux entrées du pitch lancé
+        assert len(cv_data["experiences"][0]["activities"]) < 6
+        assert cv_data["competences"]["operationnelles"] == operationnelles
+        assert cv_data["pitch"]
+        assert len(pitch_calls) == 1
+
+    @patch("core.agent.OpenAI")
+    @patch("core.agent.extract_pdf_content")
+    @patch("core.agent.generate_docx_from_cv_data")
+    def test_prefetch_warms_conversion(
+        self, mock_gen_docx, mock_extract_pdf, mock_openai
+    ):
+        """Test que la pré-extraction évite extraction et LLM à la conversion"""
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            agent = CVConverterAgent()
+
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+                tmp.write(b"dummy pdf content")
+                tmp_path = tmp.name
+
+            try:
+                mock_extract_pdf.return_value = "Texte du CV suffisamment long " * 10
+                mock_gen_docx.return_value = tmp_path.replace(".pdf", ".docx")
+                llm = AsyncMock(return_value={"header": {"name": "Jean Dupont"}})
+
+                with patch.object(agent, "extract_structured_data_with_llm_async", llm):
+                    asyncio.run(agent.prefetch_async(tmp_path))
+                    _, cv_data = asyncio.run(
+                        agent.process_cv_async(tmp_path, generate_pitch=False)
+                    )
+
+                assert cv_data["header"]["name"] == "Jean Dupont"
+                llm.assert_awaited_once()
+                mock_extract_pdf.assert_called_once()
+            finally:
+                Path(tmp_path).unlink(missing_ok=True)
@@ -0,0 +1,205 @@
+"""
+Tests unitaires pour la conversion en masse via l'API Batch (core.batch)
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.agent import CVConverterAgent
+from core.batch import (
+    BatchClient,
+    BatchError,
+    BulkConverter,
+    LocalBatchStandIn,
+    collect_inputs,
+)
+
+
+def _completion(cv_data: dict) -> dict:
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": json.dumps(cv_data)},
+            }
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }
+
+
+def _responder(body: dict) -> dict:
+    """Réponse factice : le nom du candidat est repris du texte du CV"""
+    prompt = body["messages"][1]["content"]
+    if "CV illisible" in prompt:
+        raise ValueError("réponse invalide")
+    name = "Alice Martin" if "Alice" in prompt else "Bob Durand"
+    return _completion({"header": {"name": name, "title": "Consultant"}})
+
+
+@pytest.fixture
+def cv_files(tmp_path):
+    inputs = tmp_path / "cvs"
+    inputs.mkdir()
+    for name in ("alice.pdf", "bob.pdf", "notes.txt"):
+        (inputs / name).write_bytes(b"%PDF-1.4 factice")
+    return inputs
+
+
+@pytest.fixture
+def agent():
+    with patch("core.agent.OpenAI"), patch.dict(os.environ, {"AI_API_KEY": "k"}):
+        agent = CVConverterAgent()
+    agent._extract_cv_text = Mock(
+        side_effect=lambda path: f"CV de {Path(path).stem.capitalize()} " * 20
+    )
+    return agent
+
+
+def _converter(agent, stand_in, tmp_path):
+    client = BatchClient("k", "https://llm.example/v1", transport=stand_in.transport)
+    return BulkConverter(agent, client, output_dir=tmp_path / "out")
+
+
+class TestBulkConverter:
+    """Tests du pipeline de conversion en masse"""
+
+    def test_collect_inputs(self, cv_files):
+        """Test que seuls les formats supportés sont retenus"""
+        assert [p.name for p in collect_inputs([cv_files])] == ["alice.pdf", "bob.pdf"]
+
+    def test_batch_populates_cache_and_renders_docx(self, agent, cv_files, tmp_path):
+        """Test du lot complet : JSONL, soumission, cache, DOCX"""
+        stand_in = LocalBatchStandIn(_responder)
+        converter = _converter(agent, stand_in, tmp_path)
+
+        report = converter.run([cv_files])
+
+        assert report.count("rendered") == 2
+        assert report.batch_id in stand_in.batches
+        outputs = sorted(Path(item.output_file).name for item in report.items)
+        assert [name.rsplit("_", 1)[0] for name in outputs] == [
+            "Alice_Martin_CV",
+            "Bob_Durand_CV",
+        ]
+        for item in report.items:
+            assert Path(item.output_file).parent == tmp_path / "out"
+
+        # L'extraction interactive est ensuite servie par le cache
+        cv_data = agent.extract_structured_data_with_llm(
+            "CV de Alice " * 20, model=agent.model
+        )
+        assert cv_data["header"]["name"] == "Alice Martin"
+        agent.client.chat.completions.create.assert_not_called()
+
+    def test_jsonl_requests(self, agent, cv_files, tmp_path):
+        """Test du format des lignes de requêtes du lot"""
+        converter = _converter(agent, LocalBatchStandIn(_responder), tmp_path)
+        items = converter.prepare([cv_files])
+
+        lines = [json.loads(line) for line in converter.build_jsonl(items).splitlines()]
+
+        assert [line["custom_id"] for line in lines] == ["cv-0", "cv-1"]
+        assert lines[0]["url"] == "/v1/chat/completions"
+        assert lines[0]["body"]["response_format"] == {"type": "json_object"}
+
+    def test_same_candidate_does_not_overwrite(self, agent, cv_files, tmp_path):
+        """Test que deux CV du même candidat produisent deux DOCX distincts"""
+        (cv_files / "alice_v2.pdf").write_bytes(b"%PDF-1.4 factice")
+        agent._extract_cv_text = Mock(
+            side_effect=lambda path: f"CV de Alice {Path(path).stem} " * 20
+        )
+
+        report = _converter(agent, LocalBatchStandIn(_responder), tmp_path).run(
+            [cv_files]
+        )
+
+        outputs = {item.output_file for item in report.items}
+        assert report.count("rendered") == 3
+        assert len(outputs) == 3
+        assert all(Path(output).exists() for output in outputs)
+
+    def test_auto_model_is_resolved(self, agent, cv_files, tmp_path):
+        """Test que le mode auto soumet le modèle choisi par le routeur"""
+        client = BatchClient("k", "https://llm.example/v1")
+        converter = BulkConverter(agent, client, model="auto")
+        agent.router.candidates = Mock(return_value=["petit-modele", "grand-modele"])
+
+        items = converter.prepare([cv_files])
+        lines = [json.loads(line) for line in converter.build_jsonl(items).splitlines()]
+
+        assert [line["body"]["model"] for line in lines] == ["petit-modele"] * 2
+        assert items[0].cache_key == agent._generate_cache_key(
+            items[0].cv_text, False, "none", model="petit-modele"
+        )
+
+    def test_cached_items_are_not_resubmitted(self, agent, cv_files, tmp_path):
+        """Test qu'un second passage ne soumet aucun lot"""
+        stand_in = LocalBatchStandIn(_responder)
+        _converter(agent, stand_in, tmp_path).run([cv_files])
+
+        report = _converter(agent, stand_in, tmp_path).run([cv_files])
+
+        assert report.batch_id is None
+        assert report.count("rendered") == 2
+        assert len(stand_in.batches) == 1
+
+    def test_failed_lines_are_reported(self, agent, cv_files, tmp_path):
+        """Test qu'une ligne en erreur n'empêche pas les autres CV"""
+        agent._extract_cv_text = Mock(
+            side_effect=lambda path: (
+                "CV illisible " if "bob" in str(path) else "CV de Alice "
+            )
+            * 20
+        )
+        report = _converter(agent, LocalBatchStandIn(_responder), tmp_path).run(
+            [cv_files]
+        )
+
+        statuses = {item.path.name: item.status for item in report.items}
+        assert statuses == {"alice.pdf": "rendered", "bob.pdf": "failed"}
+        assert "réponse invalide" in report.items[1].error
+
+
+class TestBatchClient:
+    """Tests du client de l'API Batch"""
+
+    def test_wait_polls_until_terminal_status(self):
+        """Test du suivi d'un lot jusqu'à sa fin"""
+        statuses = iter(["validating", "in_progress", "completed"])
+
+        def handler(request):
+            return httpx.Response(200, json={"id": "b1", "status": next(statuses)})
+
+        client = BatchClient(
+            "k", "https://llm.example/v1", httpx.MockTransport(handler)
+        )
+
+        assert client.wait("b1", poll_interval=0, timeout=5)["status"] == "completed"
+
+    def test_failed_batch_raises(self, agent, cv_files, tmp_path):
+        """Test qu'un lot en échec lève une BatchError"""
+
+        def handler(request):
+            if request.url.path.endswith("/files"):
+                return httpx.Response(200, json={"id": "f1"})
+            return httpx.Response(200, json={"id": "b1", "status": "failed"})
+
+        client = BatchClient(
+            "k", "https://llm.example/v1", httpx.MockTransport(handler)
+        )
+        converter = BulkConverter(agent, client)
+
+        with pytest.raises(BatchError, match="failed"):
+            converter.run([cv_files])
@@ -0,0 +1,385 @@
+"""
+Tests unitaires pour le cache LLM (core.cache)
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from diskcache import Cache
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.cache import (
+    SingleFlight,
+    TieredCache,
+    build_cache_key,
+    cache_set,
+    evict_namespace,
+    namespace_of,
+)
+
+
+class TestCacheKeys:
+    """Tests des clés de cache canoniques"""
+
+    def test_build_cache_key_is_order_independent(self):
+        """Test que l'ordre des entrées n'influence pas la clé"""
+        key1 = build_cache_key("cv", content="abc", model="m", max_pages=2)
+        key2 = build_cache_key("cv", max_pages=2, model="m", content="abc")
+        assert key1 == key2
+
+    def test_build_cache_key_namespace(self):
+        """Test que l'espace de noms préfixe la clé"""
+        key = build_cache_key("pitch", namespace="v2", content="abc")
+        assert key.startswith("v2:pitch:")
+        assert namespace_of(key) == "v2"
+        assert key != build_cache_key("pitch", namespace="v1", content="abc")
+
+    def test_build_cache_key_default_namespace(self, monkeypatch):
+        """Test que l'espace de noms par défaut vient de la configuration"""
+        monkeypatch.setattr("core.cache.current_namespace", lambda: "prompts-v3")
+        assert namespace_of(build_cache_key("cv", content="abc")) == "prompts-v3"
+
+
+class TestCacheNamespaces:
+    """Tests de l'éviction par espace de noms"""
+
+    def test_evict_namespace_keeps_other_entries(self, tmp_path):
+        """Test que seule la version ciblée est supprimée"""
+        cache = Cache(str(tmp_path / "cache"))
+        old_key = build_cache_key("cv", namespace="v1", content="abc")
+        new_key = build_cache_key("cv", namespace="v2", content="abc")
+        cache_set(cache, old_key, {"v": 1})
+        cache_set(cache, new_key, {"v": 2})
+
+        removed = evict_namespace("v1", cache)
+
+        assert removed == 1
+        assert old_key not in cache
+        assert cache[new_key] == {"v": 2}
+        cache.close()
+
+
+class TestTieredCache:
+    """Tests du cache à deux niveaux (mémoire + disque)"""
+
+    @pytest.fixture
+    def disk(self, tmp_path):
+        disk = Cache(str(tmp_path / "disk"))
+        yield disk
+        disk.close()
+
+    def test_disk_hit_is_promoted_to_memory(self, disk):
+        """Test qu'une entrée lue sur disque est ensuite servie par la mémoire"""
+        disk.set("k", {"name": "Test"})
+        cache = TieredCache(disk)
+
+        assert cache.get("k") == {"name": "Test"}
+        assert cache.get("k") == {"name": "Test"}
+
+        stats = cache.statistics()
+        assert stats["disk"]["hits"] == 1
+        assert stats["memory"]["hits"] == 1
+        assert stats["memory"]["misses"] == 1
+        assert stats["memory"]["bytes_served"] > 0
+        assert stats["memory"]["entries"] == 1
+
+    def test_miss_counts_both_tiers(self, disk):
+        """Test qu'une absence est comptée sur les deux niveaux"""
+        cache = TieredCache(disk)
+
+        assert cache.get("absent") is None
+        stats = cache.statistics()
+        assert stats["memory"]["misses"] == 1
+        assert stats["disk"]["misses"] == 1
+
+    def test_returned_values_are_independent_copies(self, disk):
+        """Test que modifier une valeur lue ne modifie pas le cache"""
+        cache = TieredCache(disk)
+        cache.set("k", {"header": {"name": "Test"}})
+
+        value = cache.get("k")
+        value["header"]["name"] = "Modifié"
+
+        assert cache.get("k") == {"header": {"name": "Test"}}
+
+    def test_lru_bounded_by_entries(self, disk):
+        """Test de l'éviction LRU par nombre d'entrées"""
+        cache = TieredCache(disk, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" devient la moins récemment utilisée
+        cache.set("c", 3)
+
+        stats = cache.statistics()
+        assert stats["memory"]["entries"] == 2
+        assert stats["memory"]["evictions"] == 1
+        # L'entrée évincée reste disponible sur disque
+        assert cache.get("b") == 2
+        assert cache.statistics()["disk"]["hits"] == 1
+
+    def test_lru_bounded_by_bytes(self, disk):
+        """Test de l'éviction LRU par taille en octets"""
+        cache = TieredCache(disk, max_bytes=300)
+        cache.set("a", "x" * 200)
+        cache.set("b", "y" * 200)
+
+        stats = cache.statistics()
+        assert stats["memory"]["entries"] == 1
+        assert stats["memory"]["size_bytes"] <= 300
+
+    def test_expired_memory_entry_is_ignored(self, disk):
+        """Test que l'expiration s'applique au niveau mémoire"""
+        cache = TieredCache(disk)
+        cache.set("k", "v", expire=0.05)
+        time.sleep(0.1)
+
+        assert cache.get("k") is None
+        assert "k" not in cache
+
+    def test_evict_tag_clears_both_tiers(self, disk):
+        """Test que l'éviction d'un espace de noms vide aussi la mémoire"""
+        cache = TieredCache(disk)
+        key = build_cache_key("cv", namespace="v1", content="abc")
+        cache_set(cache, key, {"v": 1})
+
+        assert evict_namespace("v1", cache) == 1
+        assert cache.get(key) is None
+
+
+class TestSingleFlight:
+    """Tests de la coalescence des appels identiques"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = Cache(str(tmp_path / "cache"))
+        yield cache
+        cache.close()
+
+    def test_concurrent_threads_share_one_call(self, cache):
+        """Test que des threads concurrents partagent un seul appel"""
+        flight = SingleFlight()
+        calls = []
+
+        def slow_call():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"name": "Test"}
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(flight.run(cache, "k", slow_call))
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{"name": "Test"}] * 5
+        assert flight.coalesced == 4
+        assert cache["k"] == {"name": "Test"}
+
+    def test_cross_process_lock_rereads_cache(self, cache):
+        """Test que le second « processus » relit le cache au lieu d'appeler"""
+        # Deux instances = deux processus partageant le répertoire de cache
+        first, second = SingleFlight(), SingleFlight()
+        calls = []
+
+        def slow_call():
+            calls.append(1)
+            time.sleep(0.1)
+            return "pitch"
+
+        thread = threading.Thread(target=first.run, args=(cache, "k", slow_call))
+        thread.start()
+        time.sleep(0.02)
+        result = second.run(cache, "k", slow_call)
+        thread.join()
+
+        assert result == "pitch"
+        assert len(calls) == 1
+
+    def test_error_is_shared_and_not_cached(self, cache):
+        """Test qu'une erreur est propagée et que l'appel suivant réessaie"""
+        flight = SingleFlight()
+
+        def failing():
+            raise RuntimeError("API Error")
+
+        with pytest.raises(RuntimeError):
+            flight.run(cache, "k", failing)
+
+        assert "k" not in cache
+        assert flight.run(cache, "k", lambda: "ok") == "ok"
+
+    def test_none_result_is_not_cached(self, cache):
+        """Test qu'un résultat None n'est pas mis en cache"""
+        flight = SingleFlight()
+        assert flight.run(cache, "k", lambda: None) is None
+        assert "k" not in cache
+
+    def test_concurrent_tasks_share_one_call(self, cache):
+        """Test que des tâches asyncio concurrentes partagent un seul appel"""
+        flight = SingleFlight()
+        calls = []
+
+        async def slow_call():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "pitch"
+
+        async def scenario():
+            return await asyncio.gather(
+                *(flight.run_async(cache, "k", slow_call) for _ in range(3))
+            )
+
+        results = asyncio.run(scenario())
+
+        assert results == ["pitch"] * 3
+        assert len(calls) == 1
+        assert cache["k"] == "pitch"
+
+    def test_each_caller_gets_an_independent_copy(self, cache):
+        """Test que modifier un résultat partagé ne touche pas celui des autres"""
+        flight = SingleFlight()
+
+        def slow_call():
+            time.sleep(0.1)
+            return {"header": {"name": "Extrait"}}
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(flight.run(cache, "k", slow_call))
+            )
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        results[0]["header"]["name"] = "Candidat A"
+        results[0]["pitch"] = "Pitch A"
+        assert flight.coalesced == 2
+        assert results[1] == results[2] == {"header": {"name": "Extrait"}}
+        assert results[1] is not results[2]
+
+        async def scenario():
+            async def call():
+                await asyncio.sleep(0.05)
+                return {"header": {"name": "Extrait"}}
+
+            return await asyncio.gather(
+                *(flight.run_async(cache, "k2", call) for _ in range(3))
+            )
+
+        first, *others = asyncio.run(scenario())
+        first["header"]["name"] = "Candidat A"
+        assert all(other == {"header": {"name": "Extrait"}} for other in others)
+
+    def test_waiters_take_over_when_leader_is_cancelled(self, cache):
+        """Test qu'un leader annulé ne propage pas l'annulation aux appels en attente"""
+        flight = SingleFlight()
+        calls = []
+
+        async def slow_call():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return "pitch"
+
+        async def scenario():
+            leader = asyncio.ensure_future(flight.run_async(cache, "k", slow_call))
+            await asyncio.sleep(0.02)
+            waiters = [
+                asyncio.ensure_future(flight.run_async(cache, "k", slow_call))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.02)
+            leader.cancel()
+            return await asyncio.gather(*waiters), leader
+
+        results, leader = asyncio.run(scenario())
+
+        assert leader.cancelled()
+        assert results == ["pitch", "pitch"]
+        # Un waiter a repris l'appel, l'autre l'a rejoint
+        assert len(calls) == 2
+        assert cache["k"] == "pitch"
+
+    def test_cancelled_leader_releases_claim(self, cache):
+        """Test qu'un leader annulé retire son marqueur « en cours »"""
+        flight = SingleFlight()
+
+        async def hang():
+            await asyncio.sleep(1)
+
+        async def scenario():
+            task = asyncio.ensure_future(flight.run_async(cache, "k", hang))
+            await asyncio.sleep(0.02)
+            assert "lock:k" in cache
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(scenario())
+
+        assert "lock:k" not in cache
+        assert flight.run(cache, "k", lambda: "ok") == "ok"
+
+    def test_follower_process_waits_without_writing(self, cache):
+        """Test que le « processus » en attente relit le cache sans y écrire"""
+        writes = []
+
+        class CountingCache:
+            """Vue d'un « processus » sur le cache partagé, écritures comptées"""
+
+            def __init__(self, name):
+                self.name = name
+
+            def get(self, key, default=None):
+                return cache.get(key, default)
+
+            def __contains__(self, key):
+                return key in cache
+
+            def set(self, key, value, **kwargs):
+                writes.append((self.name, "set"))
+                return cache.set(key, value, **kwargs)
+
+            def add(self, key, value, **kwargs):
+                writes.append((self.name, "add"))
+                return cache.add(key, value, **kwargs)
+
+            def delete(self, key, **kwargs):
+                writes.append((self.name, "delete"))
+                return cache.delete(key, **kwargs)
+
+        first = SingleFlight(poll_min=0.01, poll_max=0.02)
+        second = SingleFlight(poll_min=0.01, poll_max=0.02)
+        calls = []
+
+        def slow_call():
+            calls.append(1)
+            time.sleep(0.3)
+            return "pitch"
+
+        thread = threading.Thread(
+            target=first.run, args=(CountingCache("leader"), "k", slow_call)
+        )
+        thread.start()
+        time.sleep(0.02)
+        result = second.run(CountingCache("follower"), "k", slow_call)
+        thread.join()
+
+        assert result == "pitch"
+        assert len(calls) == 1
+        assert [op for name, op in writes if name == "follower"] == []
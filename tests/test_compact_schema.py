@@ -0,0 +1,73 @@
+"""
+Tests unitaires pour le schéma de sortie compact (core.compact_schema)
+"""
+
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.compact_schema import compact_cv_data, expand_cv_data, is_compact
+
+CV_DATA = {
+    "header": {"name": "J.D.", "title": "Développeur", "experience": "5 ans"},
+    "suggested_tjm": 550,
+    "skills_assessment": [{"skill": "Java", "level": 4}],
+    "competences": {
+        "operationnelles": ["Conception"],
+        "techniques": [{"category": "Langages", "items": ["Java", "Python"]}],
+    },
+    "formations": [{"year": "2015", "description": "Master informatique"}],
+    "experiences": [
+        {
+            "company": "ACME",
+            "period": "2020 - 2023",
+            "title": "Lead dev",
+            "context": "Refonte",
+            "activities": ["Architecture"],
+            "tech_env": "Java, Kafka",
+        }
+    ],
+}
+
+
+class TestCompactSchema:
+    """Tests de l'expansion des réponses compactes"""
+
+    def test_round_trip(self):
+        """Test que compact puis expand redonne le cv_data canonique"""
+        compact = compact_cv_data(CV_DATA)
+
+        assert is_compact(compact)
+        assert compact["x"][0] == [
+            "ACME",
+            "2020 - 2023",
+            "Lead dev",
+            "Refonte",
+            ["Architecture"],
+            "Java, Kafka",
+        ]
+        assert expand_cv_data(compact) == CV_DATA
+
+    def test_canonical_data_is_unchanged(self):
+        """Test qu'une réponse déjà canonique passe telle quelle"""
+        assert not is_compact(CV_DATA)
+        assert expand_cv_data(CV_DATA) is CV_DATA
+
+    def test_short_records_get_defaults(self):
+        """Test des positions manquantes et des objets laissés tels quels"""
+        cv_data = expand_cv_data(
+            {
+                "h": ["J.D."],
+                "x": [["ACME", "2021"], {"company": "Beta"}],
+                "pitch": "Profil senior",
+            }
+        )
+
+        assert cv_data["header"] == {"name": "J.D.", "title": "", "experience": ""}
+        assert cv_data["experiences"][0]["activities"] == []
+        assert cv_data["experiences"][1] == {"company": "Beta"}
+        assert cv_data["competences"] == {"operationnelles": [], "techniques": []}
+        assert cv_data["pitch"] == "Profil senior"
+        assert "suggested_tjm" not in cv_data
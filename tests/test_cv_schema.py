@@ -0,0 +1,144 @@
+"""
+Tests unitaires pour la réparation et la validation des réponses (core.cv_schema)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.cv_schema import (
+    CVJsonError,
+    load_json_reply,
+    repair_json,
+    stitch_continuation,
+    validate_cv_data,
+)
+
+
+class TestRepairJson:
+    """Tests de la réparation syntaxique locale"""
+
+    def test_trailing_commas_and_surrounding_text(self):
+        """Test des virgules finales, balises Markdown et texte autour du JSON"""
+        content = '```json\n{"a": [1, 2,], "b": {"c": "x,]",},}\n```\nVoilà.'
+
+        assert json.loads(repair_json(content)) == {"a": [1, 2], "b": {"c": "x,]"}}
+
+    def test_unclosed_brackets(self):
+        """Test d'une réponse tronquée dans une chaîne"""
+        content = '{"experiences": [{"company": "ACME", "activities": ["Dév'
+
+        assert json.loads(repair_json(content)) == {
+            "experiences": [{"company": "ACME", "activities": ["Dév"]}]
+        }
+
+    def test_truncated_key_is_cut(self):
+        """Test d'une réponse tronquée au milieu d'une paire clé/valeur"""
+        content = '{"header": {"name": "J.D."}, "experiences": [{"company": "A", "per'
+
+        assert json.loads(repair_json(content)) == {
+            "header": {"name": "J.D."},
+            "experiences": [{"company": "A"}],
+        }
+
+    def test_unrepairable(self):
+        """Test d'une réponse sans objet JSON"""
+        with pytest.raises(CVJsonError):
+            load_json_reply("Je ne peux pas répondre")
+
+    def test_valid_json_is_not_repaired(self):
+        """Test qu'un JSON valide est simplement parsé"""
+        assert load_json_reply('{"a": 1}') == ({"a": 1}, False)
+
+
+class TestStitchContinuation:
+    """Tests du recollage des réponses tronquées"""
+
+    def test_plain_continuation(self):
+        """Test d'une suite qui reprend au caractère près"""
+        assert stitch_continuation('{"a": "Dév', 'eloppeur"}') == '{"a": "Développeur"}'
+
+    def test_overlap_and_fences_removed(self):
+        """Test du retrait de la reprise des derniers caractères et des balises"""
+        previous = '{"experiences": [{"company": "ACME'
+        continuation = '```json\n[{"company": "ACME (Lyon)"}]}\n```'
+
+        assert stitch_continuation(previous, continuation) == (
+            '{"experiences": [{"company": "ACME (Lyon)"}]}'
+        )
+
+
+class TestValidateCvData:
+    """Tests de la validation contre le schéma typé"""
+
+    def test_coercion_and_defaults(self):
+        """Test des conversions sans ambiguïté et des valeurs par défaut"""
+        validation = validate_cv_data(
+            {
+                "header": {"name": "J.D.", "title": None},
+                "suggested_tjm": "inconnu",
+                "skills_assessment": [{"skill": "Java", "level": "85%"}],
+                "competences": {
+                    "operationnelles": "Conception",
+                    "techniques": [{"category": "Langages", "items": "Java, Go"}],
+                },
+                "formations": [{"year": 2015, "description": "Master"}],
+                "experiences": [{"company": "ACME", "activities": "Développement"}],
+                "pitch": "Profil senior",
+            }
+        )
+
+        assert not validation.broken
+        cv_data = validation.resolve()
+        assert cv_data["header"] == {"name": "J.D.", "title": "", "experience": ""}
+        assert "suggested_tjm" not in cv_data
+        assert cv_data["skills_assessment"][0]["level"] == 85
+        assert cv_data["competences"]["operationnelles"] == ["Conception"]
+        assert cv_data["competences"]["techniques"][0]["items"] == ["Java", "Go"]
+        assert cv_data["formations"][0]["year"] == "2015"
+        assert cv_data["experiences"][0]["activities"] == ["Développement"]
+        assert cv_data["experiences"][0]["tech_env"] == ""
+        assert cv_data["pitch"] == "Profil senior"
+        assert "header.title" in validation.defaults
+
+    def test_broken_fragments_are_isolated(self):
+        """Test que seuls les fragments irrécupérables sont signalés"""
+        validation = validate_cv_data(
+            {
+                "header": "J.D., développeur",
+                "experiences": [{"company": "A"}, "B, 2020, chef de projet"],
+            }
+        )
+
+        assert validation.broken == {
+            "header": "J.D., développeur",
+            "experiences[1]": "B, 2020, chef de projet",
+        }
+        assert validation.expected_shapes()["header"] == {
+            "name": "",
+            "title": "",
+            "experience": "",
+        }
+
+    def test_resolve_with_corrections_and_safe_defaults(self):
+        """Test de l'intégration des corrections, défauts sûrs sinon"""
+        validation = validate_cv_data(
+            {"header": "J.D.", "experiences": ["A", {"company": "B"}, "C"]}
+        )
+
+        cv_data = validation.resolve(
+            {
+                "experiences[0]": {"company": "A", "title": "Dev"},
+                # Correction elle-même invalide : élément retiré
+                "experiences[2]": ["C"],
+            }
+        )
+
+        assert cv_data["header"]["name"] == ""
+        assert [e["company"] for e in cv_data["experiences"]] == ["A", "B"]
+        assert cv_data["experiences"][0]["title"] == "Dev"
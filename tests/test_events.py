@@ -0,0 +1,183 @@
+"""
+Tests unitaires pour les événements de progression (core.events)
+"""
+
+import io
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.events import (
+    STAGE_END,
+    STAGE_START,
+    ConsoleProgress,
+    ConversionTimings,
+    ProgressEmitter,
+    ProgressEvent,
+    ProgressHooks,
+    StageMetrics,
+)
+from core.pipeline import StageGraph
+from core.telemetry import EXTRACTION, PITCH, ConversionTelemetry, LLMCallRecord
+
+
+class TestProgressHooks:
+    """Tests des abonnements"""
+
+    def test_subscribe_and_unsubscribe(self):
+        """Test de la diffusion aux abonnés et du désabonnement"""
+        hooks = ProgressHooks()
+        received = []
+        unsubscribe = hooks.subscribe(received.append)
+
+        hooks.emit(ProgressEvent("extracted", data={"pages": 2}))
+        unsubscribe()
+        hooks.emit(ProgressEvent("structured"))
+
+        assert [event.name for event in received] == ["extracted"]
+
+    def test_failing_listener_is_isolated(self):
+        """Test qu'un abonné en échec n'empêche ni les autres ni la conversion"""
+        hooks = ProgressHooks()
+        received = []
+
+        def failing(event):
+            raise RuntimeError("abonné cassé")
+
+        hooks.subscribe(failing)
+        emit = ProgressEmitter(hooks, received.append)
+        emit("docx_rendered", filename="cv.docx")
+
+        assert received[0].data == {"filename": "cv.docx"}
+
+    def test_emitter_active(self):
+        """Test qu'un émetteur sans abonné est inactif (pas de streaming inutile)"""
+        hooks = ProgressHooks()
+        assert not ProgressEmitter(hooks).active
+        assert ProgressEmitter(hooks, lambda event: None).active
+        hooks.subscribe(lambda event: None)
+        assert ProgressEmitter(hooks).active
+
+
+class TestStageEvents:
+    """Tests des événements d'étape du graphe"""
+
+    def test_stage_graph_reports_start_and_end(self):
+        """Test du début et de la fin (avec durée) de chaque étape"""
+        received = []
+        emit = ProgressEmitter(ProgressHooks(), received.append)
+        graph = StageGraph(listener=emit.stage)
+        graph.add_stage("a", lambda: 1)
+        graph.add_stage("b", lambda a: a + 1, depends_on=["a"])
+
+        assert graph.run() == {"a": 1, "b": 2}
+
+        assert [(event.name, event.stage) for event in received] == [
+            (STAGE_START, "a"),
+            (STAGE_END, "a"),
+            (STAGE_START, "b"),
+            (STAGE_END, "b"),
+        ]
+        assert received[1].duration == graph.report.timings["a"].duration
+        assert received[1].as_dict() == {
+            "stage": "a",
+            "duration": round(received[1].duration, 4),
+        }
+
+    def test_stage_metrics(self):
+        """Test de l'agrégation des durées par étape"""
+        metrics = StageMetrics()
+        metrics(ProgressEvent(STAGE_START, stage="cv_data"))
+        metrics(ProgressEvent(STAGE_END, stage="cv_data", duration=1.5))
+        metrics(ProgressEvent(STAGE_END, stage="cv_data", duration=0.5))
+
+        snapshot = metrics.snapshot()
+        assert list(snapshot) == ["cv_data"]
+        assert snapshot["cv_data"]["count"] == 2
+        metrics.reset()
+        assert metrics.snapshot() == {}
+
+
+class TestConversionTimings:
+    """Tests du détail des durées d'une conversion"""
+
+    def test_breakdown_order_names_and_cache_flags(self):
+        """Test des noms, de l'ordre d'exécution et des hits du cache par étape"""
+        timings = ConversionTimings()
+        emit = ProgressEmitter(ProgressHooks(), timings)
+        with timings.measure("cleanup"):
+            pass
+        with emit.measure("cache_lookup") as lookup:
+            lookup["cached"] = False
+        for stage, duration in (("pitch", 2.0), ("cv_data", 3.0), ("cv_text", 1.0)):
+            emit.publish(ProgressEvent(STAGE_END, stage=stage, duration=duration))
+        with timings.measure("upload"):
+            pass
+        emit("completed", critical_path=["cv_text", "cv_data", "pitch"])
+
+        usage = ConversionTelemetry(
+            calls=[
+                LLMCallRecord(kind=EXTRACTION, model="m", cache_hit=True),
+                LLMCallRecord(kind=PITCH, model="m", cache_hit=False),
+            ]
+        )
+        timings.add_llm_usage(usage)
+        breakdown = timings.as_dict()
+
+        # cv_text (extraction + prétraitement) n'est pas compté deux fois
+        assert list(breakdown["stages"]) == [
+            "upload",
+            "cache_lookup",
+            "llm_extraction",
+            "pitch",
+            "cleanup",
+        ]
+        assert breakdown["stages"]["llm_extraction"] == {
+            "duration": 3.0,
+            "cached": True,
+        }
+        assert breakdown["stages"]["pitch"]["cached"] is False
+        assert breakdown["stages"]["cache_lookup"]["cached"] is False
+        assert "cached" not in breakdown["stages"]["upload"]
+        assert breakdown["critical_path"] == ["cv_text", "llm_extraction", "pitch"]
+        assert "llm_extraction 3.00s (cache)" in timings.summary()
+
+    def test_cached_file_skips_extraction(self):
+        """Test d'un fichier déjà traité : extraction signalée servie par le cache"""
+        timings = ConversionTimings()
+        timings(ProgressEvent("extracted", data={"cached": True}))
+
+        assert timings.as_dict()["stages"] == {
+            "extraction": {"duration": 0.0, "cached": True}
+        }
+
+
+class TestConsoleProgress:
+    """Tests de l'affichage en ligne de commande"""
+
+    def test_console_messages(self):
+        """Test des messages d'étape et de fin de conversion"""
+        stream = io.StringIO()
+        console = ConsoleProgress(stream)
+        console(ProgressEvent(STAGE_START, stage="cv_data"))
+        console(ProgressEvent(STAGE_START, stage="job_offer"))
+        console(ProgressEvent("pitch_ready", data={"characters": 0}))
+        console(ProgressEvent("llm_tokens", data={"tokens": 12}))
+        console(
+            ProgressEvent(
+                "completed",
+                data={
+                    "output_file": "cv.docx",
+                    "critical_path": ["cv_text", "cv_data"],
+                    "critical_path_time": 1.0,
+                },
+            )
+        )
+
+        output = stream.getvalue()
+        assert "Étape 2/4" in output
+        assert "Échec de la génération du pitch" in output
+        assert "cv_text → cv_data (1.00s)" in output
+        assert "tokens" not in output
@@ -0,0 +1,154 @@
+"""
+Tests unitaires pour le transport HTTP partagé des clients LLM (core.llm_transport)
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+from openai import AsyncOpenAI, OpenAI
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.agent import CVConverterAgent
+from core.llm_transport import LLMHttpPool, TransportPolicy
+
+COMPLETION = {
+    "id": "chatcmpl-test",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "m",
+    "choices": [
+        {
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "ok"},
+        }
+    ],
+}
+
+
+def _create(client):
+    return client.chat.completions.create(
+        model="m", messages=[{"role": "user", "content": "?"}]
+    )
+
+
+async def _async_create(client):
+    return await client.chat.completions.create(
+        model="m", messages=[{"role": "user", "content": "?"}]
+    )
+
+
+class TestLLMHttpPool:
+    """Tests du pool partagé et de ses métriques"""
+
+    def test_policy_limits_and_timeouts(self):
+        """Test de la configuration du pool et des délais"""
+        policy = TransportPolicy(max_connections=4, connect_timeout=2, read_timeout=30)
+
+        assert policy.limits.max_connections == 4
+        assert policy.timeout.connect == 2
+        assert policy.timeout.read == 30
+
+    def test_http2_requires_h2(self):
+        """Test du repli en HTTP/1.1 sans le paquet h2"""
+        with patch("core.llm_transport.http2_available", return_value=False):
+            assert LLMHttpPool(TransportPolicy(http2=True)).http2 is False
+
+    def test_openai_clients_share_the_pool(self):
+        """Test que deux clients OpenAI passent par le même transport mesuré"""
+        pool = LLMHttpPool(
+            transport=httpx.MockTransport(
+                lambda r: httpx.Response(200, json=COMPLETION)
+            )
+        )
+        for _ in range(2):
+            client = OpenAI(
+                api_key="k",
+                base_url="https://llm.example/v1",
+                max_retries=0,
+                http_client=pool.client,
+            )
+            assert _create(client).choices[0].message.content == "ok"
+
+        stats = pool.stats()
+        assert stats["requests"] == 2
+        assert stats["in_flight"] == 0
+
+    def test_async_client_across_event_loops(self):
+        """Test du client asyncio partagé entre boucles successives"""
+        pool = LLMHttpPool(
+            transport=httpx.MockTransport(
+                lambda r: httpx.Response(200, json=COMPLETION)
+            )
+        )
+        client = AsyncOpenAI(
+            api_key="k",
+            base_url="https://llm.example/v1",
+            http_client=pool.async_client,
+        )
+
+        for _ in range(2):
+            response = asyncio.run(_async_create(client))
+            assert response.choices[0].message.content == "ok"
+
+        assert pool.stats()["requests"] == 2
+
+    def test_saturation_is_counted(self):
+        """Test du comptage des requêtes émises pool saturé"""
+        release = threading.Event()
+        started = threading.Semaphore(0)
+
+        def handler(request):
+            started.release()
+            release.wait(5)
+            return httpx.Response(200, json=COMPLETION)
+
+        pool = LLMHttpPool(
+            TransportPolicy(max_connections=1), transport=httpx.MockTransport(handler)
+        )
+        threads = [
+            threading.Thread(target=pool.client.get, args=("https://llm.example/",))
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+            started.acquire(timeout=5)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        stats = pool.stats()
+        assert stats["peak_in_flight"] == 2
+        assert stats["saturated"] == 1
+        assert stats["in_flight"] == 0
+
+    def test_errors_release_the_slot(self):
+        """Test qu'une erreur réseau libère l'emplacement"""
+
+        def handler(request):
+            raise httpx.ConnectError("refusé")
+
+        pool = LLMHttpPool(transport=httpx.MockTransport(handler))
+        with pytest.raises(httpx.ConnectError):
+            pool.client.get("https://llm.example/")
+
+        assert pool.stats()["errors"] == 1
+        assert pool.stats()["in_flight"] == 0
+
+    @patch("core.agent.OpenAI")
+    def test_agents_share_the_pool(self, mock_openai):
+        """Test que toutes les instances de l'agent partagent le client HTTP"""
+        with patch.dict(os.environ, {"AI_API_KEY": "test-key"}):
+            first, second = CVConverterAgent(), CVConverterAgent()
+
+        assert first.http_pool is second.http_pool
+        clients = {call.kwargs["http_client"] for call in mock_openai.call_args_list}
+        assert clients == {first.http_pool.client}
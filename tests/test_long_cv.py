@@ -0,0 +1,128 @@
+"""
+Tests unitaires pour l'extraction des CV longs (core.long_cv)
+"""
+
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.long_cv import (
+    EDUCATION_KEYS,
+    EXPERIENCE_KEYS,
+    PROFILE_KEYS,
+    CVSection,
+    merge_section_results,
+    split_cv_sections,
+)
+from core.prompts import PromptTemplates
+
+
+def _experience(index: int) -> str:
+    return "\n".join(
+        [
+            f"ENTREPRISE {index} (PARIS)",
+            "CONSULTANT SENIOR",
+            f"Janvier {2000 + index} à Décembre {2001 + index}",
+            "Contexte : refonte du système d'information de gestion des contrats.",
+        ]
+        + [f"- Activité {n} réalisée sur le projet {index}" for n in range(6)]
+    )
+
+
+def _long_cv(experiences: int = 12, with_education: bool = True) -> str:
+    parts = [
+        "Jean Dupont",
+        "Architecte logiciel - 15 ans d'expérience",
+        "COMPÉTENCES",
+        "- Java, Python, Kubernetes",
+        "EXPÉRIENCES PROFESSIONNELLES",
+    ]
+    parts += [_experience(i) for i in range(experiences)]
+    if with_education:
+        parts += ["FORMATIONS", "2005 Master Informatique"]
+    return "\n".join(parts)
+
+
+class TestSplitCvSections:
+    """Tests du découpage en sections"""
+
+    def test_sections_by_kind(self):
+        """Test du découpage profil / formations / blocs d'expériences"""
+        sections = split_cv_sections(_long_cv(), chunk_tokens=200)
+
+        kinds = [section.kind for section in sections]
+        assert kinds[:2] == ["profile", "education"]
+        assert set(kinds[2:]) == {"experiences"}
+        assert len(kinds) > 3
+
+        assert "Jean Dupont" in sections[0].text
+        assert sections[0].keys == PROFILE_KEYS
+        assert "Master Informatique" in sections[1].text
+        assert "Master" not in sections[2].text
+
+    def test_experiences_are_not_cut(self):
+        """Test que chaque expérience reste entière dans un seul bloc"""
+        sections = split_cv_sections(_long_cv(), chunk_tokens=200)
+        chunks = [s.text for s in sections if s.kind == "experiences"]
+
+        for index in range(12):
+            holders = [c for c in chunks if f"ENTREPRISE {index} (PARIS)" in c]
+            assert len(holders) == 1
+            assert f"projet {index}" in holders[0]
+            assert f"Décembre {2001 + index}" in holders[0]
+
+    def test_periods_given_as_profile_context(self):
+        """Test que les périodes sont transmises au profil (années d'expérience)"""
+        profile = split_cv_sections(_long_cv(), chunk_tokens=200)[0]
+
+        assert "Janvier 2000 à Décembre 2001" in profile.context
+
+    def test_profile_extracts_formations_without_education_section(self):
+        """Test que le profil extrait les formations si aucune section dédiée"""
+        sections = split_cv_sections(_long_cv(with_education=False), 200)
+
+        assert sections[0].keys == PROFILE_KEYS + EDUCATION_KEYS
+        assert "education" not in [s.kind for s in sections]
+
+    def test_no_experience_section(self):
+        """Test qu'un CV sans section d'expériences n'est pas découpé"""
+        assert split_cv_sections("Jean Dupont\nCOMPÉTENCES\n- Java", 200) == []
+
+    def test_section_prompt_reuses_full_schema_blocks(self):
+        """Test que chaque section ne demande que ses blocs du schéma complet"""
+        fields = PromptTemplates.JSON_SCHEMA_FIELDS
+        for keys in (PROFILE_KEYS, EDUCATION_KEYS, EXPERIENCE_KEYS):
+            prompt = PromptTemplates.build_section_extraction_prompt("texte", keys)
+
+            for key, block in fields.items():
+                assert (block in prompt) == (key in keys)
+
+
+class TestMergeSectionResults:
+    """Tests de la fusion des extractions"""
+
+    def test_merge_is_ordered_and_deduplicated(self):
+        """Test de la fusion déterministe dans le schéma cv_data"""
+        sections = [
+            CVSection("profile", "", PROFILE_KEYS),
+            CVSection("education", "", EDUCATION_KEYS),
+            CVSection("experiences", "", EXPERIENCE_KEYS),
+            CVSection("experiences", "", EXPERIENCE_KEYS),
+        ]
+        first = {"company": "A", "period": "2020 à 2021", "title": "Dev"}
+        second = {"company": "B", "period": "2021 à 2022", "title": "Lead"}
+        results = [
+            {"header": {"name": "Jean"}, "competences": {"techniques": []}},
+            {"formations": [{"year": "2005", "description": "Master"}]},
+            {"experiences": [first]},
+            {"experiences": [dict(first), second], "header": {"name": "Ignoré"}},
+        ]
+
+        merged = merge_section_results(sections, results)
+
+        assert merged["header"] == {"name": "Jean"}
+        assert merged["formations"] == [{"year": "2005", "description": "Master"}]
+        assert merged["experiences"] == [first, second]
+        assert "suggested_tjm" not in merged
@@ -0,0 +1,132 @@
+"""
+Tests unitaires pour le routeur de modèles (core.model_router)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+import openai
+import pytest
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.model_router import ModelRouter, RoutingPolicy, is_auto
+from core.resilience import CircuitOpenError, ResiliencePolicy, ResilientLLM
+
+MODELS = {
+    "small": {"tier": 1},
+    "medium": {"tier": 2},
+    "large": {"tier": 3},
+}
+
+
+@pytest.fixture
+def router():
+    gateway = ResilientLLM(ResiliencePolicy(breaker_failure_threshold=1))
+    return ModelRouter(
+        gateway, RoutingPolicy(long_cv_tokens=1000, max_p95_seconds=10.0), MODELS
+    )
+
+
+def _server_error():
+    request = httpx.Request("POST", "https://llm.example/v1/chat/completions")
+    response = httpx.Response(503, request=request)
+    return openai.InternalServerError("indisponible", response=response, body=None)
+
+
+class TestRouting:
+    """Tests du choix de modèle"""
+
+    def test_is_auto(self):
+        """Test de la détection du mode auto"""
+        assert is_auto("auto")
+        assert not is_auto("small")
+
+    def test_short_none_mode_uses_small_model(self, router):
+        """Test qu'un CV court sans amélioration va au modèle économique"""
+        assert router.select(200, "none") == "small"
+
+    def test_long_targeted_rewrite_uses_large_model(self, router):
+        """Test qu'une réécriture ciblée d'un CV long va au modèle le plus capable"""
+        assert router.required_tier(5000, "targeted") == 3
+        assert router.select(5000, "targeted") == "large"
+
+    def test_intermediate_cases(self, router):
+        """Test des cas intermédiaires (CV long ou amélioration seule)"""
+        assert router.select(5000, "none") == "medium"
+        assert router.select(200, "basic") == "medium"
+
+    def test_faster_model_preferred_within_tier(self):
+        """Test qu'à tier égal le modèle au p95 le plus bas est retenu"""
+        gateway = ResilientLLM(ResiliencePolicy())
+        router = ModelRouter(
+            gateway, RoutingPolicy(), {"slow": {"tier": 1}, "fast": {"tier": 1}}
+        )
+        gateway.stats("slow").latencies.extend([8.0] * 20)
+        gateway.stats("fast").latencies.extend([2.0] * 20)
+
+        assert router.select(100, "none") == "fast"
+
+
+class TestDegradation:
+    """Tests du repli sur modèle dégradé"""
+
+    def test_open_breaker_falls_back(self, router):
+        """Test qu'un modèle au circuit ouvert est évité"""
+        router.gateway.breaker("large").record_failure()
+
+        candidates = router.candidates(5000, "targeted")
+
+        assert candidates[0] == "medium"
+        assert candidates[-1] == "large"
+
+    def test_high_error_rate_is_degraded(self, router):
+        """Test qu'un taux d'erreur élevé rend un modèle dégradé"""
+        stats = router.gateway.stats("small")
+        stats.calls, stats.failures = 10, 5
+
+        assert router.is_degraded("small")
+        assert router.select(200, "none") == "medium"
+
+    def test_slow_p95_is_degraded(self, router):
+        """Test qu'une latence p95 excessive rend un modèle dégradé"""
+        router.gateway.stats("small").latencies.extend([30.0] * 20)
+
+        assert router.select(200, "none") == "medium"
+
+    def test_run_falls_back_on_transient_error(self, router):
+        """Test du repli à l'exécution sur erreur transitoire"""
+        tried = []
+
+        def call(model):
+            tried.append(model)
+            if model == "large":
+                raise _server_error()
+            return model
+
+        assert router.run(["large", "medium"], call) == "medium"
+        assert tried == ["large", "medium"]
+
+    def test_run_does_not_fall_back_on_other_errors(self, router):
+        """Test qu'une erreur non transitoire est relancée sans repli"""
+
+        def call(model):
+            raise ValueError("JSON invalide")
+
+        with pytest.raises(ValueError):
+            router.run(["large", "medium"], call)
+
+    def test_run_async_falls_back_on_open_circuit(self, router):
+        """Test du repli asyncio sur circuit ouvert"""
+
+        async def call(model):
+            if model == "large":
+                raise CircuitOpenError(model)
+            return model
+
+        result = asyncio.run(router.run_async(["large", "medium"], call))
+
+        assert result == "medium"
@@ -10,7 +10,7 @@ import pytest
 # Ajouter le répertoire racine au PYTHONPATH
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.backend.models import ConversionRequest, ConversionResponse
+from src.backend.models import CacheStats, ConversionRequest, ConversionResponse
 
 
 class TestConversionRequest:
@@ -55,6 +55,7 @@ class TestConversionResponse:
         assert response.pitch is None
         assert response.error is None
         assert response.processing_time is None
+        assert response.timings is None
 
     def test_conversion_response_full(self, sample_cv_data):
         """Test réponse complète"""
@@ -116,3 +117,21 @@ class TestConversionResponse:
             '"filename":"test.docx"' in json_str
             or '"filename": "test.docx"' in json_str
         )
+
+
+class TestCacheStats:
+    """Tests pour le modèle CacheStats"""
+
+    def test_cache_stats_from_statistics(self, isolated_llm_cache):
+        """Test construction depuis les statistiques du cache LLM"""
+        from core.cache import cache_statistics
+
+        isolated_llm_cache.set("k", {"name": "Test"})
+        isolated_llm_cache.get("k")
+
+        stats = CacheStats(**cache_statistics())
+
+        assert stats.memory.hits == 1
+        assert stats.memory.entries == 1
+        assert stats.disk.entries == 1
+        assert stats.coalesced >= 0
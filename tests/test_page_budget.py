@@ -0,0 +1,134 @@
+"""
+Tests unitaires pour le budget de pages local (core.page_budget)
+"""
+
+import copy
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.page_budget import PageEstimator, fit_to_page_budget
+
+
+def _long_cv(experiences=4, activities=8):
+    """CV volumineux : nombreuses expériences détaillées"""
+    return {
+        "header": {"name": "Test", "title": "Architecte", "experience": "20 ans"},
+        "skills_assessment": [
+            {"skill": f"Tech{i}", "level": level}
+            for i, level in enumerate([40, 95, 60, 85, 30, 90, 70, 55, 80, 65, 50, 75])
+        ],
+        "competences": {
+            "operationnelles": [f"Compétence opérationnelle {i}" for i in range(10)],
+            "techniques": [
+                {"category": f"Catégorie {i}", "items": [f"Tech{i}", f"Tech{i + 6}"]}
+                for i in range(6)
+            ],
+        },
+        "formations": [
+            {"year": str(2000 + i), "description": f"Formation {i}"} for i in range(5)
+        ],
+        "experiences": [
+            {
+                "company": f"Entreprise {i} (Paris)",
+                "period": "Janvier 2020 à Décembre 2021",
+                "title": "Développeur",
+                "context": "Contexte de la mission " * 4,
+                "activities": [f"Activité {j} " * 8 for j in range(activities)],
+                "tech_env": "Python, Django, PostgreSQL, Docker",
+            }
+            for i in range(experiences)
+        ],
+    }
+
+
+class TestPageEstimator:
+    """Tests de l'estimation du nombre de pages"""
+
+    def test_small_cv_fits_one_page(self, minimal_cv_data):
+        """Test qu'un CV minimal tient sur une page"""
+        assert PageEstimator().page_count(minimal_cv_data) == 1
+
+    def test_more_content_means_more_pages(self):
+        """Test que l'estimation croît avec le contenu"""
+        estimator = PageEstimator()
+        short = estimator.estimate(_long_cv(experiences=2, activities=2))
+        long = estimator.estimate(_long_cv(experiences=4, activities=8))
+        assert long > short
+        assert estimator.page_count(_long_cv()) > 3
+
+
+class TestPageBudgetTrimmer:
+    """Tests de la réduction au budget de pages"""
+
+    def test_fitting_cv_is_unchanged(self, sample_cv_data):
+        """Test qu'un CV déjà dans le budget n'est pas modifié"""
+        trimmed, report = fit_to_page_budget(sample_cv_data, 4)
+
+        assert trimmed == sample_cv_data
+        assert report.actions == []
+        assert report.fits
+
+    def test_long_cv_is_trimmed_to_budget(self):
+        """Test réduction d'un CV long sans supprimer d'expérience"""
+        cv_data = _long_cv()
+        original = copy.deepcopy(cv_data)
+
+        trimmed, report = fit_to_page_budget(cv_data, 3)
+
+        assert report.pages_before > 3
+        assert report.fits
+        assert PageEstimator().page_count(trimmed) <= 3
+        assert len(trimmed["experiences"]) == 4
+        assert all(len(e["activities"]) <= 4 for e in trimmed["experiences"])
+        # L'entrée (données en cache) n'est pas modifiée
+        assert cv_data == original
+
+    def test_priority_rules_keep_highest_levels(self):
+        """Test que les compétences de plus haut niveau sont conservées"""
+        trimmed, _ = fit_to_page_budget(_long_cv(), 2)
+
+        # L'évaluation des compétences (non rendue dans le DOCX) est conservée
+        assert trimmed["skills_assessment"] == _long_cv()["skills_assessment"]
+        # 4 catégories max, classées par meilleur niveau de leurs technologies
+        categories = [t["category"] for t in trimmed["competences"]["techniques"]]
+        assert categories == [
+            "Catégorie 1",
+            "Catégorie 2",
+            "Catégorie 3",
+            "Catégorie 5",
+        ]
+
+    def test_keep_operationnelles(self):
+        """Test que les entrées d'un pitch déjà lancé ne sont pas réduites"""
+        operationnelles = _long_cv()["competences"]["operationnelles"]
+        trimmed, report = fit_to_page_budget(_long_cv(8), 1)
+        kept, kept_report = fit_to_page_budget(
+            _long_cv(8), 1, keep_operationnelles=True
+        )
+
+        assert len(trimmed["competences"]["operationnelles"]) == 6
+        assert kept["competences"]["operationnelles"] == operationnelles
+        assert kept_report.pages_after >= report.pages_after
+
+    def test_oldest_experiences_trimmed_first(self):
+        """Test que la réduction progressive commence par les plus anciennes"""
+        trimmed, report = fit_to_page_budget(_long_cv(), 3)
+
+        counts = [len(e["activities"]) for e in trimmed["experiences"]]
+        assert counts == sorted(counts, reverse=True)
+        assert report.as_dict()["fits"] is True
+
+    def test_deterministic_and_fast(self):
+        """Test que la réduction est déterministe et rapide"""
+        cv_data = _long_cv()
+        start = time.perf_counter()
+        first, _ = fit_to_page_budget(cv_data, 2)
+        elapsed = time.perf_counter() - start
+        second, _ = fit_to_page_budget(cv_data, 2)
+
+        assert first == second
+        assert elapsed < 0.1
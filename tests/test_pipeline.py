@@ -0,0 +1,116 @@
+"""
+Tests unitaires pour le graphe d'étapes (core.pipeline)
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.pipeline import PipelineReport, StageGraph
+
+
+def _sleepy(value, delay=0.05):
+    """Étape factice qui attend puis retourne une valeur"""
+
+    def stage(**kwargs):
+        time.sleep(delay)
+        return value
+
+    return stage
+
+
+class TestStageGraph:
+    """Tests du graphe d'étapes synchrone"""
+
+    def test_dependencies_receive_results(self):
+        """Test que les résultats des dépendances sont transmis par nom"""
+        graph = StageGraph()
+        graph.add_stage("a", lambda: 2)
+        graph.add_stage("b", lambda: 3)
+        graph.add_stage("c", lambda a, b: a * b, depends_on=["a", "b"])
+
+        results = graph.run()
+
+        assert results == {"a": 2, "b": 3, "c": 6}
+
+    def test_independent_stages_run_in_parallel(self):
+        """Test que deux étapes indépendantes se chevauchent"""
+        graph = StageGraph()
+        graph.add_stage("left", _sleepy("L", 0.2))
+        graph.add_stage("right", _sleepy("R", 0.2))
+
+        start = time.perf_counter()
+        graph.run()
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.35
+        assert graph.report.wall_time < 0.35
+
+    def test_critical_path(self):
+        """Test du calcul du chemin critique"""
+        graph = StageGraph()
+        graph.add_stage("cv_text", _sleepy("text", 0.1))
+        graph.add_stage("job_offer", _sleepy(None, 0.01))
+        graph.add_stage(
+            "cv_data", _sleepy({}, 0.05), depends_on=["cv_text", "job_offer"]
+        )
+        graph.add_stage("output_file", _sleepy("out", 0.01), depends_on=["cv_data"])
+        graph.add_stage("pitch", _sleepy("pitch", 0.15), depends_on=["cv_data"])
+
+        report = PipelineReport()
+        graph.run(report)
+
+        assert report.critical_path == ["cv_text", "cv_data", "pitch"]
+        assert report.critical_path_time >= 0.3
+        assert set(report.as_dict()["stages"]) == {
+            "cv_text",
+            "job_offer",
+            "cv_data",
+            "output_file",
+            "pitch",
+        }
+
+    def test_error_is_propagated(self):
+        """Test qu'une erreur d'étape est relancée à l'appelant"""
+
+        def failing():
+            raise ValueError("boom")
+
+        graph = StageGraph()
+        graph.add_stage("a", failing)
+        graph.add_stage("b", lambda a: a, depends_on=["a"])
+
+        with pytest.raises(ValueError, match="boom"):
+            graph.run()
+
+    def test_unknown_dependency(self):
+        """Test qu'une dépendance non déclarée est refusée"""
+        graph = StageGraph()
+        with pytest.raises(ValueError, match="Dépendance inconnue"):
+            graph.add_stage("b", lambda a: a, depends_on=["a"])
+
+
+class TestStageGraphAsync:
+    """Tests du graphe d'étapes asyncio"""
+
+    def test_run_async_mixes_coroutines_and_blocking_stages(self):
+        """Test exécution asyncio avec étapes synchrones et coroutines"""
+
+        async def llm(cv_text):
+            await asyncio.sleep(0.01)
+            return {"text": cv_text}
+
+        graph = StageGraph()
+        graph.add_stage("cv_text", _sleepy("text", 0.01))
+        graph.add_stage("cv_data", llm, depends_on=["cv_text"])
+
+        results = asyncio.run(graph.run_async())
+
+        assert results["cv_data"] == {"text": "text"}
+        assert graph.report.critical_path == ["cv_text", "cv_data"]
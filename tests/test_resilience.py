@@ -0,0 +1,300 @@
+"""
+Tests unitaires pour la résilience des appels LLM (core.resilience)
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import openai
+import pytest
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ResiliencePolicy,
+    ResilientLLM,
+    is_retryable,
+    retry_after_seconds,
+)
+
+REQUEST = httpx.Request("POST", "https://llm.example/v1/chat/completions")
+
+
+def _status_error(cls, status, headers=None):
+    response = httpx.Response(status, headers=headers or {}, request=REQUEST)
+    return cls("erreur", response=response, body=None)
+
+
+def _policy(**overrides):
+    values = dict(
+        budget=5.0,
+        max_retries=3,
+        base_delay=0.001,
+        max_delay=0.05,
+        breaker_failure_threshold=2,
+        breaker_reset_timeout=0.05,
+    )
+    values.update(overrides)
+    return ResiliencePolicy(**values)
+
+
+class _Flaky:
+    """Appel factice : échoue avec les erreurs données puis réussit"""
+
+    def __init__(self, *errors, result="ok"):
+        self.errors = list(errors)
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.result
+
+
+class TestErrorClassification:
+    """Tests de la classification des erreurs"""
+
+    def test_transient_errors_are_retryable(self):
+        """Test que 429, 5xx et erreurs réseau sont réessayables"""
+        assert is_retryable(_status_error(openai.RateLimitError, 429))
+        assert is_retryable(_status_error(openai.InternalServerError, 503))
+        assert is_retryable(openai.APIConnectionError(request=REQUEST))
+        # Connexion coupée pendant la lecture d'un flux (non enveloppée par le SDK)
+        assert is_retryable(httpx.ReadError("coupure", request=REQUEST))
+        assert is_retryable(httpx.RemoteProtocolError("incomplet", request=REQUEST))
+
+    def test_client_errors_are_not_retryable(self):
+        """Test que les erreurs de requête ne sont pas réessayées"""
+        assert not is_retryable(_status_error(openai.BadRequestError, 400))
+        assert not is_retryable(ValueError("JSON invalide"))
+
+    def test_retry_after_headers(self):
+        """Test de la lecture des en-têtes Retry-After"""
+        seconds = _status_error(openai.RateLimitError, 429, {"retry-after": "2"})
+        millis = _status_error(openai.RateLimitError, 429, {"retry-after-ms": "250"})
+
+        assert retry_after_seconds(seconds) == 2.0
+        assert retry_after_seconds(millis) == 0.25
+        assert retry_after_seconds(ValueError()) is None
+
+
+class TestRetries:
+    """Tests des nouvelles tentatives"""
+
+    def test_retry_then_success(self):
+        """Test qu'une erreur transitoire est réessayée"""
+        gateway = ResilientLLM(_policy())
+        func = _Flaky(
+            _status_error(openai.RateLimitError, 429, {"retry-after-ms": "1"}),
+            _status_error(openai.InternalServerError, 502),
+        )
+
+        assert gateway.call("m", func) == "ok"
+        assert func.calls == 3
+        stats = gateway.metrics()["m"]
+        assert stats["retries"] == 2
+        assert stats["successes"] == 1
+
+    def test_retry_after_is_honored(self):
+        """Test que le délai Retry-After est respecté (borné par max_delay)"""
+        gateway = ResilientLLM(_policy(max_delay=1.0))
+        func = _Flaky(
+            _status_error(openai.RateLimitError, 429, {"retry-after-ms": "150"})
+        )
+
+        start = time.monotonic()
+        gateway.call("m", func)
+
+        assert time.monotonic() - start >= 0.15
+
+    def test_non_retryable_error_is_raised(self):
+        """Test qu'une erreur non transitoire est relancée sans nouvelle tentative"""
+        gateway = ResilientLLM(_policy())
+        func = _Flaky(_status_error(openai.BadRequestError, 400))
+
+        with pytest.raises(openai.BadRequestError):
+            gateway.call("m", func)
+        assert func.calls == 1
+        assert gateway.breaker("m").state == CircuitBreaker.CLOSED
+
+    def test_retries_are_bounded(self):
+        """Test que le nombre de tentatives est borné"""
+        gateway = ResilientLLM(_policy(max_retries=2, breaker_failure_threshold=10))
+        func = _Flaky(*[_status_error(openai.InternalServerError, 500)] * 5)
+
+        with pytest.raises(openai.InternalServerError):
+            gateway.call("m", func)
+        assert func.calls == 3
+
+    def test_budget_stops_retries(self):
+        """Test qu'un Retry-After dépassant le budget arrête les tentatives"""
+        gateway = ResilientLLM(_policy(budget=0.1, max_delay=10.0))
+        func = _Flaky(_status_error(openai.RateLimitError, 429, {"retry-after": "5"}))
+
+        with pytest.raises(openai.RateLimitError):
+            gateway.call("m", func)
+        assert func.calls == 1
+
+
+class TestCircuitBreaker:
+    """Tests du disjoncteur par modèle"""
+
+    def test_breaker_opens_and_short_circuits(self):
+        """Test que le circuit s'ouvre puis refuse les appels sans solliciter l'API"""
+        gateway = ResilientLLM(_policy(max_retries=0))
+        failing = _Flaky(*[_status_error(openai.InternalServerError, 500)] * 2)
+
+        for _ in range(2):
+            with pytest.raises(openai.InternalServerError):
+                gateway.call("m", failing)
+
+        healthy = _Flaky()
+        with pytest.raises(CircuitOpenError):
+            gateway.call("m", healthy)
+        assert healthy.calls == 0
+
+        # Les autres modèles ne sont pas affectés
+        assert gateway.call("autre", healthy) == "ok"
+
+        stats = gateway.metrics()["m"]
+        assert stats["breaker"] == CircuitBreaker.OPEN
+        assert stats["breaker_opens"] == 1
+        assert stats["short_circuited"] == 1
+
+    def test_half_open_recovers(self):
+        """Test qu'un appel d'essai réussi referme le circuit"""
+        gateway = ResilientLLM(_policy(max_retries=0))
+        failing = _Flaky(*[_status_error(openai.InternalServerError, 500)] * 2)
+        for _ in range(2):
+            with pytest.raises(openai.InternalServerError):
+                gateway.call("m", failing)
+
+        time.sleep(0.06)
+
+        assert gateway.call("m", _Flaky()) == "ok"
+        assert gateway.breaker("m").state == CircuitBreaker.CLOSED
+
+    def _open(self, gateway):
+        failing = _Flaky(*[_status_error(openai.InternalServerError, 500)] * 2)
+        for _ in range(2):
+            with pytest.raises(openai.InternalServerError):
+                gateway.call("m", failing)
+        time.sleep(0.06)
+
+    def test_half_open_closes_on_non_transient_error(self):
+        """Test qu'un essai rejeté (400) referme le circuit : l'endpoint répond"""
+        gateway = ResilientLLM(_policy(max_retries=0))
+        self._open(gateway)
+
+        with pytest.raises(openai.BadRequestError):
+            gateway.call("m", _Flaky(_status_error(openai.BadRequestError, 400)))
+
+        assert gateway.breaker("m").state == CircuitBreaker.CLOSED
+        assert gateway.call("m", _Flaky()) == "ok"
+
+    def test_cancelled_half_open_trial_reopens(self):
+        """Test qu'un essai annulé rouvre le circuit au lieu de le bloquer"""
+        gateway = ResilientLLM(_policy(max_retries=0))
+        self._open(gateway)
+
+        async def hang():
+            await asyncio.sleep(1)
+
+        async def scenario():
+            task = asyncio.ensure_future(gateway.call_async("m", hang))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(scenario())
+        assert gateway.breaker("m").state == CircuitBreaker.OPEN
+
+        time.sleep(0.06)
+        assert gateway.call("m", _Flaky()) == "ok"
+        assert gateway.breaker("m").state == CircuitBreaker.CLOSED
+
+
+class TestHedging:
+    """Tests des requêtes dupliquées (hedging)"""
+
+    def _warm(self, gateway, latency=0.001):
+        stats = gateway.stats("m")
+        stats.latencies.extend([latency] * 50)
+
+    def test_hedge_wins_on_slow_primary(self):
+        """Test que la requête dupliquée répond quand la première traîne"""
+        gateway = ResilientLLM(_policy(hedge_percentile=0.95))
+        self._warm(gateway)
+        calls = []
+
+        def func():
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.3)
+                return "lent"
+            return "rapide"
+
+        start = time.monotonic()
+        assert gateway.call("m", func) == "rapide"
+        assert time.monotonic() - start < 0.25
+
+        stats = gateway.metrics()["m"]
+        assert stats["hedges"] == 1
+        assert stats["hedge_wins"] == 1
+
+    def test_hedging_disabled_by_default(self):
+        """Test qu'aucune requête dupliquée n'est envoyée par défaut"""
+        gateway = ResilientLLM(_policy())
+        self._warm(gateway)
+
+        assert gateway.call("m", _Flaky()) == "ok"
+        assert gateway.metrics()["m"]["hedges"] == 0
+
+
+class TestAsync:
+    """Tests de la variante asyncio"""
+
+    def test_async_retry_then_success(self):
+        """Test des nouvelles tentatives en asyncio"""
+        gateway = ResilientLLM(_policy())
+        func = _Flaky(openai.APIConnectionError(request=REQUEST))
+
+        async def call():
+            return func()
+
+        assert asyncio.run(gateway.call_async("m", call)) == "ok"
+        assert func.calls == 2
+
+    def test_async_hedge_cancels_loser(self):
+        """Test que la requête perdante est annulée"""
+        gateway = ResilientLLM(_policy(hedge_percentile=0.95))
+        gateway.stats("m").latencies.extend([0.001] * 50)
+        state = {"calls": 0, "cancelled": False}
+
+        async def call():
+            state["calls"] += 1
+            if state["calls"] == 1:
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    state["cancelled"] = True
+                    raise
+                return "lent"
+            return "rapide"
+
+        async def scenario():
+            result = await gateway.call_async("m", call)
+            await asyncio.sleep(0)
+            return result
+
+        assert asyncio.run(scenario()) == "rapide"
+        assert state["cancelled"]
@@ -2,11 +2,12 @@
 Tests unitaires pour le service de conversion
 """
 
+import asyncio
 import os
 import sys
 import tempfile
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
@@ -204,6 +205,43 @@ class TestCVConversionService:
             Path(tmp_path).unlink(missing_ok=True)
             Path(job_path).unlink(missing_ok=True)
 
+    def test_convert_pdf_to_docx_async_success(self, service):
+        """Test conversion asynchrone réussie"""
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+            tmp.write(b"dummy pdf content")
+            tmp_path = tmp.name
+
+        try:
+            mock_cv_data = {
+                "header": {"name": "Test User", "title": "Dev", "experience": "5 ans"},
+                "pitch": "Test pitch",
+            }
+            with patch.object(
+                service.agent,
+                "process_cv_async",
+                AsyncMock(
+                    return_value=(tmp_path.replace(".pdf", ".docx"), mock_cv_data)
+                ),
+            ) as mock_process:
+                success, docx_path, cv_data, pitch, time = asyncio.run(
+                    service.convert_pdf_to_docx_async(tmp_path, generate_pitch=True)
+                )
+
+            assert success is True
+            assert pitch == "Test pitch"
+            mock_process.assert_awaited_once()
+        finally:
+            Path(tmp_path).unlink(missing_ok=True)
+
+    def test_convert_pdf_to_docx_async_file_not_found(self, service):
+        """Test conversion asynchrone avec fichier inexistant"""
+        success, docx_path, cv_data, pitch, time = asyncio.run(
+            service.convert_pdf_to_docx_async("nonexistent.pdf", generate_pitch=False)
+        )
+
+        assert success is False
+        assert docx_path is None
+
 
 class TestSettings:
     """Tests de configuration"""
@@ -0,0 +1,170 @@
+"""
+Tests unitaires pour la pré-extraction spéculative (core.speculative)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.speculative import (
+    CANCELLED,
+    DONE,
+    EXPIRED,
+    REJECTED,
+    RUNNING,
+    SpeculativeExtractor,
+    file_fingerprint,
+)
+
+
+class _Agent:
+    """Agent factice : la pré-extraction attend ``release``"""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.paths = []
+        self.fail = fail
+        self.release = None
+
+    async def prefetch_async(self, pdf_path, model=None):
+        self.calls.append(model)
+        self.paths.append(pdf_path)
+        assert Path(pdf_path).read_bytes() == b"%PDF"
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("LLM indisponible")
+        return {"header": {"name": "Jean Dupont"}}
+
+
+def _run(scenario, agent=None, **kwargs):
+    agent = agent or _Agent()
+
+    async def main():
+        agent.release = asyncio.Event()
+        speculative = SpeculativeExtractor(agent, **kwargs)
+        return await scenario(speculative, agent)
+
+    return asyncio.run(main()), agent
+
+
+class TestSpeculativeExtractor:
+    """Tests du budget, de l'annulation et de la réclamation"""
+
+    def test_claim_waits_for_running_prefetch(self):
+        """Test qu'une conversion attend la pré-extraction du même fichier"""
+
+        async def scenario(speculative, agent):
+            speculation = speculative.submit(b"%PDF", ".pdf", "auto")
+            assert speculation.status == RUNNING
+            # Le même upload n'est pas relancé
+            assert speculative.submit(b"%PDF", ".pdf", "auto") is speculation
+
+            claim = asyncio.ensure_future(speculative.claim(b"%PDF", "auto"))
+            await asyncio.sleep(0)
+            assert not claim.done()
+            agent.release.set()
+            return await claim, speculation, speculative.stats()
+
+        (claimed, speculation, stats), agent = _run(scenario)
+
+        assert claimed is True
+        assert speculation.status == DONE
+        assert agent.calls == ["auto"]
+        assert stats == {"running": 0, "submitted": 1, "claimed": 1, DONE: 1}
+        # Le fichier temporaire est supprimé
+        assert not Path(agent.paths[0]).exists()
+
+    def test_claim_without_prefetch(self):
+        """Test qu'une conversion sans pré-extraction n'attend rien"""
+
+        async def scenario(speculative, agent):
+            speculative.submit(b"%PDF", ".pdf", "auto")
+            result = await speculative.claim(b"%PDF", "autre-modele")
+            agent.release.set()
+            return result
+
+        claimed, _ = _run(scenario)
+        assert claimed is False
+
+    def test_claim_by_file_fingerprint(self, tmp_path):
+        """Test que l'empreinte du fichier sur disque retrouve celle de l'upload"""
+        pdf_path = tmp_path / "cv.pdf"
+        pdf_path.write_bytes(b"%PDF")
+
+        async def scenario(speculative, agent):
+            speculative.submit(b"%PDF", ".pdf", "auto")
+            agent.release.set()
+            fingerprint = file_fingerprint(str(pdf_path), "auto")
+            return await speculative.claim_fingerprint(fingerprint)
+
+        claimed, _ = _run(scenario)
+        assert claimed is True
+
+    def test_concurrency_budget(self):
+        """Test qu'au-delà du budget de tâches l'upload n'est pas pré-traité"""
+
+        async def scenario(speculative, agent):
+            first = speculative.submit(b"%PDF", ".pdf", "a")
+            second = speculative.submit(b"%PDF", ".pdf", "b")
+            agent.release.set()
+            return first.status, second.status
+
+        statuses, agent = _run(scenario, max_concurrent=1)
+        assert statuses == (RUNNING, REJECTED)
+        assert agent.calls == ["a"]
+
+    def test_cancel_abandoned_upload(self):
+        """Test de l'annulation d'une pré-extraction non réclamée"""
+
+        async def scenario(speculative, agent):
+            speculation = speculative.submit(b"%PDF", ".pdf", "auto")
+            await asyncio.sleep(0)
+            assert speculative.cancel(speculation.id) is True
+            await asyncio.wait({speculation.task})
+            return speculation, speculative.running
+
+        (speculation, running), agent = _run(scenario)
+        assert speculation.status == CANCELLED
+        assert running == 0
+        assert not Path(agent.paths[0]).exists()
+
+    def test_time_budget_expires_unclaimed_work(self):
+        """Test qu'une pré-extraction trop longue est interrompue"""
+
+        async def scenario(speculative, agent):
+            speculation = speculative.submit(b"%PDF", ".pdf", "auto")
+            await asyncio.wait({speculation.task})
+            return speculation
+
+        speculation, _ = _run(scenario, timeout=0.01)
+        assert speculation.status == EXPIRED
+
+    def test_claimed_work_is_not_cancelled(self):
+        """Test qu'une pré-extraction réclamée échappe au budget de temps"""
+
+        async def scenario(speculative, agent):
+            speculation = speculative.submit(b"%PDF", ".pdf", "auto")
+            claim = asyncio.ensure_future(speculative.claim(b"%PDF", "auto"))
+            await asyncio.sleep(0.05)
+            assert speculative.cancel(speculation.id) is False
+            agent.release.set()
+            await claim
+            return speculation
+
+        speculation, _ = _run(scenario, timeout=0.01)
+        assert speculation.status == DONE
+
+    def test_failure_is_contained(self):
+        """Test qu'un échec de pré-extraction ne remonte pas à la conversion"""
+
+        async def scenario(speculative, agent):
+            speculative.submit(b"%PDF", ".pdf", "auto")
+            agent.release.set()
+            return await speculative.claim(b"%PDF", "auto"), speculative.stats()
+
+        (claimed, stats), _ = _run(scenario, agent=_Agent(fail=True))
+        assert claimed is True
+        assert stats["failed"] == 1
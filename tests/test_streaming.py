@@ -0,0 +1,236 @@
+"""
+Tests unitaires pour l'extraction en streaming (core.streaming)
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.prompts import PromptTemplates
+from core.resilience import ResiliencePolicy, ResilientLLM
+from core.streaming import (
+    JsonStreamScanner,
+    PitchSpeculation,
+    StreamObservers,
+    TokenProgress,
+    collect_stream,
+    collect_stream_async,
+    combine_observers,
+    pitch_first,
+    pitch_inputs_ready,
+)
+
+CV_DATA = {
+    "header": {"name": "Jean Dupont", "title": "Dev {senior}", "experience": "10"},
+    "competences": {"operationnelles": ["Pilotage"], "techniques": []},
+    "experiences": [
+        {"company": f"Société {index}", "period": "2020", "activities": ["a, b"]}
+        for index in range(4)
+    ],
+    "formations": [{"year": "2010", "description": 'Master "info"'}],
+}
+
+
+def _chunk(content=None, finish_reason=None, usage=None):
+    delta = SimpleNamespace(content=content)
+    choices = [SimpleNamespace(delta=delta, finish_reason=finish_reason)]
+    return SimpleNamespace(
+        choices=choices if content or finish_reason else [], usage=usage
+    )
+
+
+def _fragments(text, size=7):
+    return [text[start:][:size] for start in range(0, len(text), size)]
+
+
+class TestJsonStreamScanner:
+    """Tests de l'analyse incrémentale"""
+
+    def test_completed_paths(self):
+        """Test des chemins terminés, chaînes contenant des délimiteurs comprises"""
+        scanner = JsonStreamScanner()
+        for fragment in _fragments(json.dumps(CV_DATA, ensure_ascii=False)):
+            scanner.feed(fragment)
+
+        assert scanner.done("header")
+        assert scanner.done("competences", "operationnelles")
+        assert scanner.done("experiences", 3)
+        assert scanner.done("experiences", 0, "activities")
+        assert scanner.done("formations", 0)
+        assert scanner.done()
+        assert not scanner.done("experiences", 4)
+
+    def test_pitch_inputs_ready_before_end(self):
+        """Test que les entrées du pitch sont prêtes avant la fin de la réponse"""
+        text = json.dumps(CV_DATA, ensure_ascii=False)
+        cut = text.index('{"company": "Société 3"')
+        scanner = JsonStreamScanner()
+        scanner.feed(text[:cut])
+
+        assert pitch_inputs_ready(scanner)
+        assert not scanner.done()
+
+    def test_short_experience_list(self):
+        """Test d'un CV de moins de trois expériences (tableau terminé)"""
+        scanner = JsonStreamScanner()
+        scanner.feed('{"h":["J",""],"op":["a"],"x":[["S","2020"]]')
+
+        assert pitch_inputs_ready(scanner, compact=True)
+        assert not pitch_inputs_ready(scanner)
+
+
+class TestPitchFirst:
+    """Tests de l'ordre des champs"""
+
+    def test_pitch_first_order(self):
+        """Test que les entrées du pitch passent en tête"""
+        data = {"formations": [], "experiences": [], "header": {}, "competences": {}}
+        assert list(pitch_first(data)) == [
+            "header",
+            "competences",
+            "experiences",
+            "formations",
+        ]
+        assert list(pitch_first({"f": [], "x": [], "op": [], "h": []}, True)) == [
+            "h",
+            "op",
+            "x",
+            "f",
+        ]
+
+    def test_pitch_first_schema(self):
+        """Test que le schéma demandé place les entrées du pitch en tête"""
+        schema = PromptTemplates.get_json_schema(pitch_first=True)
+        assert schema.index('"experiences"') < schema.index('"formations"')
+        assert schema.index('"competences"') < schema.index('"skills_assessment"')
+        assert PromptTemplates.get_json_schema() != schema
+
+
+class TestPitchSpeculation:
+    """Tests du lancement du pitch spéculatif"""
+
+    def test_starts_once_with_normalized_partial(self):
+        """Test que le pitch est lancé une fois, avec un cv_data partiel normalisé"""
+        started = []
+        speculation = PitchSpeculation(started.append)
+        feed = speculation.watcher()
+        for fragment in _fragments(json.dumps(CV_DATA, ensure_ascii=False)):
+            feed(fragment)
+
+        assert len(started) == 1
+        partial = started[0]
+        assert partial["header"]["name"] == "Jean Dupont"
+        assert len(partial["experiences"]) == 3
+        assert partial["formations"] == []
+
+    def test_compact_partial_is_expanded(self):
+        """Test qu'une réponse compacte est ramenée à la forme canonique"""
+        started = []
+        feed = PitchSpeculation(started.append, compact=True).watcher()
+        feed('{"h":["Jean Dupont","Dev","10"],"op":["a"],"x":[["S","2020"]],"f":[')
+
+        assert started[0]["header"]["title"] == "Dev"
+        assert started[0]["experiences"][0]["company"] == "S"
+
+
+class TestObservers:
+    """Tests de la progression et de la combinaison des observateurs"""
+
+    def test_token_progress_is_throttled(self):
+        """Test que la progression est signalée au plus une fois par intervalle"""
+        reports = []
+        feed = TokenProgress(reports.append, interval=3600).watcher()
+        for _ in range(5):
+            feed("x")
+        assert reports == [1]
+
+        feed = TokenProgress(reports.append, interval=0).watcher()
+        for _ in range(3):
+            feed("x")
+        assert reports == [1, 1, 2, 3]
+
+    def test_combine_observers(self):
+        """Test que chaque observateur reçoit tous les fragments"""
+        reports, started = [], []
+        progress = TokenProgress(reports.append, interval=0)
+        speculation = PitchSpeculation(started.append)
+
+        assert combine_observers(None, None) is None
+        assert combine_observers(progress, None) is progress
+        combined = combine_observers(speculation, progress)
+        assert isinstance(combined, StreamObservers)
+
+        feed = combined.watcher()
+        for fragment in _fragments(json.dumps(CV_DATA, ensure_ascii=False)):
+            feed(fragment)
+        assert len(started) == 1
+        assert reports[-1] == len(_fragments(json.dumps(CV_DATA, ensure_ascii=False)))
+
+
+class TestCollectStream:
+    """Tests de la reconstitution d'une réponse streamée"""
+
+    def test_collect_stream(self):
+        """Test du texte, du finish_reason, de l'usage et du premier token"""
+        fed, probe = [], {}
+        chunks = [
+            _chunk('{"a":'),
+            _chunk(" 1}"),
+            _chunk(finish_reason="stop"),
+            _chunk(usage={"prompt_tokens": 10, "completion_tokens": 3}),
+        ]
+
+        response = collect_stream(chunks, fed.append, probe)
+
+        assert response.choices[0].message.content == '{"a": 1}'
+        assert response.choices[0].finish_reason == "stop"
+        assert response.usage.completion_tokens == 3
+        assert fed == ['{"a":', " 1}"]
+        assert probe["first_token"] is not None
+
+    def test_collect_stream_async(self):
+        """Test de la variante asyncio"""
+
+        async def chunks():
+            yield _chunk("{}")
+            yield _chunk(finish_reason="length")
+
+        response = asyncio.run(collect_stream_async(chunks(), lambda delta: None))
+
+        assert response.choices[0].message.content == "{}"
+        assert response.choices[0].finish_reason == "length"
+        assert response.usage is None
+
+    def test_stream_broken_midway_is_retried(self):
+        """Test qu'une connexion coupée en cours de flux est réessayée"""
+        gateway = ResilientLLM(ResiliencePolicy(budget=5.0, base_delay=0.001))
+        request = httpx.Request("POST", "https://llm.example/v1/chat/completions")
+        attempts = []
+
+        def stream():
+            attempts.append(1)
+            yield _chunk('{"a":')
+            if len(attempts) == 1:
+                raise httpx.RemoteProtocolError("flux interrompu", request=request)
+            yield _chunk(" 1}")
+            yield _chunk(finish_reason="stop")
+
+        def call():
+            fed = []
+            response = collect_stream(stream(), fed.append)
+            return response, fed
+
+        response, fed = gateway.call("m", call)
+
+        assert len(attempts) == 2
+        assert response.choices[0].message.content == '{"a": 1}'
+        # La tentative réussie repart d'un texte vide
+        assert fed == ['{"a":', " 1}"]
+        assert gateway.metrics()["m"]["retries"] == 1
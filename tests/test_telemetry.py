@@ -0,0 +1,163 @@
+"""
+Tests unitaires pour la télémétrie des appels LLM (core.telemetry)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.pipeline import StageGraph
+from core.telemetry import (
+    EXTRACTION,
+    PITCH,
+    Histogram,
+    LLMCallRecord,
+    LLMTelemetry,
+)
+
+
+def _response(prompt=1200, completion=300, cached=200, finish_reason="stop"):
+    return SimpleNamespace(
+        usage=SimpleNamespace(
+            prompt_tokens=prompt,
+            completion_tokens=completion,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=cached),
+        ),
+        choices=[SimpleNamespace(finish_reason=finish_reason)],
+    )
+
+
+class TestRecords:
+    """Tests des enregistrements et histogrammes"""
+
+    def test_record_from_response(self):
+        """Test de la lecture de usage et finish_reason"""
+        record = LLMCallRecord.from_response(EXTRACTION, "m", _response(), 1.5)
+
+        assert record.prompt_tokens == 1200
+        assert record.completion_tokens == 300
+        assert record.cached_tokens == 200
+        assert record.finish_reason == "stop"
+        assert record.latency == 1.5
+
+    def test_record_without_usage(self):
+        """Test qu'une réponse sans usage donne des compteurs nuls"""
+        record = LLMCallRecord.from_response(PITCH, "m", SimpleNamespace(), 0.1)
+
+        assert record.prompt_tokens == 0
+        assert record.finish_reason is None
+
+    def test_histogram_buckets(self):
+        """Test de la répartition par classes"""
+        histogram = Histogram((1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+
+        data = histogram.as_dict()
+        assert data["count"] == 4
+        assert data["buckets"] == {"<=1": 2, "<=5": 1, ">5": 1}
+        assert data["mean"] == pytest.approx(3.625)
+
+
+class TestLLMTelemetry:
+    """Tests de l'agrégation et du bilan par conversion"""
+
+    def test_measure_aggregates_by_kind(self):
+        """Test des agrégats par type d'appel"""
+        telemetry = LLMTelemetry()
+        with telemetry.measure(EXTRACTION, "m") as probe:
+            probe["response"] = _response(finish_reason="length")
+        telemetry.record_cache_hit(EXTRACTION, "m")
+
+        stats = telemetry.snapshot()[EXTRACTION]
+        assert stats["calls"] == 1
+        assert stats["cache_hits"] == 1
+        assert stats["prompt_tokens"] == 1200
+        assert stats["finish_reasons"] == {"length": 1}
+        assert stats["latency"]["count"] == 1
+
+    def test_measure_records_errors(self):
+        """Test qu'un appel en échec est enregistré puis l'erreur relancée"""
+        telemetry = LLMTelemetry()
+        with pytest.raises(TimeoutError):
+            with telemetry.measure(PITCH, "m"):
+                raise TimeoutError()
+
+        assert telemetry.snapshot()[PITCH]["errors"] == 1
+
+    def test_time_to_first_token(self):
+        """Test du délai du premier token renseigné par un appel en streaming"""
+        telemetry = LLMTelemetry()
+        with telemetry.track() as conversion:
+            with telemetry.measure(PITCH, "m") as probe:
+                probe["first_token"] = 0.0
+                probe["response"] = _response()
+
+        assert conversion.calls[0].time_to_first_token is not None
+        assert telemetry.snapshot()[PITCH]["time_to_first_token"]["count"] == 1
+
+    def test_schema_savings(self):
+        """Test du gain moyen du schéma compact par modèle"""
+        telemetry = LLMTelemetry()
+        for schema, completion in (("verbose", 900), ("compact", 500)):
+            with telemetry.measure(EXTRACTION, "m", schema) as probe:
+                probe["response"] = _response(completion=completion)
+        with telemetry.measure(EXTRACTION, "autre", "verbose") as probe:
+            probe["response"] = _response()
+
+        savings = telemetry.schema_savings()
+        assert savings["m"]["compact"]["mean_completion_tokens"] == 500
+        assert savings["m"]["saved_completion_tokens"] == 400
+        # Une seule variante observée : pas d'économie calculée
+        assert "saved_completion_tokens" not in savings["autre"]
+
+    def test_conversion_breakdown(self):
+        """Test du bilan par conversion"""
+        telemetry = LLMTelemetry()
+        with telemetry.track() as conversion:
+            with telemetry.measure(EXTRACTION, "m") as probe:
+                probe["response"] = _response()
+            with telemetry.measure(PITCH, "m") as probe:
+                probe["response"] = _response(prompt=400, completion=100, cached=0)
+            telemetry.record_cache_hit(EXTRACTION, "m")
+
+        # Hors conversion : non rattaché
+        telemetry.record_cache_hit(PITCH, "m")
+
+        summary = conversion.as_dict()
+        assert summary["llm_calls"] == 2
+        assert summary["cache_hits"] == 1
+        assert summary["prompt_tokens"] == 1600
+        assert summary["by_kind"][PITCH]["completion_tokens"] == 100
+        assert len(summary["calls"]) == 3
+
+    def test_stage_threads_share_conversion(self):
+        """Test que les étapes (threads et asyncio) alimentent la conversion"""
+        telemetry = LLMTelemetry()
+
+        def stage():
+            telemetry.record_cache_hit(EXTRACTION, "m")
+
+        async def async_stage():
+            telemetry.record_cache_hit(PITCH, "m")
+
+        graph = StageGraph()
+        graph.add_stage("a", stage)
+        graph.add_stage("b", stage)
+
+        async_graph = StageGraph()
+        async_graph.add_stage("c", stage)
+        async_graph.add_stage("d", async_stage)
+
+        with telemetry.track() as conversion:
+            graph.run()
+            asyncio.run(async_graph.run_async())
+
+        assert [record.kind for record in conversion.calls].count(EXTRACTION) == 3
+        assert len(conversion.calls) == 4
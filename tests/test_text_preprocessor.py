@@ -0,0 +1,86 @@
+"""
+Tests unitaires pour le prétraitement du texte des CV (core.text_preprocessor)
+"""
+
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.text_preprocessor import PAGE_BREAK, estimate_tokens, preprocess_cv_text
+
+
+def _page(number, body):
+    """Page PDF avec en-tête et pied de page répétés"""
+    return "\n".join(
+        [
+            "Jean DUPONT - Développeur Python",
+            "ALLTECH Consulting",
+            *body,
+            "Document confidentiel",
+            f"Page {number}/3",
+        ]
+    )
+
+
+class TestPreprocessCvText:
+    """Tests du nettoyage du texte extrait"""
+
+    def test_repeated_headers_and_footers_removed(self):
+        """Test suppression des lignes répétées sur chaque page"""
+        text = PAGE_BREAK.join(
+            [
+                _page(1, ["EXPÉRIENCES", "Lead developer chez Tech Corp"]),
+                _page(2, ["Développeur chez Digital Solutions"]),
+                _page(3, ["FORMATIONS", "Master Informatique"]),
+            ]
+        )
+
+        cleaned, report = preprocess_cv_text(text)
+
+        # La première occurrence (nom du candidat) est conservée
+        assert cleaned.count("Jean DUPONT - Développeur Python") == 1
+        assert cleaned.count("Document confidentiel") == 1
+        assert "Page" not in cleaned
+        assert "Digital Solutions" in cleaned
+        assert report.repeated_lines_removed == 6
+        assert report.page_numbers_removed == 3
+        assert report.tokens_saved > 0
+
+    def test_hyphenation_joined(self):
+        """Test recollage des mots coupés en fin de ligne"""
+        cleaned, report = preprocess_cv_text("Dévelop-\npement d'applica-\ntions")
+
+        assert cleaned == "Développement d'applications"
+        assert report.hyphenations_joined == 2
+
+    def test_whitespace_and_decorations_collapsed(self):
+        """Test réduction des espaces, lignes vides et caractères décoratifs"""
+        text = "Python   \t Django\n\n\n\n__________\n•  Tests unitaires\n ▪ CI/CD "
+
+        cleaned, _ = preprocess_cv_text(text)
+
+        assert cleaned == "Python Django\n\n- Tests unitaires\n- CI/CD"
+
+    def test_markdown_sections_optional(self):
+        """Test marqueurs de section markdown (désactivés par défaut)"""
+        text = "Compétences :\nPython\nEXPÉRIENCES PROFESSIONNELLES\nTech Corp"
+
+        plain, _ = preprocess_cv_text(text)
+        marked, _ = preprocess_cv_text(text, markdown_sections=True)
+
+        assert "##" not in plain
+        assert "## Compétences" in marked
+        assert "## EXPÉRIENCES PROFESSIONNELLES" in marked
+        assert "## Python" not in marked
+
+    def test_report_counts_tokens(self):
+        """Test du bilan de tokens économisés"""
+        text = "Texte   utile" + " " * 400
+
+        cleaned, report = preprocess_cv_text(text)
+
+        assert report.original_tokens == estimate_tokens(text)
+        assert report.tokens == estimate_tokens(cleaned)
+        assert report.as_dict()["saved_ratio"] > 0.9